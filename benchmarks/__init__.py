@@ -0,0 +1,8 @@
+"""
+Mediciones reproducibles del acceso a datos y de la generación de certificados.
+
+Cada módulo se ejecuta con python -m benchmarks.<nombre>. Los de acceso a
+datos trabajan sobre la base de datos configurada (MySQL o SQLite) dentro de
+una unidad de trabajo que se revierte al terminar; los de certificados
+escriben en un directorio temporal. Ninguno deja datos de prueba.
+"""
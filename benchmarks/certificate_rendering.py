@@ -0,0 +1,138 @@
+"""
+Certificados por segundo según la forma de generarlos.
+
+Genera N certificados en un directorio temporal de varias formas y compara
+los tiempos:
+- python-pptx leyendo la plantilla del disco en cada certificado (como antes
+  de TemplateCache),
+- python-pptx copiando la plantilla de la caché,
+- a nivel ZIP, reescribiendo solo la diapositiva (render_certificate_zip),
+- en PDF con ReportLab, un archivo por certificado (render_certificate_pdf),
+- en PDF con ReportLab, todos en un documento de N páginas.
+
+Comprueba además que las tres formas .pptx producen la misma diapositiva para
+cada participante, que los certificados ZIP conservan intactos los demás
+miembros de la plantilla y que el PDF único tiene N páginas y guarda la parte
+fija de la plantilla una sola vez.
+
+Uso:
+    python -m benchmarks.certificate_rendering
+    python -m benchmarks.certificate_rendering --count 200 --template Formato.pptx
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+import zipfile
+
+from controllers.certificate_renderer import render_certificate, render_certificate_zip, _template_cache, SLIDE_PART
+from controllers.certificate_pdf import render_certificate_pdf, get_pdf_template
+
+MODES = (
+    ('Sin caché', lambda *args: render_certificate(*args, use_cache=False)),
+    ('Con caché', render_certificate),
+    ('ZIP', render_certificate_zip),
+)
+
+PDF_MODE = ('PDF', render_certificate_pdf)
+
+def _render_all(render, count, template_path, output_dir):
+    """Genera `count` certificados con `render`. Retorna (segundos, [rutas])."""
+    paths = []
+    started = time.perf_counter()
+    for i in range(count):
+        path, error = render(f'Participante {i:05d}', f'V-{i:08d}', 'Proyecto de benchmark',
+                             'Fecha de benchmark', template_path, output_dir)
+        if error:
+            raise RuntimeError(error)
+        paths.append(path)
+    return time.perf_counter() - started, paths
+
+def _render_document(count, template_path, output_path):
+    """Genera `count` certificados como páginas de un solo PDF. Retorna (segundos, contenido)."""
+    started = time.perf_counter()
+    template = get_pdf_template(template_path)
+    document = template.new_canvas(output_path)
+    for i in range(count):
+        template.draw_certificate(document, f'Participante {i:05d}', f'V-{i:08d}', 'Proyecto de benchmark', 'Fecha de benchmark')
+    document.save()
+    seconds = time.perf_counter() - started
+    with open(output_path, 'rb') as pdf_file:
+        return seconds, pdf_file.read()
+
+def _slide_xml(path):
+    with zipfile.ZipFile(path) as package:
+        return package.read(SLIDE_PART)
+
+def _keeps_template_members(path, template_path):
+    """True si el certificado tiene los miembros de la plantilla, todos idénticos salvo la diapositiva."""
+    with zipfile.ZipFile(path) as package, zipfile.ZipFile(template_path) as template:
+        if package.testzip() is not None or package.namelist() != template.namelist():
+            return False
+        return all(package.read(name) == template.read(name) for name in template.namelist() if name != SLIDE_PART)
+
+def run(count, template_path):
+    """
+    Ejecuta el benchmark.
+
+    Args:
+        count (int): Certificados a generar con cada forma.
+        template_path (str): Ruta a la plantilla .pptx.
+
+    Returns:
+        tuple: ([(forma, segundos), ...], bool) - Los tiempos y si los certificados son los esperados
+               (las formas .pptx iguales entre sí y el PDF único con una página por certificado).
+    """
+    results = []
+    outputs = []
+    with tempfile.TemporaryDirectory() as output_root:
+        for label, render in MODES:
+            _template_cache.clear() # Cada forma paga su primera lectura de la plantilla
+            seconds, paths = _render_all(render, count, template_path, os.path.join(output_root, str(len(results))))
+            results.append((label, seconds))
+            outputs.append(paths)
+        same_output = all(len({_slide_xml(path) for path in paths}) == 1 for paths in zip(*outputs))
+        same_output = same_output and all(_keeps_template_members(path, template_path) for path in outputs[-1])
+
+        label, render = PDF_MODE
+        _template_cache.clear()
+        seconds, paths = _render_all(render, count, template_path, os.path.join(output_root, 'pdf'))
+        results.append((label, seconds))
+        same_output = same_output and all(path.endswith('.pdf') for path in paths)
+
+        _template_cache.clear()
+        seconds, document = _render_document(count, template_path, os.path.join(output_root, 'certificados.pdf'))
+        results.append(('PDF único', seconds))
+        pages = len(re.findall(rb'/Type /Page\b(?!s)', document))
+        forms = document.count(b'/Subtype /Form')
+        same_output = same_output and pages == count and forms == get_pdf_template(template_path).form_count
+    return results, same_output
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.certificate_rendering",
+                                     description="Compara las formas de generar certificados.")
+    parser.add_argument('--count', type=int, default=100, help="Certificados a generar con cada forma.")
+    parser.add_argument('--template', default='Formato.pptx', help="Ruta a la plantilla .pptx.")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.template):
+        print(f"La plantilla no se encontró en: {args.template}")
+        return 1
+
+    results, same_output = run(args.count, args.template)
+    baseline = results[0][1]
+    print(f"{'Forma':>10} {'Total s':>10} {'ms/cert.':>10} {'cert./s':>10} {'Mejora':>8}")
+    for label, seconds in results:
+        print(f"{label:>10} {seconds:>10.2f} {seconds * 1000 / args.count:>10.2f} {args.count / seconds:>10.1f} {baseline / seconds:>7.1f}x")
+
+    if not same_output:
+        print("✗ Los certificados de las distintas formas no son los esperados.")
+        return 1
+    print("✓ Las formas .pptx generan la misma diapositiva y los certificados ZIP conservan intactos los demás miembros;")
+    print("  el PDF único tiene una página por certificado y la parte fija de la plantilla una sola vez.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
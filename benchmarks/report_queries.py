@@ -0,0 +1,117 @@
+"""
+Consultas por reporte de proyectos según el número de proyectos.
+
+Crea un período con N proyectos (3 participantes cada uno) y cuenta, con las
+estadísticas de db.connection, cuántas sentencias ejecuta
+get_filtered_projects_report. El número debe ser el mismo para cualquier N:
+si crece con N, el reporte volvió a consultar proyecto por proyecto.
+
+Uso:
+    python -m benchmarks.report_queries
+    python -m benchmarks.report_queries --sizes 10 100 1000 2000
+"""
+import argparse
+import sys
+import time
+
+from config import QUERY_STATS_CONFIG
+from db.connection import UnitOfWork, get_query_stats, reset_query_stats
+from models.report_model import get_filtered_projects_report
+
+PARTICIPANTS_PER_PROJECT = 3
+PARTICIPANT_POOL = 60
+
+def _seed_catalogs(conn):
+    """Crea el período, la materia y los participantes del benchmark. Retorna (id_periodo, id_materia, [id_participante])."""
+    cursor = conn.cursor()
+    cursor.execute(
+        "INSERT INTO periodos (nombre_periodo, fecha_inicio, fecha_fin) VALUES (%s, %s, %s)",
+        ('Benchmark de reportes', '2000-01-01', '2000-06-30')
+    )
+    period_id = cursor.lastrowid
+    cursor.execute(
+        "INSERT INTO materias (codigo_materia, nombre_materia) VALUES (%s, %s)",
+        ('BENCH-RPT', 'Benchmark de reportes')
+    )
+    subject_id = cursor.lastrowid
+    participant_ids = []
+    for i in range(PARTICIPANT_POOL):
+        cursor.execute(
+            "INSERT INTO participantes (tipo_participante, nombre, apellido, cedula) VALUES (%s, %s, %s, %s)",
+            ('Docente' if i % 10 == 0 else 'Estudiante', f'Nombre {i}', f'Apellido {i}', f'BENCH-{i:05d}')
+        )
+        participant_ids.append(cursor.lastrowid)
+    cursor.close()
+    return period_id, subject_id, participant_ids
+
+def _seed_projects(conn, period_id, subject_id, participant_ids, start, end):
+    """Añade los proyectos [start, end) del benchmark con sus participantes."""
+    cursor = conn.cursor()
+    links = []
+    for i in range(start, end):
+        name = f'Benchmark {i:05d}'
+        cursor.execute(
+            "INSERT INTO proyectos (id_periodo, id_materia, nombre_proyecto, nombre_proyecto_clave, descripcion) VALUES (%s, %s, %s, %s, %s)",
+            (period_id, subject_id, name, name.casefold(), 'Proyecto generado por el benchmark')
+        )
+        project_id = cursor.lastrowid
+        links.extend((project_id, participant_ids[(i + k) % len(participant_ids)]) for k in range(PARTICIPANTS_PER_PROJECT))
+    cursor.executemany("INSERT INTO proyectos_participantes (id_proyecto, id_participante) VALUES (%s, %s)", links)
+    cursor.close()
+
+def run(sizes):
+    """
+    Ejecuta el benchmark para cada tamaño.
+
+    Args:
+        sizes (list of int): Números de proyectos a medir, en cualquier orden.
+
+    Returns:
+        list of tuple: [(proyectos, consultas, milisegundos), ...] en orden creciente de proyectos.
+    """
+    results = []
+    with UnitOfWork() as uow:
+        try:
+            period_id, subject_id, participant_ids = _seed_catalogs(uow.connection)
+            seeded = 0
+            for size in sorted(set(sizes)):
+                _seed_projects(uow.connection, period_id, subject_id, participant_ids, seeded, size)
+                seeded = size
+
+                reset_query_stats()
+                started = time.perf_counter()
+                report = get_filtered_projects_report(period_id=period_id, conn=uow)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                statements = get_query_stats()['count']
+
+                if len(report) != size or any(len(p['participantes']) != PARTICIPANTS_PER_PROJECT for p in report):
+                    raise RuntimeError(f"El reporte de {size} proyectos no devolvió los datos esperados.")
+                results.append((size, statements, elapsed_ms))
+        finally:
+            uow.rollback_only = True # Los datos del benchmark nunca se confirman
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.report_queries",
+                                     description="Cuenta las consultas de get_filtered_projects_report según el número de proyectos.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 500, 2000], help="Números de proyectos a medir.")
+    args = parser.parse_args()
+
+    if not QUERY_STATS_CONFIG.get('enabled'):
+        print("Las estadísticas de consultas están desactivadas (QUERY_STATS_CONFIG['enabled']); no se pueden contar las consultas.")
+        return 1
+
+    results = run(args.sizes)
+    print(f"{'Proyectos':>10} {'Consultas':>10} {'Tiempo ms':>10}")
+    for size, statements, elapsed_ms in results:
+        print(f"{size:>10} {statements:>10} {elapsed_ms:>10.1f}")
+
+    counts = {statements for _, statements, _ in results}
+    if len(counts) > 1:
+        print("✗ El número de consultas crece con el número de proyectos.")
+        return 1
+    print(f"✓ {counts.pop()} consultas para cualquier número de proyectos.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,12 +16,14 @@ if IS_BUNDLED:
     DB_DIR = Path(sys.executable).parent / 'db'
     ASSETS_DIR = Path(sys.executable).parent / 'assets'
     TEMPLATES_DIR = Path(sys.executable).parent / 'templates'
+    LOGS_DIR = Path(sys.executable).parent / 'logs'
 else:
     # Running in development
     BASE_DIR = Path(__file__).parent
     DB_DIR = BASE_DIR / 'db'
     ASSETS_DIR = BASE_DIR / 'assets'
     TEMPLATES_DIR = BASE_DIR / 'templates'
+    LOGS_DIR = BASE_DIR / 'logs'
 
 # Ensure required directories exist
 for directory in [DB_DIR, ASSETS_DIR, TEMPLATES_DIR]:
@@ -38,6 +40,64 @@ DB_CONFIG = {
     'auth_plugin': 'mysql_native_password',
 }
 
+# Motor de base de datos: 'mysql' (servidor) o 'sqlite' (archivo local, sin servidor)
+DB_BACKEND = os.environ.get('GESTOR_DB_BACKEND', 'mysql')
+
+# Configuración del backend SQLite (ver db/sqlite_backend.py)
+SQLITE_CONFIG = {
+    'path': os.environ.get('GESTOR_SQLITE_PATH', str(DB_DIR / 'gestor_expoferias.sqlite3')),
+    'timeout': 10,                        # Segundos de espera si el archivo está bloqueado
+    'schema': str(DB_DIR / 'database.sql'),  # Esquema con el que se crea un archivo nuevo
+}
+
+# Pool de conexiones (ver db/connection.py)
+DB_POOL_CONFIG = {
+    'size': 5,            # Máximo de conexiones abiertas simultáneamente
+    'timeout': 10,        # Segundos de espera por una conexión libre antes de fallar
+    'pre_ping': True,     # Verificar conexiones inactivas antes de entregarlas
+    'ping_interval': 30,  # Segundos de inactividad tras los cuales se hace el pre-ping
+}
+
+# Instrumentación de consultas (ver db/connection.py)
+QUERY_STATS_CONFIG = {
+    'enabled': True,       # Medir cada sentencia (duración, filas, función que la llamó)
+    'window': 500,         # Muestras recientes por sentencia para calcular percentiles
+    'slow_query_ms': 250,  # Sentencias más lentas que esto se escriben en el log de consultas lentas
+    'slow_log_path': str(LOGS_DIR / 'slow_queries.log'),
+}
+
+# Listas paginadas de administración (ver controllers/pagination.py)
+PAGINATION_CONFIG = {
+    'page_size': 200,       # Filas por página (por consulta) en las listas paginadas
+    'max_page_size': 1000,  # Tamaño máximo de página que aceptan los controladores
+    'count_cache_ttl': 60,  # Segundos que se reutiliza un total calculado con COUNT(*)
+}
+
+# Caché de resultados de reportes (ver controllers/report_cache.py)
+REPORT_CACHE_CONFIG = {
+    'max_entries': 64,  # Resultados guardados (combinaciones de filtros); se descarta el menos usado
+    'ttl': 300,         # Segundos máximos que se reutiliza un resultado sin escrituras de ningún equipo (acota los cambios hechos fuera de la aplicación)
+    'certificate_participants_max_entries': 2048,  # Proyectos cuyos participantes guarda la pestaña de certificados
+}
+
+# Índice de búsqueda de participantes (ver controllers/search_index.py)
+SEARCH_INDEX_CONFIG = {
+    'ttl': 300,  # Segundos tras los que se reconstruye aunque no haya escrituras (acota los cambios hechos fuera de la aplicación)
+}
+
+# Generación de certificados en lote (ver controllers/certificate_batch.py)
+CERTIFICATE_BATCH_CONFIG = {
+    'max_workers': None,  # Procesos que generan certificados; None para uno por núcleo disponible
+    'renderer': 'zip',    # 'zip' (copia la plantilla y reescribe solo la diapositiva), 'pptx' (python-pptx) o 'pdf' (ReportLab)
+}
+
+# Certificados en PDF (ver controllers/certificate_pdf.py)
+CERTIFICATE_PDF_CONFIG = {
+    # Fuentes TrueType por tipo de letra de la plantilla: {'Calibri': ('calibri.ttf', 'calibrib.ttf', 'calibrii.ttf', 'calibriz.ttf')}
+    # (normal, negrita, cursiva, negrita cursiva; None si falta). Sin ellas se usan Helvetica y Times.
+    'fonts': {},
+}
+
 # Application settings
 APP_NAME = 'Gestor de Expoferias'
 APP_VERSION = '1.0.0'
@@ -0,0 +1,261 @@
+# controllers/certificate_batch.py
+import os
+import queue
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from config import CERTIFICATE_BATCH_CONFIG
+from controllers.certificate_renderer import (RENDERERS, RENDERER_EXTENSIONS, DEFAULT_EVENT_DATE, build_certificate,
+                                              certificate_filename, certificate_paragraphs)
+from controllers.certificate_manifest import CertificateManifest, certificate_key, template_version
+
+# ProcessPoolExecutor no admite más de 61 procesos en Windows
+_WINDOWS_MAX_WORKERS = 61
+
+def available_cores():
+    """Núcleos que este proceso puede usar (respeta la afinidad de CPU donde el sistema la expone)."""
+    if hasattr(os, 'sched_getaffinity'):
+        return max(1, len(os.sched_getaffinity(0)))
+    return os.cpu_count() or 1
+
+def _render_job(renderer, args, output_path):
+    """
+    Punto de entrada en los procesos del pool: genera un certificado con el renderer indicado
+    y lo escribe en output_path -> (ruta, error).
+
+    Se escribe con el sufijo '.part' y se renombra al terminar: si el lote se
+    interrumpe, en el directorio no queda ningún certificado a medio escribir.
+    """
+    package, error = build_certificate(*args, renderer=renderer)
+    if error:
+        return None, error
+    part_path = f"{output_path}.part"
+    try:
+        with open(part_path, 'wb') as output_file:
+            output_file.write(package)
+        os.replace(part_path, output_path)
+        return output_path, None
+    except OSError as e:
+        return None, f"No se pudo escribir el certificado: {e}"
+
+
+class CertificateBatch:
+    """
+    Generación de un lote de certificados en un pool de procesos.
+
+    Generar un certificado es trabajo de CPU (componer y comprimir el .pptx),
+    así que los certificados se reparten entre procesos, uno por núcleo
+    disponible como máximo; cada uno usa el renderer configurado (ver
+    certificate_renderer.RENDERERS). Un hilo coordinador envía los trabajos y
+    recoge los resultados a medida que terminan; cada resultado se publica
+    como evento en una cola que la interfaz vacía con after() (drain_events),
+    de modo que Tk nunca espera a la generación.
+
+    El lote es idempotente y se puede reanudar: cada certificado escrito se
+    anota en el manifiesto del directorio (certificate_manifest), y al volver
+    a lanzarlo se omiten los que ya están generados con la misma plantilla y
+    el mismo texto. Tras corregir un nombre solo se regenera ese certificado;
+    tras un corte, solo los que faltaban. Dos participantes homónimos del
+    mismo proyecto reciben archivos distintos.
+
+    Eventos, en el orden en que ocurren:
+        ('omitido', nombre, ruta): un certificado que ya estaba generado y sin cambios.
+        ('certificado', nombre, ruta): un certificado generado.
+        ('error', nombre, mensaje): un certificado que falló; el lote sigue.
+        ('fin', resumen): el lote terminó (ver summary()).
+
+    cancel() descarta los certificados que aún no empezaron; los que están en
+    curso terminan y se publican igual.
+    """
+    def __init__(self, participants, project_name, template_path, output_dir, event_date=None, max_workers=None, renderer=None,
+                 project_id=None):
+        """
+        Args:
+            participants (list of dict): Participantes con 'nombre_completo' y 'cedula', y opcionalmente
+                                         'id_participante' y, si su proyecto no es el del lote,
+                                         'nombre_proyecto' e 'id_proyecto'.
+            project_name (str): Nombre del proyecto de los certificados.
+            template_path (str): Ruta a la plantilla .pptx.
+            output_dir (str): Directorio donde se guardan los certificados.
+            event_date (str, optional): Fecha del evento; por defecto DEFAULT_EVENT_DATE.
+            max_workers (int, optional): Procesos del pool; por defecto CERTIFICATE_BATCH_CONFIG['max_workers']
+                                         o los núcleos disponibles, y nunca más que certificados.
+            renderer (str, optional): Clave de certificate_renderer.RENDERERS; por defecto CERTIFICATE_BATCH_CONFIG['renderer'].
+            project_id (int, optional): ID del proyecto; identifica sus certificados en el manifiesto
+                                        (sin él se usa el nombre del proyecto).
+
+        Raises:
+            ValueError: Si el renderer no existe.
+        """
+        self.project_name = project_name
+        self.project_id = project_id
+        self.template_path = template_path
+        self.output_dir = output_dir
+        self.event_date = event_date or DEFAULT_EVENT_DATE
+        self.total = len(participants)
+        self.generated = [] # Rutas de los certificados generados
+        self.skipped = [] # Rutas de los certificados que ya estaban generados y sin cambios
+        self.failed = [] # (nombre, mensaje)
+        self.cancelled_count = 0
+        self.renderer = renderer or CERTIFICATE_BATCH_CONFIG['renderer']
+        if self.renderer not in RENDERERS:
+            raise ValueError(f"Renderer de certificados desconocido: '{self.renderer}'.")
+        self._participants = list(participants)
+        self._max_workers = max_workers or CERTIFICATE_BATCH_CONFIG['max_workers'] or available_cores()
+        if sys.platform == 'win32':
+            self._max_workers = min(self._max_workers, _WINDOWS_MAX_WORKERS)
+        self._events = queue.Queue()
+        self._lock = threading.Lock()
+        self._executor = None
+        self._cancelled = False
+        self._finished = threading.Event()
+
+    @property
+    def processed(self):
+        """Certificados terminados (generados, omitidos, fallidos o cancelados)."""
+        return len(self.generated) + len(self.skipped) + len(self.failed) + self.cancelled_count
+
+    @property
+    def cancelled(self):
+        """True si se pidió cancelar el lote."""
+        return self._cancelled
+
+    @property
+    def finished(self):
+        """True cuando el lote terminó (también si se canceló)."""
+        return self._finished.is_set()
+
+    def start(self):
+        """Lanza el lote en segundo plano y retorna de inmediato."""
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def cancel(self):
+        """Cancela los certificados pendientes. Se puede llamar desde el hilo de Tk."""
+        with self._lock:
+            self._cancelled = True
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def wait(self, timeout=None):
+        """Espera a que termine el lote (para usos sin interfaz). Retorna True si terminó."""
+        return self._finished.wait(timeout)
+
+    def drain_events(self):
+        """Retorna los eventos publicados desde la última llamada (lista vacía si no hay)."""
+        events = []
+        while True:
+            try:
+                events.append(self._events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def summary(self):
+        """
+        Retorna el resultado del lote.
+
+        Returns:
+            dict: total, generados (rutas), omitidos (rutas de los que ya estaban generados),
+                  fallidos ((nombre, mensaje)), cancelados (int) y directorio.
+        """
+        return {
+            'total': self.total,
+            'generados': list(self.generated),
+            'omitidos': list(self.skipped),
+            'fallidos': list(self.failed),
+            'cancelados': self.cancelled_count,
+            'directorio': self.output_dir,
+        }
+
+    def _run(self):
+        manifest = None
+        try:
+            manifest = CertificateManifest(self.output_dir)
+            jobs = self._pending_jobs(manifest)
+            if jobs:
+                self._run_pool(jobs, manifest)
+        except Exception as e: # Por ejemplo, que el sistema no permita crear procesos
+            for _ in range(self.total - self.processed):
+                self._fail(None, f"Error al iniciar la generación de certificados: {e}")
+        finally:
+            if manifest is not None:
+                manifest.close()
+            self._finished.set()
+            self._events.put(('fin', self.summary()))
+
+    def _pending_jobs(self, manifest):
+        """
+        Publica los certificados que ya están generados (y los participantes sin datos mínimos)
+        y retorna los que hay que generar: [(nombre, argumentos de build_certificate, archivo, clave, participante, proyecto)].
+        """
+        template_hash = template_version(self.template_path)
+        extension = RENDERER_EXTENSIONS[self.renderer]
+        jobs = []
+        for participant in self._participants:
+            name = participant.get('nombre_completo')
+            ci = participant.get('cedula')
+            if not (name and ci): # Asegurarse de tener los datos mínimos
+                self._fail(name, "Información incompleta (Nombre o Cédula).")
+                continue
+            project_name = participant.get('nombre_proyecto', self.project_name)
+            project_id = participant.get('id_proyecto', self.project_id)
+            participant_key = str(participant.get('id_participante') or ci)
+            project_key = str(project_id or project_name)
+            args = (name, ci, project_name, self.event_date, self.template_path)
+            key = certificate_key(template_hash, self.renderer, participant_key, project_key,
+                                  certificate_paragraphs(name, ci, project_name, self.event_date))
+            existing_path = manifest.existing_path(key)
+            if existing_path:
+                manifest.claim_filename(os.path.basename(existing_path), participant_key, project_key)
+                self.skipped.append(existing_path)
+                self._events.put(('omitido', name, existing_path))
+                continue
+            filename = manifest.claim_filename(certificate_filename(name, project_name, extension), participant_key, project_key)
+            jobs.append((name, args, filename, key, participant_key, project_key))
+        return jobs
+
+    def _run_pool(self, jobs, manifest):
+        with self._lock:
+            if self._cancelled:
+                self.cancelled_count += len(jobs)
+                return
+            self._executor = ProcessPoolExecutor(max_workers=min(self._max_workers, len(jobs)))
+        try:
+            # Los resultados llegan por add_done_callback y no con as_completed(): los futuros que
+            # cancela shutdown(cancel_futures=True) ejecutan sus callbacks pero no despiertan a as_completed
+            done = queue.Queue()
+            submitted = {}
+            for job in jobs:
+                name, args, filename = job[:3]
+                try:
+                    future = self._executor.submit(_render_job, self.renderer, args, os.path.join(self.output_dir, filename))
+                except RuntimeError: # cancel() cerró el pool mientras se enviaban los trabajos
+                    break
+                submitted[future] = job
+                future.add_done_callback(done.put)
+            self.cancelled_count += len(jobs) - len(submitted)
+            for _ in range(len(submitted)):
+                future = done.get()
+                name, _, filename, key, participant_key, project_key = submitted[future]
+                if future.cancelled():
+                    self.cancelled_count += 1
+                    continue
+                try:
+                    path, error = future.result()
+                except Exception as e: # El proceso murió (BrokenProcessPool) u otro error fuera del renderizado
+                    path, error = None, f"Error al generar el certificado: {e}"
+                if path:
+                    try:
+                        manifest.record(key, filename, participant_key, project_key, name)
+                    except OSError: # El certificado está en disco; solo se volverá a generar en la próxima ejecución
+                        pass
+                    self.generated.append(path)
+                    self._events.put(('certificado', name, path))
+                else:
+                    self._fail(name, error)
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def _fail(self, name, message):
+        self.failed.append((name, message))
+        self._events.put(('error', name, message))
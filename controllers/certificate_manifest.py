@@ -0,0 +1,196 @@
+# controllers/certificate_manifest.py
+"""
+Manifiesto de los certificados generados en un directorio.
+
+Cada certificado que termina un lote (controllers/certificate_batch.py) se
+anota como una línea JSON en JOB_MANIFEST_NAME, dentro del mismo directorio,
+con una clave que resume todo lo que determina su contenido: la versión de
+la plantilla (hash de su contenido), el renderer, el participante, el
+proyecto y el texto del certificado. Al volver a lanzar el lote, los
+certificados cuya clave ya está anotada y cuyo archivo sigue en disco con el
+mismo tamaño se omiten; si el lote se interrumpió, los que faltan son
+justamente los que no llegaron a anotarse.
+
+Las líneas solo se añaden al final (una por certificado, ya escrito en
+disco), así que un corte a mitad del lote pierde como mucho el último
+certificado. Al abrir el manifiesto se descartan las líneas incompletas y,
+si hay muchas entradas reemplazadas, se reescribe compacto.
+"""
+import datetime
+import hashlib
+import json
+import os
+
+JOB_MANIFEST_NAME = "manifiesto_certificados.jsonl"
+_MANIFEST_VERSION = 1 # Cambiarlo invalida las claves de todos los manifiestos existentes
+_REQUIRED_FIELDS = ('clave', 'archivo', 'bytes', 'participante', 'proyecto')
+
+def template_version(template_path):
+    """Hash (sha256) del contenido de la plantilla: cambia si la plantilla cambia, aunque conserve la fecha."""
+    digest = hashlib.sha256()
+    with open(template_path, 'rb') as template_file:
+        for chunk in iter(lambda: template_file.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def certificate_key(template_hash, renderer, participant_key, project_key, paragraphs):
+    """
+    Clave de un certificado: hash de todo lo que determina su contenido.
+
+    Args:
+        template_hash (str): template_version() de la plantilla.
+        renderer (str): Clave de certificate_renderer.RENDERERS.
+        participant_key (str): Identifica al participante (su ID o, si no se tiene, su cédula).
+        project_key (str): Identifica al proyecto (su ID o, si no se tiene, su nombre).
+        paragraphs (list of str): certificate_renderer.certificate_paragraphs() del certificado.
+
+    Returns:
+        str: sha256 en hexadecimal.
+    """
+    content = json.dumps([_MANIFEST_VERSION, template_hash, renderer, participant_key, project_key, paragraphs],
+                         ensure_ascii=False)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class CertificateManifest:
+    """
+    Certificados ya generados en un directorio, leídos de JOB_MANIFEST_NAME.
+
+    Además de las claves, lleva qué participación (participante y proyecto)
+    ocupa cada nombre de archivo, para que dos participantes homónimos del
+    mismo proyecto no se sobrescriban: el segundo recibe el nombre con su
+    identificador como sufijo, y lo conserva en las siguientes ejecuciones.
+
+    No es seguro entre hilos: lo usa solo el hilo coordinador del lote.
+    """
+    def __init__(self, output_dir):
+        """
+        Args:
+            output_dir (str): Directorio de los certificados (debe existir).
+
+        Raises:
+            OSError: Si el manifiesto existe y no se puede leer o reescribir.
+        """
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, JOB_MANIFEST_NAME)
+        self._entries = {} # {clave: entrada}
+        self._latest = {} # {(participante, proyecto, extensión): entrada más reciente}
+        self._owners = {} # {archivo: (participante, proyecto, extensión)}
+        self._file = None
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        lines = 0
+        damaged = False
+        with open(self.path, 'r', encoding='utf-8') as manifest_file:
+            for line in manifest_file:
+                lines += 1
+                try:
+                    entry = json.loads(line)
+                except ValueError: # Línea cortada por una interrupción
+                    entry = None
+                if not isinstance(entry, dict) or any(field not in entry for field in _REQUIRED_FIELDS):
+                    damaged = True
+                    continue
+                damaged = damaged or not line.endswith('\n')
+                self._remember(entry, self._owner(entry['participante'], entry['proyecto'], entry['archivo']))
+        # Reescribirlo si quedó una línea incompleta (la siguiente se le pegaría) o si la mitad está reemplazada
+        if damaged or lines > 2 * len(self._latest):
+            self._rewrite()
+
+    @staticmethod
+    def _owner(participant_key, project_key, filename):
+        """Participación dueña de un archivo; cada formato (.pptx, .pdf) tiene su propio certificado."""
+        return participant_key, project_key, os.path.splitext(filename)[1]
+
+    def _remember(self, entry, owner):
+        previous = self._latest.get(owner)
+        if previous is not None:
+            self._entries.pop(previous['clave'], None)
+            if self._owners.get(previous['archivo']) == owner:
+                del self._owners[previous['archivo']]
+        self._entries[entry['clave']] = entry
+        self._latest[owner] = entry
+        self._owners[entry['archivo']] = owner
+
+    def _rewrite(self):
+        part_path = f"{self.path}.part"
+        with open(part_path, 'w', encoding='utf-8') as manifest_file:
+            for entry in self._latest.values():
+                manifest_file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        os.replace(part_path, self.path)
+
+    def existing_path(self, key):
+        """
+        Ruta del certificado con esta clave si ya está generado: anotado y en disco con el tamaño anotado.
+        None si hay que generarlo.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        path = os.path.join(self.output_dir, entry['archivo'])
+        try:
+            if os.path.getsize(path) == entry['bytes']:
+                return path
+        except OSError: # Se borró o se movió
+            pass
+        return None
+
+    def claim_filename(self, filename, participant_key, project_key):
+        """
+        Reserva un nombre de archivo para la participación y lo retorna.
+
+        Si ya lo ocupa otra participación (en este lote o en una ejecución
+        anterior), retorna el nombre con `participant_key` como sufijo.
+        """
+        owner = self._owner(participant_key, project_key, filename)
+        previous = self._latest.get(owner)
+        if previous is not None and previous['archivo'] in (filename, self._suffixed(filename, participant_key)):
+            filename = previous['archivo'] # Conserva el nombre que ya tenía
+        elif self._owners.get(filename, owner) != owner:
+            filename = self._suffixed(filename, participant_key)
+        self._owners[filename] = owner
+        return filename
+
+    @staticmethod
+    def _suffixed(filename, participant_key):
+        root, extension = os.path.splitext(filename)
+        return f"{root}_{participant_key}{extension}"
+
+    def record(self, key, filename, participant_key, project_key, participant_name):
+        """
+        Anota un certificado recién escrito en disco.
+
+        Si la participación tenía antes otro archivo del mismo formato (por
+        ejemplo, porque se corrigió el nombre del participante), lo borra: ese
+        certificado quedó reemplazado por este.
+        """
+        owner = self._owner(participant_key, project_key, filename)
+        entry = {
+            'clave': key,
+            'archivo': filename,
+            'bytes': os.path.getsize(os.path.join(self.output_dir, filename)),
+            'participante': participant_key,
+            'proyecto': project_key,
+            'nombre': participant_name,
+            'generado': datetime.datetime.now().isoformat(timespec='seconds'),
+        }
+        previous = self._latest.get(owner)
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._file.flush() # Cada certificado queda anotado en cuanto termina
+        self._remember(entry, owner)
+        if previous is not None and previous['archivo'] != filename and previous['archivo'] not in self._owners:
+            try:
+                os.remove(os.path.join(self.output_dir, previous['archivo']))
+            except OSError:
+                pass
+
+    def close(self):
+        """Cierra el archivo del manifiesto."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,650 @@
+# controllers/certificate_pdf.py
+"""
+Certificados en PDF dibujados con ReportLab a partir de la plantilla .pptx.
+
+PdfTemplate lee la plantilla una sola vez y separa lo que es igual en todos
+los certificados (fondo del patrón, imágenes, formas, título, firmas y
+líneas) de la forma TARGET_SHAPE_NAME, la única cuyo texto cambia. La parte
+fija se dibuja en cada documento una sola vez como Form XObject; cada
+certificado es una página que reutiliza ese XObject y solo escribe sus
+cuatro párrafos. Un PDF con los certificados de todo un proyecto o período
+guarda así las imágenes y el fondo una sola vez, sin importar cuántas
+páginas tenga.
+
+La plantilla se interpreta en lo que usa Formato.pptx: imágenes, formas con
+geometría personalizada o rectángulos con relleno sólido (con transparencia),
+conectores rectos y cuadros de texto. Las fuentes de la plantilla se
+sustituyen por las estándar de PDF (Helvetica, Times, Courier) salvo las que
+se configuren como TrueType en CERTIFICATE_PDF_CONFIG['fonts'] (las estándar
+no tienen letras fuera de Europa occidental), y cada párrafo usa el formato
+de su primer fragmento de texto, así que el resultado se parece al .pptx
+pero no es idéntico.
+"""
+from reportlab import rl_config
+from reportlab.lib.colors import Color
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas as pdf_canvas
+from lxml import etree
+from pptx import Presentation
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from contextlib import contextmanager
+import io
+import math
+import os
+import threading
+
+from config import CERTIFICATE_PDF_CONFIG
+from controllers.certificate_renderer import (_template_cache, certificate_filename, certificate_paragraphs,
+                                              DEFAULT_EVENT_DATE, TARGET_SHAPE_NAME)
+
+EMU_PER_POINT = 12700
+FORM_NAME = 'PlantillaCertificado' # Prefijo de los Form XObject con la parte fija del certificado
+
+_NS = {
+    'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
+    'p': 'http://schemas.openxmlformats.org/presentationml/2006/main',
+    'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
+}
+_R_EMBED = f"{{{_NS['r']}}}embed"
+
+# Familias estándar de PDF por tipo de letra de la plantilla: (normal, negrita, cursiva, negrita cursiva)
+_STANDARD_FONTS = {
+    'Times New Roman': ('Times-Roman', 'Times-Bold', 'Times-Italic', 'Times-BoldItalic'),
+    'Courier New': ('Courier', 'Courier-Bold', 'Courier-Oblique', 'Courier-BoldOblique'),
+}
+_DEFAULT_FONTS = ('Helvetica', 'Helvetica-Bold', 'Helvetica-Oblique', 'Helvetica-BoldOblique')
+# Escala horizontal (%) de la fuente estándar que sustituye a un tipo de letra más estrecho, para que el
+# texto ocupe lo mismo que en el .pptx (el título no cabe en una línea con Helvetica a todo su ancho)
+_STANDARD_FONT_SCALES = {'Calibri': 88}
+
+_registered_fonts = {} # {(tipo de letra, negrita, cursiva): nombre registrado en ReportLab}
+_fonts_lock = threading.Lock()
+
+_a85_lock = threading.Lock()
+
+@contextmanager
+def _binary_streams():
+    """
+    Desactiva ASCII85 (rl_config.useA85) mientras dura el bloque y restaura el valor anterior.
+    ReportLab lo consulta como configuración global al crear imágenes y al escribir páginas y formularios.
+    """
+    with _a85_lock:
+        previous = rl_config.useA85
+        rl_config.useA85 = 0
+        try:
+            yield
+        finally:
+            rl_config.useA85 = previous
+
+
+class _CertificateCanvas(pdf_canvas.Canvas):
+    """
+    Lienzo de los certificados: sus imágenes y flujos van en binario, sin ASCII85.
+
+    En ASCII85 las imágenes ocupan un 25 % más y, sin la extensión en C de
+    ReportLab, codificarlas en Python puro era casi todo el tiempo de generar
+    un certificado. El cambio se limita a los métodos que crean o escriben
+    flujos, así que los demás PDF de la aplicación (la exportación de
+    reportes) no se ven afectados.
+    """
+    def drawImage(self, *args, **kwargs):
+        with _binary_streams():
+            return super().drawImage(*args, **kwargs)
+
+    def endForm(self, *args, **kwargs):
+        with _binary_streams():
+            return super().endForm(*args, **kwargs)
+
+    def showPage(self):
+        with _binary_streams():
+            return super().showPage()
+
+    def save(self):
+        with _binary_streams():
+            return super().save()
+
+
+def _xpath(element, expression):
+    return element.xpath(expression, namespaces=_NS)
+
+def _first(elements, expression):
+    """Primer resultado de `expression` en la cadena de herencia `elements` (se saltan los None)."""
+    for element in elements:
+        if element is not None:
+            found = _xpath(element, expression)
+            if found:
+                return found[0]
+    return None
+
+def _attribute(elements, name, default=None):
+    """Atributo `name` del primer elemento de la cadena de herencia que lo tenga."""
+    for element in elements:
+        if element is not None and element.get(name) is not None:
+            return element.get(name)
+    return default
+
+def _emu(value):
+    return int(value) / EMU_PER_POINT
+
+def _pdf_font(typeface, bold, italic):
+    """
+    Fuente de ReportLab para un tipo de letra de la plantilla.
+
+    Returns:
+        tuple: (nombre de la fuente, escala horizontal en %).
+    """
+    variant = bold + 2 * italic
+    files = CERTIFICATE_PDF_CONFIG['fonts'].get(typeface)
+    if files and files[variant]:
+        key = (typeface, bold, italic)
+        with _fonts_lock:
+            if key not in _registered_fonts:
+                name = f"{typeface}-{variant}".replace(' ', '')
+                pdfmetrics.registerFont(TTFont(name, files[variant]))
+                _registered_fonts[key] = name
+            return _registered_fonts[key], 100
+    return _STANDARD_FONTS.get(typeface, _DEFAULT_FONTS)[variant], _STANDARD_FONT_SCALES.get(typeface, 100)
+
+
+class _Theme:
+    """Colores y fuentes del tema del patrón, con su asignación de colores (clrMap)."""
+    def __init__(self, master_part, master):
+        theme = etree.fromstring(master_part.part_related_by(RT.THEME).blob)
+        self._colors = {}
+        for scheme_color in _xpath(theme, './/a:clrScheme/*'):
+            value = scheme_color[0]
+            self._colors[etree.QName(scheme_color).localname] = value.get('lastClr') or value.get('val')
+        color_map = _xpath(master, './p:clrMap')
+        self._color_map = dict(color_map[0].attrib) if color_map else {}
+        self._fonts = {
+            '+mj-lt': _attribute(_xpath(theme, './/a:majorFont/a:latin'), 'typeface', 'Calibri'),
+            '+mn-lt': _attribute(_xpath(theme, './/a:minorFont/a:latin'), 'typeface', 'Calibri'),
+        }
+
+    def font(self, typeface):
+        return self._fonts.get(typeface, typeface)
+
+    def color(self, fill):
+        """
+        Color de un a:solidFill (o del elemento que contiene el color, como a:lnRef).
+
+        Returns:
+            Color or None: El color con su transparencia, o None si no se reconoce.
+        """
+        if fill is None or not len(fill):
+            return None
+        value = fill[0]
+        kind = etree.QName(value).localname
+        if kind == 'srgbClr':
+            hex_color = value.get('val')
+        elif kind == 'sysClr':
+            hex_color = value.get('lastClr')
+        elif kind == 'schemeClr':
+            name = value.get('val')
+            hex_color = self._colors.get(self._color_map.get(name, name))
+        else:
+            return None
+        if not hex_color:
+            return None
+        alpha = _xpath(value, './a:alpha')
+        return Color(int(hex_color[0:2], 16) / 255, int(hex_color[2:4], 16) / 255, int(hex_color[4:6], 16) / 255,
+                     alpha=int(alpha[0].get('val')) / 100000 if alpha else 1)
+
+
+class _TextBox:
+    """
+    Cuadro de texto de la plantilla con el formato ya resuelto de cada párrafo.
+
+    El formato se hereda como en PowerPoint: el párrafo y su primer fragmento,
+    el lstStyle de la forma, el del marcador de posición del diseño y del
+    patrón y, al final, los estilos del patrón o de la presentación.
+    """
+    def __init__(self, shape, levels, theme, geometry):
+        """
+        Args:
+            shape: Elemento p:sp.
+            levels (list): Cadena de herencia de a:lvl1pPr (del más específico al más general).
+            theme (_Theme): Tema del patrón.
+            geometry (tuple): (x, y, ancho, alto) en puntos desde la esquina superior izquierda.
+        """
+        body_properties = [shape.find('p:txBody/a:bodyPr', _NS)]
+        x, y, width, height = geometry
+        left = _emu(_attribute(body_properties, 'lIns', 91440))
+        right = _emu(_attribute(body_properties, 'rIns', 91440))
+        self.top = y + _emu(_attribute(body_properties, 'tIns', 45720))
+        self.bottom = y + height - _emu(_attribute(body_properties, 'bIns', 45720))
+        self.left = x + left
+        self.width = width - left - right
+        self.anchor = _attribute(body_properties, 'anchor', 't')
+        self.paragraphs = [] # [(texto de la plantilla, formato)]
+        for paragraph in _xpath(shape, './p:txBody/a:p'):
+            paragraph_chain = [paragraph.find('a:pPr', _NS)] + levels
+            run_chain = [_first([paragraph], './a:r/a:rPr')] + [level.find('a:defRPr', _NS) for level in levels]
+            self.paragraphs.append((self._paragraph_text(paragraph), self._style(paragraph_chain, run_chain, theme)))
+
+    @staticmethod
+    def _paragraph_text(paragraph):
+        parts = []
+        for element in paragraph:
+            kind = etree.QName(element).localname
+            if kind in ('r', 'fld'):
+                parts.append(''.join(_xpath(element, './a:t/text()')))
+            elif kind == 'br':
+                parts.append('\n')
+        return ''.join(parts)
+
+    @staticmethod
+    def _style(paragraph_chain, run_chain, theme):
+        size = int(_attribute(run_chain, 'sz', 1800)) / 100
+        typeface = theme.font(_attribute([_first(run_chain, './a:latin')], 'typeface', '+mn-lt'))
+        bold = _attribute(run_chain, 'b', '0') in ('1', 'true')
+        italic = _attribute(run_chain, 'i', '0') in ('1', 'true')
+        line_points = _first(paragraph_chain, './a:lnSpc/a:spcPts')
+        line_percent = _first(paragraph_chain, './a:lnSpc/a:spcPct')
+        if line_points is not None:
+            line_height = int(line_points.get('val')) / 100
+        else:
+            line_height = 1.2 * size * (int(line_percent.get('val')) / 100000 if line_percent is not None else 1)
+        space_points = _first(paragraph_chain, './a:spcBef/a:spcPts')
+        space_percent = _first(paragraph_chain, './a:spcBef/a:spcPct')
+        if space_points is not None:
+            space_before = int(space_points.get('val')) / 100
+        else:
+            space_before = 1.2 * size * int(space_percent.get('val')) / 100000 if space_percent is not None else 0
+        font, horizontal_scale = _pdf_font(typeface, bold, italic)
+        return {
+            'font': font,
+            'horizontal_scale': horizontal_scale,
+            'size': size,
+            'color': theme.color(_first(run_chain, './a:solidFill')) or Color(0, 0, 0),
+            'char_space': int(_attribute(run_chain, 'spc', 0)) / 100,
+            'align': _attribute(paragraph_chain, 'algn', 'l'),
+            'margin_left': _emu(_attribute(paragraph_chain, 'marL', 0)),
+            'margin_right': _emu(_attribute(paragraph_chain, 'marR', 0)),
+            'line_height': line_height,
+            'space_before': space_before,
+        }
+
+    @staticmethod
+    def _width(text, style):
+        return ((pdfmetrics.stringWidth(text, style['font'], style['size']) + style['char_space'] * len(text))
+                * style['horizontal_scale'] / 100)
+
+    def _wrap(self, text, style, width):
+        lines = []
+        for chunk in text.split('\n'):
+            words = chunk.split(' ')
+            line = words[0]
+            for word in words[1:]:
+                candidate = f"{line} {word}"
+                if self._width(candidate, style) <= width:
+                    line = candidate
+                else:
+                    lines.append(line)
+                    line = word
+            lines.append(line)
+        return lines
+
+    def draw(self, canvas, page_height, texts=None):
+        """
+        Escribe el cuadro en el lienzo.
+
+        Args:
+            canvas: Lienzo de ReportLab.
+            page_height (float): Alto de la página en puntos.
+            texts (list of str, optional): Texto de cada párrafo; por defecto el de la plantilla.
+                                           Si hay más textos que párrafos, los sobrantes usan el formato del último.
+        """
+        if texts is None:
+            texts = [text for text, _ in self.paragraphs]
+        placed = [] # (estilo, x, distancia desde el borde superior a la línea base, texto)
+        cursor = 0
+        for index, text in enumerate(texts):
+            style = self.paragraphs[min(index, len(self.paragraphs) - 1)][1]
+            if index:
+                cursor += style['space_before']
+            left = self.left + style['margin_left']
+            width = self.width - style['margin_left'] - style['margin_right']
+            for line in self._wrap(text, style, width):
+                line = line.rstrip(' ') if style['align'] != 'l' else line
+                line_width = self._width(line, style)
+                if style['align'] == 'ctr':
+                    x = left + (width - line_width) / 2
+                elif style['align'] == 'r':
+                    x = left + width - line_width
+                else:
+                    x = left
+                placed.append((style, x, cursor + style['line_height'] - 0.25 * style['size'], line))
+                cursor += style['line_height']
+
+        top = self.top
+        if self.anchor == 'ctr':
+            top += (self.bottom - self.top - cursor) / 2
+        elif self.anchor == 'b':
+            top = self.bottom - cursor
+        canvas.saveState()
+        for style, x, baseline, line in placed:
+            text = canvas.beginText(x, page_height - top - baseline)
+            text.setFont(style['font'], style['size'])
+            text.setFillColor(style['color'])
+            text.setCharSpace(style['char_space'])
+            text.setHorizScale(style['horizontal_scale'])
+            text.textOut(line)
+            canvas.drawText(text)
+        canvas.restoreState()
+
+    @property
+    def translucent(self):
+        """True si algún párrafo tiene color con transparencia."""
+        return any(style['color'].alpha < 1 for _, style in self.paragraphs)
+
+
+class PdfTemplate:
+    """
+    Plantilla de certificado preparada para ReportLab.
+
+    Al construirla se recorren el patrón, el diseño y la diapositiva de la
+    plantilla y la parte fija queda como una lista de operaciones de dibujo
+    con las imágenes ya decodificadas; new_canvas() la dibuja una vez por
+    documento como Form XObject y draw_certificate() añade una página que la
+    reutiliza y solo escribe el texto del certificado.
+
+    ReportLab no guarda la transparencia (ExtGState) en los recursos de un
+    Form XObject, así que las formas con transparencia se dibujan en cada
+    página: la parte fija se divide en capas, las opacas como un XObject
+    cada una y las transparentes directamente, respetando el orden de la
+    plantilla. En Formato.pptx son dos triángulos pequeños.
+    """
+    def __init__(self, template_path):
+        """
+        Args:
+            template_path (str): Ruta a la plantilla .pptx.
+
+        Raises:
+            ValueError: Si la plantilla no tiene la forma TARGET_SHAPE_NAME.
+        """
+        prs = Presentation(template_path)
+        slide_part = prs.slides[0].part
+        layout_part = slide_part.part_related_by(RT.SLIDE_LAYOUT)
+        master_part = layout_part.part_related_by(RT.SLIDE_MASTER)
+        slide, layout, master = (etree.fromstring(part.blob) for part in (slide_part, layout_part, master_part))
+        presentation = etree.fromstring(prs.part.blob)
+
+        self.page_size = (_emu(prs.slide_width), _emu(prs.slide_height))
+        self._theme = _Theme(master_part, master)
+        self._layout = layout
+        self._master = master
+        self._default_levels = _xpath(presentation, './p:defaultTextStyle/a:lvl1pPr')
+        self._layers = [] # [(transparente, [f(canvas)])], en el orden en que se dibujan
+        self._body = None
+
+        self._add_background([slide, layout, master])
+        if slide.get('showMasterSp') != '0' and layout.get('showMasterSp') != '0':
+            self._add_shapes(master, master_part, skip_placeholders=True)
+        self._add_shapes(layout, layout_part, skip_placeholders=True)
+        self._add_shapes(slide, slide_part, skip_placeholders=False)
+        if self._body is None:
+            raise ValueError(f"No se encontró la forma '{TARGET_SHAPE_NAME}' en la plantilla para insertar el texto.")
+
+    def _add_operation(self, operation, translucent=False):
+        """Añade una operación de dibujo a la parte fija, junto a las anteriores si son igual de opacas."""
+        if self._layers and self._layers[-1][0] == translucent:
+            self._layers[-1][1].append(operation)
+        else:
+            self._layers.append((translucent, [operation]))
+
+    def _add_background(self, documents):
+        fill = _first(documents, './p:cSld/p:bg/p:bgPr/a:solidFill')
+        color = self._theme.color(fill)
+        if color is not None:
+            width, height = self.page_size
+            self._add_operation(lambda canvas: self._fill_rect(canvas, color, 0, 0, width, height), color.alpha < 1)
+
+    @staticmethod
+    def _fill_rect(canvas, color, x, y, width, height):
+        canvas.setFillColor(color)
+        canvas.rect(x, y, width, height, stroke=0, fill=1)
+
+    def _placeholder_levels(self, placeholder):
+        """Cadena de a:lvl1pPr que hereda un marcador de posición de la diapositiva."""
+        kind = placeholder.get('type', 'body')
+        index = placeholder.get('idx')
+        levels = []
+        for document in (self._layout, self._master):
+            for shape in _xpath(document, './p:cSld/p:spTree/p:sp'):
+                candidate = _first([shape], './p:nvSpPr/p:nvPr/p:ph')
+                if candidate is not None and (candidate.get('type', 'body') == kind
+                                              and (index is None or candidate.get('idx') in (None, index))):
+                    levels.extend(_xpath(shape, './p:txBody/a:lstStyle/a:lvl1pPr'))
+                    break
+        style = 'titleStyle' if kind in ('title', 'ctrTitle') else 'bodyStyle'
+        return levels + _xpath(self._master, f'./p:txStyles/p:{style}/a:lvl1pPr')
+
+    def _placeholder_geometry(self, placeholder):
+        for document in (self._layout, self._master):
+            for shape in _xpath(document, './p:cSld/p:spTree/p:sp'):
+                candidate = _first([shape], './p:nvSpPr/p:nvPr/p:ph')
+                if candidate is not None and candidate.get('type', 'body') == placeholder.get('type', 'body'):
+                    return self._geometry(shape)
+        return None
+
+    @staticmethod
+    def _geometry(shape):
+        transform = _first([shape], './p:spPr/a:xfrm')
+        if transform is None:
+            return None
+        offset, extent = transform.find('a:off', _NS), transform.find('a:ext', _NS)
+        return (_emu(offset.get('x')), _emu(offset.get('y')), _emu(extent.get('cx')), _emu(extent.get('cy')))
+
+    def _add_shapes(self, document, part, skip_placeholders):
+        for shape in _xpath(document, './p:cSld/p:spTree/*'):
+            kind = etree.QName(shape).localname
+            placeholder = _first([shape], './*/p:nvPr/p:ph')
+            if placeholder is not None and skip_placeholders:
+                continue
+            geometry = self._geometry(shape)
+            if geometry is None and placeholder is not None:
+                geometry = self._placeholder_geometry(placeholder)
+            if geometry is None: # Grupos y otros elementos sin posición propia
+                continue
+            if kind == 'pic':
+                self._add_picture(shape, part, geometry)
+            elif kind in ('sp', 'cxnSp'):
+                self._add_shape(shape, geometry)
+                if kind != 'sp' or shape.find('p:txBody', _NS) is None:
+                    continue
+                is_body = (self._body is None and not skip_placeholders
+                           and _attribute(_xpath(shape, './p:nvSpPr/p:cNvPr'), 'name') == TARGET_SHAPE_NAME)
+                if is_body or _xpath(shape, './p:txBody/a:p/a:r'):
+                    levels = _xpath(shape, './p:txBody/a:lstStyle/a:lvl1pPr')
+                    levels += self._placeholder_levels(placeholder) if placeholder is not None else self._default_levels
+                    text_box = _TextBox(shape, levels, self._theme, geometry)
+                    if is_body:
+                        self._body = text_box
+                    else:
+                        self._add_operation(lambda canvas, box=text_box: box.draw(canvas, self.page_size[1]),
+                                            text_box.translucent)
+
+    def _add_picture(self, shape, part, geometry):
+        blip = _first([shape], './p:blipFill/a:blip')
+        if blip is None or blip.get(_R_EMBED) is None:
+            return
+        image = ImageReader(io.BytesIO(part.related_part(blip.get(_R_EMBED)).blob))
+        x, y, width, height = geometry
+        bottom = self.page_size[1] - y - height
+        self._add_operation(lambda canvas: canvas.drawImage(image, x, bottom, width, height, mask='auto'))
+
+    def _add_shape(self, shape, geometry):
+        properties = shape.find('p:spPr', _NS)
+        fill_color = self._theme.color(properties.find('a:solidFill', _NS))
+        line = properties.find('a:ln', _NS)
+        line_color = None
+        if line is not None and line.find('a:noFill', _NS) is None:
+            line_color = self._theme.color(line.find('a:solidFill', _NS))
+        if line_color is None and (line is None or line.find('a:noFill', _NS) is None):
+            line_reference = _first([shape], './p:style/a:lnRef')
+            if line_reference is not None and line_reference.get('idx') != '0':
+                line_color = self._theme.color(line_reference)
+        line_width = _emu(line.get('w', 9525)) if line is not None else 0.75
+        if fill_color is None and line_color is None:
+            return
+
+        preset = _first([properties], './a:prstGeom/@prst')
+        subpaths = _xpath(properties, './a:custGeom/a:pathLst/a:path')
+        transform = properties.find('a:xfrm', _NS)
+        flip_h = transform is not None and transform.get('flipH') == '1'
+        flip_v = transform is not None and transform.get('flipV') == '1'
+        x, y, width, height = geometry
+        page_height = self.page_size[1]
+
+        def draw(canvas):
+            canvas.saveState()
+            if fill_color is not None:
+                canvas.setFillColor(fill_color)
+            if line_color is not None:
+                canvas.setStrokeColor(line_color)
+                canvas.setLineWidth(line_width)
+            path = canvas.beginPath()
+            if subpaths:
+                for subpath in subpaths:
+                    self._trace_custom_path(path, subpath, x, page_height - y, width, height)
+            elif preset in ('line', 'straightConnector1'):
+                x1, x2 = (x + width, x) if flip_h else (x, x + width)
+                y1, y2 = (y + height, y) if flip_v else (y, y + height)
+                path.moveTo(x1, page_height - y1)
+                path.lineTo(x2, page_height - y2)
+            else: # Rectángulo y cualquier otra forma predefinida se aproximan con su caja
+                path.rect(x, page_height - y - height, width, height)
+            canvas.drawPath(path, stroke=line_color is not None,
+                            fill=fill_color is not None and preset not in ('line', 'straightConnector1'))
+            canvas.restoreState()
+
+        self._add_operation(draw, any(color is not None and color.alpha < 1 for color in (fill_color, line_color)))
+
+    @staticmethod
+    def _trace_custom_path(path, subpath, left, top, width, height):
+        """Añade a `path` un a:path de geometría personalizada (coordenadas propias escaladas a la caja)."""
+        scale_x = width / int(subpath.get('w', 1) or 1)
+        scale_y = height / int(subpath.get('h', 1) or 1)
+
+        def point(pt):
+            return left + int(pt.get('x')) * scale_x, top - int(pt.get('y')) * scale_y
+
+        current = (left, top)
+        for command in subpath:
+            kind = etree.QName(command).localname
+            points = [point(pt) for pt in _xpath(command, './a:pt')]
+            if kind == 'moveTo':
+                path.moveTo(*points[0])
+            elif kind == 'lnTo':
+                path.lineTo(*points[0])
+            elif kind == 'cubicBezTo':
+                path.curveTo(*points[0], *points[1], *points[2])
+            elif kind == 'quadBezTo':
+                (cx, cy), (ex, ey) = points
+                x0, y0 = current
+                path.curveTo(x0 + 2 * (cx - x0) / 3, y0 + 2 * (cy - y0) / 3,
+                             ex + 2 * (cx - ex) / 3, ey + 2 * (cy - ey) / 3, ex, ey)
+            elif kind == 'arcTo':
+                radius_x = int(command.get('wR')) * scale_x
+                radius_y = int(command.get('hR')) * scale_y
+                start = int(command.get('stAng')) / 60000
+                sweep = int(command.get('swAng')) / 60000
+                center_x = current[0] - radius_x * math.cos(math.radians(start))
+                center_y = current[1] + radius_y * math.sin(math.radians(start))
+                # En PDF el eje Y crece hacia arriba: los ángulos cambian de signo
+                path.arcTo(center_x - radius_x, center_y - radius_y, center_x + radius_x, center_y + radius_y,
+                           -start, -sweep)
+                end = math.radians(start + sweep)
+                points = [(center_x + radius_x * math.cos(end), center_y - radius_y * math.sin(end))]
+            elif kind == 'close':
+                path.close()
+            if points:
+                current = points[-1]
+
+    @property
+    def form_count(self):
+        """Form XObject que new_canvas() añade a cada documento."""
+        return sum(1 for translucent, _ in self._layers if not translucent)
+
+    def new_canvas(self, output, title=None):
+        """
+        Crea un lienzo del tamaño de la plantilla con la parte fija ya definida como Form XObject.
+
+        Args:
+            output (str or file): Ruta o archivo binario donde se guardará el PDF.
+            title (str, optional): Título del documento.
+        """
+        canvas = _CertificateCanvas(output, pagesize=self.page_size, pageCompression=1)
+        if title:
+            canvas.setTitle(title)
+        for index, (translucent, operations) in enumerate(self._layers):
+            if not translucent:
+                canvas.beginForm(f"{FORM_NAME}{index}")
+                for operation in operations:
+                    operation(canvas)
+                canvas.endForm()
+        return canvas
+
+    def draw_certificate(self, canvas, participant_name, participant_ci, project_name, event_date=DEFAULT_EVENT_DATE):
+        """Añade al lienzo (creado con new_canvas) la página de un certificado."""
+        for index, (translucent, operations) in enumerate(self._layers):
+            if translucent:
+                for operation in operations:
+                    operation(canvas)
+            else:
+                canvas.doForm(f"{FORM_NAME}{index}")
+        self._body.draw(canvas, self.page_size[1],
+                        certificate_paragraphs(participant_name, participant_ci, project_name, event_date))
+        canvas.showPage()
+
+
+def get_pdf_template(template_path):
+    """PdfTemplate de la plantilla, construida una vez por proceso (ver certificate_renderer.TemplateCache)."""
+    return _template_cache.get(template_path).pdf_template()
+
+def build_certificate_pdf(participant_name, participant_ci, project_name, event_date=DEFAULT_EVENT_DATE, template_path="Formato.pptx"):
+    """
+    Genera un certificado en PDF en memoria, sin escribir ningún archivo.
+
+    Args:
+        participant_name (str): Nombre completo del participante.
+        participant_ci (str): Cédula de identidad del participante.
+        project_name (str): Nombre del proyecto en el que participó.
+        event_date (str): La fecha del evento.
+        template_path (str): Ruta al archivo de la plantilla .pptx.
+
+    Returns:
+        tuple: (bytes or None, str or None) - El contenido del PDF y un mensaje de error si falla.
+    """
+    try:
+        if not os.path.exists(template_path):
+            return None, f"La plantilla no se encontró en: {template_path}"
+        template = get_pdf_template(template_path)
+        buffer = io.BytesIO()
+        canvas = template.new_canvas(buffer, title=f"Certificado - {participant_name}")
+        template.draw_certificate(canvas, participant_name, participant_ci, project_name, event_date)
+        canvas.save()
+        return buffer.getvalue(), None
+    except Exception as e:
+        return None, f"Error al generar el certificado: {e}"
+
+def render_certificate_pdf(participant_name, participant_ci, project_name, event_date=DEFAULT_EVENT_DATE, template_path="Formato.pptx", output_dir="certificados_generados"):
+    """
+    Genera el certificado de un participante como archivo PDF (ver build_certificate_pdf).
+
+    Args y Returns: los de certificate_renderer.render_certificate.
+    """
+    document, error = build_certificate_pdf(participant_name, participant_ci, project_name, event_date, template_path)
+    if error:
+        return None, error
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+        output_path = os.path.join(output_dir, certificate_filename(participant_name, project_name, '.pdf'))
+        with open(output_path, 'wb') as output_file:
+            output_file.write(document)
+        return output_path, None
+    except Exception as e:
+        return None, f"Error al generar el certificado: {e}"
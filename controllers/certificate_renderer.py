@@ -0,0 +1,432 @@
+# controllers/certificate_renderer.py
+"""
+Generación de un certificado .pptx a partir de la plantilla.
+
+Hay dos formas de generarlo, con el mismo resultado:
+- render_certificate: edita la presentación con python-pptx y la guarda.
+- render_certificate_zip: copia el .pptx de la plantilla miembro a miembro
+  sin descomprimir y solo reescribe ppt/slides/slide1.xml (ver _ZipTemplate).
+
+El certificado en PDF (controllers/certificate_pdf.py) usa la misma caché de
+plantillas y se registra aquí como renderer 'pdf'.
+
+Este módulo solo depende de python-pptx (no de la base de datos ni de Tk)
+para que los procesos de controllers/certificate_batch.py lo importen rápido;
+ReportLab se importa solo cuando se pide un PDF.
+"""
+from pptx import Presentation
+from xml.sax.saxutils import escape
+import copy
+import io
+import os
+import re
+import struct
+import threading
+import zipfile
+import zlib
+
+DEFAULT_EVENT_DATE = "16 de enero del 2025"
+TARGET_SHAPE_NAME = 'object 3' # Forma de la plantilla que recibe el texto del certificado
+SLIDE_PART = 'ppt/slides/slide1.xml' # Único miembro del .pptx que cambia entre certificados
+
+# Marcadores que ocupan el lugar de cada dato en la diapositiva precompilada (caracteres de uso privado)
+_FIELDS = ('participant_name', 'participant_ci', 'project_name', 'event_date')
+_PLACEHOLDERS = {field: f"\ue000{i}\ue001" for i, field in enumerate(_FIELDS)}
+_PLACEHOLDER_RE = re.compile("(\ue000\\d\ue001)".encode('utf-8'))
+
+# Registros ZIP (APPNOTE 4.3.7, 4.3.12 y 4.3.16), sin ZIP64: la plantilla pesa unos cientos de KB
+_LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+_CENTRAL_HEADER = struct.Struct('<4s6H3L5H2L')
+_END_OF_CENTRAL_DIR = struct.Struct('<4s4H2LH')
+_FLAG_DATA_DESCRIPTOR = 0x08
+_FLAG_UTF8 = 0x800
+
+def _find_target_shape_index(slide):
+    """Posición en slide.shapes de la forma TARGET_SHAPE_NAME con marco de texto, o None."""
+    for index, shape in enumerate(slide.shapes):
+        if shape.has_text_frame and shape.name == TARGET_SHAPE_NAME:
+            return index
+    return None
+
+
+def _zip_safe(value):
+    """
+    True si python-pptx escribe `value` tal cual (solo escapando &, < y >) en un a:t.
+    Los saltos de línea y otros caracteres de control los transforma; un texto vacío no genera run.
+    """
+    return bool(value) and not any(c < ' ' or c in '\ue000\ue001' for c in value)
+
+def _dos_date_time(date_time):
+    year, month, day, hour, minute, second = date_time
+    return (hour << 11) | (minute << 5) | (second // 2), ((year - 1980) << 9) | (month << 5) | day
+
+
+class _ZipTemplate:
+    """
+    La plantilla como archivo ZIP listo para copiar.
+
+    Guarda cada miembro ya comprimido tal como está en la plantilla y la
+    diapositiva dividida en fragmentos alrededor de los marcadores de cada
+    dato. Generar un certificado es unir los fragmentos con los datos
+    escapados, comprimir esa diapositiva (unos 20 KB) y escribir el resto de
+    miembros sin descomprimirlos ni recomprimirlos; python-pptx, en cambio,
+    vuelve a comprimir las imágenes en cada guardado.
+    """
+    def __init__(self, path, slide_xml):
+        """
+        Args:
+            path (str): Ruta a la plantilla .pptx.
+            slide_xml (bytes): SLIDE_PART serializada por python-pptx con los marcadores en lugar de los datos.
+        """
+        with open(path, 'rb') as template_file:
+            data = template_file.read()
+        with zipfile.ZipFile(io.BytesIO(data)) as package:
+            infos = package.infolist()
+
+        self._members = [] # [(campos de cabecera, (método, CRC, tamaños), cabecera local + datos)]; la diapositiva con None
+        for info in infos:
+            name = info.filename.encode('utf-8' if info.flag_bits & _FLAG_UTF8 else 'cp437')
+            flags = info.flag_bits & ~_FLAG_DATA_DESCRIPTOR # Los tamaños van en la cabecera local
+            dos_time, dos_date = _dos_date_time(info.date_time)
+            fields = {'name': name, 'flags': flags, 'dos_time': dos_time, 'dos_date': dos_date,
+                      'version': (info.create_system << 8) | info.create_version,
+                      'extract_version': info.extract_version, 'internal_attr': info.internal_attr,
+                      'external_attr': info.external_attr}
+            if info.filename == SLIDE_PART:
+                self._members.append((fields, None, None))
+                continue
+            name_length, extra_length = struct.unpack_from('<2H', data, info.header_offset + 26)
+            start = info.header_offset + _LOCAL_HEADER.size + name_length + extra_length
+            compressed = data[start:start + info.compress_size]
+            sizes = (info.compress_type, info.CRC, info.compress_size, info.file_size)
+            self._members.append((fields, sizes, self._local_entry(fields, *sizes) + compressed))
+        if not any(entry is None for _, _, entry in self._members):
+            raise ValueError(f"La plantilla no contiene {SLIDE_PART}.")
+
+        placeholders = {value.encode('utf-8'): field for field, value in _PLACEHOLDERS.items()}
+        self._slide_parts = [placeholders.get(part, part) for part in _PLACEHOLDER_RE.split(slide_xml)]
+        found = sorted(part for part in self._slide_parts if isinstance(part, str))
+        if found != sorted(_FIELDS):
+            raise ValueError("La diapositiva de la plantilla no tiene exactamente un lugar para cada dato del certificado.")
+
+    @staticmethod
+    def _local_entry(fields, method, crc, compressed_size, size):
+        return _LOCAL_HEADER.pack(b'PK\x03\x04', fields['extract_version'], fields['flags'], method,
+                                  fields['dos_time'], fields['dos_date'], crc, compressed_size, size,
+                                  len(fields['name']), 0) + fields['name']
+
+    def render(self, values):
+        """
+        Retorna el .pptx completo (bytes) con los datos de `values` en la diapositiva.
+
+        Args:
+            values (dict): {campo de _FIELDS: texto}; cada texto debe cumplir _zip_safe.
+        """
+        slide_xml = b''.join(part if isinstance(part, bytes) else escape(values[part]).encode('utf-8')
+                             for part in self._slide_parts)
+        compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -zlib.MAX_WBITS)
+        compressed = compressor.compress(slide_xml) + compressor.flush()
+        slide_sizes = (zipfile.ZIP_DEFLATED, zlib.crc32(slide_xml), len(compressed), len(slide_xml))
+
+        chunks = []
+        central_directory = []
+        offset = 0
+        for fields, sizes, entry in self._members:
+            if entry is None:
+                sizes = slide_sizes
+                entry = self._local_entry(fields, *sizes) + compressed
+            central_directory.append(_CENTRAL_HEADER.pack(
+                b'PK\x01\x02', fields['version'], fields['extract_version'], fields['flags'], sizes[0],
+                fields['dos_time'], fields['dos_date'], sizes[1], sizes[2], sizes[3],
+                len(fields['name']), 0, 0, 0, fields['internal_attr'], fields['external_attr'], offset
+            ) + fields['name'])
+            chunks.append(entry)
+            offset += len(entry)
+        central_size = sum(len(record) for record in central_directory)
+        chunks.extend(central_directory)
+        chunks.append(_END_OF_CENTRAL_DIR.pack(b'PK\x05\x06', 0, 0, len(central_directory), len(central_directory),
+                                               central_size, offset, 0))
+        return b''.join(chunks)
+
+
+class _CachedTemplate:
+    """
+    Plantilla ya leída y la posición de su forma de texto.
+
+    `_prototype` no se toca nunca: solo se copia con deepcopy. Acceder a sus
+    diapositivas o formas dejaría en caché de python-pptx referencias a
+    elementos XML internos, y deepcopy los duplicaría fuera de su árbol (las
+    copias editarían un XML que no se guarda).
+    """
+    def __init__(self, path, stamp):
+        self.path = path
+        self.stamp = stamp
+        self._prototype = Presentation(path)
+        self.shape_index = _find_target_shape_index(self.clone().slides[0])
+        self._zip_template = None
+        self._pdf_template = None
+        self._lock = threading.Lock()
+
+    def clone(self):
+        """Presentation independiente, idéntica a la plantilla recién leída."""
+        return copy.deepcopy(self._prototype)
+
+    def zip_template(self):
+        """_ZipTemplate de esta plantilla, construida la primera vez que se pide."""
+        with self._lock:
+            if self._zip_template is None:
+                prs = self.clone()
+                shape = prs.slides[0].shapes[self.shape_index]
+                _fill_certificate_text(shape.text_frame, **_PLACEHOLDERS)
+                self._zip_template = _ZipTemplate(self.path, prs.slides[0].part.blob)
+            return self._zip_template
+
+    def pdf_template(self):
+        """certificate_pdf.PdfTemplate de esta plantilla, construida la primera vez que se pide."""
+        from controllers.certificate_pdf import PdfTemplate
+        with self._lock:
+            if self._pdf_template is None:
+                self._pdf_template = PdfTemplate(self.path)
+            return self._pdf_template
+
+
+class TemplateCache:
+    """
+    Plantillas de certificado leídas una sola vez por proceso.
+
+    Cada entrada se guarda por ruta absoluta junto con la fecha de
+    modificación y el tamaño del archivo; si la plantilla cambia en disco se
+    vuelve a leer. Copiar la presentación en memoria es varias veces más
+    rápido que volver a abrir y descomprimir el .pptx, y la forma de texto ya
+    está localizada (ver python -m benchmarks.certificate_rendering).
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._templates = {} # {ruta absoluta: _CachedTemplate}
+        self.loads = 0 # Lecturas del disco (para el benchmark)
+
+    def get(self, template_path):
+        """
+        Retorna la plantilla en caché, leyéndola si no está o si cambió en disco.
+
+        Raises:
+            OSError: Si el archivo no existe o no se puede leer.
+        """
+        path = os.path.abspath(template_path)
+        stat = os.stat(path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            template = self._templates.get(path)
+            if template is None or template.stamp != stamp:
+                template = self._templates[path] = _CachedTemplate(path, stamp)
+                self.loads += 1
+            return template
+
+    def clear(self):
+        """Descarta las plantillas en caché."""
+        with self._lock:
+            self._templates.clear()
+
+_template_cache = TemplateCache()
+
+def certificate_paragraphs(participant_name, participant_ci, project_name, event_date):
+    """Los cuatro párrafos del texto del certificado, en orden."""
+    return [
+        "Que se otorga a:",
+        f"{participant_name}",
+        f"C.I. {participant_ci}",
+        f"Por haber participado en la 4ta Expoferia de la Escuela de Ingeniería con el proyecto “{project_name}”, realizado el {event_date}.",
+    ]
+
+def _fill_certificate_text(text_frame, participant_name, participant_ci, project_name, event_date):
+    """Reemplaza el contenido del marco de texto por los cuatro párrafos del certificado."""
+    # Limpiamos todo el contenido existente del text_frame
+    # Se eliminan todos los párrafos excepto el primero, y luego se limpia el primero.
+    # Esto es más robusto si la forma tiene múltiples párrafos por defecto.
+    while len(text_frame.paragraphs) > 1:
+        p = text_frame.paragraphs[-1]._element
+        p.getparent().remove(p)
+
+    # Limpiar el texto del único párrafo restante (o el primero si estaba vacío)
+    p = text_frame.paragraphs[0]
+    p.text = "" # Borra el texto existente
+
+    # Aquí construimos el texto dinámicamente con saltos de línea para el formato.
+    # Puedes ajustar el formato según necesites nuevas líneas, etc.
+    # Importante: Esto asume que el text_frame se expandirá para contener el texto.
+    # Si el text_frame tiene un tamaño fijo, el texto podría desbordarse.
+
+    greeting, name, ci, project = certificate_paragraphs(participant_name, participant_ci, project_name, event_date)
+
+    # Primer párrafo: "Que se otorga a:"
+    p.text = greeting
+
+    # Segundo párrafo: Nombre del participante (posiblemente con un estilo diferente)
+    new_p_name = text_frame.add_paragraph()
+    new_p_name.text = name
+    # Opcional: Si quieres un estilo diferente para el nombre, puedes aplicarlo aquí
+    # from pptx.util import Pt
+    # new_p_name.font.size = Pt(24) # Ejemplo: tamaño de fuente más grande
+    # new_p_name.font.bold = True # Ejemplo: negrita
+
+    # Tercer párrafo: Cédula de Identidad
+    new_p_ci = text_frame.add_paragraph()
+    new_p_ci.text = ci
+
+    # Cuarto párrafo: Descripción del proyecto y fecha
+    new_p_project = text_frame.add_paragraph()
+    new_p_project.text = project
+
+def certificate_filename(participant_name, project_name, extension=".pptx"):
+    """Nombre del archivo del certificado de un participante en un proyecto."""
+    # Sanitizar el nombre de archivo para evitar caracteres inválidos
+    safe_participant_name = re.sub(r'[\\/*?:"<>|]', '', participant_name).replace(' ', '_')
+    safe_project_name = re.sub(r'[\\/*?:"<>|]', '', project_name).replace(' ', '_')
+
+    return f"Certificado_{safe_participant_name}_{safe_project_name}{extension}"
+
+def _build_presentation(participant_name, participant_ci, project_name, event_date, template_path, use_cache=True):
+    """
+    Presentation del certificado editada con python-pptx (sin guardar).
+
+    Returns:
+        tuple: (Presentation or None, str or None) - La presentación y un mensaje de error si la plantilla no sirve.
+    """
+    if use_cache:
+        template = _template_cache.get(template_path)
+        prs = template.clone()
+        shape_index = template.shape_index
+    else:
+        prs = Presentation(template_path)
+        shape_index = _find_target_shape_index(prs.slides[0])
+    slide = prs.slides[0] # Asumiendo que el certificado está en la primera diapositiva
+
+    # La forma que contiene el texto del participante y el proyecto ('object 3')
+    target_shape = slide.shapes[shape_index] if shape_index is not None else None
+
+    if not target_shape:
+        return None, f"No se encontró la forma '{TARGET_SHAPE_NAME}' en la plantilla para insertar el texto."
+
+    _fill_certificate_text(target_shape.text_frame, participant_name, participant_ci, project_name, event_date)
+    return prs, None
+
+def build_certificate(participant_name, participant_ci, project_name, event_date=DEFAULT_EVENT_DATE, template_path="Formato.pptx", renderer='zip'):
+    """
+    Genera un certificado en memoria, sin escribir ningún archivo.
+
+    Con renderer='zip' copia la plantilla a nivel ZIP (ver _ZipTemplate): solo se
+    reescribe la diapositiva y el resto se copia comprimido. Si algún dato tiene
+    texto que python-pptx transforma (saltos de línea u otros caracteres de
+    control, o un texto vacío), usa python-pptx para que el resultado sea idéntico.
+    Con renderer='pdf' genera un PDF (ver certificate_pdf.build_certificate_pdf).
+
+    Args:
+        participant_name (str): Nombre completo del participante.
+        participant_ci (str): Cédula de identidad del participante.
+        project_name (str): Nombre del proyecto en el que participó.
+        event_date (str): La fecha del evento.
+        template_path (str): Ruta al archivo de la plantilla .pptx.
+        renderer (str): 'zip', 'pptx' (python-pptx) o 'pdf'.
+
+    Returns:
+        tuple: (bytes or None, str or None) - El contenido del certificado y un mensaje de error si falla.
+    """
+    if renderer == 'pdf':
+        from controllers.certificate_pdf import build_certificate_pdf
+        return build_certificate_pdf(participant_name, participant_ci, project_name, event_date, template_path)
+    try:
+        if not os.path.exists(template_path):
+            return None, f"La plantilla no se encontró en: {template_path}"
+
+        values = {'participant_name': participant_name, 'participant_ci': participant_ci,
+                  'project_name': project_name, 'event_date': event_date}
+        if renderer == 'zip' and all(isinstance(value, str) and _zip_safe(value) for value in values.values()):
+            template = _template_cache.get(template_path)
+            if template.shape_index is None:
+                return None, f"No se encontró la forma '{TARGET_SHAPE_NAME}' en la plantilla para insertar el texto."
+            return template.zip_template().render(values), None
+
+        prs, error = _build_presentation(participant_name, participant_ci, project_name, event_date, template_path)
+        if error:
+            return None, error
+        buffer = io.BytesIO()
+        prs.save(buffer)
+        return buffer.getvalue(), None
+
+    except Exception as e:
+        return None, f"Error al generar el certificado: {e}"
+
+def render_certificate(participant_name, participant_ci, project_name, event_date=DEFAULT_EVENT_DATE, template_path="Formato.pptx", output_dir="certificados_generados", use_cache=True):
+    """
+    Genera un certificado personalizado a partir de la plantilla.
+
+    Args:
+        participant_name (str): Nombre completo del participante.
+        participant_ci (str): Cédula de identidad del participante.
+        project_name (str): Nombre del proyecto en el que participó.
+        event_date (str): La fecha del evento. (Por ahora fijo, puede hacerse dinámico)
+        template_path (str): Ruta al archivo de la plantilla .pptx.
+        output_dir (str): Directorio donde se guardarán los certificados generados.
+        use_cache (bool): Si es False, lee la plantilla del disco y busca la forma en cada llamada
+                          (solo para comparar en el benchmark).
+
+    Returns:
+        tuple: (ruta_del_certificado_generado, error_mensaje)
+    """
+    try:
+        if not os.path.exists(template_path):
+            return None, f"La plantilla no se encontró en: {template_path}"
+
+        prs, error = _build_presentation(participant_name, participant_ci, project_name, event_date, template_path, use_cache)
+        if error:
+            return None, error
+
+        # Crear el directorio de salida si no existe
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+
+        output_path = os.path.join(output_dir, certificate_filename(participant_name, project_name))
+        prs.save(output_path)
+
+        return output_path, None
+
+    except Exception as e:
+        return None, f"Error al generar el certificado: {e}"
+
+def render_certificate_zip(participant_name, participant_ci, project_name, event_date=DEFAULT_EVENT_DATE, template_path="Formato.pptx", output_dir="certificados_generados"):
+    """
+    Genera el mismo certificado que render_certificate copiando la plantilla a nivel ZIP
+    (ver build_certificate).
+
+    Args y Returns: los de render_certificate.
+    """
+    package, error = build_certificate(participant_name, participant_ci, project_name, event_date, template_path, renderer='zip')
+    if error:
+        return None, error
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+        output_path = os.path.join(output_dir, certificate_filename(participant_name, project_name))
+        with open(output_path, 'wb') as output_file:
+            output_file.write(package)
+        return output_path, None
+    except Exception as e:
+        return None, f"Error al generar el certificado: {e}"
+
+def _render_certificate_pdf(*args):
+    """certificate_pdf.render_certificate_pdf, importando ReportLab solo cuando se usa."""
+    from controllers.certificate_pdf import render_certificate_pdf
+    return render_certificate_pdf(*args)
+
+# Formas de generar un certificado, por nombre (CERTIFICATE_BATCH_CONFIG['renderer'])
+RENDERERS = {
+    'pptx': render_certificate,
+    'zip': render_certificate_zip,
+    'pdf': _render_certificate_pdf,
+}
+
+# Extensión de los archivos que genera cada renderer
+RENDERER_EXTENSIONS = {
+    'pptx': ".pptx",
+    'zip': ".pptx",
+    'pdf': ".pdf",
+}
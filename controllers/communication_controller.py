@@ -1,12 +1,39 @@
 # controllers/communication_controller.py
 # Importa las funciones de conexión directamente de db.connection
 from db.connection import create_connection, close_connection
-from pptx import Presentation
-from pptx.util import Inches
+from models.project_model import search_projects
+from controllers.pagination import validate_page_args
+from models.report_model import iter_certificate_recipients
+from controllers.certificate_renderer import (render_certificate, build_certificate, certificate_filename,
+                                              DEFAULT_EVENT_DATE, RENDERER_EXTENSIONS)
+from controllers.certificate_pdf import get_pdf_template
+from controllers.certificate_batch import CertificateBatch
+from controllers.report_cache import ReportCache
+from config import CERTIFICATE_BATCH_CONFIG, REPORT_CACHE_CONFIG
+from mysql.connector import Error
+import copy
+import csv
+import io
 import os
-import re # Necesario para el _on_project_select en la vista si parsea la cadena
+import re
+import time
+import zipfile
+
+CERTIFICATE_MANIFEST_NAME = "manifiesto.csv" # Entrada del ZIP de certificados que los relaciona con cada participante
+# Tablas de las que dependen los participantes de cada proyecto en la pestaña de certificados
+CERTIFICATE_PARTICIPANTS_TABLES = ('proyectos_participantes', 'participantes')
+_CERTIFICATE_MANIFEST_COLUMNS = ("archivo", "estado", "error", "id_participante", "nombre", "apellido", "cedula",
+                                 "correo_electronico", "tipo_participante", "id_proyecto", "proyecto", "periodo")
+
+def _archive_folder_name(name):
+    """Nombre de carpeta dentro del ZIP de certificados (sin caracteres inválidos en Windows)."""
+    safe_name = re.sub(r'[\\/*?:"<>|]', '', name or '').strip().replace(' ', '_')
+    return safe_name or "Sin_nombre"
 
 class CommunicationController:
+    # Participantes por proyecto para certificados, compartidos por todas las instancias
+    _participants_cache = ReportCache(max_entries=REPORT_CACHE_CONFIG['certificate_participants_max_entries'])
+
     def __init__(self):
         # Ya no necesitamos un objeto db_manager aquí,
         # llamaremos a create_connection() y close_connection() directamente.
@@ -111,40 +138,127 @@ class CommunicationController:
         """
         Obtiene los proyectos con la información necesaria para los certificados.
         Incluye nombre del proyecto, descripción, periodo y participantes.
+
+        Returns:
+            tuple: (list of dict, str or None) - Los proyectos con id_proyecto, nombre_proyecto, descripcion,
+                   nombre_periodo, participantes (lista de dict con id_participante, nombre_completo,
+                   cedula y correo_electronico) y participantes_info (los participantes en una línea, para mostrar).
+        """
+        return self._fetch_projects_for_certificates()
+
+    def search_projects_for_certificates(self, search_text, limit=None):
+        """
+        Busca proyectos para certificados por palabras del nombre o la descripción
+        (índice de texto completo, ver project_model.search_projects).
+
+        Args:
+            search_text (str): Texto de búsqueda.
+            limit (int, optional): Cantidad máxima de proyectos. Por defecto PAGINATION_CONFIG['page_size'].
+
+        Returns:
+            tuple: (list of dict, str or None) - Los proyectos, de más a menos relevante,
+                   con las mismas claves que get_projects_for_certificates.
+        """
+        _, limit, error = validate_page_args(None, limit)
+        if error:
+            return None, error
+        try:
+            ranked = search_projects(search_text, limit=limit)
+        except Exception as e:
+            return None, f"Error al buscar proyectos para certificados: {e}"
+        if not ranked:
+            return [], None
+        projects, error = self._fetch_projects_for_certificates([p['id_proyecto'] for p in ranked])
+        if error:
+            return None, error
+        by_id = {p['id_proyecto']: p for p in projects}
+        return [by_id[p['id_proyecto']] for p in ranked if p['id_proyecto'] in by_id], None
+
+    def _fetch_projects_for_certificates(self, project_ids=None):
+        """
+        Consulta de get_projects_for_certificates, opcionalmente solo para los IDs indicados.
+
+        Los participantes se leen con una segunda consulta para todos los proyectos
+        a la vez, en lugar de concatenarlos con GROUP_CONCAT: así llegan como datos
+        separados y no se truncan en equipos grandes (group_concat_max_len). Se
+        guardan por proyecto (_participants_cache) mientras no cambien sus tablas,
+        así que al refrescar la pestaña solo se consultan los proyectos que faltan.
         """
         conn = create_connection()
         if conn is None:
             return None, "Error: No se pudo establecer conexión con la base de datos."
         cursor = conn.cursor(dictionary=True)
         try:
-            query = """
+            project_clause = ""
+            params = ()
+            if project_ids:
+                project_clause = f"WHERE p.id_proyecto IN ({', '.join(['%s'] * len(project_ids))})"
+                params = tuple(project_ids)
+            query = f"""
             SELECT
                 p.id_proyecto,
                 p.nombre_proyecto,
                 p.descripcion,
-                pe.nombre_periodo,
-                -- CAMBIO APLICADO AQUÍ: Usar CONCAT() para MySQL/MariaDB
-                GROUP_CONCAT(CONCAT(pa.nombre, ' ', pa.apellido, ' (CI: ', pa.cedula, ' - ', COALESCE(pa.correo_electronico, 'N/A'), ')') SEPARATOR '; ') AS participantes_info
+                pe.nombre_periodo
             FROM
                 proyectos p
             LEFT JOIN
                 periodos pe ON p.id_periodo = pe.id_periodo
-            LEFT JOIN
-                proyectos_participantes pp ON p.id_proyecto = pp.id_proyecto
-            LEFT JOIN
-                participantes pa ON pp.id_participante = pa.id_participante
-            GROUP BY
-                p.id_proyecto, p.nombre_proyecto, p.descripcion, pe.nombre_periodo
+            {project_clause}
             ORDER BY
                 pe.nombre_periodo DESC, p.nombre_proyecto ASC;
             """
-            cursor.execute(query)
+            cursor.execute(query, params)
             projects_data = cursor.fetchall()
-            
+            if not projects_data:
+                return [], None
+
+            def fetch_participants(missing_ids):
+                # Sin filtro si faltan todos los proyectos del listado completo
+                link_clause = ""
+                link_params = ()
+                if project_ids or len(missing_ids) < len(projects_data):
+                    link_clause = f"WHERE pp.id_proyecto IN ({', '.join(['%s'] * len(missing_ids))})"
+                    link_params = tuple(missing_ids)
+                participants_by_project = {project_id: [] for project_id in missing_ids}
+                cursor.execute(f"""
+                SELECT
+                    pp.id_proyecto,
+                    pa.id_participante,
+                    pa.nombre,
+                    pa.apellido,
+                    pa.cedula,
+                    pa.correo_electronico
+                FROM
+                    proyectos_participantes pp
+                JOIN
+                    participantes pa ON pp.id_participante = pa.id_participante
+                {link_clause}
+                ORDER BY
+                    pp.id_proyecto, pa.apellido, pa.nombre, pa.id_participante;
+                """, link_params)
+                for row in cursor.fetchall():
+                    if row['id_proyecto'] in participants_by_project:
+                        participants_by_project[row['id_proyecto']].append({
+                            'id_participante': row['id_participante'],
+                            'nombre_completo': f"{row['nombre']} {row['apellido']}",
+                            'cedula': row['cedula'],
+                            'correo_electronico': row['correo_electronico'],
+                        })
+                return participants_by_project
+
+            participants_by_project = self._participants_cache.get_many(
+                [project['id_proyecto'] for project in projects_data], CERTIFICATE_PARTICIPANTS_TABLES, fetch_participants)
             for project in projects_data:
-                if project['participantes_info'] is None:
-                    project['participantes_info'] = "N/A"
-            
+                # Copia: las listas cacheadas no deben modificarse desde la vista
+                project['participantes'] = copy.deepcopy(participants_by_project[project['id_proyecto']])
+
+            for project in projects_data:
+                project['participantes_info'] = "; ".join(
+                    f"{p['nombre_completo']} (CI: {p['cedula']} - {p['correo_electronico'] or 'N/A'})"
+                    for p in project['participantes']
+                ) or "N/A"
+
             return projects_data, None
         except Exception as e:
             return None, f"Error al obtener proyectos para certificados: {e}"
@@ -153,9 +267,10 @@ class CommunicationController:
                 cursor.close()
             close_connection(conn)
 
-    def generate_certificate(self, participant_name, participant_ci, project_name, event_date="16 de enero del 2025", template_path="Formato.pptx", output_dir="certificados_generados"):
+    def generate_certificate(self, participant_name, participant_ci, project_name, event_date=DEFAULT_EVENT_DATE, template_path="Formato.pptx", output_dir="certificados_generados"):
         """
-        Genera un certificado personalizado a partir de la plantilla.
+        Genera un certificado personalizado a partir de la plantilla
+        (ver controllers.certificate_renderer.render_certificate).
 
         Args:
             participant_name (str): Nombre completo del participante.
@@ -168,75 +283,279 @@ class CommunicationController:
         Returns:
             tuple: (ruta_del_certificado_generado, error_mensaje)
         """
+        return render_certificate(participant_name, participant_ci, project_name, event_date, template_path, output_dir)
+
+    def start_certificate_batch(self, participants, project_name, template_path, output_dir, event_date=None, project_id=None):
+        """
+        Lanza la generación en segundo plano de los certificados de varios participantes,
+        repartida entre procesos (ver controllers.certificate_batch.CertificateBatch).
+
+        Los certificados que ya estén en output_dir sin cambios (misma plantilla,
+        participante, proyecto y texto) no se vuelven a generar, así que lanzar
+        de nuevo un lote interrumpido lo continúa donde quedó.
+
+        Args:
+            participants (list of dict): Participantes con 'nombre_completo' y 'cedula'.
+            project_name (str): Nombre del proyecto en el que participaron.
+            template_path (str): Ruta al archivo de la plantilla .pptx.
+            output_dir (str): Directorio donde se guardarán los certificados generados.
+            event_date (str, optional): La fecha del evento.
+            project_id (int, optional): ID del proyecto.
+
+        Returns:
+            tuple: (CertificateBatch or None, str or None)
+                   - El lote ya iniciado; su progreso se lee con drain_events() y se cancela con cancel().
+                   - Un mensaje de error si no se puede iniciar.
+        """
+        if not participants:
+            return None, "No hay participantes para generar certificados."
+        if not os.path.exists(template_path):
+            return None, f"La plantilla no se encontró en: {template_path}"
         try:
-            if not os.path.exists(template_path):
-                return None, f"La plantilla no se encontró en: {template_path}"
-
-            prs = Presentation(template_path)
-            slide = prs.slides[0] # Asumiendo que el certificado está en la primera diapositiva
-
-            # Buscar la forma que contiene el texto del participante y el proyecto
-            # Basado en la salida del script, es el 'object 3'
-            target_shape = None
-            for shape in slide.shapes:
-                # Comprobar si tiene text_frame y si el nombre es 'object 3'
-                if shape.has_text_frame and shape.name == 'object 3':
-                    target_shape = shape
-                    break
-            
-            if not target_shape:
-                return None, "No se encontró la forma 'object 3' en la plantilla para insertar el texto."
+            os.makedirs(output_dir, exist_ok=True) # Una vez aquí y no en cada proceso
+            batch = CertificateBatch(participants, project_name, template_path, output_dir, event_date, project_id=project_id)
+            batch.start()
+            return batch, None
+        except Exception as e:
+            return None, f"Error al iniciar la generación de certificados: {e}"
 
-            text_frame = target_shape.text_frame
-            
-            # Limpiamos todo el contenido existente del text_frame
-            # Se eliminan todos los párrafos excepto el primero, y luego se limpia el primero.
-            # Esto es más robusto si la forma tiene múltiples párrafos por defecto.
-            while len(text_frame.paragraphs) > 1:
-                p = text_frame.paragraphs[-1]._element
-                p.getparent().remove(p)
-            
-            # Limpiar el texto del único párrafo restante (o el primero si estaba vacío)
-            p = text_frame.paragraphs[0]
-            p.text = "" # Borra el texto existente
-
-            # Aquí construimos el texto dinámicamente con saltos de línea para el formato.
-            # Puedes ajustar el formato según necesites nuevas líneas, etc.
-            # Importante: Esto asume que el text_frame se expandirá para contener el texto.
-            # Si el text_frame tiene un tamaño fijo, el texto podría desbordarse.
-            
-            # Primer párrafo: "Que se otorga a:"
-            p.text = "Que se otorga a:"
-            
-            # Segundo párrafo: Nombre del participante (posiblemente con un estilo diferente)
-            new_p_name = text_frame.add_paragraph()
-            new_p_name.text = f"{participant_name}"
-            # Opcional: Si quieres un estilo diferente para el nombre, puedes aplicarlo aquí
-            # from pptx.util import Pt
-            # new_p_name.font.size = Pt(24) # Ejemplo: tamaño de fuente más grande
-            # new_p_name.font.bold = True # Ejemplo: negrita
-
-            # Tercer párrafo: Cédula de Identidad
-            new_p_ci = text_frame.add_paragraph()
-            new_p_ci.text = f"C.I. {participant_ci}"
-
-            # Cuarto párrafo: Descripción del proyecto y fecha
-            new_p_project = text_frame.add_paragraph()
-            new_p_project.text = f"Por haber participado en la 4ta Expoferia de la Escuela de Ingeniería con el proyecto “{project_name}”, realizado el {event_date}."
-
-            # Crear el directorio de salida si no existe
-            if not os.path.exists(output_dir):
-                os.makedirs(output_dir)
-
-            # Sanitizar el nombre de archivo para evitar caracteres inválidos
-            safe_participant_name = re.sub(r'[\\/*?:"<>|]', '', participant_name).replace(' ', '_')
-            safe_project_name = re.sub(r'[\\/*?:"<>|]', '', project_name).replace(' ', '_')
-
-            output_filename = f"Certificado_{safe_participant_name}_{safe_project_name}.pptx"
-            output_path = os.path.join(output_dir, output_filename)
-            prs.save(output_path)
-            
-            return output_path, None
+    def start_period_certificate_batch(self, period_id, template_path, output_dir, event_date=None):
+        """
+        Lanza en segundo plano la generación en un directorio de los certificados de
+        todos los proyectos de un período, un archivo por participación
+        (ver start_certificate_batch).
+
+        Como el lote omite lo que ya está generado, volver a lanzarlo tras corregir
+        un dato solo regenera los certificados afectados.
+
+        Args:
+            period_id (int): ID del período.
+            template_path (str): Ruta al archivo de la plantilla .pptx.
+            output_dir (str): Directorio donde se guardarán los certificados generados.
+            event_date (str, optional): La fecha del evento.
+
+        Returns:
+            tuple: (CertificateBatch or None, str or None) - Igual que start_certificate_batch.
+        """
+        error = self._validate_certificate_export(period_id, None, None, template_path)
+        if error:
+            return None, error
+        participants = []
+        batches = iter_certificate_recipients(period_id)
+        try:
+            for batch in batches:
+                participants.extend({
+                    'nombre_completo': f"{row['nombre']} {row['apellido']}".strip() if row['nombre'] else None,
+                    'cedula': row['cedula'],
+                    'id_participante': row['id_participante'],
+                    'nombre_proyecto': row['nombre_proyecto'],
+                    'id_proyecto': row['id_proyecto'],
+                } for row in batch)
+        except Error as e:
+            return None, f"Error de base de datos al cargar los participantes: {e}"
+        finally:
+            batches.close()
+        if not participants:
+            return None, "No hay participantes en proyectos del período indicado."
+        return self.start_certificate_batch(participants, None, template_path, output_dir, event_date)
+
+    def export_certificates_archive(self, archive_path, period_id=None, project_ids=None, participant_ids=None,
+                                    template_path="Formato.pptx", event_date=DEFAULT_EVENT_DATE, progress_callback=None):
+        """
+        Genera los certificados de un período (o de un conjunto de proyectos o participantes)
+        directamente en un único archivo ZIP, sin escribir un archivo por certificado.
+
+        Cada certificado se genera en memoria y se añade al ZIP sin volver a
+        comprimirlo (un .pptx ya está comprimido), en la carpeta
+        <período>/<proyecto>/. Al final se añade CERTIFICATE_MANIFEST_NAME, un
+        CSV con una fila por participación: la entrada del ZIP, si se generó o
+        por qué falló, y los datos del participante y del proyecto. Un
+        certificado que falla queda en el manifiesto y el lote sigue.
+
+        Las participaciones se leen de la base de datos en lotes (cursor sin buffer)
+        y el ZIP se escribe con el sufijo '.part', que solo reemplaza al destino si
+        todo termina bien. La función es bloqueante y no toca Tk: la interfaz la
+        llama desde un hilo aparte.
+
+        Args:
+            archive_path (str): Ruta del archivo .zip a escribir.
+            period_id (int, optional): Solo proyectos de este período.
+            project_ids (list of int, optional): Solo estos proyectos.
+            participant_ids (list of int, optional): Solo estos participantes.
+            template_path (str): Ruta al archivo de la plantilla .pptx.
+            event_date (str): La fecha del evento.
+            progress_callback (callable, optional): Se llama con el número de certificados procesados.
+
+        Returns:
+            tuple: (dict or None, str or None)
+                   - {'archivo', 'total', 'certificados' (generados), 'fallidos' [(nombre, error)]}.
+                   - Un mensaje de error si no se pudo crear el archivo (en ese caso no queda nada escrito).
+        """
+        error = self._validate_certificate_export(period_id, project_ids, participant_ids, template_path)
+        if error:
+            return None, error
 
+        renderer = CERTIFICATE_BATCH_CONFIG['renderer']
+        part_path = f"{archive_path}.part"
+        summary = {'archivo': archive_path, 'total': 0, 'certificados': 0, 'fallidos': []}
+        manifest = io.StringIO()
+        manifest_writer = csv.writer(manifest)
+        manifest_writer.writerow(_CERTIFICATE_MANIFEST_COLUMNS)
+        entry_names = set()
+        batches = iter_certificate_recipients(period_id, project_ids, participant_ids)
+        try:
+            with zipfile.ZipFile(part_path, 'w', compression=zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+                for batch in batches:
+                    for row in batch:
+                        participant_name = f"{row['nombre']} {row['apellido']}".strip()
+                        entry_name, error = None, None
+                        if row['nombre'] and row['cedula']: # Asegurarse de tener los datos mínimos
+                            package, error = build_certificate(participant_name, row['cedula'], row['nombre_proyecto'],
+                                                               event_date, template_path, renderer)
+                        else:
+                            package, error = None, "Información incompleta (Nombre o Cédula)."
+
+                        if package is not None:
+                            entry_name = self._certificate_entry_name(row, participant_name, entry_names,
+                                                                      RENDERER_EXTENSIONS[renderer])
+                            info = zipfile.ZipInfo(entry_name, date_time=time.localtime()[:6])
+                            info.compress_type = zipfile.ZIP_STORED
+                            archive.writestr(info, package)
+                            summary['certificados'] += 1
+                        else:
+                            summary['fallidos'].append((participant_name, error))
+                        summary['total'] += 1
+                        manifest_writer.writerow((
+                            entry_name or "", "Generado" if entry_name else "Error", error or "",
+                            row['id_participante'], row['nombre'], row['apellido'], row['cedula'],
+                            row['correo_electronico'] or "", row['tipo_participante'],
+                            row['id_proyecto'], row['nombre_proyecto'], row['nombre_periodo'],
+                        ))
+                        if progress_callback:
+                            progress_callback(summary['total'])
+
+                if summary['total'] == 0:
+                    return None, "No hay participantes en proyectos con los filtros indicados."
+                # UTF-8 con BOM para que Excel respete las tildes (igual que las exportaciones CSV)
+                archive.writestr(CERTIFICATE_MANIFEST_NAME, manifest.getvalue().encode('utf-8-sig'))
+            os.replace(part_path, archive_path)
+            return summary, None
+        except Error as e:
+            return None, f"Error de base de datos al generar los certificados: {e}"
+        except OSError as e:
+            return None, f"No se pudo escribir el archivo: {e}"
         except Exception as e:
-            return None, f"Error al generar el certificado: {e}"
\ No newline at end of file
+            return None, f"Error inesperado al generar los certificados: {e}"
+        finally:
+            batches.close() # Libera la conexión si el lote se cortó a mitad
+            if os.path.exists(part_path):
+                try:
+                    os.remove(part_path)
+                except OSError:
+                    pass
+
+    def export_certificates_pdf(self, pdf_path, period_id=None, project_ids=None, participant_ids=None,
+                                template_path="Formato.pptx", event_date=DEFAULT_EVENT_DATE, progress_callback=None):
+        """
+        Genera los certificados de un período (o de un conjunto de proyectos o participantes)
+        como un único PDF, con una página por certificado.
+
+        La parte fija de la plantilla (fondo, imágenes, título y firmas) se guarda
+        una sola vez en el documento y cada página solo añade su texto (ver
+        controllers.certificate_pdf.PdfTemplate), así que el PDF de un período
+        entero pesa poco más que el de un certificado. El índice del PDF agrupa
+        las páginas por proyecto con el nombre de cada participante. Una
+        participación sin nombre o cédula no tiene página y queda en 'fallidos'.
+
+        Igual que export_certificates_archive, lee las participaciones en lotes,
+        escribe con el sufijo '.part' y no toca Tk.
+
+        Args:
+            pdf_path (str): Ruta del archivo .pdf a escribir.
+            period_id (int, optional): Solo proyectos de este período.
+            project_ids (list of int, optional): Solo estos proyectos.
+            participant_ids (list of int, optional): Solo estos participantes.
+            template_path (str): Ruta al archivo de la plantilla .pptx.
+            event_date (str): La fecha del evento.
+            progress_callback (callable, optional): Se llama con el número de certificados procesados.
+
+        Returns:
+            tuple: (dict or None, str or None)
+                   - {'archivo', 'total', 'certificados' (páginas), 'fallidos' [(nombre, error)]}.
+                   - Un mensaje de error si no se pudo crear el archivo (en ese caso no queda nada escrito).
+        """
+        error = self._validate_certificate_export(period_id, project_ids, participant_ids, template_path)
+        if error:
+            return None, error
+
+        part_path = f"{pdf_path}.part"
+        summary = {'archivo': pdf_path, 'total': 0, 'certificados': 0, 'fallidos': []}
+        batches = iter_certificate_recipients(period_id, project_ids, participant_ids)
+        try:
+            template = get_pdf_template(template_path)
+            document = template.new_canvas(part_path, title="Certificados de participación")
+            document.showOutline()
+            current_project = None
+            for batch in batches:
+                for row in batch:
+                    participant_name = f"{row['nombre']} {row['apellido']}".strip()
+                    summary['total'] += 1
+                    if row['nombre'] and row['cedula']: # Asegurarse de tener los datos mínimos
+                        # El índice identifica cada entrada por su clave: proyecto y participante llevan una propia
+                        if row['id_proyecto'] != current_project:
+                            current_project = row['id_proyecto']
+                            document.bookmarkPage(f"proyecto_{current_project}")
+                            document.addOutlineEntry(f"{row['nombre_proyecto']} ({row['nombre_periodo']})",
+                                                     f"proyecto_{current_project}", level=0)
+                        page_key = f"certificado_{summary['total']}"
+                        document.bookmarkPage(page_key)
+                        document.addOutlineEntry(participant_name, page_key, level=1)
+                        template.draw_certificate(document, participant_name, row['cedula'], row['nombre_proyecto'], event_date)
+                        summary['certificados'] += 1
+                    else:
+                        summary['fallidos'].append((participant_name, "Información incompleta (Nombre o Cédula)."))
+                    if progress_callback:
+                        progress_callback(summary['total'])
+
+            if summary['total'] == 0:
+                return None, "No hay participantes en proyectos con los filtros indicados."
+            if summary['certificados'] == 0:
+                return None, "Ningún participante con los filtros indicados tiene nombre y cédula."
+            document.save()
+            os.replace(part_path, pdf_path)
+            return summary, None
+        except Error as e:
+            return None, f"Error de base de datos al generar los certificados: {e}"
+        except OSError as e:
+            return None, f"No se pudo escribir el archivo: {e}"
+        except Exception as e:
+            return None, f"Error inesperado al generar los certificados: {e}"
+        finally:
+            batches.close() # Libera la conexión si el lote se cortó a mitad
+            if os.path.exists(part_path):
+                try:
+                    os.remove(part_path)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _validate_certificate_export(period_id, project_ids, participant_ids, template_path):
+        """Mensaje de error si faltan los filtros de una exportación de certificados o la plantilla; None si son válidos."""
+        if period_id is None and project_ids is None and participant_ids is None:
+            return "Error: Indique un período, proyectos o participantes para generar los certificados."
+        if period_id is not None and (not isinstance(period_id, int) or period_id <= 0):
+            return "Error: El ID del período debe ser un número entero positivo."
+        if not os.path.exists(template_path):
+            return f"La plantilla no se encontró en: {template_path}"
+        return None
+
+    @staticmethod
+    def _certificate_entry_name(row, participant_name, used_names, extension=".pptx"):
+        """Entrada del ZIP para un certificado, única aunque dos participantes se llamen igual."""
+        folder = f"{_archive_folder_name(row['nombre_periodo'])}/{_archive_folder_name(row['nombre_proyecto'])}"
+        entry_name = f"{folder}/{certificate_filename(participant_name, row['nombre_proyecto'], extension)}"
+        if entry_name in used_names:
+            root, extension = os.path.splitext(entry_name)
+            entry_name = f"{root}_{row['id_participante']}{extension}"
+        used_names.add(entry_name)
+        return entry_name
@@ -0,0 +1,46 @@
+# controllers/dashboard_controller.py
+from models.dashboard_model import get_dashboard_stats, rebuild_dashboard_stats
+
+class DashboardController:
+    """
+    Controlador de las estadísticas del dashboard.
+    Las lee de las tablas de resumen que mantienen los modelos (ver models/dashboard_model.py).
+    """
+    def get_dashboard_stats(self, period_id=None):
+        """
+        Obtiene los totales del dashboard: proyectos por período y por materia,
+        participantes por carrera y estudiantes frente a docentes.
+
+        Args:
+            period_id (int, optional): ID del período; None para todos los períodos.
+
+        Returns:
+            tuple: (dict or None, str or None)
+                   - Las estadísticas (ver models.dashboard_model.get_dashboard_stats).
+                   - Un mensaje de error si falla.
+        """
+        if period_id is not None and (not isinstance(period_id, int) or period_id <= 0):
+            return None, "Error: El ID del período debe ser un número entero positivo."
+        try:
+            stats = get_dashboard_stats(period_id)
+            if stats is None:
+                return None, "Error al obtener las estadísticas del dashboard. Verifique los logs del modelo."
+            return stats, None
+        except Exception as e:
+            return None, f"Error inesperado al obtener las estadísticas del dashboard: {e}"
+
+    def rebuild_dashboard_stats(self):
+        """
+        Recalcula las tablas de resumen desde los datos (reparación si se desincronizaron).
+
+        Returns:
+            tuple: (bool, str or None)
+                   - True si se recalcularon.
+                   - Un mensaje de error si falla.
+        """
+        try:
+            if rebuild_dashboard_stats():
+                return True, None
+            return False, "Error al recalcular las estadísticas del dashboard. Verifique los logs del modelo."
+        except Exception as e:
+            return False, f"Error inesperado al recalcular las estadísticas del dashboard: {e}"
@@ -0,0 +1,296 @@
+# controllers/export_controller.py
+import csv
+import os
+from pathlib import Path
+
+from mysql.connector import Error
+from db.connection import STREAM_BATCH_SIZE
+from models.participant_model import iter_participants
+from models.project_model import iter_projects
+from models.user_model import iter_users
+from models.report_model import iter_projects_report, iter_participants_report
+from controllers.report_controller import ReportController
+
+EXPORT_BATCH_SIZE = STREAM_BATCH_SIZE # Filas que se leen de la base de datos y se escriben juntas
+
+def _yes_no(value):
+    return "Sí" if value else "No"
+
+def _project_participants_text(project):
+    return ", ".join(f"{p['nombre']} {p['apellido']} ({p['tipo_participante'][0]})" for p in project['participantes'])
+
+# (encabezado, ancho de columna en Excel, función que extrae el valor de la fila)
+_PARTICIPANT_COLUMNS = (
+    ("ID", 8, lambda r: r['id_participante']),
+    ("Tipo", 12, lambda r: r['tipo_participante']),
+    ("Nombre", 20, lambda r: r['nombre']),
+    ("Apellido", 20, lambda r: r['apellido']),
+    ("Cédula", 14, lambda r: r['cedula']),
+    ("Correo Electrónico", 30, lambda r: r['correo_electronico']),
+    ("Teléfono", 16, lambda r: r['telefono']),
+    ("Carrera", 25, lambda r: r['carrera']),
+)
+_PROJECT_COLUMNS = (
+    ("ID", 8, lambda r: r['id_proyecto']),
+    ("Nombre del Proyecto", 35, lambda r: r['nombre_proyecto']),
+    ("Descripción", 50, lambda r: r['descripcion']),
+    ("Período", 15, lambda r: r['nombre_periodo']),
+    ("Materia", 25, lambda r: r['nombre_materia']),
+    ("Fecha de Registro", 20, lambda r: r['fecha_registro']),
+)
+_USER_COLUMNS = (
+    ("ID", 8, lambda r: r['id_usuario']),
+    ("Usuario", 20, lambda r: r['nombre_usuario']),
+    ("Rol", 15, lambda r: r['rol']),
+    ("Nombre Completo", 30, lambda r: r['nombre_completo']),
+    ("Correo Electrónico", 30, lambda r: r['correo_electronico']),
+    ("Activo", 8, lambda r: _yes_no(r['activo'])),
+    ("Fecha de Creación", 20, lambda r: r['fecha_creacion']),
+    ("Última Sesión", 20, lambda r: r['ultima_sesion']),
+)
+_PROJECTS_REPORT_COLUMNS = (
+    ("ID", 8, lambda r: r['id_proyecto']),
+    ("Nombre del Proyecto", 35, lambda r: r['nombre_proyecto']),
+    ("Descripción", 50, lambda r: r['descripcion']),
+    ("Período", 15, lambda r: r['nombre_periodo']),
+    ("Inicio del Período", 14, lambda r: r['periodo_inicio']),
+    ("Fin del Período", 14, lambda r: r['periodo_fin']),
+    ("Materia", 25, lambda r: r['nombre_materia']),
+    ("Código de Materia", 14, lambda r: r['codigo_materia']),
+    ("Participantes", 60, _project_participants_text),
+)
+_PARTICIPANTS_REPORT_COLUMNS = (
+    ("ID", 8, lambda r: r['id_participante']),
+    ("Nombre", 20, lambda r: r['nombre']),
+    ("Apellido", 20, lambda r: r['apellido']),
+    ("Cédula", 14, lambda r: r['cedula']),
+    ("Tipo", 12, lambda r: r['tipo_participante']),
+    ("Carrera", 25, lambda r: r['carrera']),
+    ("Correo Electrónico", 30, lambda r: r['correo_electronico']),
+    ("Teléfono", 16, lambda r: r['telefono']),
+    ("Proyectos Asociados", 60, lambda r: r['proyectos_asociados']),
+)
+
+
+class _CsvWriter:
+    """Escribe filas en un CSV a medida que llegan (UTF-8 con BOM para que Excel respete las tildes)."""
+    def __init__(self, file_path, sheet_title, columns):
+        self._file = open(file_path, 'w', newline='', encoding='utf-8-sig')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow([header for header, _, _ in columns])
+
+    def write_rows(self, rows):
+        self._writer.writerows(rows)
+
+    def close(self):
+        self._file.close()
+
+    def abort(self):
+        self._file.close()
+
+
+class _XlsxWriter:
+    """
+    Escribe filas en un libro de openpyxl en modo write-only: cada fila se
+    vuelca a un archivo temporal al añadirla, así que la memoria no crece con
+    el número de filas.
+    """
+    def __init__(self, file_path, sheet_title, columns):
+        from openpyxl import Workbook # Solo se carga al exportar a Excel
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+        from openpyxl.styles import Font
+        from openpyxl.utils import get_column_letter
+
+        self._file_path = file_path
+        self._cell = WriteOnlyCell
+        self._illegal_re = ILLEGAL_CHARACTERS_RE
+        self._workbook = Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet(title=sheet_title[:31]) # Límite de Excel para el nombre de la hoja
+        for index, (_, width, _) in enumerate(columns, start=1):
+            self._sheet.column_dimensions[get_column_letter(index)].width = width
+        self._sheet.freeze_panes = 'A2'
+
+        bold = Font(bold=True)
+        header_cells = []
+        for header, _, _ in columns:
+            cell = WriteOnlyCell(self._sheet, value=header)
+            cell.font = bold
+            header_cells.append(cell)
+        self._sheet.append(header_cells)
+
+    def _cell_value(self, value):
+        if not isinstance(value, str):
+            return value
+        value = self._illegal_re.sub('', value) # openpyxl rechaza caracteres de control
+        if value.startswith('='):
+            # Un texto que empieza por '=' se guardaría como fórmula
+            cell = self._cell(self._sheet, value=value)
+            cell.data_type = 's'
+            return cell
+        return value
+
+    def write_rows(self, rows):
+        for row in rows:
+            self._sheet.append([self._cell_value(value) for value in row])
+
+    def close(self):
+        self._workbook.save(self._file_path)
+
+    def abort(self):
+        self._workbook.close()
+
+
+_WRITERS = {'.csv': _CsvWriter, '.xlsx': _XlsxWriter}
+
+
+class ExportController:
+    """
+    Exportación de las tablas de administración y de los reportes a XLSX o CSV.
+
+    Los datos se leen del modelo con cursores sin buffer (iter_*) y cada lote se
+    escribe en el archivo antes de leer el siguiente, así que una exportación
+    de decenas de miles de filas no se carga entera en memoria. Las funciones
+    export_* son bloqueantes y no tocan Tk: la interfaz las llama desde un hilo
+    aparte y recibe el avance por progress_callback.
+
+    El archivo se escribe primero con el sufijo '.part' y solo reemplaza al
+    destino si la exportación termina bien; si falla, no queda un archivo a medias.
+    """
+    def __init__(self, report_controller=None):
+        self.report_controller = report_controller or ReportController()
+
+    def export_participants(self, file_path, participant_type=None, progress_callback=None, batch_size=EXPORT_BATCH_SIZE):
+        """
+        Exporta los participantes registrados.
+
+        Args:
+            file_path (str): Ruta del archivo .xlsx o .csv a escribir.
+            participant_type (str, optional): Si se indica, solo participantes de ese tipo.
+            progress_callback (callable, optional): Se llama con el número de filas escritas tras cada lote.
+            batch_size (int): Filas por lote.
+
+        Returns:
+            tuple: (int, str or None)
+                   - El número de filas exportadas.
+                   - Un mensaje de error si falla (en ese caso no se crea el archivo).
+        """
+        if participant_type is not None and participant_type not in ['Estudiante', 'Docente']:
+            return 0, "Error: El tipo de participante debe ser 'Estudiante' o 'Docente'."
+        batches = iter_participants(batch_size, participant_type)
+        return self._export(file_path, "Participantes", _PARTICIPANT_COLUMNS, batches, progress_callback)
+
+    def export_projects(self, file_path, period_id=None, subject_id=None, progress_callback=None, batch_size=EXPORT_BATCH_SIZE):
+        """
+        Exporta los proyectos registrados, del más reciente al más antiguo.
+
+        Args:
+            file_path (str): Ruta del archivo .xlsx o .csv a escribir.
+            period_id (int, optional): Si se indica, solo proyectos de ese período.
+            subject_id (int, optional): Si se indica, solo proyectos de esa materia.
+            progress_callback (callable, optional): Se llama con el número de filas escritas tras cada lote.
+            batch_size (int): Filas por lote.
+
+        Returns:
+            tuple: (int, str or None) - Filas exportadas y un mensaje de error si falla.
+        """
+        batches = iter_projects(batch_size, period_id, subject_id)
+        return self._export(file_path, "Proyectos", _PROJECT_COLUMNS, batches, progress_callback)
+
+    def export_users(self, file_path, role=None, progress_callback=None, batch_size=EXPORT_BATCH_SIZE):
+        """
+        Exporta los usuarios del sistema (sin contraseñas).
+
+        Args:
+            file_path (str): Ruta del archivo .xlsx o .csv a escribir.
+            role (str, optional): Si se indica, solo usuarios con ese rol.
+            progress_callback (callable, optional): Se llama con el número de filas escritas tras cada lote.
+            batch_size (int): Filas por lote.
+
+        Returns:
+            tuple: (int, str or None) - Filas exportadas y un mensaje de error si falla.
+        """
+        batches = iter_users(batch_size, role)
+        return self._export(file_path, "Usuarios", _USER_COLUMNS, batches, progress_callback)
+
+    def export_projects_report(self, file_path, period_id=None, student_id=None, teacher_id=None, subject_id=None,
+                               progress_callback=None, batch_size=EXPORT_BATCH_SIZE):
+        """
+        Exporta el reporte de proyectos con los mismos filtros y orden que
+        ReportController.generate_projects_report, un proyecto por fila.
+
+        Args:
+            file_path (str): Ruta del archivo .xlsx o .csv a escribir.
+            period_id (int, optional): ID del período.
+            student_id (int, optional): ID de un participante (estudiante).
+            teacher_id (int, optional): ID de un participante (docente).
+            subject_id (int, optional): ID de la materia.
+            progress_callback (callable, optional): Se llama con el número de filas escritas tras cada lote.
+            batch_size (int): Filas por lote.
+
+        Returns:
+            tuple: (int, str or None) - Filas exportadas y un mensaje de error si falla.
+        """
+        filters, error = self.report_controller.validate_projects_report_filters(period_id, student_id, teacher_id, subject_id)
+        if error:
+            return 0, error
+        batches = iter_projects_report(*filters, batch_size=batch_size)
+        return self._export(file_path, "Reporte de Proyectos", _PROJECTS_REPORT_COLUMNS, batches, progress_callback)
+
+    def export_participants_report(self, file_path, period_id=None, participant_type=None,
+                                   progress_callback=None, batch_size=EXPORT_BATCH_SIZE):
+        """
+        Exporta el reporte de participantes con los mismos filtros y orden que
+        ReportController.generate_participants_report.
+
+        Args:
+            file_path (str): Ruta del archivo .xlsx o .csv a escribir.
+            period_id (int, optional): ID del período.
+            participant_type (str, optional): Tipo de participante ('Estudiante', 'Docente').
+            progress_callback (callable, optional): Se llama con el número de filas escritas tras cada lote.
+            batch_size (int): Filas por lote.
+
+        Returns:
+            tuple: (int, str or None) - Filas exportadas y un mensaje de error si falla.
+        """
+        filters, error = self.report_controller.validate_participants_report_filters(period_id, participant_type)
+        if error:
+            return 0, error
+        batches = iter_participants_report(*filters, batch_size=batch_size)
+        return self._export(file_path, "Reporte de Participantes", _PARTICIPANTS_REPORT_COLUMNS, batches, progress_callback)
+
+    def _export(self, file_path, sheet_title, columns, batches, progress_callback):
+        writer_class = _WRITERS.get(Path(file_path).suffix.lower())
+        if writer_class is None:
+            batches.close()
+            return 0, "Formato no soportado. Use un archivo .xlsx o .csv."
+
+        part_path = f"{file_path}.part"
+        rows_written = 0
+        writer = None
+        try:
+            writer = writer_class(part_path, sheet_title, columns)
+            for batch in batches:
+                writer.write_rows([tuple(value(row) for _, _, value in columns) for row in batch])
+                rows_written += len(batch)
+                if progress_callback:
+                    progress_callback(rows_written)
+            writer.close()
+            writer = None
+            os.replace(part_path, file_path)
+            return rows_written, None
+        except Error as e:
+            return 0, f"Error de base de datos al exportar: {e}"
+        except OSError as e:
+            return 0, f"No se pudo escribir el archivo: {e}"
+        except Exception as e:
+            return 0, f"Error inesperado al exportar: {e}"
+        finally:
+            batches.close() # Libera la conexión si la exportación se cortó a mitad
+            if writer is not None:
+                writer.abort()
+            if os.path.exists(part_path):
+                try:
+                    os.remove(part_path)
+                except OSError:
+                    pass
@@ -0,0 +1,71 @@
+# controllers/pagination.py
+import threading
+import time
+
+from config import PAGINATION_CONFIG
+
+PAGE_SIZE = PAGINATION_CONFIG['page_size']
+MAX_PAGE_SIZE = PAGINATION_CONFIG['max_page_size']
+
+def validate_page_args(after_id, page_size):
+    """
+    Valida el cursor y el tamaño de página que recibe un método paginado de un controlador.
+
+    Args:
+        after_id (int or None): ID del último elemento de la página anterior; None para la primera.
+        page_size (int or None): Filas por página; None usa PAGINATION_CONFIG['page_size'].
+
+    Returns:
+        tuple: (int or None, int, str or None)
+               - El cursor validado.
+               - El tamaño de página validado.
+               - Un mensaje de error si alguno no es válido.
+    """
+    if page_size is None:
+        page_size = PAGE_SIZE
+    try:
+        page_size = int(page_size)
+        after_id = int(after_id) if after_id is not None else None
+    except (TypeError, ValueError):
+        return None, PAGE_SIZE, "Error: El cursor y el tamaño de página deben ser números enteros."
+    if not 1 <= page_size <= MAX_PAGE_SIZE:
+        return None, PAGE_SIZE, f"Error: El tamaño de página debe estar entre 1 y {MAX_PAGE_SIZE}."
+    if after_id is not None and after_id < 0:
+        return None, page_size, "Error: El cursor de paginación no puede ser negativo."
+    return after_id, page_size, None
+
+
+class CountCache:
+    """
+    Totales (COUNT(*)) por combinación de filtros, reutilizados durante
+    PAGINATION_CONFIG['count_cache_ttl'] segundos.
+
+    Los controladores la comparten entre instancias (atributo de clase) y la
+    invalidan al crear, modificar o eliminar; el TTL acota el desfase cuando
+    los datos cambian por otra vía (otro equipo contra la misma base de datos).
+    """
+    def __init__(self, ttl=None):
+        self.ttl = PAGINATION_CONFIG['count_cache_ttl'] if ttl is None else ttl
+        self._lock = threading.Lock()
+        self._entries = {} # {filtros: (total, instante_monotónico)}
+
+    def get(self, key, compute):
+        """
+        Retorna el total guardado para `key` o lo calcula con `compute()`.
+        Un resultado None (error del modelo) no se guarda.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and now - entry[1] < self.ttl:
+                return entry[0]
+        total = compute()
+        if total is not None:
+            with self._lock:
+                self._entries[key] = (total, now)
+        return total
+
+    def invalidate(self):
+        """Descarta todos los totales guardados."""
+        with self._lock:
+            self._entries.clear()
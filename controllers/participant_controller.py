@@ -2,19 +2,28 @@
 from models.participant_model import (
     create_participant,
     get_all_participants,
+    get_participants_page,
+    count_participants,
     get_participant_by_id,
+    exists_participant_with,
     update_participant,
     delete_participant
     # get_participants_by_type, # Estas se pueden manejar con get_all_participants y filtrar en el controlador
     # get_participants_by_project_id # Esta iría en project_model o report_model si la necesitas
 )
 from mysql.connector import Error # Importar Error para manejo específico de la base de datos
+from db.errors import duplicate_key
+from controllers.pagination import CountCache, validate_page_args
+from controllers.search_index import ParticipantSearchIndex
 
 class ParticipantController:
     """
     Controlador para la gestión de participantes (Estudiantes y Docentes).
     Centraliza la lógica de negocio, validaciones y manejo de errores.
     """
+    _count_cache = CountCache() # Totales compartidos por todas las instancias
+    _search_index = ParticipantSearchIndex() # Índice de búsqueda compartido, construido en la primera búsqueda y al cambiar participantes en otro equipo
+
     def add_new_participant(self, tipo_participante, nombre, apellido, cedula, correo_electronico=None, telefono=None, carrera=None):
         """
         Añade un nuevo participante a la base de datos.
@@ -39,17 +48,13 @@ class ParticipantController:
         if tipo_participante not in ['Estudiante', 'Docente']:
             return None, "Error: Tipo de participante inválido. Debe ser 'Estudiante' o 'Docente'."
         
-        # Validación de que la cédula sea única
-        all_parts, _ = self.get_all_system_participants()
-        for p in all_parts:
-            if p['cedula'] == cedula:
-                return None, f"Error: La cédula '{cedula}' ya está registrada para otro participante."
-        
-        # Validación de que el correo electrónico sea único (si se proporciona)
-        if correo_electronico:
-            for p in all_parts:
-                if p['correo_electronico'] == correo_electronico:
-                    return None, f"Error: El correo electrónico '{correo_electronico}' ya está registrado."
+        # Validación de que la cédula y el correo electrónico (si se proporciona) sean únicos
+        try:
+            taken = exists_participant_with(cedula=cedula, email=correo_electronico)
+        except Exception as e:
+            return None, f"Error al verificar la unicidad del participante: {e}"
+        if taken:
+            return None, self._duplicate_message(taken[0], cedula, correo_electronico)
 
         if tipo_participante == 'Docente' and carrera:
             # print("Advertencia: Se especificó una carrera para un docente. Se ignorará.")
@@ -58,13 +63,20 @@ class ParticipantController:
         try:
             participant_id = create_participant(tipo_participante, nombre, apellido, cedula, correo_electronico, telefono, carrera)
             if participant_id:
+                self._count_cache.invalidate()
+                self._search_index.add({
+                    'id_participante': participant_id, 'tipo_participante': tipo_participante,
+                    'nombre': nombre, 'apellido': apellido, 'cedula': cedula,
+                    'correo_electronico': correo_electronico, 'telefono': telefono, 'carrera': carrera,
+                })
                 return participant_id, None
             else:
                 return None, "Error desconocido al añadir participante. Verifique los logs del modelo."
         except Error as e:
             # Captura errores específicos de MySQL, como duplicados si hay UNIQUE en la DB
             if "1062" in str(e): # MySQL error code for Duplicate entry for key 'PRIMARY' or 'UNIQUE'
-                return None, "Error de duplicidad: La cédula o el correo electrónico ya existen."
+                # Otro registro ganó la carrera entre la verificación y el INSERT
+                return None, self._duplicate_message(duplicate_key(e), cedula, correo_electronico)
             return None, f"Error de base de datos al añadir participante: {e}"
         except Exception as e:
             return None, f"Error inesperado al añadir participante: {e}"
@@ -84,6 +96,72 @@ class ParticipantController:
         except Exception as e:
             return [], f"Error al obtener todos los participantes: {e}"
 
+    def get_participants_page(self, after_id=None, page_size=None, participant_type=None):
+        """
+        Obtiene una página de participantes ordenada por ID, para listas que cargan a medida que se desplazan.
+
+        Args:
+            after_id (int, optional): ID del último participante de la página anterior. None para la primera página.
+            page_size (int, optional): Filas por página. Por defecto PAGINATION_CONFIG['page_size'].
+            participant_type (str, optional): 'Estudiante' o 'Docente' para filtrar por tipo.
+
+        Returns:
+            tuple: (list of dict, str or None)
+                   - Los participantes de la página; menos de page_size indica que es la última.
+                   - Un mensaje de error si falla.
+        """
+        after_id, page_size, error_msg = validate_page_args(after_id, page_size)
+        if error_msg:
+            return [], error_msg
+        if participant_type and participant_type not in ['Estudiante', 'Docente']:
+            return [], "Error: El tipo de participante debe ser 'Estudiante' o 'Docente'."
+        try:
+            return get_participants_page(after_id, page_size, participant_type), None
+        except Exception as e:
+            return [], f"Error al obtener la página de participantes: {e}"
+
+    def count_system_participants(self, participant_type=None):
+        """
+        Cuenta los participantes (total que acompaña a las listas paginadas).
+        El resultado se reutiliza durante PAGINATION_CONFIG['count_cache_ttl'] segundos.
+
+        Args:
+            participant_type (str, optional): 'Estudiante' o 'Docente' para contar solo ese tipo.
+
+        Returns:
+            tuple: (int, str or None)
+                   - El total de participantes.
+                   - Un mensaje de error si falla.
+        """
+        try:
+            return self._count_cache.get(participant_type, lambda: count_participants(participant_type)), None
+        except Exception as e:
+            return 0, f"Error al contar los participantes: {e}"
+
+    def search_participants(self, query, participant_type=None, limit=20):
+        """
+        Busca participantes por nombre, apellido, cédula o correo electrónico, mientras se escribe.
+        Usa el índice en memoria compartido (ver controllers/search_index.py); de la base de datos solo
+        lee la generación de escritura de participantes, para reconstruirlo si otro equipo los cambió.
+
+        Args:
+            query (str): Texto de búsqueda; sin acentos ni distinción de mayúsculas.
+            participant_type (str, optional): 'Estudiante' o 'Docente' para buscar solo ese tipo.
+            limit (int or None): Cantidad máxima de resultados; None para todos.
+
+        Returns:
+            tuple: (list of dict, str or None)
+                   - Los participantes, de más a menos relevante.
+                   - Un mensaje de error si falla.
+        """
+        if participant_type and participant_type not in ['Estudiante', 'Docente']:
+            return [], "Error: El tipo de participante debe ser 'Estudiante' o 'Docente'."
+        predicate = (lambda p: p['tipo_participante'] == participant_type) if participant_type else None
+        try:
+            return self._search_index.search(query, limit, predicate), None
+        except Exception as e:
+            return [], f"Error al buscar participantes: {e}"
+
     def get_participant_details(self, participant_id):
         """
         Obtiene los detalles de un participante específico por su ID.
@@ -147,29 +225,31 @@ class ParticipantController:
             # print("Advertencia: Se intentó asignar carrera a un docente. Se ignorará.")
             carrera = None # Asegurarse de que docentes no tengan carrera
         
-        # Validar unicidad de cédula si se está actualizando
-        if cedula and cedula != current_participant['cedula']:
-            all_parts, _ = self.get_all_system_participants()
-            for p in all_parts:
-                if p['cedula'] == cedula and p['id_participante'] != participant_id:
-                    return False, f"Error: La cédula '{cedula}' ya está registrada para otro participante."
-
-        # Validar unicidad de correo electrónico si se está actualizando
-        if correo_electronico and correo_electronico != current_participant['correo_electronico']:
-            all_parts, _ = self.get_all_system_participants()
-            for p in all_parts:
-                if p['correo_electronico'] == correo_electronico and p['id_participante'] != participant_id:
-                    return False, f"Error: El correo electrónico '{correo_electronico}' ya está registrado."
+        # Validar unicidad de cédula y correo electrónico si se están actualizando
+        new_cedula = cedula if cedula and cedula != current_participant['cedula'] else None
+        new_email = correo_electronico if correo_electronico and correo_electronico != current_participant['correo_electronico'] else None
+        if new_cedula or new_email:
+            try:
+                taken = exists_participant_with(cedula=new_cedula, email=new_email, exclude_id=participant_id)
+            except Exception as e:
+                return False, f"Error al verificar la unicidad del participante: {e}"
+            if taken:
+                return False, self._duplicate_message(taken[0], cedula, correo_electronico)
 
         try:
             success = update_participant(participant_id, tipo_participante, nombre, apellido, cedula, correo_electronico, telefono, carrera)
             if success:
+                self._count_cache.invalidate() # Puede haber cambiado el tipo
+                # Los campos None no cambian: se combinan con los datos que ya se leyeron
+                changes = {'tipo_participante': tipo_participante, 'nombre': nombre, 'apellido': apellido, 'cedula': cedula,
+                           'correo_electronico': correo_electronico, 'telefono': telefono, 'carrera': carrera}
+                self._search_index.update(dict(current_participant, **{k: v for k, v in changes.items() if v is not None}))
                 return True, None
             else:
                 return False, "No se pudo actualizar el participante. Puede que no exista o no hubo cambios."
         except Error as e:
             if "1062" in str(e): # Duplicate entry
-                return False, "Error de duplicidad al actualizar: la cédula o el correo ya existen."
+                return False, self._duplicate_message(duplicate_key(e), cedula, correo_electronico)
             return False, f"Error de base de datos al actualizar participante {participant_id}: {e}"
         except Exception as e:
             return False, f"Error inesperado al actualizar participante {participant_id}: {e}"
@@ -191,6 +271,8 @@ class ParticipantController:
         try:
             success = delete_participant(participant_id)
             if success:
+                self._count_cache.invalidate()
+                self._search_index.remove(participant_id)
                 return True, None
             else:
                 return False, f"No se encontró un participante con ID {participant_id} para eliminar."
@@ -233,4 +315,15 @@ class ParticipantController:
             return [], error_msg
         
         teachers = [p for p in all_parts if p['tipo_participante'] == 'Docente']
-        return teachers, None
\ No newline at end of file
+        return teachers, None
+
+    def _duplicate_message(self, field, cedula, correo_electronico):
+        """
+        Mensaje de duplicidad para el campo en conflicto ('cedula' o 'correo_electronico').
+        Es el mismo tanto si lo detecta la verificación previa como el error 1062 de la base de datos.
+        """
+        if field == 'cedula':
+            return f"Error: La cédula '{cedula}' ya está registrada para otro participante."
+        if field == 'correo_electronico':
+            return f"Error: El correo electrónico '{correo_electronico}' ya está registrado."
+        return "Error de duplicidad: La cédula o el correo electrónico ya existen."
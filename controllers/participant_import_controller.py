@@ -0,0 +1,244 @@
+# controllers/participant_import_controller.py
+import codecs
+import csv
+import re
+import unicodedata
+from pathlib import Path
+
+from mysql.connector import Error
+from db.connection import UnitOfWork
+from db.errors import duplicate_key
+from models.participant_model import get_taken_identifiers, create_participants_bulk
+from controllers.participant_controller import ParticipantController
+
+IMPORT_BATCH_SIZE = 1000 # Filas que se validan y se insertan juntas
+
+# Encabezados aceptados (normalizados con _normalize_header) para cada columna de 'participantes'
+_HEADER_ALIASES = {
+    'tipo_participante': {'tipo', 'tipo_participante', 'tipo_de_participante'},
+    'nombre': {'nombre', 'nombres'},
+    'apellido': {'apellido', 'apellidos'},
+    'cedula': {'cedula', 'ci', 'documento'},
+    'correo_electronico': {'correo', 'correo_electronico', 'email', 'e_mail'},
+    'telefono': {'telefono'},
+    'carrera': {'carrera'},
+}
+_REQUIRED_COLUMNS = ('tipo_participante', 'nombre', 'apellido', 'cedula')
+# Longitudes máximas de db/database.sql: un valor más largo haría fallar todo el lote
+_MAX_LENGTHS = {'nombre': 100, 'apellido': 100, 'cedula': 20, 'correo_electronico': 100, 'telefono': 20, 'carrera': 100}
+_PARTICIPANT_TYPES = {'estudiante': 'Estudiante', 'docente': 'Docente'}
+_COLUMN_LABELS = {'tipo_participante': 'tipo', 'nombre': 'nombre', 'apellido': 'apellido', 'cedula': 'cédula'}
+_COLUMN_ORDER = ('tipo_participante', 'nombre', 'apellido', 'cedula', 'correo_electronico', 'telefono', 'carrera')
+
+def _normalize_header(header):
+    text = unicodedata.normalize('NFKD', str(header or '')).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r"[\s\-]+", '_', text.strip().lower())
+
+def _cell_text(value):
+    """Convierte una celda (de CSV o de openpyxl) en texto sin espacios sobrantes, o None si está vacía."""
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value) # Cédulas y teléfonos que Excel guardó como número
+    text = str(value).strip()
+    return text or None
+
+
+class ParticipantImportController:
+    """
+    Importación masiva de participantes desde CSV o XLSX.
+
+    Las filas se leen en streaming (csv o openpyxl en modo read-only), se validan
+    por lotes y se comprueban contra la base de datos con una consulta IN (...)
+    por lote, no una por fila. Todas las inserciones van en una sola transacción:
+    si la base de datos rechaza un lote, no queda nada importado a medias.
+    """
+    def import_participants(self, file_path, progress_callback=None, dry_run=False, batch_size=IMPORT_BATCH_SIZE):
+        """
+        Importa los participantes de un archivo CSV o XLSX.
+
+        La primera fila debe tener los encabezados (tipo, nombre, apellido, cédula,
+        y opcionalmente correo, teléfono y carrera). Las filas inválidas o
+        duplicadas (en el archivo o en la base de datos) no se importan y se
+        informan en 'errores'; el resto sí.
+
+        Args:
+            file_path (str): Ruta del archivo .csv o .xlsx.
+            progress_callback (callable, optional): Se llama con el número de filas procesadas tras cada lote.
+            dry_run (bool): Si es True, valida todo pero no inserta nada ('importados' cuenta las filas que se importarían).
+            batch_size (int): Filas por lote de validación e inserción.
+
+        Returns:
+            tuple: (dict or None, str or None)
+                   - Resumen: {'filas', 'importados', 'errores': [(fila, cédula, mensaje), ...]}.
+                   - Un mensaje de error si el archivo no se pudo leer o la importación se revirtió.
+        """
+        summary = {'filas': 0, 'importados': 0, 'errores': []}
+        seen_cedulas, seen_emails = set(), set()
+        try:
+            rows = self._read_rows(file_path)
+            with UnitOfWork() as uow:
+                batch = []
+                for row in rows:
+                    batch.append(row)
+                    if len(batch) >= batch_size:
+                        self._import_batch(batch, summary, seen_cedulas, seen_emails, uow, dry_run)
+                        batch = []
+                        if progress_callback:
+                            progress_callback(summary['filas'])
+                if batch:
+                    self._import_batch(batch, summary, seen_cedulas, seen_emails, uow, dry_run)
+                    if progress_callback:
+                        progress_callback(summary['filas'])
+                if dry_run:
+                    uow.rollback_only = True
+        except ValueError as e:
+            return None, f"Error en el archivo: {e}"
+        except OSError as e:
+            return None, f"No se pudo leer el archivo: {e}"
+        except Error as e:
+            if "1062" in str(e): # Otro registro ganó la carrera entre la verificación y el INSERT
+                field = {'cedula': 'cédula', 'correo_electronico': 'correo electrónico'}.get(duplicate_key(e), 'clave')
+                return None, f"Importación revertida: se registró otro participante con la misma {field} durante la importación. Vuelva a intentarlo."
+            return None, f"Importación revertida por un error de base de datos: {e}"
+        except Exception as e:
+            return None, f"Error inesperado al importar participantes: {e}"
+
+        summary['errores'].sort(key=lambda error: error[0]) # En el orden del archivo
+        if summary['importados'] and not dry_run:
+            ParticipantController._count_cache.invalidate()
+            ParticipantController._search_index.invalidate() # executemany no devuelve los IDs de cada fila
+        return summary, None
+
+    def write_error_report(self, errors, file_path):
+        """
+        Guarda las filas rechazadas de una importación en un CSV.
+
+        Args:
+            errors (list of tuple): summary['errores'] de import_participants.
+            file_path (str): Ruta del CSV a escribir.
+
+        Returns:
+            tuple: (bool, str or None)
+                   - True si se guardó el informe.
+                   - Un mensaje de error si falla.
+        """
+        try:
+            with open(file_path, 'w', newline='', encoding='utf-8-sig') as f:
+                writer = csv.writer(f)
+                writer.writerow(['Fila', 'Cédula', 'Error'])
+                writer.writerows(errors)
+            return True, None
+        except OSError as e:
+            return False, f"No se pudo guardar el informe de errores: {e}"
+
+    def _read_rows(self, file_path):
+        """Genera (número de fila, {columna: valor}) leyendo el archivo en streaming."""
+        suffix = Path(file_path).suffix.lower()
+        if suffix == '.csv':
+            yield from self._read_csv(file_path)
+        elif suffix in ('.xlsx', '.xlsm'):
+            yield from self._read_xlsx(file_path)
+        else:
+            raise ValueError("Formato no soportado. Use un archivo .csv o .xlsx.")
+
+    def _read_csv(self, file_path):
+        with open(file_path, 'rb') as f:
+            head = f.read(65536)
+        try:
+            codecs.getincrementaldecoder('utf-8')().decode(head) # Tolera un carácter cortado al final del bloque
+            encoding = 'utf-8-sig'
+        except UnicodeDecodeError:
+            encoding = 'cp1252' # CSV guardado por Excel en Windows
+        with open(file_path, newline='', encoding=encoding) as f:
+            sample = f.read(4096)
+            f.seek(0)
+            try:
+                # Excel en español exporta con ';'
+                dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+            except csv.Error:
+                dialect = csv.excel
+            reader = csv.reader(f, dialect)
+            columns = self._map_headers(next(reader, []))
+            for row_number, values in enumerate(reader, start=2):
+                if any(v.strip() for v in values):
+                    yield row_number, {column: _cell_text(values[index]) if index < len(values) else None
+                                       for column, index in columns.items()}
+
+    def _read_xlsx(self, file_path):
+        from openpyxl import load_workbook # Solo se carga al importar desde Excel
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            columns = self._map_headers(next(rows, ()))
+            for row_number, values in enumerate(rows, start=2):
+                if any(v is not None and str(v).strip() for v in values):
+                    yield row_number, {column: _cell_text(values[index]) if index < len(values) else None
+                                       for column, index in columns.items()}
+        finally:
+            workbook.close()
+
+    def _map_headers(self, headers):
+        """Retorna {columna: índice} a partir de la fila de encabezados."""
+        columns = {}
+        for index, header in enumerate(headers):
+            normalized = _normalize_header(header)
+            for column, aliases in _HEADER_ALIASES.items():
+                if normalized in aliases and column not in columns:
+                    columns[column] = index
+        missing = [column for column in _REQUIRED_COLUMNS if column not in columns]
+        if missing:
+            raise ValueError(f"Faltan las columnas obligatorias: {', '.join(_COLUMN_LABELS[column] for column in missing)}.")
+        return columns
+
+    def _validate_row(self, row):
+        """Normaliza una fila y retorna (tupla para insertar, None) o (None, mensaje de error)."""
+        if not all(row.get(column) for column in _REQUIRED_COLUMNS):
+            return None, "Faltan campos obligatorios (tipo, nombre, apellido, cédula)."
+        tipo = _PARTICIPANT_TYPES.get(row['tipo_participante'].lower())
+        if tipo is None:
+            return None, f"Tipo de participante inválido '{row['tipo_participante']}'. Debe ser 'Estudiante' o 'Docente'."
+        for column, max_length in _MAX_LENGTHS.items():
+            if row.get(column) and len(row[column]) > max_length:
+                return None, f"El campo {column} supera los {max_length} caracteres."
+        values = dict(row, tipo_participante=tipo)
+        if tipo == 'Docente':
+            values['carrera'] = None # Los docentes no tienen carrera
+        return tuple(values.get(column) for column in _COLUMN_ORDER), None
+
+    def _import_batch(self, batch, summary, seen_cedulas, seen_emails, uow, dry_run):
+        errors = summary['errores']
+        valid = []
+        for row_number, row in batch:
+            values, error_msg = self._validate_row(row)
+            if error_msg:
+                errors.append((row_number, row.get('cedula'), error_msg))
+            else:
+                valid.append((row_number, values))
+
+        # Una consulta por lote para las cédulas y correos que ya existen
+        taken_cedulas, taken_emails = get_taken_identifiers(
+            [values[3] for _, values in valid], [values[4] for _, values in valid], conn=uow)
+
+        to_insert = []
+        for row_number, values in valid:
+            cedula = values[3].lower()
+            email = values[4].lower() if values[4] else None
+            if cedula in taken_cedulas:
+                errors.append((row_number, values[3], f"La cédula '{values[3]}' ya está registrada."))
+            elif cedula in seen_cedulas:
+                errors.append((row_number, values[3], f"La cédula '{values[3]}' está repetida en el archivo."))
+            elif email and email in taken_emails:
+                errors.append((row_number, values[3], f"El correo electrónico '{values[4]}' ya está registrado."))
+            elif email and email in seen_emails:
+                errors.append((row_number, values[3], f"El correo electrónico '{values[4]}' está repetido en el archivo."))
+            else:
+                to_insert.append(values)
+                seen_cedulas.add(cedula)
+                if email:
+                    seen_emails.add(email)
+
+        if to_insert and not dry_run:
+            create_participants_bulk(to_insert, conn=uow)
+        summary['filas'] += len(batch)
+        summary['importados'] += len(to_insert)
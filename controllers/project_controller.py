@@ -3,7 +3,11 @@ from datetime import datetime
 from models.project_model import (
     create_project,
     get_project_by_id,
+    get_project_by_name,
     get_all_projects,
+    get_projects_page,
+    count_projects,
+    search_projects,
     update_project,
     delete_project,
     add_participants_to_project,
@@ -15,7 +19,9 @@ from models.project_model import (
 #       Por ahora, usar los modelos directamente es más simple para este ejemplo.
 from models.period_model import get_period_by_id
 from models.subject_model import get_subject_by_id
-from models.participant_model import get_participant_by_id
+from models.participant_model import get_participants_by_ids
+from db.connection import UnitOfWork
+from controllers.pagination import CountCache, validate_page_args
 from mysql.connector import Error # Para capturar errores específicos de la base de datos
 
 class ProjectController:
@@ -24,6 +30,8 @@ class ProjectController:
     Centraliza la lógica de negocio, validaciones de claves foráneas y la
     asociación/desasociación de participantes.
     """
+    _count_cache = CountCache() # Totales compartidos por todas las instancias
+
     def create_new_project(self, id_periodo, id_materia, nombre_proyecto, descripcion, participantes_ids=None):
         """
         Crea un nuevo proyecto en el sistema, validando las claves foráneas
@@ -50,44 +58,35 @@ class ProjectController:
         except ValueError:
             return None, "Error: Los IDs de período y materia deben ser números enteros."
 
-        # Validar IDs de claves foráneas
-        if not get_period_by_id(id_periodo):
-            return None, f"Error: El período con ID {id_periodo} no existe."
-        if not get_subject_by_id(id_materia):
-            return None, f"Error: La materia con ID {id_materia} no existe."
-        
-        # Validar que los IDs de participantes sean válidos
-        processed_participants_ids = []
-        if participantes_ids:
-            if not isinstance(participantes_ids, list):
-                return None, "Error: La lista de participantes debe ser una lista de IDs."
-            
-            unique_participant_ids = set() # Usar un set para evitar duplicados y validar
-            for p_id_raw in participantes_ids:
-                try:
-                    p_id = int(p_id_raw)
-                except ValueError:
-                    return None, f"Error: El ID de participante '{p_id_raw}' no es un número entero válido."
-
-                if not get_participant_by_id(p_id):
-                    return None, f"Error: El participante con ID {p_id} no existe."
-                unique_participant_ids.add(p_id)
-            processed_participants_ids = list(unique_participant_ids)
-
-        # Validar unicidad del nombre del proyecto
-        all_projects, _ = self.get_all_system_projects()
-        for proj in all_projects:
-            if proj['nombre_proyecto'].lower() == nombre_proyecto.lower():
-                return None, f"Error: Ya existe un proyecto con el nombre '{nombre_proyecto}'."
+        if participantes_ids and not isinstance(participantes_ids, list):
+            return None, "Error: La lista de participantes debe ser una lista de IDs."
 
         try:
-            project_id = create_project(id_periodo, id_materia, nombre_proyecto, descripcion, processed_participants_ids)
+            # Validaciones y escritura comparten una sola conexión y una sola transacción
+            with UnitOfWork() as uow:
+                # Validar IDs de claves foráneas
+                if not get_period_by_id(id_periodo, conn=uow):
+                    return None, f"Error: El período con ID {id_periodo} no existe."
+                if not get_subject_by_id(id_materia, conn=uow):
+                    return None, f"Error: La materia con ID {id_materia} no existe."
+
+                # Validar que los IDs de participantes sean válidos (una sola consulta para toda la lista)
+                processed_participants_ids, error_msg = self._validate_participant_ids(participantes_ids or [], conn=uow)
+                if error_msg:
+                    return None, error_msg
+
+                # Validar unicidad del nombre del proyecto (búsqueda puntual por la clave normalizada)
+                if get_project_by_name(nombre_proyecto, conn=uow):
+                    return None, f"Error: Ya existe un proyecto con el nombre '{nombre_proyecto}'."
+
+                project_id = create_project(id_periodo, id_materia, nombre_proyecto, descripcion, processed_participants_ids, conn=uow)
             if project_id:
+                self._count_cache.invalidate()
                 return project_id, None
             else:
                 return None, "Error desconocido al crear el proyecto. No se recibió un ID de proyecto."
         except Error as e:
-            if "1062" in str(e): # Duplicate entry for UNIQUE constraint (e.g., nombre_proyecto si es único en DB)
+            if "1062" in str(e): # Duplicate entry en uq_proyectos_nombre_clave (otra alta concurrente con el mismo nombre)
                 return None, f"Error de duplicidad: Ya existe un proyecto con el nombre '{nombre_proyecto}'."
             elif "1452" in str(e): # Foreign key constraint fails (aunque ya validamos arriba, es un respaldo)
                 return None, "Error de clave foránea. Asegúrese de que el período y la materia existan y sean correctos."
@@ -134,6 +133,84 @@ class ProjectController:
         except Exception as e:
             return [], f"Error al obtener todos los proyectos: {e}"
 
+    def get_projects_page(self, after_id=None, page_size=None, period_id=None, subject_id=None):
+        """
+        Obtiene una página de proyectos, del más reciente al más antiguo, para listas que cargan a medida que se desplazan.
+
+        Args:
+            after_id (int, optional): ID del último proyecto de la página anterior. None para la primera página.
+            page_size (int, optional): Filas por página. Por defecto PAGINATION_CONFIG['page_size'].
+            period_id (int, optional): ID del período por el que filtrar.
+            subject_id (int, optional): ID de la materia por la que filtrar.
+
+        Returns:
+            tuple: (list of dict, str or None)
+                   - Los proyectos de la página; menos de page_size indica que es la última.
+                   - Un mensaje de error si falla.
+        """
+        after_id, page_size, error_msg = validate_page_args(after_id, page_size)
+        if error_msg:
+            return [], error_msg
+        try:
+            period_id = int(period_id) if period_id else None
+            subject_id = int(subject_id) if subject_id else None
+        except ValueError:
+            return [], "Error: Los IDs de período y materia deben ser números enteros."
+        try:
+            return get_projects_page(after_id, page_size, period_id, subject_id), None
+        except Exception as e:
+            return [], f"Error al obtener la página de proyectos: {e}"
+
+    def count_system_projects(self, period_id=None, subject_id=None):
+        """
+        Cuenta los proyectos (total que acompaña a las listas paginadas).
+        El resultado se reutiliza durante PAGINATION_CONFIG['count_cache_ttl'] segundos.
+
+        Args:
+            period_id (int, optional): ID del período por el que filtrar.
+            subject_id (int, optional): ID de la materia por la que filtrar.
+
+        Returns:
+            tuple: (int, str or None)
+                   - El total de proyectos.
+                   - Un mensaje de error si falla.
+        """
+        try:
+            total = self._count_cache.get((period_id, subject_id), lambda: count_projects(period_id, subject_id))
+            if total is None:
+                return 0, "Error al contar los proyectos. Verifique los logs del modelo."
+            return total, None
+        except Exception as e:
+            return 0, f"Error al contar los proyectos: {e}"
+
+    def search_system_projects(self, query, period_id=None, limit=None):
+        """
+        Busca proyectos por palabras del nombre o la descripción, de más a menos relevante.
+
+        Args:
+            query (str): Texto de búsqueda; cada palabra se busca como prefijo y todas deben aparecer.
+            period_id (int, optional): ID del período por el que filtrar.
+            limit (int, optional): Cantidad máxima de resultados. Por defecto PAGINATION_CONFIG['page_size'].
+
+        Returns:
+            tuple: (list of dict, str or None)
+                   - Los proyectos encontrados (lista vacía si ninguno coincide).
+                   - Un mensaje de error si falla o la búsqueda no tiene palabras.
+        """
+        if not query or not query.strip():
+            return [], "Error: Ingrese al menos una palabra para buscar."
+        _, limit, error_msg = validate_page_args(None, limit)
+        if error_msg:
+            return [], error_msg
+        try:
+            period_id = int(period_id) if period_id else None
+        except ValueError:
+            return [], "Error: El ID de período debe ser un número entero válido."
+        try:
+            return search_projects(query, period_id, limit), None
+        except Exception as e:
+            return [], f"Error al buscar proyectos: {e}"
+
     def update_existing_project(self, project_id, **kwargs):
         """
         Actualiza la información de un proyecto existente.
@@ -154,47 +231,47 @@ class ProjectController:
         if not kwargs:
             return False, "Error: No se proporcionaron campos para actualizar."
 
-        current_project, error_msg = self.get_project_details(project_id)
-        if error_msg:
-            return False, error_msg # El proyecto no existe para actualizar
-
-        # Validar IDs de claves foráneas si se están actualizando
-        if 'id_periodo' in kwargs and kwargs['id_periodo'] is not None:
-            try:
-                new_period_id = int(kwargs['id_periodo'])
-                if not get_period_by_id(new_period_id):
-                    return False, f"Error: El período con ID {new_period_id} no existe."
-                kwargs['id_periodo'] = new_period_id # Actualizar con el entero validado
-            except ValueError:
-                return False, "Error: El ID de período debe ser un número entero válido."
-
-        if 'id_materia' in kwargs and kwargs['id_materia'] is not None:
-            try:
-                new_subject_id = int(kwargs['id_materia'])
-                if not get_subject_by_id(new_subject_id):
-                    return False, f"Error: La materia con ID {new_subject_id} no existe."
-                kwargs['id_materia'] = new_subject_id # Actualizar con el entero validado
-            except ValueError:
-                return False, "Error: El ID de materia debe ser un número entero válido."
-
-        # Validar unicidad del nombre del proyecto si se está actualizando
-        if 'nombre_proyecto' in kwargs and kwargs['nombre_proyecto'] is not None:
-            new_name = kwargs['nombre_proyecto']
-            if new_name.lower() != current_project['nombre_proyecto'].lower(): # Solo verificar si el nombre realmente cambió
-                all_projects, _ = self.get_all_system_projects()
-                for p in all_projects:
-                    if p['nombre_proyecto'].lower() == new_name.lower() and p['id_proyecto'] != project_id:
+        try:
+            with UnitOfWork() as uow:
+                current_project = get_project_by_id(project_id, conn=uow)
+                if not current_project:
+                    return False, f"No se encontró un proyecto con ID {project_id}." # El proyecto no existe para actualizar
+
+                # Validar IDs de claves foráneas si se están actualizando
+                if 'id_periodo' in kwargs and kwargs['id_periodo'] is not None:
+                    try:
+                        new_period_id = int(kwargs['id_periodo'])
+                    except ValueError:
+                        return False, "Error: El ID de período debe ser un número entero válido."
+                    if not get_period_by_id(new_period_id, conn=uow):
+                        return False, f"Error: El período con ID {new_period_id} no existe."
+                    kwargs['id_periodo'] = new_period_id # Actualizar con el entero validado
+
+                if 'id_materia' in kwargs and kwargs['id_materia'] is not None:
+                    try:
+                        new_subject_id = int(kwargs['id_materia'])
+                    except ValueError:
+                        return False, "Error: El ID de materia debe ser un número entero válido."
+                    if not get_subject_by_id(new_subject_id, conn=uow):
+                        return False, f"Error: La materia con ID {new_subject_id} no existe."
+                    kwargs['id_materia'] = new_subject_id # Actualizar con el entero validado
+
+                # Validar unicidad del nombre del proyecto si se está actualizando
+                if 'nombre_proyecto' in kwargs and kwargs['nombre_proyecto'] is not None:
+                    new_name = kwargs['nombre_proyecto']
+                    existing = get_project_by_name(new_name, conn=uow)
+                    if existing and existing['id_proyecto'] != project_id: # Renombrar el propio proyecto (p. ej. cambiar mayúsculas) es válido
                         return False, f"Error: Ya existe un proyecto con el nombre '{new_name}'."
 
-        try:
-            success = update_project(project_id, **kwargs)
+                success = update_project(project_id, conn=uow, **kwargs)
             if success:
+                self._count_cache.invalidate() # Puede haber cambiado el período o la materia
                 return True, None
             else:
                 return False, "No se pudo actualizar el proyecto. Puede que el proyecto no exista o no hubo cambios."
         except Error as e:
             if "1062" in str(e): # Duplicate entry for UNIQUE constraint
-                return False, f"Error de duplicidad al actualizar: Ya existe un proyecto con el nombre '{kwargs.get('nombre_proyecto', current_project['nombre_proyecto'])}'."
+                return False, f"Error de duplicidad al actualizar: Ya existe un proyecto con el nombre '{kwargs.get('nombre_proyecto')}'."
             elif "1452" in str(e): # Foreign key constraint fails
                 return False, "Error de clave foránea al actualizar. Asegúrese de que el período y la materia existan."
             return False, f"Error de base de datos al actualizar el proyecto: {e}"
@@ -218,6 +295,7 @@ class ProjectController:
         try:
             success = delete_project(project_id)
             if success:
+                self._count_cache.invalidate()
                 return True, None
             else:
                 return False, f"No se encontró un proyecto con ID {project_id} para eliminar."
@@ -245,28 +323,23 @@ class ProjectController:
         """
         if not isinstance(project_id, int):
             return False, "Error: El ID del proyecto debe ser un número entero."
-        if not self.get_project_details(project_id)[0]: # Check if project exists using the controller's method
-            return False, f"Error: El proyecto con ID {project_id} no existe."
-        
         if not new_participant_ids:
             return True, None # No hay participantes para añadir, se considera éxito
         
         if not isinstance(new_participant_ids, list):
             return False, "Error: La lista de IDs de participantes a añadir debe ser una lista."
 
-        # Validar que los IDs de participantes sean válidos y únicos
-        validated_ids = set()
-        for p_id_raw in new_participant_ids:
-            try:
-                p_id = int(p_id_raw)
-            except ValueError:
-                return False, f"Error: El ID de participante '{p_id_raw}' no es un número entero válido."
-            if not get_participant_by_id(p_id):
-                return False, f"Error: El participante con ID {p_id} no existe."
-            validated_ids.add(p_id)
-        
         try:
-            success = add_participants_to_project(project_id, list(validated_ids))
+            with UnitOfWork() as uow:
+                if not get_project_by_id(project_id, conn=uow):
+                    return False, f"Error: El proyecto con ID {project_id} no existe."
+
+                # Validar que los IDs de participantes sean válidos y únicos
+                validated_ids, error_msg = self._validate_participant_ids(new_participant_ids, conn=uow)
+                if error_msg:
+                    return False, error_msg
+
+                success = add_participants_to_project(project_id, validated_ids, conn=uow)
             if success:
                 return True, None
             else:
@@ -321,4 +394,38 @@ class ProjectController:
         except Error as e:
             return False, f"Error de base de datos al remover participantes: {e}"
         except Exception as e:
-            return False, f"Error inesperado al remover participantes: {e}"
\ No newline at end of file
+            return False, f"Error inesperado al remover participantes: {e}"
+
+    def _validate_participant_ids(self, raw_ids, conn=None):
+        """
+        Valida una lista de IDs de participantes en un solo viaje a la base de datos.
+        Reúne todos los problemas (IDs no numéricos e IDs inexistentes) en un único mensaje.
+
+        Args:
+            raw_ids (list): IDs tal como llegan de la vista (int o str).
+            conn (UnitOfWork, optional): Unidad de trabajo a la que unirse.
+
+        Returns:
+            tuple: (list of int, str or None)
+                   - Los IDs válidos, sin duplicados y en el orden recibido.
+                   - Un mensaje de error si algún ID no es válido.
+        """
+        ids, invalid = [], []
+        for p_id_raw in raw_ids:
+            try:
+                ids.append(int(p_id_raw))
+            except (TypeError, ValueError):
+                invalid.append(f"'{p_id_raw}'")
+        ids = list(dict.fromkeys(ids))
+
+        found = {p['id_participante'] for p in get_participants_by_ids(ids, conn=conn)}
+        missing = [str(p_id) for p_id in ids if p_id not in found]
+
+        errors = []
+        if invalid:
+            errors.append(f"Los siguientes IDs de participante no son números enteros válidos: {', '.join(invalid)}.")
+        if missing:
+            errors.append(f"No existen participantes con los IDs: {', '.join(missing)}.")
+        if errors:
+            return [], "Error: " + " ".join(errors)
+        return ids, None
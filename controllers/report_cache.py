@@ -0,0 +1,176 @@
+# controllers/report_cache.py
+import threading
+import time
+from collections import OrderedDict
+
+from config import REPORT_CACHE_CONFIG
+from db.connection import get_write_generation
+
+_MISSING = object() # Clave ausente de la caché (distinta de cualquier resultado, incluso uno vacío)
+
+
+class _PendingResult:
+    """Cálculo en curso de una clave: las peticiones concurrentes esperan su resultado en lugar de repetirlo."""
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+
+
+class ReportCache:
+    """
+    Resultados de reportes por filtros normalizados, con expulsión LRU y TTL.
+
+    Cada resultado se guarda junto con la generación de escritura de las
+    tablas de las que depende (db.connection.get_write_generation). Los
+    modelos incrementan esas generaciones al confirmar cambios, también en la
+    tabla compartida generaciones_escritura, así que un resultado se sirve de
+    memoria solo mientras ninguna de sus tablas haya cambiado, aunque el
+    cambio lo haga otro equipo contra la misma base de datos. Cada consulta a
+    la caché lee esa tabla una vez (una consulta por clave primaria). El TTL
+    acota el desfase cuando los datos cambian fuera de la aplicación (SQL
+    directo) o si la tabla no existe (migración 0006 sin aplicar).
+
+    Si varias peticiones piden a la vez una clave que no está, solo la
+    primera consulta la base de datos; las demás esperan su resultado.
+    """
+    def __init__(self, max_entries=None, ttl=None):
+        self.max_entries = REPORT_CACHE_CONFIG['max_entries'] if max_entries is None else max_entries
+        self.ttl = REPORT_CACHE_CONFIG['ttl'] if ttl is None else ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict() # {clave: (resultado, generación, instante_monotónico)}, del menos al más usado
+        self._pending = {} # {(clave, generación): _PendingResult}
+        self._counters = dict.fromkeys(('hits', 'misses', 'coalesced', 'stale', 'expired', 'evicted'), 0)
+
+    def get(self, key, tables, compute):
+        """
+        Retorna el resultado guardado para `key` o lo calcula con `compute()`.
+
+        Args:
+            key (hashable): Filtros normalizados (por ejemplo, el nombre del reporte y la tupla de filtros).
+            tables (tuple of str): Tablas de las que depende el resultado.
+            compute (callable): Calcula el resultado; uno None (error del modelo) no se guarda.
+
+        Returns:
+            El resultado, guardado o recién calculado.
+        """
+        generation = get_write_generation(*tables)
+        with self._lock:
+            value = self._lookup(key, generation)
+            if value is not _MISSING:
+                return value
+            pending = self._pending.get((key, generation))
+            owner = pending is None
+            if owner:
+                pending = self._pending[(key, generation)] = _PendingResult()
+                self._counters['misses'] += 1
+            else:
+                self._counters['coalesced'] += 1
+
+        if not owner:
+            pending.done.wait()
+            if pending.value is not None:
+                return pending.value
+            return compute() # El cálculo original falló: intentarlo de nuevo
+
+        try:
+            value = compute()
+            pending.value = value
+        finally:
+            # Se lee fuera del lock: consulta generaciones_escritura y no debe hacer esperar a las demás peticiones
+            current = get_write_generation(*tables) if pending.value is not None else None
+            with self._lock:
+                del self._pending[(key, generation)]
+                # Si hubo escrituras mientras se calculaba, el resultado puede no reflejarlas: no se guarda
+                if pending.value is not None and current == generation:
+                    self._store(key, pending.value, generation)
+            pending.done.set()
+        return value
+
+    def get_many(self, keys, tables, compute_missing):
+        """
+        Como get(), pero para varias claves a la vez: las que no están se calculan
+        juntas con una sola llamada a `compute_missing` (una consulta para todas).
+
+        A diferencia de get(), no agrupa peticiones concurrentes de las mismas claves.
+
+        Args:
+            keys (iterable): Claves buscadas (sin repetir).
+            tables (tuple of str): Tablas de las que dependen los resultados.
+            compute_missing (callable): Recibe la lista de claves que faltan y retorna
+                {clave: resultado}; None (error del modelo) no se guarda.
+
+        Returns:
+            dict or None: {clave: resultado} para cada clave, o None si compute_missing falló.
+        """
+        generation = get_write_generation(*tables)
+        values = {}
+        with self._lock:
+            for key in keys:
+                value = self._lookup(key, generation)
+                if value is _MISSING:
+                    self._counters['misses'] += 1
+                    values[key] = _MISSING
+                else:
+                    values[key] = value
+        missing = [key for key, value in values.items() if value is _MISSING]
+        if not missing:
+            return values
+
+        computed = compute_missing(missing)
+        if computed is None:
+            return None
+        values.update(computed)
+        # Igual que en get(): fuera del lock, y sin guardar si hubo escrituras durante el cálculo
+        if get_write_generation(*tables) == generation:
+            with self._lock:
+                for key in missing:
+                    if key in computed:
+                        self._store(key, computed[key], generation)
+        return values
+
+    def _lookup(self, key, generation):
+        """Resultado vigente de `key`, o _MISSING (descartándolo si quedó obsoleto). Se llama con el lock tomado."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        value, entry_generation, created = entry
+        if entry_generation != generation:
+            self._counters['stale'] += 1
+            del self._entries[key]
+        elif time.monotonic() - created >= self.ttl:
+            self._counters['expired'] += 1
+            del self._entries[key]
+        else:
+            self._counters['hits'] += 1
+            self._entries.move_to_end(key)
+            return value
+        return _MISSING
+
+    def _store(self, key, value, generation):
+        """Guarda un resultado y expulsa los menos usados si se supera max_entries. Se llama con el lock tomado."""
+        self._entries[key] = (value, generation, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters['evicted'] += 1
+
+    def invalidate(self):
+        """Descarta todos los resultados guardados."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Retorna los contadores de la caché.
+
+        Returns:
+            dict: hits (servidos de memoria), misses (calculados), coalesced (esperaron un
+                  cálculo en curso), stale (descartados por escrituras), expired (por TTL),
+                  evicted (por LRU), entries, max_entries, ttl y hit_rate (0-1).
+        """
+        with self._lock:
+            stats = dict(self._counters, entries=len(self._entries), max_entries=self.max_entries, ttl=self.ttl)
+        served = stats['hits'] + stats['coalesced']
+        requests = served + stats['misses']
+        stats['hit_rate'] = served / requests if requests else 0.0
+        return stats
@@ -1,23 +1,25 @@
 # controllers/report_controller.py
 from models.report_model import (
     get_filtered_projects_report,
-    get_filtered_participants_report
+    get_filtered_participants_report,
+    get_report_filter_references
 )
-
-# Importar modelos para validación de IDs.
-# NOTA: En un sistema más grande, podrías inyectar los controladores de Periodo, Sujeto, Participante
-#       en el ReportController para que este use sus métodos de validación, en lugar de importar los modelos directamente.
-#       Por ahora, usar los modelos directamente es más simple para este ejemplo.
-from models.period_model import get_period_by_id
-from models.subject_model import get_subject_by_id
-from models.participant_model import get_participant_by_id
 from mysql.connector import Error
+from controllers.report_cache import ReportCache
+import copy
+
+# Tablas que lee cada reporte: una escritura en cualquiera de ellas invalida sus resultados cacheados
+PROJECTS_REPORT_TABLES = ('proyectos', 'periodos', 'materias', 'proyectos_participantes', 'participantes')
+PARTICIPANTS_REPORT_TABLES = ('participantes', 'proyectos_participantes', 'proyectos', 'periodos')
 
 class ReportController:
     """
     Controlador para la generación de reportes del sistema.
     Coordina la obtención de datos para proyectos y participantes con filtros.
+    Los resultados se sirven de una caché compartida mientras no cambien las tablas que leen.
     """
+    _report_cache = ReportCache() # Compartida por todas las instancias
+
     def generate_projects_report(self, period_id=None, student_id=None, teacher_id=None, subject_id=None):
         """
         Genera un reporte de proyectos aplicando los filtros especificados.
@@ -33,50 +35,21 @@ class ReportController:
             tuple: (list of dict, str or None) - Una lista de proyectos si tiene éxito,
                    o una lista vacía y un mensaje de error en caso de fallo.
         """
-        # Validaciones de entrada para los filtros
-        if period_id is not None:
-            try:
-                period_id = int(period_id)
-                if not get_period_by_id(period_id):
-                    return [], f"Error: El ID de período '{period_id}' no existe."
-            except ValueError:
-                return [], "Error: El ID de período debe ser un número entero válido."
-        
-        if student_id is not None:
-            try:
-                student_id = int(student_id)
-                participant_data = get_participant_by_id(student_id)
-                if not participant_data:
-                    return [], f"Error: El ID de estudiante '{student_id}' no existe."
-                if participant_data['tipo_participante'] != 'Estudiante':
-                    return [], f"Error: El participante con ID '{student_id}' no es un estudiante."
-            except ValueError:
-                return [], "Error: El ID de estudiante debe ser un número entero válido."
-
-        if teacher_id is not None:
-            try:
-                teacher_id = int(teacher_id)
-                participant_data = get_participant_by_id(teacher_id)
-                if not participant_data:
-                    return [], f"Error: El ID de docente '{teacher_id}' no existe."
-                if participant_data['tipo_participante'] != 'Docente':
-                    return [], f"Error: El participante con ID '{teacher_id}' no es un docente."
-            except ValueError:
-                return [], "Error: El ID de docente debe ser un número entero válido."
-
-        if subject_id is not None:
-            try:
-                subject_id = int(subject_id)
-                if not get_subject_by_id(subject_id):
-                    return [], f"Error: El ID de materia '{subject_id}' no existe."
-            except ValueError:
-                return [], "Error: El ID de materia debe ser un número entero válido."
+        filters, error = self.validate_projects_report_filters(period_id, student_id, teacher_id, subject_id)
+        if error:
+            return [], error
+        period_id, student_id, teacher_id, subject_id = filters
 
         try:
-            projects = get_filtered_projects_report(period_id, student_id, teacher_id, subject_id)
+            projects = self._report_cache.get(
+                ('proyectos', filters), PROJECTS_REPORT_TABLES,
+                lambda: get_filtered_projects_report(period_id, student_id, teacher_id, subject_id))
+            if projects is None:
+                return [], "Error de base de datos al generar el reporte de proyectos. Verifique los logs del modelo."
             if not projects:
                 return [], "No se encontraron proyectos con los filtros aplicados."
-            return projects, None
+            # Copia profunda: ni la lista cacheada ni sus dicts (con sus listas de participantes) deben modificarse
+            return copy.deepcopy(projects), None
         except Error as e: # Captura errores específicos de MySQL si el modelo los propaga
             return [], f"Error de base de datos al generar el reporte de proyectos: {e}"
         except Exception as e:
@@ -95,25 +68,109 @@ class ReportController:
             tuple: (list of dict, str or None) - Una lista de participantes si tiene éxito,
                    o una lista vacía y un mensaje de error en caso de fallo.
         """
-        # Validaciones de entrada para los filtros
-        if period_id is not None:
-            try:
-                period_id = int(period_id)
-                if not get_period_by_id(period_id):
-                    return [], f"Error: El ID de período '{period_id}' no existe."
-            except ValueError:
-                return [], "Error: El ID de período debe ser un número entero válido."
+        filters, error = self.validate_participants_report_filters(period_id, participant_type)
+        if error:
+            return [], error
+        period_id, participant_type = filters
 
-        if participant_type is not None:
-            if participant_type not in ['Estudiante', 'Docente']:
-                return [], "Error: El tipo de participante debe ser 'Estudiante' o 'Docente'."
-        
         try:
-            participants = get_filtered_participants_report(period_id, participant_type)
+            participants = self._report_cache.get(
+                ('participantes', filters), PARTICIPANTS_REPORT_TABLES,
+                lambda: get_filtered_participants_report(period_id, participant_type))
+            if participants is None:
+                return [], "Error de base de datos al generar el reporte de participantes. Verifique los logs del modelo."
             if not participants:
                 return [], "No se encontraron participantes con los filtros aplicados."
-            return participants, None
+            return copy.deepcopy(participants), None
         except Error as e: # Captura errores específicos de MySQL si el modelo los propaga
             return [], f"Error de base de datos al generar el reporte de participantes: {e}"
         except Exception as e:
-            return [], f"Error inesperado al generar el reporte de participantes: {e}"
\ No newline at end of file
+            return [], f"Error inesperado al generar el reporte de participantes: {e}"
+
+    def get_report_cache_stats(self):
+        """
+        Obtiene los contadores de la caché de reportes (aciertos, fallos, expulsiones...).
+
+        Returns:
+            tuple: (dict, None) - Ver ReportCache.stats().
+        """
+        return self._report_cache.stats(), None
+
+    def validate_projects_report_filters(self, period_id=None, student_id=None, teacher_id=None, subject_id=None):
+        """
+        Valida los filtros del reporte de proyectos (también los usa la exportación).
+        La existencia de todos los IDs se comprueba en una sola consulta.
+
+        Returns:
+            tuple: (tuple or None, str or None)
+                   - (period_id, student_id, teacher_id, subject_id) convertidos a enteros.
+                   - Un mensaje de error si algún filtro no es válido o no existe.
+        """
+        period_id, error = self._parse_filter_id(period_id, "período")
+        if error:
+            return None, error
+        student_id, error = self._parse_filter_id(student_id, "estudiante")
+        if error:
+            return None, error
+        teacher_id, error = self._parse_filter_id(teacher_id, "docente")
+        if error:
+            return None, error
+        subject_id, error = self._parse_filter_id(subject_id, "materia")
+        if error:
+            return None, error
+
+        participant_ids = [pid for pid in (student_id, teacher_id) if pid is not None]
+        references = get_report_filter_references(period_id, participant_ids, subject_id)
+        if references is None:
+            return None, "Error de base de datos al validar los filtros del reporte. Verifique los logs del modelo."
+
+        if period_id is not None and not references['periodo']:
+            return None, f"Error: El ID de período '{period_id}' no existe."
+        for participant_id, label, expected_type in ((student_id, 'estudiante', 'Estudiante'),
+                                                     (teacher_id, 'docente', 'Docente')):
+            if participant_id is None:
+                continue
+            participant_type = references['participantes'].get(participant_id)
+            if participant_type is None:
+                return None, f"Error: El ID de {label} '{participant_id}' no existe."
+            if participant_type != expected_type:
+                return None, f"Error: El participante con ID '{participant_id}' no es un {label}."
+        if subject_id is not None and not references['materia']:
+            return None, f"Error: El ID de materia '{subject_id}' no existe."
+
+        return (period_id, student_id, teacher_id, subject_id), None
+
+    def validate_participants_report_filters(self, period_id=None, participant_type=None):
+        """
+        Valida los filtros del reporte de participantes (también los usa la exportación).
+
+        Returns:
+            tuple: (tuple or None, str or None)
+                   - (period_id, participant_type) validados.
+                   - Un mensaje de error si algún filtro no es válido o no existe.
+        """
+        if participant_type is not None:
+            if participant_type not in ['Estudiante', 'Docente']:
+                return None, "Error: El tipo de participante debe ser 'Estudiante' o 'Docente'."
+
+        period_id, error = self._parse_filter_id(period_id, "período")
+        if error:
+            return None, error
+        if period_id is not None:
+            references = get_report_filter_references(period_id=period_id)
+            if references is None:
+                return None, "Error de base de datos al validar los filtros del reporte. Verifique los logs del modelo."
+            if not references['periodo']:
+                return None, f"Error: El ID de período '{period_id}' no existe."
+
+        return (period_id, participant_type), None
+
+    @staticmethod
+    def _parse_filter_id(value, label):
+        """Convierte un ID de filtro a entero; retorna (ID o None, mensaje de error o None)."""
+        if value is None:
+            return None, None
+        try:
+            return int(value), None
+        except ValueError:
+            return None, f"Error: El ID de {label} debe ser un número entero válido."
@@ -0,0 +1,332 @@
+# controllers/search_index.py
+import heapq
+import re
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+
+from config import SEARCH_INDEX_CONFIG
+from db.connection import get_write_generation
+from models.participant_model import iter_participants
+
+TRIGRAM_SIZE = 3
+_WORD_RE = re.compile(r"[^\W_]+")
+
+def normalize_text(text):
+    """Texto en minúsculas y sin acentos ('Pérez' -> 'perez'), para comparar sin distinguirlos."""
+    if text is None:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', str(text))
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+def tokenize(text):
+    """Palabras normalizadas de un texto (secuencias de letras y dígitos)."""
+    return _WORD_RE.findall(normalize_text(text))
+
+def _trigrams(token):
+    return {token[i:i + TRIGRAM_SIZE] for i in range(len(token) - TRIGRAM_SIZE + 1)}
+
+def _prefixes(token):
+    return [token[:length] for length in range(1, min(len(token), TRIGRAM_SIZE - 1) + 1)]
+
+def _discard(mapping, entry, value):
+    values = mapping.get(entry)
+    if values is not None:
+        values.discard(value)
+        if not values:
+            del mapping[entry]
+
+
+class SearchIndex:
+    """
+    Índice en memoria para buscar registros por texto mientras se escribe.
+
+    Cada campo indexado se normaliza (minúsculas, sin acentos) y se divide en
+    palabras (letras y dígitos; 'ana.perez@uni.edu' da 'ana', 'perez', 'uni'
+    y 'edu'). Los mapas de prefijos y de trigramas se construyen sobre el
+    vocabulario (las palabras distintas), que es mucho menor que el número de
+    registros cuando los nombres se repiten; cada palabra apunta después a los
+    registros que la contienen en cada campo.
+
+    Las palabras de la búsqueda con menos de tres letras se buscan en el mapa
+    de prefijos; las demás, intersecando los conjuntos de sus trigramas y
+    confirmando con una comparación de subcadena. Así "ana" encuentra
+    "Mariana" y "per" encuentra "Pérez" sin recorrer todos los registros.
+
+    Todas las palabras de la búsqueda deben aparecer en algún campo. Los
+    resultados se ordenan por relevancia (palabra exacta > prefijo de palabra
+    > subcadena, multiplicado por el peso del campo) y después por `order`.
+
+    add/update/remove mantienen el índice al día sin reconstruirlo; son seguros
+    entre hilos.
+    """
+    EXACT_SCORE = 3
+    PREFIX_SCORE = 2
+    SUBSTRING_SCORE = 1
+
+    def __init__(self, key, fields, order=None):
+        """
+        Args:
+            key (callable): Extrae la clave única de un registro (por ejemplo su ID).
+            fields (dict): {nombre: (función que extrae el texto del registro, peso)}.
+            order (callable, optional): Clave de orden entre resultados con la misma relevancia.
+        """
+        self._key = key
+        self._fields = fields
+        self._order = order or key
+        self._lock = threading.RLock()
+        self._clear()
+
+    def _clear(self):
+        self._records = {} # {clave: registro}
+        self._order_keys = {} # {clave: order(registro)}, calculado al añadir
+        self._record_tokens = {} # {clave: [(campo, (palabras)), ...]}
+        self._postings = {field: defaultdict(set) for field in self._fields} # {campo: {palabra: {claves}}}
+        self._token_refs = defaultdict(int) # {palabra: apariciones en postings}
+        self._prefix_map = defaultdict(set) # {prefijo de 1-2 letras: {palabras}}
+        self._trigram_map = defaultdict(set) # {trigrama: {palabras}}
+
+    def __len__(self):
+        return len(self._records)
+
+    def build(self, records):
+        """Reemplaza el contenido del índice por `records`."""
+        with self._lock:
+            self._clear()
+            for record in records:
+                self._add(record)
+
+    def add(self, record):
+        """Añade un registro, o lo reemplaza si ya había uno con la misma clave."""
+        with self._lock:
+            self._add(record)
+
+    def update(self, record):
+        """Alias de add(): reemplaza el registro con la misma clave."""
+        self.add(record)
+
+    def remove(self, key):
+        """Quita el registro con esa clave, si está."""
+        with self._lock:
+            self._remove(key)
+
+    def get(self, key):
+        """Retorna el registro con esa clave, o None."""
+        return self._records.get(key)
+
+    def search(self, query, limit=20, predicate=None):
+        """
+        Busca registros que contengan todas las palabras de `query`.
+
+        Args:
+            query (str): Texto de búsqueda.
+            limit (int or None): Cantidad máxima de resultados; None para todos.
+            predicate (callable, optional): Filtro adicional sobre el registro (por ejemplo, por tipo).
+
+        Returns:
+            list of dict: Los registros, de más a menos relevante (lista vacía si la búsqueda no tiene palabras).
+        """
+        terms = sorted(set(tokenize(query)), key=len, reverse=True) # Las más largas filtran más
+        if not terms:
+            return []
+        with self._lock:
+            scores = None
+            for term in terms:
+                term_scores = self._term_scores(term, restrict_to=scores)
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {key: score + term_scores[key] for key, score in scores.items() if key in term_scores}
+                if not scores:
+                    return []
+
+            if predicate is not None:
+                scores = {key: score for key, score in scores.items() if predicate(self._records[key])}
+            order_keys = self._order_keys
+            sort_key = lambda item: (-item[1], order_keys[item[0]])
+            if limit is None:
+                ranked = sorted(scores.items(), key=sort_key)
+            else:
+                ranked = heapq.nsmallest(limit, scores.items(), key=sort_key)
+            return [self._records[key] for key, _ in ranked]
+
+    def _term_scores(self, term, restrict_to=None):
+        """{clave: mejor puntuación de `term` en el registro}, opcionalmente solo para las claves de restrict_to."""
+        matching = self._matching_tokens(term)
+        if restrict_to is not None and len(restrict_to) < len(matching):
+            # Pocos candidatos y muchas palabras (por ejemplo, "100" en miles de cédulas):
+            # es más rápido revisar las palabras de cada candidato que recorrer los postings
+            return self._scores_for_keys(term, set(matching), restrict_to)
+        term_scores = {}
+        for token in matching:
+            base = self._token_score(term, token)
+            for field, (_, weight) in self._fields.items():
+                keys = self._postings[field].get(token)
+                if not keys:
+                    continue
+                if restrict_to is not None and len(restrict_to) < len(keys):
+                    keys = [key for key in restrict_to if key in keys]
+                score = base * weight
+                for key in keys:
+                    if term_scores.get(key, 0) < score:
+                        term_scores[key] = score
+        return term_scores
+
+    def _scores_for_keys(self, term, matching, keys):
+        term_scores = {}
+        for key in keys:
+            best = 0
+            for field, tokens in self._record_tokens[key]:
+                weight = self._fields[field][1]
+                for token in tokens:
+                    if token in matching:
+                        best = max(best, self._token_score(term, token) * weight)
+            if best:
+                term_scores[key] = best
+        return term_scores
+
+    def _token_score(self, term, token):
+        if token == term:
+            return self.EXACT_SCORE
+        if token.startswith(term):
+            return self.PREFIX_SCORE
+        return self.SUBSTRING_SCORE
+
+    def _matching_tokens(self, term):
+        """Palabras del vocabulario que empiezan por `term` (si es corto) o que lo contienen."""
+        if len(term) < TRIGRAM_SIZE:
+            return self._prefix_map.get(term, ())
+        sets = sorted((self._trigram_map.get(trigram, set()) for trigram in _trigrams(term)), key=len)
+        if not sets[0]:
+            return ()
+        candidates = set(sets[0])
+        for tokens in sets[1:]:
+            candidates &= tokens
+            if not candidates:
+                return ()
+        return [token for token in candidates if term in token]
+
+    def _add(self, record):
+        key = self._key(record)
+        if key in self._records:
+            self._remove(key)
+        self._records[key] = record
+        self._order_keys[key] = self._order(record)
+        record_tokens = []
+        for field, (extract, _) in self._fields.items():
+            tokens = set(tokenize(extract(record)))
+            if not tokens:
+                continue
+            record_tokens.append((field, tuple(tokens)))
+            postings = self._postings[field]
+            for token in tokens:
+                postings[token].add(key)
+                self._token_refs[token] += 1
+                if self._token_refs[token] == 1: # Palabra nueva en el vocabulario
+                    for prefix in _prefixes(token):
+                        self._prefix_map[prefix].add(token)
+                    for trigram in _trigrams(token):
+                        self._trigram_map[trigram].add(token)
+        self._record_tokens[key] = record_tokens
+
+    def _remove(self, key):
+        if self._records.pop(key, None) is None:
+            return
+        del self._order_keys[key]
+        for field, tokens in self._record_tokens.pop(key):
+            postings = self._postings[field]
+            for token in tokens:
+                _discard(postings, token, key)
+                self._token_refs[token] -= 1
+                if not self._token_refs[token]: # Ningún registro la usa ya
+                    del self._token_refs[token]
+                    for prefix in _prefixes(token):
+                        _discard(self._prefix_map, prefix, token)
+                    for trigram in _trigrams(token):
+                        _discard(self._trigram_map, trigram, token)
+
+
+class ParticipantSearchIndex(SearchIndex):
+    """
+    Índice de participantes por nombre, apellido, cédula y correo electrónico.
+
+    Se construye la primera vez que se consulta, leyendo los participantes del
+    modelo en streaming (iter_participants). ParticipantController lo mantiene
+    al día al crear, modificar o eliminar; las altas masivas lo invalidan y se
+    reconstruye en la siguiente búsqueda.
+
+    Antes de cada búsqueda se compara la generación de escritura de
+    'participantes' (db.connection.get_write_generation, igual que
+    ReportCache) con la de la construcción: si avanzó más que los cambios que
+    este proceso ya aplicó al índice, alguien más (otro equipo contra la misma
+    base de datos) modificó participantes y el índice se reconstruye. Pasado
+    el TTL se reconstruye siempre.
+    """
+    TABLE = 'participantes'
+
+    def __init__(self, ttl=None):
+        """
+        Args:
+            ttl (float, optional): Segundos de vida del índice; por defecto SEARCH_INDEX_CONFIG['ttl'].
+        """
+        super().__init__(
+            key=lambda p: p['id_participante'],
+            fields={
+                'nombre': (lambda p: f"{p['nombre']} {p['apellido']}", 2),
+                'cedula': (lambda p: p['cedula'], 2),
+                'correo_electronico': (lambda p: p['correo_electronico'], 1),
+            },
+            order=lambda p: (normalize_text(p['apellido']), normalize_text(p['nombre']), p['id_participante'])
+        )
+        self.ttl = SEARCH_INDEX_CONFIG['ttl'] if ttl is None else ttl
+        self._built = False
+        self._built_at = None # Instante monotónico de la construcción
+        self._built_generation = None # (local, compartida) de TABLE al construir
+        self._applied_writes = 0 # Cambios de este proceso aplicados al índice desde la construcción
+
+    def _is_current(self):
+        """True si el índice está construido y nadie más cambió participantes desde entonces."""
+        if not self._built or time.monotonic() - self._built_at >= self.ttl:
+            return False
+        (local, shared), = get_write_generation(self.TABLE)
+        built_local, built_shared = self._built_generation
+        if local - built_local != self._applied_writes:
+            return False
+        # Si la tabla compartida no se pudo leer, basta con las escrituras de este proceso y el TTL
+        return shared is None or built_shared is None or shared - built_shared == self._applied_writes
+
+    def ensure_built(self):
+        """Construye el índice desde la base de datos si no está construido, se invalidó o quedó desactualizado."""
+        with self._lock:
+            if self._is_current():
+                return
+            # La generación se lee antes que los datos: un cambio durante la lectura provoca otra reconstrucción
+            (generation,) = get_write_generation(self.TABLE)
+            self.build(participant for batch in iter_participants() for participant in batch)
+            self._built = True
+            self._built_at = time.monotonic()
+            self._built_generation = generation
+            self._applied_writes = 0
+
+    def add(self, record):
+        with self._lock:
+            if self._built: # Si no está construido, la construcción ya lo incluirá
+                self._add(record)
+                self._applied_writes += 1
+
+    def remove(self, key):
+        with self._lock:
+            if self._built:
+                self._remove(key)
+                self._applied_writes += 1
+
+    def invalidate(self):
+        """Descarta el contenido; se reconstruye en la próxima búsqueda."""
+        with self._lock:
+            self._built = False
+            self._clear()
+
+    def search(self, query, limit=20, predicate=None):
+        self.ensure_built()
+        return super().search(query, limit, predicate)
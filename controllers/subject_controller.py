@@ -3,11 +3,13 @@ from models.subject_model import (
     create_subject,
     get_subject_by_id,
     get_subject_by_code,
+    get_subject_by_name,
     get_all_subjects,
     update_subject,
     delete_subject
 )
 from mysql.connector import Error # Para capturar errores específicos de la base de datos
+from db.errors import duplicate_key
 
 class SubjectController:
     """
@@ -38,13 +40,9 @@ class SubjectController:
         if get_subject_by_code(codigo_materia):
             return None, f"Error: Ya existe una materia con el código '{codigo_materia}'."
         
-        # Validar unicidad del nombre de materia (asumiendo que get_all_subjects puede ayudar)
-        # Nota: Idealmente, tendrías get_subject_by_name en el modelo para una búsqueda eficiente.
-        # Por ahora, simulamos buscando en todos los nombres.
-        all_subjects, _ = self.get_all_system_subjects()
-        for sub in all_subjects:
-            if sub['nombre_materia'].lower() == nombre_materia.lower():
-                return None, f"Error: Ya existe una materia con el nombre '{nombre_materia}'."
+        # Validar unicidad del nombre de materia
+        if get_subject_by_name(nombre_materia):
+            return None, f"Error: Ya existe una materia con el nombre '{nombre_materia}'."
 
         try:
             subject_id = create_subject(codigo_materia, nombre_materia, creditos)
@@ -54,6 +52,11 @@ class SubjectController:
                 return None, "Error desconocido al crear la materia. Verifique los logs del modelo."
         except Error as e:
             if "1062" in str(e): # Duplicate entry for unique key (could be code or name if unique)
+                key = duplicate_key(e)
+                if key == 'codigo_materia':
+                    return None, f"Error: Ya existe una materia con el código '{codigo_materia}'."
+                if key == 'nombre_materia':
+                    return None, f"Error: Ya existe una materia con el nombre '{nombre_materia}'."
                 return None, f"Error de duplicidad: El código o nombre de la materia ya existen."
             return None, f"Error de base de datos al crear materia: {e}"
         except Exception as e:
@@ -132,10 +135,9 @@ class SubjectController:
         if 'nombre_materia' in kwargs and kwargs['nombre_materia'] is not None:
             new_name = kwargs['nombre_materia']
             if new_name.lower() != current_subject['nombre_materia'].lower(): # Solo verificar si el nombre cambió
-                all_subjects, _ = self.get_all_system_subjects()
-                for sub in all_subjects:
-                    if sub['nombre_materia'].lower() == new_name.lower() and sub['id_materia'] != subject_id:
-                        return False, f"Error: El nombre de materia '{new_name}' ya está en uso por otra materia."
+                existing_subject_by_name = get_subject_by_name(new_name)
+                if existing_subject_by_name and existing_subject_by_name['id_materia'] != subject_id:
+                    return False, f"Error: El nombre de materia '{new_name}' ya está en uso por otra materia."
 
         if 'creditos' in kwargs and kwargs['creditos'] is not None:
             if not isinstance(kwargs['creditos'], int):
@@ -149,6 +151,11 @@ class SubjectController:
                 return False, "No se pudo actualizar la materia. Puede que no exista o no hubo cambios."
         except Error as e:
             if "1062" in str(e): # Duplicate entry for unique key
+                key = duplicate_key(e)
+                if key == 'codigo_materia':
+                    return False, f"Error: El código de materia '{kwargs.get('codigo_materia')}' ya está en uso por otra materia."
+                if key == 'nombre_materia':
+                    return False, f"Error: El nombre de materia '{kwargs.get('nombre_materia')}' ya está en uso por otra materia."
                 return False, f"Error de duplicidad al actualizar: El código o nombre de la materia ya existen."
             return False, f"Error de base de datos al actualizar materia {subject_id}: {e}"
         except Exception as e:
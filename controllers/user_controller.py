@@ -1,11 +1,13 @@
 # controllers/user_controller.py
 import hashlib # No es estrictamente necesario aquí si el hashing está en el modelo, pero se mantiene si se necesita para algo más.
 from mysql.connector import Error # Importar Error para manejo específico
+from db.errors import duplicate_key
+from controllers.pagination import CountCache, validate_page_args
 
 # Importar todas las funciones CRUD y de hashing/verificación desde user_model.py
 from models.user_model import (
-    create_user, get_user_by_username, get_user_by_id,
-    get_all_users, update_user, delete_user,
+    create_user, get_user_by_username, get_user_by_email, get_user_by_id,
+    get_all_users, get_users_page, count_users, update_user, delete_user,
     hash_password, verify_password # Importar las funciones de hashing y verificación
 )
 
@@ -15,6 +17,7 @@ class UserController:
     Centraliza la lógica de negocio relacionada con la autenticación y la administración de usuarios.
     """
     _logged_in_user = None # Variable de clase para el usuario actualmente logueado
+    _count_cache = CountCache() # Totales compartidos por todas las instancias
 
     def get_logged_in_user(self):
         """Retorna los datos del usuario actualmente logueado."""
@@ -82,22 +85,26 @@ class UserController:
             return None, f"El nombre de usuario '{username}' ya está en uso."
         
         # Verificar si el correo electrónico ya existe (si se proporciona)
-        if email:
-            all_users = get_all_users() # Obtener todos los usuarios para buscar si el email ya está registrado
-            for u in all_users:
-                if u['correo_electronico'] == email: # Asumiendo que 'correo_electronico' es la clave
-                    return None, f"El correo electrónico '{email}' ya está registrado."
+        if email and get_user_by_email(email):
+            return None, f"El correo electrónico '{email}' ya está registrado."
 
         try:
             # Llamar a create_user del modelo. El modelo se encarga del hashing.
             user_id = create_user(username, password, role, full_name, email)
             if user_id:
+                self._count_cache.invalidate()
                 return user_id, None
             else:
                 return None, "Error desconocido al registrar el usuario. Verifique los logs del modelo."
         except Error as e:
             # Captura errores específicos de MySQL (ej. 1062 para duplicados)
             if "1062" in str(e): 
+                # Otro registro ganó la carrera entre la verificación y el INSERT
+                key = duplicate_key(e)
+                if key == 'nombre_usuario':
+                    return None, f"El nombre de usuario '{username}' ya está en uso."
+                if key == 'correo_electronico':
+                    return None, f"El correo electrónico '{email}' ya está registrado."
                 return None, "Error de duplicidad. El usuario o correo ya existen."
             return None, f"Error de base de datos al registrar el usuario: {e}"
         except Exception as e:
@@ -118,6 +125,51 @@ class UserController:
         except Exception as e:
             return [], f"Error al obtener todos los usuarios: {e}"
 
+    def get_users_page(self, after_id=None, page_size=None, role=None):
+        """
+        Obtiene una página de usuarios ordenada por ID, para listas que cargan a medida que se desplazan.
+
+        Args:
+            after_id (int, optional): ID del último usuario de la página anterior. None para la primera página.
+            page_size (int, optional): Filas por página. Por defecto PAGINATION_CONFIG['page_size'].
+            role (str, optional): Rol por el que filtrar.
+
+        Returns:
+            tuple: (list of dict, str or None)
+                   - Los usuarios de la página; menos de page_size indica que es la última.
+                   - Un mensaje de error si falla.
+        """
+        after_id, page_size, error_msg = validate_page_args(after_id, page_size)
+        if error_msg:
+            return [], error_msg
+        if role and role not in ['Administrador', 'Coordinador', 'Profesor']:
+            return [], "Rol inválido. Los roles permitidos son: Administrador, Coordinador, Profesor."
+        try:
+            return get_users_page(after_id, page_size, role), None
+        except Exception as e:
+            return [], f"Error al obtener la página de usuarios: {e}"
+
+    def count_system_users(self, role=None):
+        """
+        Cuenta los usuarios (total que acompaña a las listas paginadas).
+        El resultado se reutiliza durante PAGINATION_CONFIG['count_cache_ttl'] segundos.
+
+        Args:
+            role (str, optional): Rol por el que filtrar.
+
+        Returns:
+            tuple: (int, str or None)
+                   - El total de usuarios.
+                   - Un mensaje de error si falla.
+        """
+        try:
+            total = self._count_cache.get(role, lambda: count_users(role))
+            if total is None:
+                return 0, "Error al contar los usuarios. Verifique los logs del modelo."
+            return total, None
+        except Exception as e:
+            return 0, f"Error al contar los usuarios: {e}"
+
     def get_single_user_by_id(self, user_id):
         """
         Obtiene un usuario por su ID.
@@ -182,10 +234,9 @@ class UserController:
                 return False, f"El nombre de usuario '{username}' ya está en uso por otro usuario."
         
         if email and email != current_user['correo_electronico']: # Usar 'correo_electronico' según tu modelo
-            all_users, _ = self.get_all_system_users()
-            for u in all_users:
-                if u['correo_electronico'] == email and u['id_usuario'] != user_id:
-                    return False, f"El correo electrónico '{email}' ya está registrado por otro usuario."
+            existing_user_by_email = get_user_by_email(email)
+            if existing_user_by_email and existing_user_by_email['id_usuario'] != user_id:
+                return False, f"El correo electrónico '{email}' ya está registrado por otro usuario."
 
         # Preparar los argumentos para la función update_user del modelo
         update_kwargs = {}
@@ -205,6 +256,7 @@ class UserController:
         try:
             success = update_user(user_id, **update_kwargs)
             if success:
+                self._count_cache.invalidate() # Puede haber cambiado el rol
                 # Si el usuario logueado es el que se actualizó, refrescar sus datos
                 if UserController._logged_in_user and UserController._logged_in_user['id_usuario'] == user_id:
                     UserController._logged_in_user = get_user_by_id(user_id)[0] # get_user_by_id retorna (user, error_msg)
@@ -213,6 +265,11 @@ class UserController:
                 return False, "No se pudo actualizar el usuario. Puede que no exista o no hubo cambios."
         except Error as e:
             if "1062" in str(e):
+                key = duplicate_key(e)
+                if key == 'nombre_usuario':
+                    return False, f"El nombre de usuario '{username}' ya está en uso por otro usuario."
+                if key == 'correo_electronico':
+                    return False, f"El correo electrónico '{email}' ya está registrado por otro usuario."
                 return False, "Error de duplicidad al actualizar: el nombre de usuario o correo ya existen."
             return False, f"Error de base de datos al actualizar usuario: {e}"
         except Exception as e:
@@ -239,6 +296,7 @@ class UserController:
         try:
             success = delete_user(user_id)
             if success:
+                self._count_cache.invalidate()
                 return True, None
             else:
                 return False, f"No se encontró un usuario con ID {user_id} para eliminar."
@@ -1,40 +1,779 @@
+import atexit
+import logging
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+from functools import lru_cache
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
 import mysql.connector
 from mysql.connector import Error
-from config import DB_CONFIG
+from mysql.connector.errors import PoolError
+from config import DB_BACKEND, DB_CONFIG, DB_POOL_CONFIG, SQLITE_CONFIG, QUERY_STATS_CONFIG
+from db import sqlite_backend
 
 """ DB_CONFIG = {
-    'host': 'localhost', 
+    'host': 'localhost',
     'database': 'gestor_expoferias',
     'user': 'root',
-    'password': 'admin'       
+    'password': 'admin'
 } """
 
-def create_connection():
-    connection = None
+
+# Filas por lote en las lecturas en streaming (iter_query y las funciones iter_* de los modelos)
+STREAM_BATCH_SIZE = 500
+
+_STRING_LITERAL_RE = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER_LITERAL_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_RE = re.compile(r"%s|%\(\w+\)s")
+_IN_LIST_RE = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+
+@lru_cache(maxsize=1024)
+def normalize_statement(statement):
+    """
+    Texto canónico de una sentencia, para agrupar sus ejecuciones: sin literales,
+    comentarios ni espacios repetidos, y con las listas IN (?, ?, ...) colapsadas.
+    """
+    text = _STRING_LITERAL_RE.sub('?', statement)
+    text = re.sub(r"--[^\n]*", "", text)
+    text = _PLACEHOLDER_RE.sub('?', text)
+    text = _NUMBER_LITERAL_RE.sub('?', text)
+    text = ' '.join(text.split())
+    return _IN_LIST_RE.sub('IN (...)', text)
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+def _find_caller():
+    """
+    Función que originó la consulta: la primera de un modelo en la pila; si no
+    hay, la primera de un controlador; si tampoco, la primera fuera de este módulo.
+    """
+    frame = sys._getframe(2)
+    controller = other = None
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        if module.startswith('models.'):
+            return f"{module}.{frame.f_code.co_name}"
+        if controller is None and module.startswith('controllers.'):
+            controller = f"{module}.{frame.f_code.co_name}"
+        elif other is None and module != __name__:
+            other = f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return controller or other or '?'
+
+
+class QueryStats:
+    """
+    Estadísticas en memoria de las sentencias ejecutadas, agrupadas por texto normalizado.
+    Guarda las últimas `window` duraciones de cada sentencia para calcular percentiles móviles.
+    """
+    def __init__(self, window=500):
+        self.window = window
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Descarta todas las muestras acumuladas."""
+        with self._lock:
+            self._statements = {}
+            self._recent = deque(maxlen=self.window * 10) # Duraciones recientes de todas las sentencias
+            self._slow_count = 0
+            self._since = datetime.now()
+
+    def record(self, statement, duration_ms, rows, caller, slow=False):
+        with self._lock:
+            entry = self._statements.get(statement)
+            if entry is None:
+                entry = self._statements[statement] = {
+                    'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'rows': 0,
+                    'samples': deque(maxlen=self.window), 'callers': Counter(),
+                }
+            entry['count'] += 1
+            entry['total_ms'] += duration_ms
+            entry['max_ms'] = max(entry['max_ms'], duration_ms)
+            entry['rows'] += rows
+            entry['samples'].append(duration_ms)
+            entry['callers'][caller] += 1
+            self._recent.append(duration_ms)
+            if slow:
+                self._slow_count += 1
+
+    def add_rows(self, statement, rows):
+        """Suma filas leídas después de execute() (cursores sin buffer)."""
+        with self._lock:
+            entry = self._statements.get(statement)
+            if entry is not None:
+                entry['rows'] += rows
+
+    def snapshot(self):
+        """
+        Retorna una copia de las estadísticas.
+
+        Returns:
+            dict: Totales ('count', 'total_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'slow_count', 'since')
+                  y 'statements': lista de diccionarios por sentencia ordenada por tiempo total.
+        """
+        with self._lock:
+            recent = sorted(self._recent)
+            statements = []
+            for statement, entry in self._statements.items():
+                samples = sorted(entry['samples'])
+                statements.append({
+                    'statement': statement,
+                    'count': entry['count'],
+                    'total_ms': entry['total_ms'],
+                    'avg_ms': entry['total_ms'] / entry['count'],
+                    'p50_ms': _percentile(samples, 50),
+                    'p95_ms': _percentile(samples, 95),
+                    'p99_ms': _percentile(samples, 99),
+                    'max_ms': entry['max_ms'],
+                    'rows': entry['rows'],
+                    'callers': dict(entry['callers'].most_common()),
+                })
+            data = {
+                'since': self._since,
+                'count': sum(s['count'] for s in statements),
+                'total_ms': sum(s['total_ms'] for s in statements),
+                'p50_ms': _percentile(recent, 50),
+                'p95_ms': _percentile(recent, 95),
+                'p99_ms': _percentile(recent, 99),
+                'slow_count': self._slow_count,
+            }
+        data['statements'] = sorted(statements, key=lambda s: s['total_ms'], reverse=True)
+        return data
+
+
+_query_stats = QueryStats(QUERY_STATS_CONFIG['window'])
+_slow_logger = None
+
+def _get_slow_logger():
+    global _slow_logger
+    if _slow_logger is None:
+        logger = logging.getLogger('gestor_expoferias.slow_queries')
+        if not logger.handlers:
+            log_path = Path(QUERY_STATS_CONFIG['slow_log_path'])
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            handler = RotatingFileHandler(log_path, maxBytes=2 * 1024 * 1024, backupCount=3, encoding='utf-8')
+            handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+        _slow_logger = logger
+    return _slow_logger
+
+
+class InstrumentedCursor:
+    """
+    Envoltorio de un cursor que mide cada execute()/executemany(): texto normalizado,
+    duración, filas y función del modelo que lo llamó. Las sentencias más lentas que
+    QUERY_STATS_CONFIG['slow_query_ms'] se escriben en el log de consultas lentas.
+
+    En los cursores sin buffer, la duración cubre la ejecución en el servidor hasta
+    la primera fila; las filas se van sumando a medida que se leen con fetch*().
+    """
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._statement = None
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def _measure(self, method, operation, args, kwargs):
+        start = time.perf_counter()
+        try:
+            return method(operation, *args, **kwargs)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            self._statement = normalize_statement(operation)
+            # Con filas pendientes de leer se cuentan en fetch*(); si no, son las afectadas
+            rows = 0 if getattr(self._cursor, 'with_rows', False) else max(self._cursor.rowcount or 0, 0)
+            caller = _find_caller()
+            slow = duration_ms >= QUERY_STATS_CONFIG['slow_query_ms']
+            _query_stats.record(self._statement, duration_ms, rows, caller, slow)
+            if slow:
+                _get_slow_logger().info(f"{duration_ms:.1f} ms | {rows} filas | {caller} | {self._statement}")
+
+    def execute(self, operation, *args, **kwargs):
+        return self._measure(self._cursor.execute, operation, args, kwargs)
+
+    def executemany(self, operation, *args, **kwargs):
+        return self._measure(self._cursor.executemany, operation, args, kwargs)
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            _query_stats.add_rows(self._statement, 1)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        _query_stats.add_rows(self._statement, len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        _query_stats.add_rows(self._statement, len(rows))
+        return rows
+
+
+class PooledConnection:
+    """
+    Envoltorio de una conexión física prestada por el pool.
+    Delega todo en la conexión real, pero close() la devuelve al pool
+    en lugar de cerrar el socket.
+    """
+    def __init__(self, pool, raw_connection):
+        self._pool = pool
+        self._raw = raw_connection
+
+    def __getattr__(self, name):
+        raw = self.__dict__.get('_raw')
+        if raw is None:
+            raise Error("La conexión ya fue devuelta al pool.")
+        return getattr(raw, name)
+
+    def cursor(self, *args, **kwargs):
+        """Crea un cursor en la conexión real, instrumentado si QUERY_STATS_CONFIG lo indica."""
+        cursor = self.__getattr__('cursor')(*args, **kwargs)
+        return InstrumentedCursor(cursor) if QUERY_STATS_CONFIG['enabled'] else cursor
+
+    def close(self):
+        """Devuelve la conexión física al pool."""
+        if self._raw is not None:
+            raw, self._raw = self._raw, None
+            self._pool.release(raw)
+
+
+class ConnectionPool:
+    """
+    Pool de conexiones reutilizables.
+
+    Mantiene hasta `size` conexiones abiertas. Si todas están prestadas,
+    get_connection() espera hasta `timeout` segundos a que se libere una.
+    Las conexiones que llevan más de `ping_interval` segundos inactivas se
+    verifican con un ping antes de entregarse (pre-ping) y se reemplazan si
+    el servidor las cerró.
+    """
+    def __init__(self, connect, size=5, timeout=10, pre_ping=True, ping_interval=30):
+        self._connect = connect
+        self.size = size
+        self.timeout = timeout
+        self.pre_ping = pre_ping
+        self.ping_interval = ping_interval
+
+        self._idle = [] # Pila (LIFO) de tuplas (conexión, instante de devolución)
+        self._open = 0
+        self._condition = threading.Condition()
+        self._stats = {
+            'checkouts': 0,   # Conexiones entregadas
+            'waits': 0,       # Entregas que tuvieron que esperar por un pool lleno
+            'handshakes': 0,  # Conexiones físicas nuevas (TCP + autenticación)
+            'reconnects': 0,  # Conexiones reemplazadas tras fallar el pre-ping
+            'timeouts': 0,    # Esperas que superaron el timeout
+        }
+
+    def get_connection(self):
+        """
+        Obtiene una conexión del pool.
+
+        Returns:
+            PooledConnection: Conexión prestada; se devuelve con close().
+
+        Raises:
+            PoolError: Si no se libera ninguna conexión dentro del timeout.
+            Error: Si falla la conexión con la base de datos.
+        """
+        deadline = time.monotonic() + self.timeout
+        raw, last_used = None, None
+        with self._condition:
+            self._stats['checkouts'] += 1
+            waited = False
+            while True:
+                if self._idle:
+                    raw, last_used = self._idle.pop()
+                    break
+                if self._open < self.size:
+                    self._open += 1 # Reservar el cupo; la conexión se abre fuera del lock
+                    break
+                if not waited:
+                    self._stats['waits'] += 1
+                    waited = True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise PoolError(f"No hay conexiones disponibles tras esperar {self.timeout} segundos (pool de {self.size}).")
+                self._condition.wait(remaining)
+
+        try:
+            if raw is None:
+                raw = self._handshake()
+            elif self.pre_ping and time.monotonic() - last_used >= self.ping_interval:
+                raw = self._ping_or_replace(raw)
+        except Exception:
+            self._discard()
+            raise
+        return PooledConnection(self, raw)
+
+    def release(self, raw):
+        """
+        Devuelve una conexión física al pool, descartando resultados pendientes
+        y revirtiendo cualquier transacción que haya quedado abierta.
+        """
+        try:
+            if raw.unread_result:
+                raw.consume_results()
+            if raw.in_transaction:
+                raw.rollback()
+        except Error:
+            self._close_quietly(raw)
+            self._discard()
+            return
+        with self._condition:
+            self._idle.append((raw, time.monotonic()))
+            self._condition.notify()
+
+    def close_all(self):
+        """Cierra todas las conexiones inactivas del pool."""
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+        for raw, _ in idle:
+            self._close_quietly(raw)
+
+    def stats(self):
+        """Retorna un diccionario con los contadores y el estado actual del pool."""
+        with self._condition:
+            data = dict(self._stats)
+            data.update(size=self.size, open=self._open, idle=len(self._idle),
+                        in_use=self._open - len(self._idle))
+        return data
+
+    def _handshake(self):
+        raw = self._connect()
+        with self._condition:
+            self._stats['handshakes'] += 1
+        return raw
+
+    def _ping_or_replace(self, raw):
+        try:
+            raw.ping(reconnect=False)
+            return raw
+        except Error:
+            self._close_quietly(raw)
+            with self._condition:
+                self._stats['reconnects'] += 1
+            return self._handshake()
+
+    def _discard(self):
+        with self._condition:
+            self._open -= 1
+            self._condition.notify()
+
+    @staticmethod
+    def _close_quietly(raw):
+        try:
+            raw.close()
+        except Error:
+            pass
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _connect_mysql():
+    connection = mysql.connector.connect(**DB_CONFIG)
+    print(f"Conexión exitosa a la base de datos '{DB_CONFIG['database']}'")
+    return connection
+
+_sqlite_migrated = False
+_sqlite_auto_migrate = True
+_sqlite_migration_lock = threading.Lock()
+
+def set_sqlite_auto_migrate(enabled):
+    """
+    Activa o desactiva la migración automática de SQLite al abrir la primera conexión.
+
+    `python -m db.migrations` la desactiva para aplicar (e informar) las
+    migraciones por sí mismo. Debe llamarse antes de la primera conexión.
+    """
+    global _sqlite_auto_migrate
+    _sqlite_auto_migrate = enabled
+
+def _connect_sqlite():
+    global _sqlite_migrated
+    connection = sqlite_backend.connect(**SQLITE_CONFIG)
+    if _sqlite_auto_migrate and not _sqlite_migrated:
+        # Un archivo local no tiene un paso de instalación aparte: se migra al abrirlo
+        from db.migrations import apply_migrations
+        with _sqlite_migration_lock:
+            if not _sqlite_migrated:
+                _, error = apply_migrations(conn=connection)
+                if error:
+                    # Sin marcarlo como migrado: la próxima conexión vuelve a intentarlo
+                    connection.close()
+                    raise Error(error)
+                connection.commit() # Unida a esta conexión, la migración no confirma por sí misma
+                _sqlite_migrated = True
+    return connection
+
+# Funciones que abren una conexión física según el motor configurado en DB_BACKEND
+BACKENDS = {
+    'mysql': _connect_mysql,
+    'sqlite': _connect_sqlite,
+}
+
+def get_backend_name(connection=None):
+    """
+    Retorna el nombre del motor de base de datos ('mysql' o 'sqlite').
+
+    Args:
+        connection (optional): Si se indica, se determina el motor de esa conexión
+            (atravesando los envoltorios del pool y de la unidad de trabajo).
+            Si es None, retorna el motor configurado en DB_BACKEND.
+    """
+    if connection is None:
+        return DB_BACKEND
+    raw = get_raw_connection(connection)
+    return 'sqlite' if isinstance(raw, sqlite_backend.SQLiteConnection) else 'mysql'
+
+def get_raw_connection(connection):
+    """
+    Retorna la conexión física (MySQLConnection o SQLiteConnection) detrás de los
+    envoltorios del pool (PooledConnection) y de la unidad de trabajo (JoinedConnection).
+    """
+    if isinstance(connection, UnitOfWork):
+        connection = connection.connection
+    while not isinstance(connection, sqlite_backend.SQLiteConnection) and '_raw' in getattr(connection, '__dict__', {}):
+        connection = connection.__dict__['_raw']
+    return connection
+
+def get_pool():
+    """Retorna el pool de conexiones de la aplicación, creándolo si aún no existe."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                if DB_BACKEND not in BACKENDS:
+                    raise Error(f"Motor de base de datos desconocido: '{DB_BACKEND}'. Opciones: {', '.join(BACKENDS)}.")
+                _pool = ConnectionPool(BACKENDS[DB_BACKEND], **DB_POOL_CONFIG)
+                atexit.register(_pool.close_all)
+    return _pool
+
+def get_pool_stats():
+    """Retorna los contadores del pool (entregas, esperas, handshakes, etc.)."""
+    return get_pool().stats()
+
+def get_query_stats():
+    """
+    Retorna las estadísticas de las sentencias ejecutadas desde el inicio (o desde reset_query_stats()).
+
+    Returns:
+        dict: Totales y percentiles globales, y en 'statements' una entrada por
+              sentencia normalizada (ejecuciones, p50/p95/p99, filas, funciones que la llaman).
+    """
+    return _query_stats.snapshot()
+
+def reset_query_stats():
+    """Descarta las estadísticas de consultas acumuladas."""
+    _query_stats.reset()
+
+def format_query_stats(limit=20):
+    """
+    Formatea las estadísticas de consultas como texto, para la consola o un archivo.
+
+    Args:
+        limit (int or None): Cantidad máxima de sentencias a listar (las de mayor tiempo total).
+            None lista todas.
+
+    Returns:
+        str: Informe legible.
+    """
+    stats = get_query_stats()
+    lines = [
+        f"Consultas desde {stats['since']:%Y-%m-%d %H:%M:%S}: {stats['count']} "
+        f"(total {stats['total_ms']:.0f} ms, p50 {stats['p50_ms']:.1f} ms, p95 {stats['p95_ms']:.1f} ms, "
+        f"p99 {stats['p99_ms']:.1f} ms, lentas {stats['slow_count']})",
+        "",
+    ]
+    for entry in stats['statements'][:limit]:
+        callers = ', '.join(entry['callers'])
+        lines.append(
+            f"{entry['count']:>6}x  total {entry['total_ms']:>9.1f} ms  p50 {entry['p50_ms']:>7.1f}  "
+            f"p95 {entry['p95_ms']:>7.1f}  p99 {entry['p99_ms']:>7.1f}  máx {entry['max_ms']:>7.1f}  "
+            f"filas {entry['rows']:>7}  [{callers}]"
+        )
+        lines.append(f"        {entry['statement']}")
+    return '\n'.join(lines)
+
+# --- Generaciones de escritura ---
+# Un contador por tabla que los modelos incrementan (record_write) cada vez que
+# confirman un cambio en ella. Las cachés de lecturas guardan la generación con
+# la que calcularon cada resultado y lo descartan si alguna tabla de la que
+# depende cambió desde entonces.
+#
+# Cada generación tiene dos partes: un contador en memoria, que este proceso
+# incrementa sin consultar la base de datos, y uno compartido en la tabla
+# WRITE_GENERATIONS_TABLE (migración 0006), que ven todas las instancias de la
+# aplicación contra la misma base de datos. Sin esa tabla (migración sin
+# aplicar) solo se detectan las escrituras de este proceso y las cachés
+# dependen de su TTL.
+WRITE_GENERATIONS_TABLE = 'generaciones_escritura'
+WRITE_TRACKED_TABLES = ('periodos', 'materias', 'proyectos', 'proyectos_participantes', 'participantes')
+
+_write_generations = Counter()
+_write_generations_lock = threading.Lock()
+_shared_generations_available = True # Pasa a False si la tabla no existe; se avisa una sola vez
+_NO_SUCH_TABLE = 1146 # ER_NO_SUCH_TABLE (el backend SQLite usa el mismo errno)
+
+def _shared_generations_error(error):
+    """Ante una tabla inexistente deja de usar las generaciones compartidas; otros errores solo omiten esta vez."""
+    global _shared_generations_available
+    if getattr(error, 'errno', None) == _NO_SUCH_TABLE and _shared_generations_available:
+        _shared_generations_available = False
+        print(f"Advertencia: No existe la tabla {WRITE_GENERATIONS_TABLE} (python -m db.migrations); "
+              f"las cachés solo verán los cambios de este proceso.")
+
+def _read_shared_generations(tables):
+    """{tabla: generación} de WRITE_GENERATIONS_TABLE, o None si no se pudo leer."""
+    if not _shared_generations_available:
+        return None
+    conn = create_connection()
+    if conn is None:
+        return None
     try:
-        connection = mysql.connector.connect(**DB_CONFIG)
-        if connection.is_connected():
-            print(f"Conexión exitosa a la base de datos '{DB_CONFIG['database']}'")
-            return connection
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT tabla, generacion FROM {WRITE_GENERATIONS_TABLE} "
+                       f"WHERE tabla IN ({', '.join(['%s'] * len(tables))})", tuple(tables))
+        generations = dict(cursor.fetchall())
+        cursor.close()
+        return generations
     except Error as e:
-        print(f"Error al conectar a MySQL: {e}")
+        _shared_generations_error(e)
+        return None
+    finally:
+        close_connection(conn)
+
+def _bump_shared_generations(conn, tables, commit=False):
+    """Incrementa las generaciones compartidas en la transacción de `conn` y, si commit, la confirma."""
+    tables = sorted(set(tables))
+    if not tables or not _shared_generations_available:
+        return
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f"UPDATE {WRITE_GENERATIONS_TABLE} SET generacion = generacion + 1 "
+                       f"WHERE tabla IN ({', '.join(['%s'] * len(tables))})", tuple(tables))
+        cursor.close()
+        if commit:
+            conn.commit()
+    except Error as e:
+        _shared_generations_error(e)
+
+def get_write_generation(*tables):
+    """
+    Retorna la generación actual de cada tabla, en el mismo orden (tupla).
+
+    Cada generación es un par (contador de este proceso, contador compartido
+    en la base de datos o None si no está disponible); solo tiene sentido
+    compararlas entre sí. Lee la tabla compartida con una sola consulta.
+    """
+    with _write_generations_lock:
+        local = [_write_generations[table] for table in tables]
+    shared = _read_shared_generations(tables) if tables else None
+    return tuple((count, shared.get(table) if shared is not None else None) for table, count in zip(tables, local))
+
+def bump_write_generation(*tables):
+    """Incrementa la generación de las tablas en este proceso (invalida lo cacheado a partir de ellas)."""
+    with _write_generations_lock:
+        for table in tables:
+            _write_generations[table] += 1
+
+def record_write(conn, *tables):
+    """
+    Registra que un modelo modificó `tables` a través de `conn`.
+
+    Dentro de una UnitOfWork no hace nada todavía: la unidad incrementa las
+    generaciones compartidas en su propia transacción, justo antes de
+    confirmarla, y las de este proceso después. Con una conexión propia del
+    modelo (ya confirmada) las incrementa en el acto, en una transacción
+    mínima sobre la misma conexión. En ambos casos ninguna caché puede ver la
+    generación nueva antes que los datos que la causaron, así que nunca guarda
+    con ella una lectura previa al cambio; si la unidad se revierte, no hay
+    nada que invalidar.
+
+    Args:
+        conn: La conexión que usó el modelo (el resultado de create_connection(conn)).
+        *tables (str): Tablas modificadas.
+    """
+    owner = getattr(conn, '_owner', None) if isinstance(conn, JoinedConnection) else None
+    if isinstance(owner, UnitOfWork):
+        owner.written_tables.update(tables)
+        return
+    # Con una conexión del llamador (JoinedConnection), commit() no hace nada: queda en su transacción
+    _bump_shared_generations(conn, tables, commit=True)
+    bump_write_generation(*tables)
+
+class UnitOfWork:
+    """
+    Unidad de trabajo: una conexión y una transacción compartidas por varias
+    llamadas a los modelos dentro de una misma operación del controlador.
+
+        with UnitOfWork() as uow:
+            if get_period_by_id(id_periodo, conn=uow):
+                create_project(..., conn=uow)
+
+    Al salir del bloque se confirma la transacción. Si ocurre una excepción, o
+    si algún modelo revirtió su parte (rollback), se revierte todo el trabajo.
+    """
+    def __init__(self):
+        self.connection = None
+        self.rollback_only = False
+        self.written_tables = set() # Tablas modificadas (record_write), para las generaciones de escritura
+
+    def __enter__(self):
+        self.connection = get_pool().get_connection()
+        self.rollback_only = False
+        self.written_tables = set()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None and not self.rollback_only:
+                _bump_shared_generations(self.connection, self.written_tables)
+                self.connection.commit()
+                bump_write_generation(*self.written_tables)
+            else:
+                self.connection.rollback()
+        finally:
+            self.connection.close()
+            self.connection = None
+        return False # No suprimir la excepción
+
+
+class JoinedConnection:
+    """
+    Vista de una conexión ajena (UnitOfWork o conexión abierta por el llamador)
+    que un modelo usa sin ser su dueño: commit() y close() no hacen nada,
+    porque la transacción la cierra quien abrió la unidad de trabajo.
+    """
+    def __init__(self, owner):
+        self._owner = owner
+        self._raw = owner.connection if isinstance(owner, UnitOfWork) else owner
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def cursor(self, *args, **kwargs):
+        # Cursores con buffer: varios modelos comparten la conexión y un
+        # fetchone() sin consumir el resto bloquearía la siguiente consulta.
+        kwargs.setdefault('buffered', True)
+        return self._raw.cursor(*args, **kwargs)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        if isinstance(self._owner, UnitOfWork):
+            self._owner.rollback_only = True
+        else:
+            self._raw.rollback()
+
+    def close(self):
+        pass
+
+
+def create_connection(conn=None):
+    """
+    Obtiene una conexión del pool.
+
+    Args:
+        conn (UnitOfWork or connection, optional): Si se indica, se reutiliza esa
+            conexión (y su transacción) en lugar de pedir una nueva al pool.
+
+    Returns:
+        PooledConnection or JoinedConnection or None: Conexión lista para usar,
+            o None si no se pudo obtener.
+    """
+    if conn is not None:
+        return JoinedConnection(conn)
+    try:
+        return get_pool().get_connection()
+    except Error as e:
+        print(f"Error al conectar a la base de datos ({DB_BACKEND}): {e}")
     return None
 
 def close_connection(connection):
     """
-    Cierra la conexión a la base de datos MySQL.
+    Devuelve la conexión al pool.
 
     Args:
-        connection (mysql.connector.connection.MySQLConnection): Objeto de conexión a cerrar.
+        connection (PooledConnection): Objeto de conexión obtenido con create_connection().
     """
-    if connection and connection.is_connected():
+    if connection:
         try:
             connection.close()
-            print("Conexión a MySQL cerrada.")
         except Error as e:
             print(f"Error al cerrar la conexión a MySQL: {e}")
 
 
+def iter_query(query, params=(), batch_size=STREAM_BATCH_SIZE, conn=None):
+    """
+    Ejecuta una consulta con un cursor sin buffer y genera sus filas en lotes.
+
+    El servidor entrega las filas a medida que se leen, así que la memoria
+    usada depende de batch_size y no del tamaño del resultado. La conexión
+    queda ocupada mientras se itera: con conn=uow no se pueden ejecutar otras
+    consultas en esa unidad de trabajo hasta agotar (o cerrar) el generador.
+    Si el consumidor deja de iterar antes del final, el resto de filas se lee
+    y descarta por lotes para dejar la conexión utilizable.
+
+    Args:
+        query (str): Consulta SELECT con marcadores %s.
+        params (tuple): Parámetros de la consulta.
+        batch_size (int): Filas por lote (y por llamada a fetchmany).
+        conn (UnitOfWork or connection, optional): Conexión a la que unirse. Si es None, usa una conexión propia.
+
+    Yields:
+        list of dict: Lotes de hasta batch_size filas.
+
+    Raises:
+        mysql.connector.Error: Si no hay conexión o la consulta falla.
+    """
+    connection = create_connection(conn)
+    if connection is None:
+        raise Error("No se pudo establecer conexión con la base de datos.")
+    cursor = None
+    exhausted = False
+    try:
+        cursor = connection.cursor(dictionary=True, buffered=False)
+        cursor.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                exhausted = True
+                break
+            yield rows
+    finally:
+        if cursor is not None:
+            try:
+                if not exhausted:
+                    while cursor.fetchmany(batch_size):
+                        pass
+                cursor.close()
+            except Error:
+                pass # El pool descarta la conexión si quedó en mal estado
+        close_connection(connection)
+
 
 if __name__ == "__main__":
     db_connection = create_connection()
@@ -45,9 +784,11 @@ if __name__ == "__main__":
             cursor = db_connection.cursor()
             cursor.execute("SELECT VERSION();")
             db_version = cursor.fetchone()
-            print(f"Versión del servidor MySQL: {db_version[0]}")
+            print(f"Versión del servidor ({DB_BACKEND}): {db_version[0]}")
             cursor.close()
         except Error as e:
             print(f"Error al ejecutar una consulta de prueba: {e}")
         finally:
-            close_connection(db_connection)
\ No newline at end of file
+            close_connection(db_connection)
+        print(f"Estadísticas del pool: {get_pool_stats()}")
+        print(format_query_stats())
@@ -0,0 +1,30 @@
+import re
+
+from mysql.connector import errorcode
+
+DUPLICATE_ENTRY = errorcode.ER_DUP_ENTRY # 1062
+
+_DUPLICATE_KEY_RE = re.compile(r"for key '([^']+)'")
+
+def is_duplicate_entry(error):
+    """Indica si el error es una violación de una restricción UNIQUE o PRIMARY KEY (1062)."""
+    return getattr(error, 'errno', None) == DUPLICATE_ENTRY
+
+def duplicate_key(error):
+    """
+    Obtiene el índice que provocó un error 1062.
+
+    MySQL 8 informa 'tabla.indice' y versiones anteriores solo 'indice'; en ambos
+    casos se retorna el nombre del índice, que para las columnas UNIQUE del esquema
+    coincide con el nombre de la columna (por ejemplo 'cedula' o 'correo_electronico').
+
+    Args:
+        error (mysql.connector.Error): Error capturado.
+
+    Returns:
+        str or None: Nombre del índice, o None si el error no es de duplicidad.
+    """
+    if not is_duplicate_entry(error):
+        return None
+    match = _DUPLICATE_KEY_RE.search(getattr(error, 'msg', '') or str(error))
+    return match.group(1).rsplit('.', 1)[-1] if match else None
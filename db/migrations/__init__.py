@@ -0,0 +1,14 @@
+"""
+Migraciones versionadas del esquema.
+
+Cada archivo de db/migrations/versions se llama NNNN_descripcion.py y define
+DESCRIPTION y upgrade(conn). Las versiones aplicadas se registran en la tabla
+schema_migrations; cada migración comprueba antes de crear, por lo que es
+seguro repetirla.
+
+Uso:
+    python -m db.migrations            # Aplica las migraciones pendientes
+    python -m db.migrations --status   # Muestra qué versiones están aplicadas
+    python -m db.migrations --verify   # EXPLAIN de las consultas de los modelos
+"""
+from db.migrations.runner import apply_migrations, discover_migrations, get_applied_versions
@@ -0,0 +1,57 @@
+import argparse
+import sys
+
+from db.connection import set_sqlite_auto_migrate
+from db.migrations import apply_migrations, discover_migrations, get_applied_versions
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m db.migrations", description="Migraciones del esquema de Gestor de Expoferias.")
+    parser.add_argument('--status', action='store_true', help="Mostrar las migraciones aplicadas y pendientes.")
+    parser.add_argument('--verify', action='store_true', help="Ejecutar EXPLAIN sobre las consultas de los modelos y marcar recorridos completos.")
+    parser.add_argument('--rebuild-stats', action='store_true', help="Recalcular las tablas de resumen del dashboard desde los datos.")
+    args = parser.parse_args()
+    # Con SQLite, la primera conexión aplicaría las migraciones sin informarlas: aquí las aplica (y muestra) el comando
+    set_sqlite_auto_migrate(False)
+
+    if args.status:
+        applied = get_applied_versions()
+        for version, module in discover_migrations():
+            state = "aplicada " if version in applied else "pendiente"
+            print(f"[{state}] {version:04d} {module.DESCRIPTION}")
+        return 0
+
+    if args.verify:
+        # Importación diferida: la verificación carga todos los modelos
+        from db.migrations.verify import verify_query_plans
+        plans, error_msg = verify_query_plans()
+        full_scans = 0
+        for check, query, findings in plans:
+            print(f"{'✗' if findings else '✓'} {check}")
+            for finding in findings:
+                print(f"    {finding}")
+                print(f"    {query[:150]}{'...' if len(query) > 150 else ''}")
+            full_scans += len(findings)
+        if error_msg:
+            print(error_msg)
+            return 1
+        print(f"\n{len(plans)} consultas verificadas, {full_scans} recorridos completos.")
+        return 1 if full_scans else 0
+
+    if args.rebuild_stats:
+        # Importación diferida, como en --verify
+        from models.dashboard_model import rebuild_dashboard_stats
+        if not rebuild_dashboard_stats():
+            print("✗ No se pudieron recalcular las estadísticas del dashboard.")
+            return 1
+        print("✓ Estadísticas del dashboard recalculadas.")
+        return 0
+
+    applied, error_msg = apply_migrations()
+    if error_msg:
+        print(f"✗ {error_msg}")
+        return 1
+    print(f"✓ {len(applied)} migraciones aplicadas." if applied else "✓ El esquema está al día.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
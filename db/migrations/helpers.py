@@ -0,0 +1,211 @@
+import re
+
+from mysql.connector import Error
+from db.connection import get_backend_name, get_raw_connection
+
+_IDENTIFIER_RE = re.compile(r"^\w+$")
+
+def _check_identifier(name):
+    # Los nombres de tablas e índices se interpolan en el DDL: solo se aceptan identificadores simples
+    if not _IDENTIFIER_RE.match(name):
+        raise Error(f"Identificador no válido en migración: '{name}'")
+    return name
+
+def table_exists(conn, table):
+    """
+    Indica si una tabla existe en la base de datos actual.
+
+    Args:
+        conn: Conexión (o JoinedConnection) sobre la que consultar.
+        table (str): Nombre de la tabla.
+
+    Returns:
+        bool: True si la tabla existe.
+    """
+    cursor = conn.cursor()
+    try:
+        if get_backend_name(conn) == 'sqlite':
+            cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = %s", (table,))
+        else:
+            cursor.execute(
+                "SELECT COUNT(*) FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = %s",
+                (table,)
+            )
+        return cursor.fetchone()[0] > 0
+    finally:
+        cursor.close()
+
+def column_exists(conn, table, column):
+    """
+    Indica si una columna existe en una tabla.
+
+    Args:
+        conn: Conexión (o JoinedConnection) sobre la que consultar.
+        table (str): Nombre de la tabla.
+        column (str): Nombre de la columna.
+
+    Returns:
+        bool: True si la columna existe.
+    """
+    _check_identifier(table)
+    cursor = conn.cursor()
+    try:
+        if get_backend_name(conn) == 'sqlite':
+            cursor.execute(f"PRAGMA table_info({table})")
+            return any(row[1] == column for row in cursor.fetchall())
+        cursor.execute(
+            "SELECT COUNT(*) FROM information_schema.columns WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s",
+            (table, column)
+        )
+        return cursor.fetchone()[0] > 0
+    finally:
+        cursor.close()
+
+def add_column(conn, table, column, definition):
+    """
+    Añade una columna a una tabla si aún no existe.
+
+    Args:
+        conn: Conexión (o JoinedConnection) sobre la que ejecutar el DDL.
+        table (str): Tabla a modificar.
+        column (str): Nombre de la nueva columna.
+        definition (str): Tipo y restricciones de la columna (por ejemplo "VARCHAR(255) NULL").
+
+    Returns:
+        bool: True si se añadió la columna, False si ya existía.
+    """
+    _check_identifier(column)
+    if column_exists(conn, table, column):
+        return False
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    finally:
+        cursor.close()
+    print(f"  Columna {table}.{column} añadida.")
+    return True
+
+def get_index_columns(conn, table):
+    """
+    Obtiene los índices de una tabla con sus columnas en orden.
+
+    En MySQL (InnoDB) cada índice secundario incluye implícitamente la clave
+    primaria, así que se añaden sus columnas al final para reflejar qué
+    consultas puede resolver el índice sin leer la tabla.
+
+    Args:
+        conn: Conexión (o JoinedConnection) sobre la que consultar.
+        table (str): Nombre de la tabla.
+
+    Returns:
+        dict: {nombre_indice: [columna, ...]}
+    """
+    _check_identifier(table)
+    indexes = {}
+    cursor = conn.cursor()
+    try:
+        if get_backend_name(conn) == 'sqlite':
+            cursor.execute(f"PRAGMA index_list({table})")
+            for row in cursor.fetchall():
+                index_name = row[1]
+                info_cursor = conn.cursor()
+                info_cursor.execute(f"PRAGMA index_info({_check_identifier(index_name)})")
+                indexes[index_name] = [info[2] for info in info_cursor.fetchall()]
+                info_cursor.close()
+        else:
+            cursor.execute("""
+                SELECT index_name AS index_name, column_name AS column_name
+                FROM information_schema.statistics
+                WHERE table_schema = DATABASE() AND table_name = %s
+                ORDER BY index_name, seq_in_index
+            """, (table,))
+            for index_name, column_name in cursor.fetchall():
+                indexes.setdefault(index_name, []).append(column_name)
+            primary = indexes.get('PRIMARY', [])
+            for index_name, columns in indexes.items():
+                if index_name != 'PRIMARY':
+                    columns.extend(c for c in primary if c not in columns)
+    finally:
+        cursor.close()
+    return indexes
+
+def index_exists(conn, table, index_name):
+    """Indica si la tabla ya tiene un índice con ese nombre."""
+    return index_name in get_index_columns(conn, table)
+
+def create_index(conn, table, index_name, columns, unique=False):
+    """
+    Crea un índice si no existe ya, ni otro índice que lo cubra.
+
+    Un índice no único se considera cubierto cuando algún índice existente
+    empieza por las mismas columnas en el mismo orden (por ejemplo, el índice
+    que InnoDB crea automáticamente para cada clave foránea).
+
+    Args:
+        conn: Conexión (o JoinedConnection) sobre la que ejecutar el DDL.
+        table (str): Tabla a indexar.
+        index_name (str): Nombre del nuevo índice.
+        columns (list of str): Columnas del índice, en orden.
+        unique (bool): Si el índice debe ser UNIQUE.
+
+    Returns:
+        bool: True si se creó el índice, False si ya existía o estaba cubierto.
+    """
+    _check_identifier(index_name)
+    for column in columns:
+        _check_identifier(column)
+
+    existing = get_index_columns(conn, table)
+    if index_name in existing:
+        return False
+    if not unique:
+        for name, index_columns in existing.items():
+            if index_columns[:len(columns)] == list(columns):
+                print(f"  Índice {index_name} omitido: {table}({', '.join(columns)}) ya está cubierto por '{name}'.")
+                return False
+
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"CREATE {'UNIQUE ' if unique else ''}INDEX {index_name} ON {table} ({', '.join(columns)})")
+    finally:
+        cursor.close()
+    print(f"  Índice {index_name} creado en {table}({', '.join(columns)}).")
+    return True
+
+def create_fulltext_index(conn, table, index_name, columns):
+    """
+    Crea un índice FULLTEXT (MySQL) si no existe ya.
+
+    El primer índice FULLTEXT de una tabla InnoDB obliga a reconstruirla para
+    añadir la columna oculta FTS_DOC_ID, y MySQL lo avisa con una advertencia
+    (124) que raise_on_warnings convertiría en excepción; se desactiva solo
+    durante el CREATE.
+
+    Args:
+        conn: Conexión (o JoinedConnection) MySQL sobre la que ejecutar el DDL.
+        table (str): Tabla a indexar.
+        index_name (str): Nombre del nuevo índice.
+        columns (list of str): Columnas de texto del índice.
+
+    Returns:
+        bool: True si se creó el índice, False si ya existía.
+    """
+    _check_identifier(index_name)
+    for column in columns:
+        _check_identifier(column)
+    if index_exists(conn, table, index_name):
+        return False
+
+    raw = get_raw_connection(conn)
+    raise_on_warnings = getattr(raw, 'raise_on_warnings', False)
+    if raise_on_warnings:
+        raw.raise_on_warnings = False
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"CREATE FULLTEXT INDEX {index_name} ON {table} ({', '.join(columns)})")
+    finally:
+        cursor.close()
+        if raise_on_warnings:
+            raw.raise_on_warnings = True
+    print(f"  Índice FULLTEXT {index_name} creado en {table}({', '.join(columns)}).")
+    return True
@@ -0,0 +1,110 @@
+import importlib
+import re
+from pathlib import Path
+
+from mysql.connector import Error
+from db.connection import create_connection, close_connection
+from db.migrations.helpers import table_exists
+
+VERSIONS_DIR = Path(__file__).parent / 'versions'
+_VERSION_FILE_RE = re.compile(r"^(\d{4})_(\w+)\.py$")
+
+def discover_migrations():
+    """
+    Lista las migraciones disponibles en db/migrations/versions.
+    Cada archivo se llama NNNN_descripcion.py y define DESCRIPTION y upgrade(conn).
+
+    Returns:
+        list of tuple: [(version, módulo), ...] ordenada por versión.
+    """
+    migrations = []
+    for path in sorted(VERSIONS_DIR.glob('*.py')):
+        match = _VERSION_FILE_RE.match(path.name)
+        if match:
+            module = importlib.import_module(f"db.migrations.versions.{path.stem}")
+            migrations.append((int(match.group(1)), module))
+    return migrations
+
+def _ensure_migrations_table(conn):
+    if table_exists(conn, 'schema_migrations'):
+        return
+    cursor = conn.cursor()
+    cursor.execute("""
+        CREATE TABLE schema_migrations (
+            version INT PRIMARY KEY,
+            descripcion VARCHAR(255) NOT NULL,
+            fecha_aplicacion DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.close()
+
+def get_applied_versions(conn=None):
+    """
+    Obtiene las versiones de migración ya aplicadas.
+
+    Args:
+        conn (UnitOfWork or connection, optional): Conexión a la que unirse. Si es None, usa una conexión propia.
+
+    Returns:
+        set of int: Versiones registradas en schema_migrations.
+    """
+    conn = create_connection(conn)
+    if conn is None:
+        return set()
+    try:
+        if not table_exists(conn, 'schema_migrations'):
+            return set()
+        cursor = conn.cursor()
+        cursor.execute("SELECT version FROM schema_migrations")
+        versions = {row[0] for row in cursor.fetchall()}
+        cursor.close()
+        return versions
+    finally:
+        close_connection(conn)
+
+def apply_migrations(conn=None):
+    """
+    Aplica, en orden, las migraciones que aún no están registradas.
+
+    Cada migración es idempotente (comprueba antes de crear), así que volver
+    a ejecutarla tras un fallo a medias es seguro. La ejecución se detiene en
+    la primera migración que falle.
+
+    Args:
+        conn (UnitOfWork or connection, optional): Conexión a la que unirse. Si es None, usa una conexión propia.
+
+    Returns:
+        tuple: (list of int, str or None)
+               - Versiones aplicadas en esta ejecución.
+               - Un mensaje de error si alguna migración falló.
+    """
+    conn = create_connection(conn)
+    if conn is None:
+        return [], "Error: No se pudo establecer conexión con la base de datos."
+
+    applied_now = []
+    try:
+        _ensure_migrations_table(conn)
+        applied = get_applied_versions(conn=conn)
+        for version, module in discover_migrations():
+            if version in applied:
+                continue
+            print(f"Aplicando migración {version:04d}: {module.DESCRIPTION}")
+            try:
+                module.upgrade(conn)
+                cursor = conn.cursor()
+                cursor.execute(
+                    "INSERT INTO schema_migrations (version, descripcion) VALUES (%s, %s)",
+                    (version, module.DESCRIPTION)
+                )
+                cursor.close()
+                conn.commit()
+            except Error as e:
+                conn.rollback()
+                return applied_now, f"Error al aplicar la migración {version:04d}: {e}"
+            applied_now.append(version)
+        return applied_now, None
+    except Error as e:
+        return applied_now, f"Error al preparar las migraciones: {e}"
+    finally:
+        close_connection(conn)
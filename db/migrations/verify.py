@@ -0,0 +1,139 @@
+"""
+Verificación de planes de ejecución.
+
+Ejecuta las consultas de lectura de los modelos a través de una conexión que,
+antes de cada SELECT, pide su plan con EXPLAIN (MySQL) o EXPLAIN QUERY PLAN
+(SQLite) y marca las tablas que se recorren completas. Como se llama a las
+funciones reales de los modelos (con conn=...), se verifica exactamente la
+consulta que se ejecuta en producción, incluidos los filtros dinámicos.
+"""
+import re
+
+from mysql.connector import Error
+from db.connection import create_connection, close_connection, get_backend_name, get_raw_connection
+from models.participant_model import get_participants_by_type, get_participants_by_project_id, get_participants_page
+from models.project_model import get_project_by_id, get_project_by_name, get_all_projects, get_projects_page, search_projects
+from models.report_model import get_filtered_projects_report, get_filtered_participants_report, get_report_filter_references, iter_certificate_recipients
+from models.dashboard_model import get_dashboard_stats
+
+# Detalle de EXPLAIN QUERY PLAN para un recorrido completo: "SCAN p" (sin "USING ... INDEX")
+_SQLITE_FULL_SCAN_RE = re.compile(r"^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$")
+
+
+class _ExplainingCursor:
+    def __init__(self, owner, cursor):
+        self._owner = owner
+        self._cursor = cursor
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def execute(self, operation, params=()):
+        if operation.lstrip().upper().startswith('SELECT'):
+            self._owner.explain(operation, params)
+        return self._cursor.execute(operation, params)
+
+
+class _ExplainingConnection:
+    """Conexión que registra el plan de cada SELECT antes de ejecutarlo."""
+    def __init__(self, connection, backend):
+        self._connection = connection
+        self._raw = connection # Para que get_backend_name atraviese este envoltorio
+        self._backend = backend
+        self.current_check = None
+        self.plans = [] # [(verificación, consulta, [hallazgos])]
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def cursor(self, *args, **kwargs):
+        return _ExplainingCursor(self, self._connection.cursor(*args, **kwargs))
+
+    def explain(self, query, params):
+        cursor = self._connection.cursor(dictionary=True)
+        try:
+            if self._backend == 'sqlite':
+                cursor.execute("EXPLAIN QUERY PLAN " + query, params)
+                findings = [f"recorrido completo de '{m.group(1)}' ({row['detail']})"
+                            for row in cursor.fetchall()
+                            for m in [_SQLITE_FULL_SCAN_RE.match(row['detail'])] if m]
+            else:
+                cursor.execute("EXPLAIN " + query, params)
+                findings = [f"recorrido completo de '{row['table']}' (type=ALL, {row.get('rows')} filas estimadas)"
+                            for row in cursor.fetchall() if row.get('type') == 'ALL']
+        finally:
+            cursor.close()
+        self.plans.append((self.current_check, ' '.join(query.split()), findings))
+
+
+def _sample_ids(conn):
+    """IDs reales para que las consultas que dependen de un resultado previo también se ejecuten."""
+    samples = {}
+    cursor = conn.cursor()
+    for key, table, column, where in [
+        ('periodo', 'periodos', 'id_periodo', ''),
+        ('materia', 'materias', 'id_materia', ''),
+        ('proyecto', 'proyectos', 'id_proyecto', ''),
+        ('estudiante', 'participantes', 'id_participante', "WHERE tipo_participante = 'Estudiante'"),
+        ('docente', 'participantes', 'id_participante', "WHERE tipo_participante = 'Docente'"),
+    ]:
+        cursor.execute(f"SELECT MIN({column}) FROM {table} {where}")
+        samples[key] = cursor.fetchone()[0] or 1
+    cursor.close()
+    return samples
+
+def _model_checks(ids):
+    return [
+        ("project_model.get_all_projects", lambda c: get_all_projects(conn=c)),
+        ("project_model.get_project_by_id", lambda c: get_project_by_id(ids['proyecto'], conn=c)),
+        ("project_model.get_project_by_name", lambda c: get_project_by_name('Proyecto de verificación', conn=c)),
+        ("project_model.get_projects_page", lambda c: get_projects_page(after_id=ids['proyecto'] + 1, limit=50, conn=c)),
+        ("project_model.search_projects", lambda c: search_projects('proyecto verificación', period_id=ids['periodo'], limit=50, conn=c)),
+        ("participant_model.get_participants_page", lambda c: get_participants_page(after_id=ids['estudiante'], limit=50, conn=c)),
+        ("participant_model.get_participants_by_type", lambda c: get_participants_by_type('Estudiante', conn=c)),
+        ("participant_model.get_participants_by_project_id", lambda c: get_participants_by_project_id(ids['proyecto'], conn=c)),
+        ("report_model.get_filtered_projects_report(period_id)", lambda c: get_filtered_projects_report(period_id=ids['periodo'], conn=c)),
+        ("report_model.get_filtered_projects_report(subject_id)", lambda c: get_filtered_projects_report(subject_id=ids['materia'], conn=c)),
+        ("report_model.get_filtered_projects_report(student_id)", lambda c: get_filtered_projects_report(student_id=ids['estudiante'], conn=c)),
+        ("report_model.get_filtered_projects_report(teacher_id)", lambda c: get_filtered_projects_report(teacher_id=ids['docente'], conn=c)),
+        ("report_model.get_filtered_participants_report(period_id, tipo)", lambda c: get_filtered_participants_report(period_id=ids['periodo'], participant_type='Estudiante', conn=c)),
+        ("report_model.get_report_filter_references", lambda c: get_report_filter_references(ids['periodo'], [ids['estudiante'], ids['docente']], ids['materia'], conn=c)),
+        ("report_model.iter_certificate_recipients(period_id)", lambda c: list(iter_certificate_recipients(period_id=ids['periodo'], conn=c))),
+        ("dashboard_model.get_dashboard_stats(period_id)", lambda c: get_dashboard_stats(ids['periodo'], conn=c)),
+    ]
+
+def verify_query_plans(conn=None):
+    """
+    Ejecuta EXPLAIN sobre las consultas de lectura de los modelos y marca los recorridos completos.
+
+    Args:
+        conn (UnitOfWork or connection, optional): Conexión a la que unirse. Si es None, usa una conexión propia.
+
+    Returns:
+        tuple: (list of tuple, str or None)
+               - [(verificación, consulta, [hallazgos])] para cada SELECT ejecutado.
+               - Un mensaje de error si la verificación no pudo completarse.
+    """
+    conn = create_connection(conn)
+    if conn is None:
+        return [], "Error: No se pudo establecer conexión con la base de datos."
+
+    backend = get_backend_name(conn)
+    raw = get_raw_connection(conn)
+    # MySQL 8 acompaña cada EXPLAIN con una nota (1003) que raise_on_warnings convertiría en excepción
+    raise_on_warnings = getattr(raw, 'raise_on_warnings', False)
+    if raise_on_warnings:
+        raw.raise_on_warnings = False
+
+    explaining = _ExplainingConnection(conn, backend)
+    try:
+        for name, check in _model_checks(_sample_ids(conn)):
+            explaining.current_check = name
+            check(explaining)
+        return explaining.plans, None
+    except Error as e:
+        return explaining.plans, f"Error al verificar los planes de ejecución: {e}"
+    finally:
+        if raise_on_warnings:
+            raw.raise_on_warnings = True
+        close_connection(conn)
@@ -0,0 +1,15 @@
+"""
+Índices secundarios de la tabla proyectos.
+
+- (id_periodo, fecha_registro): filtro por período de los reportes, ya ordenado por fecha.
+- (id_materia): filtro por materia de los reportes.
+- (fecha_registro): ORDER BY fecha_registro DESC de get_all_projects sin ordenar en memoria.
+"""
+from db.migrations.helpers import create_index
+
+DESCRIPTION = "Índices de proyectos por período, materia y fecha de registro"
+
+def upgrade(conn):
+    create_index(conn, 'proyectos', 'idx_proyectos_periodo_fecha', ['id_periodo', 'fecha_registro'])
+    create_index(conn, 'proyectos', 'idx_proyectos_materia', ['id_materia'])
+    create_index(conn, 'proyectos', 'idx_proyectos_fecha_registro', ['fecha_registro'])
@@ -0,0 +1,16 @@
+"""
+Índices de participantes y de la tabla de unión proyectos_participantes.
+
+- participantes(tipo_participante, apellido, nombre): filtro por tipo y el
+  ORDER BY tipo_participante, apellido, nombre del reporte de participantes.
+- proyectos_participantes(id_participante, id_proyecto): búsqueda inversa
+  (proyectos de un participante). La clave primaria empieza por id_proyecto
+  y no sirve para esta dirección.
+"""
+from db.migrations.helpers import create_index
+
+DESCRIPTION = "Índices de participantes por tipo y de proyectos por participante"
+
+def upgrade(conn):
+    create_index(conn, 'participantes', 'idx_participantes_tipo_apellido', ['tipo_participante', 'apellido', 'nombre'])
+    create_index(conn, 'proyectos_participantes', 'idx_proyectos_participantes_participante', ['id_participante', 'id_proyecto'])
@@ -0,0 +1,59 @@
+"""
+Clave normalizada y única para el nombre de los proyectos.
+
+- proyectos.nombre_proyecto_clave: nombre_proyecto normalizado con
+  models.project_model.normalize_project_name (sin espacios sobrantes y en
+  minúsculas). La escriben create_project y update_project.
+- uq_proyectos_nombre_clave: índice UNIQUE sobre la clave. La unicidad del
+  nombre deja de depender de que el controlador recorra todos los proyectos:
+  la comprobación es una búsqueda puntual y la base de datos rechaza (1062)
+  los duplicados que lleguen por altas concurrentes.
+
+La unicidad es global, como ya la aplicaba ProjectController. En MySQL la
+columna usa utf8mb4_bin para que el índice compare exactamente la clave ya
+normalizada y no aplique además las reglas de acentos de la colación.
+"""
+from mysql.connector import Error
+from db.connection import get_backend_name
+from db.migrations.helpers import add_column, create_index
+from models.project_model import normalize_project_name
+
+DESCRIPTION = "Clave normalizada y única del nombre de proyecto"
+
+def _backfill(conn):
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT id_proyecto, nombre_proyecto FROM proyectos WHERE nombre_proyecto_clave IS NULL")
+        rows = cursor.fetchall()
+        if rows:
+            cursor.executemany(
+                "UPDATE proyectos SET nombre_proyecto_clave = %s WHERE id_proyecto = %s",
+                [(normalize_project_name(nombre), project_id) for project_id, nombre in rows]
+            )
+            print(f"  Clave de nombre calculada para {len(rows)} proyectos.")
+    finally:
+        cursor.close()
+
+def _check_duplicates(conn):
+    # Proyectos antiguos con nombres que solo difieren en espacios o mayúsculas impedirían crear el índice UNIQUE
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            SELECT nombre_proyecto_clave, COUNT(*)
+            FROM proyectos
+            GROUP BY nombre_proyecto_clave
+            HAVING COUNT(*) > 1
+        """)
+        duplicates = cursor.fetchall()
+    finally:
+        cursor.close()
+    if duplicates:
+        names = ', '.join(f"'{key}' ({count})" for key, count in duplicates)
+        raise Error(f"Hay proyectos con nombres duplicados que deben renombrarse antes de migrar: {names}")
+
+def upgrade(conn):
+    collation = '' if get_backend_name(conn) == 'sqlite' else ' CHARACTER SET utf8mb4 COLLATE utf8mb4_bin'
+    add_column(conn, 'proyectos', 'nombre_proyecto_clave', f"VARCHAR(255){collation} NULL")
+    _backfill(conn)
+    _check_duplicates(conn)
+    create_index(conn, 'proyectos', 'uq_proyectos_nombre_clave', ['nombre_proyecto_clave'], unique=True)
@@ -0,0 +1,60 @@
+"""
+Búsqueda de texto completo sobre el nombre y la descripción de los proyectos.
+
+- MySQL: índice FULLTEXT ft_proyectos_texto sobre proyectos(nombre_proyecto,
+  descripcion), que usa project_model.search_projects con MATCH ... AGAINST.
+- SQLite: no tiene FULLTEXT; se crea la tabla virtual FTS5 proyectos_fts con
+  el contenido de proyectos (content='proyectos') y tres triggers que la
+  mantienen al día en cada INSERT, UPDATE y DELETE. El tokenizador ignora
+  mayúsculas y acentos, como la colación de MySQL.
+"""
+from db.connection import get_backend_name
+from db.migrations.helpers import table_exists, create_fulltext_index
+
+DESCRIPTION = "Índice de texto completo de proyectos (nombre y descripción)"
+
+_SQLITE_STATEMENTS = [
+    """
+    CREATE VIRTUAL TABLE proyectos_fts USING fts5(
+        nombre_proyecto, descripcion,
+        content='proyectos', content_rowid='id_proyecto',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS proyectos_fts_ai AFTER INSERT ON proyectos BEGIN
+        INSERT INTO proyectos_fts(rowid, nombre_proyecto, descripcion)
+        VALUES (new.id_proyecto, new.nombre_proyecto, new.descripcion);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS proyectos_fts_ad AFTER DELETE ON proyectos BEGIN
+        INSERT INTO proyectos_fts(proyectos_fts, rowid, nombre_proyecto, descripcion)
+        VALUES ('delete', old.id_proyecto, old.nombre_proyecto, old.descripcion);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS proyectos_fts_au AFTER UPDATE OF nombre_proyecto, descripcion ON proyectos BEGIN
+        INSERT INTO proyectos_fts(proyectos_fts, rowid, nombre_proyecto, descripcion)
+        VALUES ('delete', old.id_proyecto, old.nombre_proyecto, old.descripcion);
+        INSERT INTO proyectos_fts(rowid, nombre_proyecto, descripcion)
+        VALUES (new.id_proyecto, new.nombre_proyecto, new.descripcion);
+    END
+    """,
+    # Indexa los proyectos que ya existían
+    "INSERT INTO proyectos_fts(proyectos_fts) VALUES ('rebuild')",
+]
+
+def upgrade(conn):
+    if get_backend_name(conn) != 'sqlite':
+        create_fulltext_index(conn, 'proyectos', 'ft_proyectos_texto', ['nombre_proyecto', 'descripcion'])
+        return
+    if table_exists(conn, 'proyectos_fts'):
+        return
+    cursor = conn.cursor()
+    try:
+        for statement in _SQLITE_STATEMENTS:
+            cursor.execute(statement)
+    finally:
+        cursor.close()
+    print("  Tabla FTS5 proyectos_fts creada e indexada.")
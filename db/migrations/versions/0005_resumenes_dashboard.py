@@ -0,0 +1,68 @@
+"""
+Tablas de resumen para las estadísticas del dashboard.
+
+- resumen_proyectos(id_periodo, id_materia): proyectos de cada materia en
+  cada período.
+- resumen_participantes(id_periodo, tipo_participante, carrera):
+  participantes por tipo y carrera; id_periodo = 0 cuenta todos los
+  registrados y cada período, los que tienen algún proyecto en él.
+- participantes_periodo(id_periodo, id_participante): en cuántos proyectos
+  del período está cada participante.
+
+project_model y participant_model las mantienen en la misma transacción que
+cada alta, cambio o baja (ver models/dashboard_model.py). Al migrar se
+calculan desde los datos existentes; `python -m db.migrations --rebuild-stats`
+las vuelve a calcular si se desincronizan.
+"""
+from mysql.connector import Error
+from db.connection import get_backend_name
+from db.migrations.helpers import table_exists, create_index
+from db.sqlite_backend import translate_schema
+from models.dashboard_model import rebuild_dashboard_stats
+
+DESCRIPTION = "Tablas de resumen del dashboard (proyectos y participantes)"
+
+_TABLES = {
+    'resumen_proyectos': """
+    CREATE TABLE resumen_proyectos (
+        id_periodo INT NOT NULL,
+        id_materia INT NOT NULL,
+        total_proyectos INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (id_periodo, id_materia)
+    )
+    """,
+    'resumen_participantes': """
+    CREATE TABLE resumen_participantes (
+        id_periodo INT NOT NULL,
+        tipo_participante VARCHAR(20) NOT NULL,
+        carrera VARCHAR(100) NOT NULL DEFAULT '',
+        total_participantes INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (id_periodo, tipo_participante, carrera)
+    )
+    """,
+    'participantes_periodo': """
+    CREATE TABLE participantes_periodo (
+        id_periodo INT NOT NULL,
+        id_participante INT NOT NULL,
+        total_proyectos INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (id_periodo, id_participante)
+    )
+    """,
+}
+
+def upgrade(conn):
+    sqlite = get_backend_name(conn) == 'sqlite'
+    cursor = conn.cursor()
+    try:
+        for table, ddl in _TABLES.items():
+            if table_exists(conn, table):
+                continue
+            # En SQLite, las mismas colaciones que el esquema principal (VARCHAR sin distinguir mayúsculas)
+            cursor.execute(translate_schema(ddl).rstrip().rstrip(';') if sqlite else ddl)
+            print(f"  Tabla {table} creada.")
+    finally:
+        cursor.close()
+    # Cambiar el tipo o la carrera de un participante y eliminarlo buscan sus períodos
+    create_index(conn, 'participantes_periodo', 'idx_participantes_periodo_participante', ['id_participante'])
+    if not rebuild_dashboard_stats(conn=conn):
+        raise Error("No se pudieron calcular las tablas de resumen del dashboard.")
@@ -0,0 +1,37 @@
+"""
+Generaciones de escritura compartidas entre instancias de la aplicación.
+
+generaciones_escritura(tabla, generacion) tiene una fila por cada tabla de
+db.connection.WRITE_TRACKED_TABLES. Cada alta, cambio o baja incrementa la
+generación de las tablas que modificó (db.connection.record_write), y las
+cachés de lecturas (controllers/report_cache.py, el índice de búsqueda de
+participantes) la leen para descartar lo que calcularon antes de un cambio,
+aunque ese cambio lo haya hecho otro equipo contra la misma base de datos.
+"""
+from db.connection import get_backend_name, WRITE_GENERATIONS_TABLE, WRITE_TRACKED_TABLES
+from db.migrations.helpers import table_exists
+from db.sqlite_backend import translate_schema
+
+DESCRIPTION = "Generaciones de escritura compartidas para invalidar cachés"
+
+_DDL = f"""
+CREATE TABLE {WRITE_GENERATIONS_TABLE} (
+    tabla VARCHAR(64) NOT NULL PRIMARY KEY,
+    generacion BIGINT NOT NULL DEFAULT 0
+)
+"""
+
+def upgrade(conn):
+    sqlite = get_backend_name(conn) == 'sqlite'
+    cursor = conn.cursor()
+    try:
+        if not table_exists(conn, WRITE_GENERATIONS_TABLE):
+            cursor.execute(translate_schema(_DDL).rstrip().rstrip(';') if sqlite else _DDL)
+            print(f"  Tabla {WRITE_GENERATIONS_TABLE} creada.")
+        cursor.execute(f"SELECT tabla FROM {WRITE_GENERATIONS_TABLE}")
+        existing = {row[0] for row in cursor.fetchall()}
+        for table in WRITE_TRACKED_TABLES:
+            if table not in existing:
+                cursor.execute(f"INSERT INTO {WRITE_GENERATIONS_TABLE} (tabla, generacion) VALUES (%s, 0)", (table,))
+    finally:
+        cursor.close()
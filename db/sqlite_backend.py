@@ -0,0 +1,429 @@
+"""
+Backend SQLite para la capa de modelos.
+
+Permite ejecutar modelos y controladores sobre un archivo local, sin servidor
+MySQL (mesas de registro sin red, benchmarks, pruebas locales). Las conexiones
+imitan la API de mysql-connector que usa el proyecto (cursor(dictionary=True),
+lastrowid, rowcount, ping, in_transaction...) y traducen al vuelo las
+construcciones propias de MySQL:
+
+    - Marcadores %s / %(nombre)s  -> ? / :nombre
+    - INSERT IGNORE               -> INSERT OR IGNORE
+    - ON DUPLICATE KEY UPDATE     -> ON CONFLICT DO UPDATE SET (VALUES(col) -> excluded.col)
+    - GROUP_CONCAT(... SEPARATOR) -> GROUP_CONCAT(..., separador)
+    - CONCAT(), VERSION()         -> funciones registradas en la conexión
+    - ENUM, AUTO_INCREMENT, etc.  -> equivalentes al crear el esquema
+
+Los errores de sqlite3 se convierten en errores de mysql.connector con el
+mismo errno que daría MySQL (1062, 1451, 1452...), de modo que los
+controladores los manejan igual en ambos motores.
+"""
+import datetime
+import re
+import sqlite3
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+from mysql.connector import errors
+
+
+# --- Traducción de consultas ---
+
+def _mask_literals(query):
+    """
+    Retorna una copia de la consulta con el contenido de literales, identificadores
+    entre comillas y comentarios reemplazado por espacios, conservando las posiciones.
+    Así las búsquedas sobre la máscara nunca coinciden dentro de un texto.
+    """
+    masked = list(query)
+    i, n = 0, len(query)
+    while i < n:
+        ch = query[i]
+        if ch in ("'", '"', '`'):
+            j = i + 1
+            while j < n:
+                if query[j] == '\\' and ch != '`':
+                    j += 2
+                    continue
+                if query[j] == ch:
+                    if j + 1 < n and query[j + 1] == ch: # Comilla escapada duplicándola
+                        j += 2
+                        continue
+                    break
+                j += 1
+            for k in range(i + 1, min(j, n)):
+                masked[k] = ' '
+            i = j + 1
+        elif query.startswith('--', i) or ch == '#':
+            j = query.find('\n', i)
+            j = n if j == -1 else j
+            for k in range(i, j):
+                masked[k] = ' '
+            i = j
+        elif query.startswith('/*', i):
+            j = query.find('*/', i + 2)
+            j = n if j == -1 else j + 2
+            for k in range(i, j):
+                masked[k] = ' '
+            i = j
+        else:
+            i += 1
+    return ''.join(masked)
+
+def _closing_paren(masked, open_index):
+    """Retorna el índice del paréntesis que cierra el abierto en open_index."""
+    depth = 0
+    for i in range(open_index, len(masked)):
+        if masked[i] == '(':
+            depth += 1
+        elif masked[i] == ')':
+            depth -= 1
+            if depth == 0:
+                return i
+    raise errors.ProgrammingError(msg="Paréntesis sin cerrar en la consulta.", errno=1064)
+
+def _top_level_keyword(masked, keyword):
+    """Posición de `keyword` fuera de paréntesis anidados, o -1."""
+    depth = 0
+    for match in re.finditer(r"[()]|\b%s\b" % keyword, masked, re.IGNORECASE):
+        token = match.group(0)
+        if token == '(':
+            depth += 1
+        elif token == ')':
+            depth -= 1
+        elif depth == 0:
+            return match.start()
+    return -1
+
+def _translate_group_concat(query):
+    masked = _mask_literals(query)
+    match = re.search(r"\bGROUP_CONCAT\s*\(", masked, re.IGNORECASE)
+    if not match:
+        return query
+    open_index = match.end() - 1
+    close_index = _closing_paren(masked, open_index)
+    inner = query[open_index + 1:close_index]
+    inner_masked = masked[open_index + 1:close_index]
+
+    separator = None
+    sep_index = _top_level_keyword(inner_masked, 'SEPARATOR')
+    if sep_index != -1:
+        separator = inner[sep_index + len('SEPARATOR'):].strip()
+        inner, inner_masked = inner[:sep_index], inner_masked[:sep_index]
+
+    distinct = re.match(r"\s*DISTINCT\b", inner_masked, re.IGNORECASE)
+    if distinct:
+        inner = inner[distinct.end():]
+    expression = _translate_group_concat(inner.strip())
+
+    if distinct and separator is not None:
+        # SQLite no admite DISTINCT en agregados de dos argumentos
+        call = f"MYSQL_GROUP_CONCAT_DISTINCT({expression}, {separator})"
+    elif distinct:
+        call = f"GROUP_CONCAT(DISTINCT {expression})"
+    else:
+        call = f"GROUP_CONCAT({expression}, {separator or repr(',')})"
+    return query[:match.start()] + call + _translate_group_concat(query[close_index + 1:])
+
+def _translate_placeholders(query):
+    masked = _mask_literals(query)
+    parts = []
+    last = 0
+    for match in re.finditer(r"%%|%s|%\((\w+)\)s", masked):
+        parts.append(query[last:match.start()])
+        token = match.group(0)
+        if token == '%%':
+            parts.append('%')
+        elif token == '%s':
+            parts.append('?')
+        else:
+            parts.append(':' + match.group(1))
+        last = match.end()
+    parts.append(query[last:])
+    return ''.join(parts)
+
+def _translate_upsert(query):
+    # SQLite >= 3.35 admite ON CONFLICT sin indicar la restricción, como MySQL con cualquier clave única
+    masked = _mask_literals(query)
+    match = re.search(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b", masked, re.IGNORECASE)
+    head, tail = query[:match.start()], query[match.end():]
+    tail = re.sub(r"\bVALUES\s*\(\s*(\w+)\s*\)", r"excluded.\1", tail, flags=re.IGNORECASE)
+    # Alias de fila de MySQL 8 (VALUES (...) AS nuevo): en SQLite la fila propuesta es `excluded`
+    alias = re.search(r"\)\s*AS\s+(\w+)\s*$", head, re.IGNORECASE)
+    if alias:
+        head = head[:alias.start() + 1] + ' '
+        tail = re.sub(rf"\b{alias.group(1)}\.(\w+)", r"excluded.\1", tail)
+    return f"{head}ON CONFLICT DO UPDATE SET{tail}"
+
+@lru_cache(maxsize=512)
+def translate_query(query):
+    """
+    Traduce una consulta escrita para MySQL al dialecto de SQLite.
+    El resultado se cachea: los modelos repiten siempre las mismas cadenas.
+
+    Args:
+        query (str): Consulta con sintaxis MySQL y marcadores %s.
+
+    Returns:
+        str: Consulta equivalente para SQLite.
+    """
+    query = re.sub(r"^(\s*INSERT)\s+IGNORE\b", r"\1 OR IGNORE", query, flags=re.IGNORECASE)
+    if re.search(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b", query, re.IGNORECASE):
+        query = _translate_upsert(query)
+    if re.search(r"GROUP_CONCAT", query, re.IGNORECASE):
+        query = _translate_group_concat(query)
+    return _translate_placeholders(query)
+
+def translate_schema(script):
+    """
+    Traduce un script DDL de MySQL (como db/database.sql) a SQLite.
+
+    Args:
+        script (str): Script SQL con sintaxis MySQL.
+
+    Returns:
+        str: Script ejecutable con executescript().
+    """
+    statements = []
+    for statement in script.split(';'):
+        # Quitar comentarios de línea antes de analizar la sentencia
+        statement = re.sub(r"--[^\n]*", "", statement).strip()
+        if not statement or re.match(r"(CREATE\s+DATABASE|USE)\b", statement, re.IGNORECASE):
+            continue
+        statement = re.sub(r"^CREATE\s+TABLE\s+(?!IF\s+NOT\s+EXISTS)", "CREATE TABLE IF NOT EXISTS ", statement, flags=re.IGNORECASE)
+        statement = re.sub(r"\bINT\s+AUTO_INCREMENT\s+PRIMARY\s+KEY\b", "INTEGER PRIMARY KEY AUTOINCREMENT", statement, flags=re.IGNORECASE)
+        # ENUM('a', 'b') -> TEXT con CHECK sobre los mismos valores
+        statement = re.sub(r"(\w+)\s+ENUM\s*\(([^)]*)\)", r"\1 TEXT CHECK (\1 IN (\2))", statement, flags=re.IGNORECASE)
+        # Las colaciones *_ci de MySQL comparan sin distinguir mayúsculas
+        statement = re.sub(r"\b(VARCHAR\s*\(\d+\))", r"\1 COLLATE NOCASE", statement, flags=re.IGNORECASE)
+        # CURRENT_TIMESTAMP de SQLite es UTC; MySQL usa la hora local de la sesión
+        statement = re.sub(r"DEFAULT\s+CURRENT_TIMESTAMP\b", "DEFAULT (datetime('now', 'localtime'))", statement, flags=re.IGNORECASE)
+        statement = re.sub(r"\)\s*ENGINE\s*=.*$", ")", statement, flags=re.IGNORECASE | re.DOTALL)
+        statements.append(statement)
+    return ';\n\n'.join(statements) + ';\n'
+
+
+# --- Funciones SQL propias de MySQL ---
+
+def _concat(*args):
+    # Igual que en MySQL: si algún argumento es NULL, el resultado es NULL
+    if any(arg is None for arg in args):
+        return None
+    return ''.join(str(arg) for arg in args)
+
+class _GroupConcatDistinct:
+    """Agregado GROUP_CONCAT(DISTINCT expr SEPARATOR sep)."""
+    def __init__(self):
+        self.values = []
+        self.seen = set()
+        self.separator = ','
+
+    def step(self, value, separator):
+        self.separator = separator
+        if value is not None and value not in self.seen:
+            self.seen.add(value)
+            self.values.append(str(value))
+
+    def finalize(self):
+        return self.separator.join(self.values) if self.values else None
+
+
+# --- Errores ---
+
+_UNIQUE_RE = re.compile(r"UNIQUE constraint failed: (.+)")
+
+def _translate_error(exc, query=''):
+    """Convierte una excepción de sqlite3 en el error de mysql.connector equivalente."""
+    message = str(exc)
+    verb = query.lstrip().split(None, 1)[0].upper() if query.strip() else ''
+    if isinstance(exc, sqlite3.IntegrityError):
+        unique = _UNIQUE_RE.match(message)
+        if unique:
+            columns = [c.strip() for c in unique.group(1).split(',')]
+            key = columns[0] if len(columns) == 1 else 'PRIMARY'
+            return errors.IntegrityError(msg=f"Duplicate entry for key '{key}'", errno=1062, sqlstate='23000')
+        if message.startswith('FOREIGN KEY'):
+            if verb == 'DELETE':
+                return errors.IntegrityError(msg="Cannot delete or update a parent row: a foreign key constraint fails", errno=1451, sqlstate='23000')
+            return errors.IntegrityError(msg="Cannot add or update a child row: a foreign key constraint fails", errno=1452, sqlstate='23000')
+        if message.startswith('NOT NULL'):
+            column = message.rsplit('.', 1)[-1]
+            return errors.IntegrityError(msg=f"Column '{column}' cannot be null", errno=1048, sqlstate='23000')
+        if message.startswith('CHECK'):
+            return errors.DataError(msg=f"Data truncated ({message})", errno=1265, sqlstate='01000')
+        return errors.IntegrityError(msg=message, sqlstate='23000')
+    if isinstance(exc, sqlite3.OperationalError):
+        if 'locked' in message or 'busy' in message:
+            return errors.DatabaseError(msg=f"Lock wait timeout exceeded ({message})", errno=1205, sqlstate='HY000')
+        if message.startswith('no such table'):
+            return errors.ProgrammingError(msg=message, errno=1146, sqlstate='42S02')
+        if message.startswith('no such column'):
+            return errors.ProgrammingError(msg=message, errno=1054, sqlstate='42S22')
+        if 'syntax error' in message:
+            return errors.ProgrammingError(msg=message, errno=1064, sqlstate='42000')
+        return errors.OperationalError(msg=message)
+    if isinstance(exc, sqlite3.ProgrammingError):
+        return errors.ProgrammingError(msg=message)
+    return errors.DatabaseError(msg=message)
+
+
+# --- Conexión y cursor compatibles con mysql-connector ---
+
+class SQLiteCursor:
+    """Cursor de SQLite con la interfaz de los cursores de mysql-connector."""
+    def __init__(self, connection, dictionary=False):
+        self._connection = connection
+        self._cursor = connection._raw.cursor()
+        self._dictionary = dictionary
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def column_names(self):
+        return tuple(col[0] for col in self._cursor.description or ())
+
+    @property
+    def with_rows(self):
+        return self._cursor.description is not None
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def execute(self, operation, params=()):
+        try:
+            self._cursor.execute(translate_query(operation), params or ())
+        except sqlite3.Error as e:
+            raise _translate_error(e, operation) from e
+
+    def executemany(self, operation, seq_params):
+        try:
+            self._cursor.executemany(translate_query(operation), seq_params)
+        except sqlite3.Error as e:
+            raise _translate_error(e, operation) from e
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return dict(zip(self.column_names, row))
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchmany(self, size=1):
+        return [self._row(row) for row in self._cursor.fetchmany(size)]
+
+    def fetchall(self):
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def close(self):
+        self._cursor.close()
+        return True
+
+
+class SQLiteConnection:
+    """Conexión a un archivo SQLite con la interfaz de MySQLConnection."""
+    unread_result = False # SQLite no deja resultados pendientes en el socket
+
+    def __init__(self, raw_connection):
+        self._raw = raw_connection
+
+    @property
+    def in_transaction(self):
+        return self._raw.in_transaction
+
+    def cursor(self, dictionary=False, buffered=None, **kwargs):
+        return SQLiteCursor(self, dictionary=dictionary)
+
+    def commit(self):
+        try:
+            self._raw.commit()
+        except sqlite3.Error as e:
+            raise _translate_error(e) from e
+
+    def rollback(self):
+        self._raw.rollback()
+
+    def start_transaction(self, **kwargs):
+        if not self._raw.in_transaction:
+            self._raw.execute("BEGIN")
+
+    def consume_results(self):
+        pass
+
+    def ping(self, reconnect=False, attempts=1, delay=0):
+        try:
+            self._raw.execute("SELECT 1")
+        except sqlite3.Error as e:
+            raise errors.InterfaceError(msg=f"Conexión SQLite no disponible: {e}") from e
+
+    def is_connected(self):
+        try:
+            self.ping()
+            return True
+        except errors.Error:
+            return False
+
+    def close(self):
+        self._raw.close()
+
+
+def _register_types():
+    # Adaptadores explícitos (los predeterminados de sqlite3 están obsoletos desde 3.12)
+    sqlite3.register_adapter(datetime.date, lambda value: value.isoformat())
+    sqlite3.register_adapter(datetime.datetime, lambda value: value.isoformat(' '))
+    sqlite3.register_converter('DATE', lambda raw: datetime.date.fromisoformat(raw.decode()))
+    sqlite3.register_converter('DATETIME', lambda raw: datetime.datetime.fromisoformat(raw.decode()))
+
+_register_types()
+
+_bootstrapped = set()
+_bootstrap_lock = threading.Lock()
+
+def _bootstrap_schema(raw, path, schema_path):
+    """Crea las tablas de db/database.sql la primera vez que se abre el archivo."""
+    with _bootstrap_lock:
+        if path in _bootstrapped:
+            return
+        exists = raw.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'usuarios'").fetchone()
+        if not exists and schema_path and Path(schema_path).exists():
+            raw.executescript(translate_schema(Path(schema_path).read_text(encoding='utf-8')))
+            print(f"Esquema SQLite creado en '{path}'")
+        _bootstrapped.add(path)
+
+def connect(path, timeout=10, schema=None):
+    """
+    Abre una conexión SQLite compatible con la API de mysql-connector.
+
+    Args:
+        path (str): Ruta del archivo de base de datos (se crea si no existe).
+        timeout (int): Segundos de espera cuando otra conexión tiene el archivo bloqueado.
+        schema (str, optional): Script MySQL con el que crear las tablas si el archivo está vacío.
+
+    Returns:
+        SQLiteConnection: Conexión lista para usar.
+    """
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    try:
+        raw = sqlite3.connect(path, timeout=timeout, detect_types=sqlite3.PARSE_DECLTYPES,
+                              check_same_thread=False) # El pool garantiza un único hilo a la vez
+        raw.execute("PRAGMA foreign_keys = ON")
+        raw.execute("PRAGMA journal_mode = WAL")
+        raw.execute("PRAGMA synchronous = NORMAL")
+        raw.create_function('CONCAT', -1, _concat, deterministic=True)
+        raw.create_function('VERSION', 0, lambda: f"SQLite {sqlite3.sqlite_version}")
+        raw.create_aggregate('MYSQL_GROUP_CONCAT_DISTINCT', 2, _GroupConcatDistinct)
+        _bootstrap_schema(raw, path, schema)
+    except sqlite3.Error as e:
+        raise errors.InterfaceError(msg=f"No se pudo abrir la base de datos SQLite '{path}': {e}") from e
+    return SQLiteConnection(raw)
@@ -0,0 +1,63 @@
+import queue
+import threading
+from tkinter import messagebox, filedialog
+
+EXPORT_FILETYPES = [("Libro de Excel", "*.xlsx"), ("CSV", "*.csv")]
+POLL_INTERVAL_MS = 100
+
+def ask_export_path(title, initialfile):
+    """Pide la ruta del archivo de exportación (.xlsx por defecto). Retorna '' si se cancela."""
+    return filedialog.asksaveasfilename(title=title, initialfile=initialfile, defaultextension=".xlsx",
+                                        filetypes=EXPORT_FILETYPES)
+
+def run_export(widget, export, file_path, button=None, status_label=None, description="filas"):
+    """
+    Ejecuta una exportación de ExportController en un hilo aparte.
+
+    El hilo solo llama a `export`; el avance llega por una cola que se consulta
+    con widget.after(), de modo que todos los cambios en la interfaz ocurren en
+    el hilo de Tk y la ventana sigue respondiendo durante la exportación.
+
+    Args:
+        widget (tk.Widget): Widget sobre el que programar la consulta de la cola.
+        export (callable): export(file_path, progress_callback=...) -> (int, str or None),
+            normalmente un método export_* de ExportController (con los filtros ya aplicados).
+        file_path (str): Ruta del archivo a escribir.
+        button (ttk.Button, optional): Botón que se deshabilita mientras dura la exportación.
+        status_label (ttk.Label, optional): Etiqueta donde mostrar el progreso; al terminar recupera su texto anterior.
+        description (str): Qué se exporta, para los mensajes ("participantes", "proyectos"...).
+    """
+    updates = queue.Queue() # Filas escritas (int) y, al final, el resultado (tuple)
+
+    def worker():
+        updates.put(export(file_path, progress_callback=updates.put))
+
+    def poll():
+        result = None
+        while not updates.empty():
+            item = updates.get_nowait()
+            if isinstance(item, tuple):
+                result = item
+            elif status_label is not None:
+                status_label.config(text=f"Exportando {description}... {item} filas escritas")
+        if result is None:
+            widget.after(POLL_INTERVAL_MS, poll)
+            return
+
+        if button is not None:
+            button.config(state='normal')
+        if status_label is not None:
+            status_label.config(text=previous_status)
+        rows, error = result
+        if error:
+            messagebox.showerror("Error de Exportación", error)
+            return
+        messagebox.showinfo("Exportación Completada", f"Se exportaron {rows} filas de {description} a:\n{file_path}")
+
+    previous_status = status_label.cget('text') if status_label is not None else None
+    if button is not None:
+        button.config(state='disabled')
+    if status_label is not None:
+        status_label.config(text=f"Exportando {description}...")
+    threading.Thread(target=worker, daemon=True).start()
+    widget.after(POLL_INTERVAL_MS, poll)
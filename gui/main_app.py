@@ -6,10 +6,13 @@ from ttkthemes import ThemedTk
 # Importar todos los controladores
 from controllers.user_controller import UserController
 from controllers.participant_controller import ParticipantController
+from controllers.participant_import_controller import ParticipantImportController
 from controllers.subject_controller import SubjectController
 from controllers.period_controller import PeriodController
 from controllers.project_controller import ProjectController
 from controllers.report_controller import ReportController
+from controllers.export_controller import ExportController
+from controllers.dashboard_controller import DashboardController
 from controllers.communication_controller import CommunicationController 
 
 # Importar las vistas y el nuevo BaseScrollableFrame
@@ -20,6 +23,7 @@ from gui.views.dashboard_view import DashboardView
 from gui.views.data_admin_view import DataAdminView 
 from gui.views.report_view import ReportView 
 from gui.views.communication_tools_view import CommunicationToolsView 
+from gui.views.query_stats_view import QueryStatsView
 
 class MainApp(ThemedTk):
     """
@@ -42,10 +46,13 @@ class MainApp(ThemedTk):
         self.controllers = {
             "user_controller": UserController(),
             "participant_controller": ParticipantController(),
+            "participant_import_controller": ParticipantImportController(),
             "subject_controller": SubjectController(),
             "period_controller": PeriodController(),
             "project_controller": ProjectController(),
             "report_controller": ReportController(),
+            "export_controller": ExportController(),
+            "dashboard_controller": DashboardController(),
             "communication_controller": CommunicationController() 
         }
 
@@ -134,6 +141,14 @@ class MainApp(ThemedTk):
         self.title("Herramientas de Comunicación y Certificados") 
         print("Mostrando vista de Herramientas de Comunicación y Certificados.")
 
+    def show_query_stats_view(self):
+        if self.logged_in_user_data and self.logged_in_user_data['rol'] == 'Administrador':
+            self._clear_current_view()
+            self.current_view = QueryStatsView(self.main_container, self)
+            self.current_view.pack(expand=True, fill='both')
+        else:
+            messagebox.showwarning("Acceso Denegado", "Solo los administradores pueden ver el rendimiento de las consultas.")
+
     def logout_and_show_login(self): 
         if self.controllers["user_controller"].logout_user():
             self.logged_in_user_data = None 
@@ -0,0 +1,115 @@
+from controllers.pagination import PAGE_SIZE
+
+class PagedTreeLoader:
+    """
+    Llena un ttk.Treeview por páginas a medida que el usuario se desplaza.
+
+    Se engancha al yscrollcommand del Treeview: cuando la parte visible llega
+    cerca del final de las filas cargadas, pide la página siguiente al
+    controlador con el ID de la última fila como cursor. Si las filas
+    cargadas no llenan el Treeview, sigue pidiendo páginas hasta llenarlo o
+    llegar al final.
+    """
+    LOAD_THRESHOLD = 0.9 # Fracción desplazada a partir de la cual se pide la página siguiente
+
+    def __init__(self, tree, scrollbar, fetch_page, row_values, id_key,
+                 count_total=None, status_label=None, on_error=None, page_size=PAGE_SIZE):
+        """
+        Args:
+            tree (ttk.Treeview): Treeview a llenar.
+            scrollbar (ttk.Scrollbar): Scrollbar vertical del Treeview.
+            fetch_page (callable): fetch_page(after_id, page_size) -> (list of dict, str or None),
+                normalmente un método get_*_page de un controlador.
+            row_values (callable): Convierte una fila (dict) en la tupla de valores del Treeview.
+            id_key (str): Clave de la fila que se usa como cursor (por ejemplo 'id_participante').
+            count_total (callable, optional): count_total() -> (int, str or None), para mostrar el total.
+            status_label (ttk.Label, optional): Etiqueta donde mostrar "Mostrando X de N".
+            on_error (callable, optional): Recibe el mensaje de error si una página no se puede cargar.
+            page_size (int): Filas por página.
+        """
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.fetch_page = fetch_page
+        self.row_values = row_values
+        self.id_key = id_key
+        self.count_total = count_total
+        self.status_label = status_label
+        self.on_error = on_error
+        self.page_size = page_size
+
+        self.after_id = None
+        self.loaded = 0
+        self.total = None
+        self.exhausted = True # Hasta el primer reset() no hay nada que cargar
+        self._load_scheduled = False
+
+        self.tree.configure(yscrollcommand=self._on_yscroll)
+        self.scrollbar.config(command=self.tree.yview)
+
+    def reset(self):
+        """Vacía el Treeview y vuelve a cargar desde la primera página."""
+        for item in self.tree.get_children():
+            self.tree.delete(item)
+        self.after_id = None
+        self.loaded = 0
+        self.total = None
+        self.exhausted = False
+        if self.count_total:
+            total, error = self.count_total()
+            self.total = None if error else total
+        self.load_next_page()
+
+    def show_rows(self, rows, status_text=None):
+        """
+        Reemplaza el contenido del Treeview por `rows` (por ejemplo, resultados de
+        una búsqueda) y deja de cargar páginas hasta el próximo reset().
+        """
+        for item in self.tree.get_children():
+            self.tree.delete(item)
+        self.exhausted = True
+        for row in rows:
+            self.tree.insert("", "end", values=self.row_values(row))
+        if self.status_label and status_text is not None:
+            self.status_label.config(text=status_text)
+
+    def load_next_page(self):
+        """Carga la página siguiente, si queda alguna."""
+        if self.exhausted:
+            return
+        rows, error = self.fetch_page(self.after_id, self.page_size)
+        if error:
+            self.exhausted = True # No reintentar en cada desplazamiento
+            if self.on_error:
+                self.on_error(error)
+            return
+
+        for row in rows:
+            self.tree.insert("", "end", values=self.row_values(row))
+        if rows:
+            self.after_id = rows[-1][self.id_key]
+            self.loaded += len(rows)
+        if len(rows) < self.page_size:
+            self.exhausted = True
+        self._update_status()
+
+    def _on_yscroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if not self.exhausted and not self._load_scheduled and float(last) >= self.LOAD_THRESHOLD:
+            # Fuera del callback: insertar filas vuelve a llamar a yscrollcommand
+            self._load_scheduled = True
+            self.tree.after_idle(self._load_from_scroll)
+
+    def _load_from_scroll(self):
+        self._load_scheduled = False
+        self.load_next_page()
+
+    def _update_status(self):
+        if not self.status_label:
+            return
+        if self.total is not None:
+            text = f"Mostrando {self.loaded} de {max(self.total, self.loaded)}"
+        else:
+            text = f"Mostrando {self.loaded}"
+        if not self.exhausted:
+            text += " (desplácese para cargar más)"
+        self.status_label.config(text=text)
@@ -1,14 +1,25 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import os # Importar para manejar rutas de archivos
+import queue
 import re
+import threading
 
 # Importa las vistas
 from gui.views.email_list_generator_view import EmailListGeneratorView 
 from gui.base_scrollable_frame import BaseScrollableFrame 
+from gui.background_export import POLL_INTERVAL_MS
+
+SEARCH_DELAY_MS = 300 # Pausa al escribir antes de lanzar la búsqueda
 
 # Ahora hereda de BaseScrollableFrame
 class CommunicationToolsView(BaseScrollableFrame): 
+    # Formatos del archivo único de certificados: {nombre: (extensión, tipo de archivo, método del controlador)}
+    ARCHIVE_FORMATS = {
+        "ZIP": (".zip", "Archivo ZIP", "export_certificates_archive"),
+        "PDF": (".pdf", "Documento PDF", "export_certificates_pdf"),
+    }
+
     def __init__(self, master, app_controller_callback):
         super().__init__(master, padding="15 15 15 15") 
         self.master = master
@@ -59,6 +70,7 @@ class CommunicationToolsView(BaseScrollableFrame):
         self.project_search_entry = ttk.Entry(cert_controls_frame)
         self.project_search_entry.pack(expand=True, fill=tk.X, padx=5)
         self.project_search_entry.bind("<KeyRelease>", self._filter_projects_display)
+        self._project_search_job = None # after() pendiente de la búsqueda
 
         # Treeview para mostrar proyectos y sus participantes
         self.projects_tree = ttk.Treeview(self.certificates_tab, columns=("ID", "Nombre Proyecto", "Descripción", "Periodo", "Participantes"), show="headings")
@@ -99,22 +111,69 @@ class CommunicationToolsView(BaseScrollableFrame):
         self.generate_certs_button = ttk.Button(selected_project_frame, text="Generar Certificados Seleccionados", 
                                                 command=self._generate_selected_certificates, style='Accent.TButton')
         self.generate_certs_button.pack(pady=10)
+
+        self.cancel_certs_button = ttk.Button(selected_project_frame, text="Cancelar Generación",
+                                              command=self._cancel_certificate_batch, state='disabled')
+        self.cancel_certs_button.pack(pady=(0, 10))
+
+        self.cert_progress_bar = ttk.Progressbar(selected_project_frame, mode='determinate')
+        self.cert_progress_bar.pack(fill=tk.X, pady=5)
+
+        # Todos los certificados de un período (o del proyecto seleccionado) en un solo archivo:
+        # un ZIP con un certificado por participante y su manifiesto, o un PDF con una página por certificado.
+        # También en una carpeta, un archivo por certificado: volver a generarla solo rehace lo que cambió
+        archive_frame = ttk.LabelFrame(self.certificates_tab, text="Certificados del Período", padding="10")
+        archive_frame.pack(fill=tk.X, pady=10)
+
+        ttk.Label(archive_frame, text="Período:").pack(side=tk.LEFT, padx=5)
+        self.archive_period_combobox = ttk.Combobox(archive_frame, state="readonly", width=25)
+        self.archive_period_combobox.pack(side=tk.LEFT, padx=5)
+        ttk.Label(archive_frame, text="Formato:").pack(side=tk.LEFT, padx=5)
+        self.archive_format_combobox = ttk.Combobox(archive_frame, state="readonly", width=12,
+                                                    values=list(self.ARCHIVE_FORMATS))
+        self.archive_format_combobox.current(0)
+        self.archive_format_combobox.pack(side=tk.LEFT, padx=5)
+        self.archive_period_button = ttk.Button(archive_frame, text="Archivo del Período...",
+                                                command=self._export_period_certificates_archive)
+        self.archive_period_button.pack(side=tk.LEFT, padx=5)
+        self.archive_project_button = ttk.Button(archive_frame, text="Archivo del Proyecto Seleccionado...",
+                                                 command=self._export_project_certificates_archive)
+        self.archive_project_button.pack(side=tk.LEFT, padx=5)
+        self.period_folder_button = ttk.Button(archive_frame, text="Carpeta del Período...",
+                                               command=self._generate_period_certificates_folder)
+        self.period_folder_button.pack(side=tk.LEFT, padx=5)
+        self.archive_periods = []
         
         self.cert_status_label = ttk.Label(self.certificates_tab, text="", foreground="blue")
         self.cert_status_label.pack(pady=5)
+        self.certificate_batch = None # Lote en curso (CertificateBatch)
 
         self.loaded_projects_data = [] # Para almacenar todos los proyectos cargados
         self.selected_project_id = None
         self.selected_project_name = None
-        self.selected_project_participants = [] # Almacena {nombre, cedula, email}
+        self.selected_project_participants = [] # Almacena {id_participante, nombre_completo, cedula, correo_electronico}
+        self.projects_by_id = {} # Proyectos mostrados o cargados, con sus participantes: {id_proyecto: proyecto}
 
         self._load_projects_for_certificates()
+        self._load_archive_periods()
 
 
+    def _load_archive_periods(self):
+        """Carga los períodos del selector del ZIP de certificados."""
+        periods, error = self.communication_controller.get_periods()
+        if error:
+            self.cert_status_label.config(text=f"No se pudieron cargar los períodos: {error}", foreground="red")
+            return
+        self.archive_periods = periods
+        self.archive_period_combobox['values'] = [p['nombre_periodo'] for p in periods]
+        if periods:
+            self.archive_period_combobox.current(0)
+
     def _load_projects_for_certificates(self):
         """Carga los proyectos en el Treeview para la generación de certificados."""
         self.projects_tree.delete(*self.projects_tree.get_children())
         self.loaded_projects_data = []
+        self.projects_by_id = {}
         
         projects, error = self.communication_controller.get_projects_for_certificates()
         if error:
@@ -127,30 +186,40 @@ class CommunicationToolsView(BaseScrollableFrame):
     def _display_projects(self, projects_list):
         self.projects_tree.delete(*self.projects_tree.get_children())
         for p in projects_list:
-            # Mantener la cadena original del controlador aquí.
-            # El Treeview la mostrará como una sola línea si la columna es ancha,
-            # o el desborde horizontal si es más estrecha.
-            self.projects_tree.insert("", tk.END, values=(
+            # Cada fila se identifica por el ID del proyecto; al seleccionarla, sus participantes
+            # se toman de projects_by_id en lugar de leerlos del texto de la columna
+            self.projects_by_id[p['id_proyecto']] = p
+            self.projects_tree.insert("", tk.END, iid=str(p['id_proyecto']), values=(
                 p['id_proyecto'],
                 p['nombre_proyecto'],
                 p['descripcion'],
                 p['nombre_periodo'],
-                p['participantes_info'] # <-- ¡CAMBIO AQUÍ! No .replace('\n')
+                p['participantes_info']
             ))
 
     def _filter_projects_display(self, event=None):
-        """Filtra los proyectos visibles en el Treeview según el texto de búsqueda."""
-        search_term = self.project_search_entry.get().lower()
-        
-        filtered_projects = []
-        for p in self.loaded_projects_data:
-            if search_term in str(p['nombre_proyecto']).lower() or \
-               search_term in str(p['descripcion']).lower() or \
-               search_term in str(p['nombre_periodo']).lower() or \
-               search_term in str(p['participantes_info']).lower():
-                filtered_projects.append(p)
-        
-        self._display_projects(filtered_projects)
+        """
+        Programa la búsqueda de proyectos tras una pausa al escribir, para no
+        consultar la base de datos en cada tecla.
+        """
+        if self._project_search_job is not None:
+            self.after_cancel(self._project_search_job)
+        self._project_search_job = self.after(SEARCH_DELAY_MS, self._search_projects)
+
+    def _search_projects(self):
+        """Muestra los proyectos que coinciden con el texto de búsqueda (índice de texto completo), o todos si está vacío."""
+        self._project_search_job = None
+        search_term = self.project_search_entry.get().strip()
+        if not search_term:
+            self._display_projects(self.loaded_projects_data)
+            return
+
+        projects, error = self.communication_controller.search_projects_for_certificates(search_term)
+        if error:
+            self.cert_status_label.config(text=f"Error al buscar proyectos: {error}", foreground="red")
+            return
+        self.cert_status_label.config(text="")
+        self._display_projects(projects)
 
     def _on_project_select(self, event):
         selected_item = self.projects_tree.focus()
@@ -164,112 +233,11 @@ class CommunicationToolsView(BaseScrollableFrame):
             self.selected_participants_text.config(state=tk.DISABLED)
             return
 
-        values = self.projects_tree.item(selected_item, 'values')
-        self.selected_project_id = values[0]
-        self.selected_project_name = values[1]
+        project = self.projects_by_id[int(selected_item)]
+        self.selected_project_id = project['id_proyecto']
+        self.selected_project_name = project['nombre_proyecto']
         self.selected_project_name_label.config(text=self.selected_project_name)
-
-        participants_info_str = values[4] # Esta cadena ya tiene el '\n' si lo pusiste en _display_projects
-        parsed_participants = []
-
-        if participants_info_str and participants_info_str != "N/A":
-            # La expresión regular debe ser más flexible para el email (puede ser un email o 'N/A')
-            # Usaremos una regex que coincida con el patrón de cada participante
-            # y re.findall para obtener todas las ocurrencias.
-            # Capturamos: Nombre Completo, CI, Email (que puede ser 'N/A' o un email real)
-            # patron_participante = re.compile(r"(.+?)\s+\(CI:\s*([\w\d]+)\s*-\s*([^)]+)\)")
-            
-            # Ajuste de la regex para que sea más robusta:
-            # (.+?) - Captura el nombre completo (no codicioso)
-            # \s+\(CI:\s* - Espacios, "(CI:", espacios
-            # ([\w\d]+) - Captura la cédula (letras o dígitos, uno o más)
-            # \s*-\s* - Espacios, "-", espacios
-            # (?:([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})|N/A) - **GRUPO SIN CAPTURA (?:...)**
-            #                                                               **Alternativa (email O N/A)**
-            #                                                                  Captura un email O la cadena "N/A"
-            # \) - Literal ")"
-            
-            # Vamos a usar una regex que capture la información dentro de los paréntesis para el email/N/A
-            # y luego decodificarlo.
-
-            # REFINAMIENTO CRÍTICO DE LA REGEX:
-            # Captura 1: Nombre completo
-            # Captura 2: Cédula
-            # Captura 3: Contenido del email (puede ser un email real o 'N/A')
-            # Usamos re.MULTILINE si la cadena de entrada del Treeview puede tener saltos de línea reales.
-            # Sin embargo, el split anterior ya manejaba eso.
-            # Lo más seguro es que el string `participants_info_str` venga con '\n' si así se insertó.
-            # Necesitamos que la regex funcione por CADA LÍNEA del Treeview.
-            
-            # El problema es que values[4] ahora contiene saltos de línea si se usó .replace('; ', '\n')
-            # Necesitamos que el findall trabaje sobre cada línea o que la regex sea multilínea.
-            # Mejor, volvemos a hacer el split por '\n' o '; ' para procesar cada item individualmente.
-            
-            # La cadena participants_info_str ya tiene '\n' si se usó en _display_projects
-            # Si se usó .replace('; ', '\n') en _display_projects, la cadena se verá así:
-            # "Carlos Reyes (CI: 99999999 - carlos.r@example.com)\nCarlos Reyes (CI: 99999999 - carlos.r@example.com)\nJuan 2 Juan 2 (CI: 67654321 - None)"
-
-            # Por lo tanto, el split debe ser por '\n' o por el separador original si no se hizo replace.
-            # Recomiendo que en _display_projects NO se haga el .replace('\n') al insertar en Treeview,
-            # y que el split sea por '; ' aquí. Así, values[4] siempre es la cadena del controlador.
-
-            # VOLVEMOS A LA SOLUCIÓN ANTERIOR DEL CONTROLADOR Y VISTA:
-            # La cadena del controlador es "PART1; PART2; PART3".
-            # La columna del Treeview la muestra con \n por el _display_projects.
-            # Cuando values[4] se recupera, puede que el Treeview ya haya "interpretado" los \n.
-            # Es mejor parsear la cadena original del controlador.
-
-            # Revertir la línea en _display_projects para que no cambie el string:
-            # self.projects_tree.insert("", tk.END, values=(..., p['participantes_info'])) # NO participants_display
-
-            # Y aquí en _on_project_select:
-            # Usa la regex para encontrar CADA PATRÓN de participante en la cadena original
-            # independientemente de si tiene '; ' o '\n'.
-            
-            # La regex para encontrar cada participante:
-            # (.+?) => Nombre completo (cualquier cosa no codiciosa hasta el siguiente patrón)
-            # \s+\(CI:\s* => Espacio, (CI:, espacio
-            # ([\w\d]+) => Cédula (letras o dígitos)
-            # \s*-\s* => Espacio, -, espacio
-            # (.*?)\) => Email o 'N/A' o lo que sea que esté antes del paréntesis de cierre (no codicioso)
-            #            (.*?): esto es crucial para capturar "None" o "N/A"
-            patron_participante_robusto = re.compile(r"(.+?)\s+\(CI:\s*([\w\d]+)\s*-\s*(.*?)\)")
-
-            # Usamos findall en la cadena completa. Esto es más robusto que split + loop + search.
-            # re.findall devolverá una lista de tuplas.
-            matches = patron_participante_robusto.findall(participants_info_str)
-
-            if matches:
-                for match in matches:
-                    nombre_completo = match[0].strip()
-                    cedula = match[1].strip()
-                    email_raw = match[2].strip() # Esto puede ser un email, 'None', o 'N/A'
-
-                    parsed_participants.append({
-                        "nombre_completo": nombre_completo,
-                        "cedula": cedula,
-                        "email": email_raw # Guardamos el raw email para los certificados
-                    })
-            else:
-                # Fallback si no se encuentra ningún patrón.
-                # Esto es para asegurar que al menos el nombre se muestre si el formato es totalmente inesperado.
-                if participants_info_str and participants_info_str != "N/A":
-                    messagebox.showwarning("Advertencia de Parseo", 
-                                           "No se pudieron extraer los detalles completos de los participantes. "
-                                           "Mostrando nombres parciales. Verifique el formato de la DB.")
-                    # Intenta dividir por el separador del controlador y mostrar nombres básicos
-                    temp_parts = participants_info_str.split('; ')
-                    for part in temp_parts:
-                        # Extraer solo lo que parece un nombre antes del primer paréntesis
-                        name_match = re.match(r"(.+?)(?:\s+\(|;|$)", part)
-                        nombre_basico = name_match.group(1).strip() if name_match else part.strip()
-                        parsed_participants.append({
-                            "nombre_completo": nombre_basico,
-                            "cedula": "N/A", # No se pudo parsear
-                            "email": "N/A" # No se pudo parsear
-                        })
-        
-        self.selected_project_participants = parsed_participants
+        self.selected_project_participants = project['participantes']
 
         self.selected_participants_text.config(state=tk.NORMAL)
         self.selected_participants_text.delete("1.0", tk.END)
@@ -281,7 +249,7 @@ class CommunicationToolsView(BaseScrollableFrame):
         self.selected_participants_text.config(state=tk.DISABLED)
 
     def _generate_selected_certificates(self):
-        """Genera certificados para los participantes del proyecto seleccionado."""
+        """Genera en segundo plano los certificados de los participantes del proyecto seleccionado."""
         if not self.selected_project_id:
             messagebox.showwarning("Selección Requerida", "Por favor, selecciona un proyecto para generar certificados.")
             return
@@ -290,8 +258,9 @@ class CommunicationToolsView(BaseScrollableFrame):
             messagebox.showwarning("No Participantes", "El proyecto seleccionado no tiene participantes asociados para generar certificados.")
             return
 
-        self.cert_status_label.config(text="Generando certificados...", foreground="blue")
-        self.update_idletasks() # Actualiza la UI para mostrar el mensaje
+        if self.certificate_batch is not None and not self.certificate_batch.finished:
+            messagebox.showwarning("Generación en Curso", "Espera a que termine (o cancela) la generación de certificados en curso.")
+            return
 
         template_path = os.path.join(os.path.dirname(__file__), "..", "..", "Formato.pptx") # Ajusta esta ruta si Formato.pptx no está en la raíz del proyecto
         template_path = os.path.abspath(template_path) # Obtener la ruta absoluta
@@ -299,41 +268,171 @@ class CommunicationToolsView(BaseScrollableFrame):
         output_dir = os.path.join(os.path.dirname(__file__), "..", "..", "certificados_generados")
         output_dir = os.path.abspath(output_dir)
 
-        generated_count = 0
-        failed_count = 0
-        failed_certs = []
-
-        for participant in self.selected_project_participants:
-            if participant['nombre_completo'] and participant['cedula']: # Asegurarse de tener los datos mínimos
-                cert_path, error = self.communication_controller.generate_certificate(
-                    participant_name=participant['nombre_completo'],
-                    participant_ci=participant['cedula'],
-                    project_name=self.selected_project_name,
-                    template_path=template_path,
-                    output_dir=output_dir
-                )
-                if cert_path:
-                    generated_count += 1
-                else:
-                    failed_count += 1
-                    failed_certs.append(f"{participant['nombre_completo']}: {error}")
-            else:
-                failed_count += 1
-                failed_certs.append(f"{participant['nombre_completo']}: Información incompleta (Nombre o Cédula).")
+        # Los certificados se generan en otros procesos; el progreso se consulta con after()
+        batch, error = self.communication_controller.start_certificate_batch(
+            self.selected_project_participants, self.selected_project_name, template_path, output_dir,
+            project_id=self.selected_project_id)
+        if error:
+            messagebox.showerror("Error en la Generación", error)
+            return
+        self._watch_certificate_batch(batch)
+
+    def _generate_period_certificates_folder(self):
+        """Genera en una carpeta, en segundo plano, los certificados de todos los proyectos del período elegido."""
+        index = self.archive_period_combobox.current()
+        if index < 0:
+            messagebox.showwarning("Selección Requerida", "Por favor, selecciona un período.")
+            return
+        if self.certificate_batch is not None and not self.certificate_batch.finished:
+            messagebox.showwarning("Generación en Curso", "Espera a que termine (o cancela) la generación de certificados en curso.")
+            return
+        output_dir = filedialog.askdirectory(title="Carpeta de los Certificados", mustexist=False)
+        if not output_dir:
+            return
 
+        period = self.archive_periods[index]
+        template_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "Formato.pptx"))
+        batch, error = self.communication_controller.start_period_certificate_batch(period['id_periodo'], template_path, output_dir)
+        if error:
+            messagebox.showerror("Error en la Generación", error)
+            return
+        self._watch_certificate_batch(batch)
+
+    def _watch_certificate_batch(self, batch):
+        """Muestra el progreso de un lote de certificados recién iniciado."""
+        self.certificate_batch = batch
+        self.generate_certs_button.config(state='disabled')
+        self.period_folder_button.config(state='disabled')
+        self.cancel_certs_button.config(state='normal')
+        self.cert_progress_bar.config(maximum=batch.total, value=0)
+        self.cert_status_label.config(text=f"Generando certificados... 0/{batch.total}", foreground="blue")
+        self.after(POLL_INTERVAL_MS, self._poll_certificate_batch, batch)
+
+    def _cancel_certificate_batch(self):
+        """Cancela los certificados que aún no empezaron a generarse."""
+        if self.certificate_batch is not None:
+            self.certificate_batch.cancel()
+            self.cancel_certs_button.config(state='disabled')
+            self.cert_status_label.config(text="Cancelando la generación de certificados...", foreground="blue")
+
+    def _poll_certificate_batch(self, batch):
+        """Muestra el progreso del lote de certificados y, cuando termina, su resumen."""
+        summary = None
+        for event in batch.drain_events():
+            if event[0] == 'fin':
+                summary = event[1]
+        self.cert_progress_bar.config(value=batch.processed)
+        if summary is None:
+            if not batch.cancelled:
+                self.cert_status_label.config(text=f"Generando certificados... {batch.processed}/{batch.total}", foreground="blue")
+            self.after(POLL_INTERVAL_MS, self._poll_certificate_batch, batch)
+            return
 
-        if generated_count > 0:
-            messagebox.showinfo("Generación Completa", 
-                                f"Se generaron {generated_count} certificado(s) exitosamente en:\n{output_dir}")
+        self.generate_certs_button.config(state='normal')
+        self.period_folder_button.config(state='normal')
+        self.cancel_certs_button.config(state='disabled')
+        generated_count = len(summary['generados'])
+        skipped_count = len(summary['omitidos'])
+        failed_count = len(summary['fallidos'])
+        cancelled_count = summary['cancelados']
+        failed_certs = [f"{name}: {error}" for name, error in summary['fallidos']]
+        status = f"Creados: {generated_count}, Sin cambios: {skipped_count}, Fallidos: {failed_count}"
+        if cancelled_count:
+            status += f", Cancelados: {cancelled_count}"
+
+        if generated_count > 0 or (skipped_count > 0 and not cancelled_count):
+            message = f"Se generaron {generated_count} certificado(s) exitosamente en:\n{summary['directorio']}"
+            if skipped_count:
+                message += f"\n\n{skipped_count} certificado(s) ya estaban generados y sin cambios; no se volvieron a generar."
+            messagebox.showinfo("Generación Completa", message)
             if failed_count > 0:
                 messagebox.showwarning("Errores en la Generación", 
                                        f"Fallaron {failed_count} certificado(s):\n" + "\n".join(failed_certs))
-            self.cert_status_label.config(text=f"Generación completada. Creados: {generated_count}, Fallidos: {failed_count}", foreground="green")
-        else:
+            self.cert_status_label.config(text=f"Generación completada. {status}", foreground="green")
+        elif failed_count > 0:
             messagebox.showerror("Error en la Generación", 
                                   f"No se pudo generar ningún certificado. Fallaron {failed_count} certificado(s):\n" + "\n".join(failed_certs))
             self.cert_status_label.config(text="Error: No se pudo generar ningún certificado.", foreground="red")
+        else:
+            self.cert_status_label.config(text=f"Generación cancelada. {status}", foreground="blue")
+
+    def _export_period_certificates_archive(self):
+        """Genera en un solo archivo los certificados de todos los proyectos del período elegido."""
+        index = self.archive_period_combobox.current()
+        if index < 0:
+            messagebox.showwarning("Selección Requerida", "Por favor, selecciona un período.")
+            return
+        period = self.archive_periods[index]
+        self._export_certificates_archive(f"Certificados_{period['nombre_periodo']}", period_id=period['id_periodo'])
 
+    def _export_project_certificates_archive(self):
+        """Genera en un solo archivo los certificados del proyecto seleccionado."""
+        if not self.selected_project_id:
+            messagebox.showwarning("Selección Requerida", "Por favor, selecciona un proyecto para generar certificados.")
+            return
+        self._export_certificates_archive(f"Certificados_{self.selected_project_name}",
+                                          project_ids=[self.selected_project_id])
+
+    def _export_certificates_archive(self, initialfile, **filters):
+        """
+        Pide la ruta del archivo en el formato elegido y lo genera en un hilo aparte;
+        el progreso se consulta con after().
+        """
+        file_format = self.archive_format_combobox.get()
+        extension, file_type, export_method_name = self.ARCHIVE_FORMATS[file_format]
+        archive_path = filedialog.asksaveasfilename(title="Guardar Certificados",
+                                                    initialfile=re.sub(r'[\\/*?:"<>|]', '', initialfile) + extension,
+                                                    defaultextension=extension, filetypes=[(file_type, f"*{extension}")])
+        if not archive_path:
+            return
+
+        template_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "Formato.pptx"))
+        export = getattr(self.communication_controller, export_method_name)
+        updates = queue.Queue() # Certificados procesados (int) y, al final, el resultado (tuple)
+
+        def worker():
+            updates.put(export(archive_path, template_path=template_path, progress_callback=updates.put, **filters))
+
+        self.archive_period_button.config(state='disabled')
+        self.archive_project_button.config(state='disabled')
+        self.cert_status_label.config(text=f"Generando el {file_format} de certificados...", foreground="blue")
+        threading.Thread(target=worker, daemon=True).start()
+        self.after(POLL_INTERVAL_MS, self._poll_certificates_archive, updates, file_format)
+
+    def _poll_certificates_archive(self, updates, file_format):
+        """Muestra el progreso del archivo de certificados y, cuando termina, su resumen."""
+        result = None
+        while not updates.empty():
+            item = updates.get_nowait()
+            if isinstance(item, tuple):
+                result = item
+            else:
+                self.cert_status_label.config(text=f"Generando el {file_format} de certificados... {item} procesados",
+                                              foreground="blue")
+        if result is None:
+            self.after(POLL_INTERVAL_MS, self._poll_certificates_archive, updates, file_format)
+            return
+
+        self.archive_period_button.config(state='normal')
+        self.archive_project_button.config(state='normal')
+        summary, error = result
+        if error:
+            self.cert_status_label.config(text=f"Error: {error}", foreground="red")
+            messagebox.showerror("Error en la Generación", error)
+            return
+
+        failed_count = len(summary['fallidos'])
+        self.cert_status_label.config(text=f"{file_format} generado. Creados: {summary['certificados']}, Fallidos: {failed_count}",
+                                      foreground="green")
+        message = f"Se generaron {summary['certificados']} certificado(s) en:\n{summary['archivo']}"
+        if file_format == "ZIP":
+            message += "\n\nEl archivo incluye manifiesto.csv con el certificado de cada participante."
+        if failed_count:
+            failed_certs = [f"{name}: {error}" for name, error in summary['fallidos']]
+            messagebox.showwarning("Generación con Errores",
+                                   message + f"\n\nFallaron {failed_count} certificado(s):\n" + "\n".join(failed_certs[:20]))
+        else:
+            messagebox.showinfo("Generación Completa", message)
 
     # Mantén los métodos existentes de email_list_generator_view que se copiaron aquí
     # (e.g., _load_periods, _load_recipients, _display_recipients, etc.)
@@ -348,10 +447,4 @@ class CommunicationToolsView(BaseScrollableFrame):
     # NO DEBEN ESTAR EN CommunicationToolsView si ya están en EmailListGeneratorView.
     # Asegúrate de que EmailListGeneratorView herede correctamente de BaseScrollableFrame
     # y que estos métodos estén en EmailListGeneratorView.
-    # La CommunicationToolsView solo necesita los métodos relacionados con el notebook y la pestaña de certificados.    
-        self.email_list_generator_view.pack(expand=True, fill='both')
-
-        # Pestaña para Generación de Certificados (aún vacía)
-        self.certificates_tab = ttk.Frame(self.notebook)
-        self.notebook.add(self.certificates_tab, text="Generar Certificados")
-        ttk.Label(self.certificates_tab, text="¡Aquí irán las opciones para generar certificados!").pack(pady=50)
\ No newline at end of file
+    # La CommunicationToolsView solo necesita los métodos relacionados con el notebook y la pestaña de certificados.
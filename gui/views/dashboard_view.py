@@ -1,27 +1,37 @@
 # gui/views/dashboard_view.py
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, messagebox
 from .background_image_frame import BackgroundImageFrame
 
 class DashboardView(BackgroundImageFrame):
     """
     Vista principal de la aplicación después del login.
-    Contiene botones para navegar a las diferentes secciones (Administrador de Datos, Reportes, Comunicación).
+    Contiene botones para navegar a las diferentes secciones (Administrador de Datos, Reportes, Comunicación)
+    y un resumen con los totales de proyectos y participantes.
     """
+    ALL_PERIODS_LABEL = "Todos los períodos"
+
     def __init__(self, master, app_controller_callback, user_role=None):
         super().__init__(master)
         self.master = master
         self.app_controller_callback = app_controller_callback
         self.user_role = user_role 
+        self.dashboard_controller = self.app_controller_callback.controllers["dashboard_controller"]
+        self.period_controller = self.app_controller_callback.controllers["period_controller"]
+        self.period_names_to_ids = {self.ALL_PERIODS_LABEL: None}
 
         self.setup_ui()
+        self._load_periods()
+        self.refresh_stats()
 
     def setup_ui(self):
         self.pack(expand=True, fill='both', padx=20, pady=20)
 
         welcome_label = ttk.Label(self, text=f"Bienvenido al Dashboard {self.user_role if self.user_role else ''}", 
                                   font=("Arial", 24, "bold"))
-        welcome_label.pack(pady=40)
+        welcome_label.pack(pady=(40, 20))
+
+        self._setup_stats_panel()
 
         buttons_frame = ttk.Frame(self)
         buttons_frame.pack(pady=20)
@@ -44,6 +54,13 @@ class DashboardView(BackgroundImageFrame):
                                           width=30)
         communication_button.pack(pady=10)
         # -----------------------------------------------
+
+        # Botón de Rendimiento de Consultas (solo administradores)
+        if self.user_role == 'Administrador':
+            query_stats_button = ttk.Button(buttons_frame, text="Rendimiento de Consultas",
+                                            command=self.show_query_stats,
+                                            width=30)
+            query_stats_button.pack(pady=10)
         
         # Botón de Cerrar Sesión
         logout_button = ttk.Button(self, text="Cerrar Sesión", 
@@ -51,6 +68,72 @@ class DashboardView(BackgroundImageFrame):
                                    width=20)
         logout_button.pack(side=tk.BOTTOM, pady=20)
 
+    def _setup_stats_panel(self):
+        stats_frame = ttk.LabelFrame(self, text="Resumen", padding=10)
+        stats_frame.pack(fill='x', padx=40)
+
+        header_frame = ttk.Frame(stats_frame)
+        header_frame.pack(fill='x')
+        ttk.Label(header_frame, text="Período:").pack(side='left')
+        self.stats_period_combobox = ttk.Combobox(header_frame, state="readonly", width=25)
+        self.stats_period_combobox.pack(side='left', padx=5)
+        self.stats_period_combobox.bind("<<ComboboxSelected>>", lambda event: self.refresh_stats())
+        ttk.Button(header_frame, text="Actualizar", command=self.refresh_stats).pack(side='left', padx=5)
+        self.stats_totals_label = ttk.Label(header_frame, text="", font=("Arial", 11, "bold"))
+        self.stats_totals_label.pack(side='right')
+
+        tables_frame = ttk.Frame(stats_frame)
+        tables_frame.pack(fill='x', pady=(10, 0))
+        self.stats_subject_tree = self._create_stats_tree(tables_frame, "Proyectos por materia", "Materia", "Proyectos")
+        self.stats_period_tree = self._create_stats_tree(tables_frame, "Proyectos por período", "Período", "Proyectos")
+        self.stats_career_tree = self._create_stats_tree(tables_frame, "Participantes por carrera", "Carrera", "Participantes")
+
+    def _create_stats_tree(self, parent, title, name_heading, total_heading):
+        frame = ttk.LabelFrame(parent, text=title, padding=5)
+        frame.pack(side='left', fill='both', expand=True, padx=5)
+        tree = ttk.Treeview(frame, columns=("Nombre", "Total"), show="headings", height=5)
+        tree.heading("Nombre", text=name_heading)
+        tree.heading("Total", text=total_heading)
+        tree.column("Nombre", width=160, stretch=tk.YES)
+        tree.column("Total", width=80, anchor='e', stretch=tk.NO)
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side='right', fill='y')
+        tree.pack(fill='both', expand=True)
+        return tree
+
+    def _load_periods(self):
+        periods, error = self.period_controller.get_all_system_periods()
+        if error:
+            messagebox.showerror("Error de Carga", f"No se pudieron cargar los períodos: {error}")
+            periods = []
+        for p in periods:
+            self.period_names_to_ids[p['nombre_periodo']] = p['id_periodo']
+        self.stats_period_combobox['values'] = list(self.period_names_to_ids.keys())
+        self.stats_period_combobox.set(self.ALL_PERIODS_LABEL)
+
+    def refresh_stats(self):
+        """Vuelve a leer las estadísticas del período seleccionado (lecturas de las tablas de resumen)."""
+        period_id = self.period_names_to_ids.get(self.stats_period_combobox.get())
+        stats, error = self.dashboard_controller.get_dashboard_stats(period_id)
+        if error:
+            self.stats_totals_label.config(text=error)
+            return
+
+        self.stats_totals_label.config(
+            text=f"Proyectos: {stats['total_proyectos']}   Estudiantes: {stats['estudiantes']}   Docentes: {stats['docentes']}")
+        self._fill_stats_tree(self.stats_subject_tree,
+                              [(row['nombre_materia'], row['total_proyectos']) for row in stats['proyectos_por_materia']])
+        self._fill_stats_tree(self.stats_period_tree,
+                              [(row['nombre_periodo'], row['total_proyectos']) for row in stats['proyectos_por_periodo']])
+        self._fill_stats_tree(self.stats_career_tree,
+                              [(row['carrera'] or "Sin carrera", row['total_participantes']) for row in stats['participantes_por_carrera']])
+
+    def _fill_stats_tree(self, tree, rows):
+        tree.delete(*tree.get_children())
+        for name, total in rows:
+            tree.insert("", "end", values=(name, total))
+
     def show_data_admin(self):
         """
         Maneja la acción del botón 'Administrar Datos'.
@@ -73,4 +156,12 @@ class DashboardView(BackgroundImageFrame):
         Llama al método correspondiente en el controlador principal.
         """
         print("Navegando a Herramientas de Comunicación y Certificados...")
-        self.app_controller_callback.show_communication_tools_view() # ¡Nueva llamada!
\ No newline at end of file
+        self.app_controller_callback.show_communication_tools_view() # ¡Nueva llamada!
+
+    def show_query_stats(self):
+        """
+        Maneja la acción del botón 'Rendimiento de Consultas'.
+        Llama al método correspondiente en el controlador principal.
+        """
+        print("Navegando a Rendimiento de Consultas...")
+        self.app_controller_callback.show_query_stats_view()
\ No newline at end of file
@@ -1,7 +1,9 @@
 # gui/views/data_admin_view.py
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
+import queue
 import sys
+import threading
 from datetime import datetime
 
 # Importar los controladores necesarios
@@ -10,6 +12,8 @@ from controllers.participant_controller import ParticipantController
 from controllers.subject_controller import SubjectController
 from controllers.period_controller import PeriodController
 from controllers.project_controller import ProjectController
+from gui.paged_tree_loader import PagedTreeLoader
+from gui.background_export import ask_export_path, run_export
 
 class DataAdminView(tk.Frame):
     def __init__(self, master, app_controller_callback, user_role=None):
@@ -33,6 +37,8 @@ class DataAdminView(tk.Frame):
         # pero es mejor que el controlador principal los inyecte.
         self.user_controller = self.app_controller_callback.controllers["user_controller"]
         self.participant_controller = self.app_controller_callback.controllers["participant_controller"]
+        self.participant_import_controller = self.app_controller_callback.controllers["participant_import_controller"]
+        self.export_controller = self.app_controller_callback.controllers["export_controller"]
         self.subject_controller = self.app_controller_callback.controllers["subject_controller"]
         self.period_controller = self.app_controller_callback.controllers["period_controller"]
         self.project_controller = self.app_controller_callback.controllers["project_controller"]
@@ -179,6 +185,26 @@ class DataAdminView(tk.Frame):
 
         self.user_tree.bind("<<TreeviewSelect>>", self._load_user_data_to_form)
 
+        # Los usuarios se cargan por páginas a medida que se desplaza la lista
+        self.user_status_label = ttk.Label(self.user_tab, text="")
+        self.user_status_label.pack(anchor='w')
+        self.user_loader = PagedTreeLoader(
+            self.user_tree, scrollbar,
+            fetch_page=lambda after_id, size: self.user_controller.get_users_page(after_id, size),
+            row_values=lambda user: (
+                user.get('id_usuario'),
+                user.get('nombre_usuario'),
+                user.get('rol'),
+                user.get('nombre_completo', ''),
+                user.get('correo_electronico', ''),
+                "Sí" if user.get('activo') else "No"
+            ),
+            id_key='id_usuario',
+            count_total=self.user_controller.count_system_users,
+            status_label=self.user_status_label,
+            on_error=lambda error: messagebox.showerror("Error de Carga", f"No se pudieron cargar los usuarios: {error}")
+        )
+
         input_frame = ttk.LabelFrame(self.user_tab, text="Detalles del Usuario", padding=15)
         input_frame.pack(pady=20, fill='x', expand=False) 
 
@@ -219,27 +245,20 @@ class DataAdminView(tk.Frame):
         ttk.Button(buttons_frame, text="Editar Usuario", command=self._edit_user).pack(side='left', padx=5)
         ttk.Button(buttons_frame, text="Eliminar Usuario", command=self._delete_user).pack(side='left', padx=5)
         ttk.Button(buttons_frame, text="Limpiar Campos", command=self._clear_user_form).pack(side='left', padx=5)
+        self.export_users_button = ttk.Button(buttons_frame, text="Exportar...", command=self._export_users)
+        self.export_users_button.pack(side='left', padx=5)
 
 
     def load_user_data(self):
-        # ... (Tu código de carga de usuarios) ...
-        for item in self.user_tree.get_children():
-            self.user_tree.delete(item)
-        
-        users, error = self.user_controller.get_all_system_users()
-        if error:
-            messagebox.showerror("Error de Carga", f"No se pudieron cargar los usuarios: {error}")
-            return
+        """Recarga la lista de usuarios desde la primera página."""
+        self.user_loader.reset()
 
-        for user in users:
-            self.user_tree.insert("", "end", values=(
-                user.get('id_usuario'), 
-                user.get('nombre_usuario'), 
-                user.get('rol'), 
-                user.get('nombre_completo', ''),
-                user.get('correo_electronico', ''),
-                "Sí" if user.get('activo') else "No"
-            ))
+    def _export_users(self):
+        """Exporta todos los usuarios a XLSX o CSV en segundo plano."""
+        file_path = ask_export_path("Exportar Usuarios", "usuarios.xlsx")
+        if file_path:
+            run_export(self, self.export_controller.export_users, file_path,
+                       button=self.export_users_button, status_label=self.user_status_label, description="usuarios")
 
     def _load_user_data_to_form(self, event):
         # ... (Tu código de carga de datos a formulario de usuarios) ...
@@ -402,6 +421,28 @@ class DataAdminView(tk.Frame):
 
         self.participant_tree.bind("<<TreeviewSelect>>", self._load_participant_data_to_form)
 
+        # Los participantes se cargan por páginas a medida que se desplaza la lista
+        self.participant_status_label = ttk.Label(self.participant_tab, text="")
+        self.participant_status_label.pack(anchor='w')
+        self.participant_loader = PagedTreeLoader(
+            self.participant_tree, scrollbar,
+            fetch_page=lambda after_id, size: self.participant_controller.get_participants_page(after_id, size),
+            row_values=lambda p: (
+                p.get('id_participante'),
+                p.get('tipo_participante'),
+                p.get('nombre'),
+                p.get('apellido'),
+                p.get('cedula', ''),
+                p.get('correo_electronico', ''),
+                p.get('telefono', ''),
+                p.get('carrera', '')
+            ),
+            id_key='id_participante',
+            count_total=self.participant_controller.count_system_participants,
+            status_label=self.participant_status_label,
+            on_error=lambda error: messagebox.showerror("Error de Carga", f"No se pudieron cargar los participantes: {error}")
+        )
+
         input_frame = ttk.LabelFrame(self.participant_tab, text="Detalles del Participante", padding=15)
         input_frame.pack(pady=20, fill='x', expand=False) 
 
@@ -445,28 +486,78 @@ class DataAdminView(tk.Frame):
         ttk.Button(buttons_frame, text="Editar Participante", command=self._edit_participant).pack(side='left', padx=5)
         ttk.Button(buttons_frame, text="Eliminar Participante", command=self._delete_participant).pack(side='left', padx=5)
         ttk.Button(buttons_frame, text="Limpiar Campos", command=self._clear_participant_form).pack(side='left', padx=5)
+        self.import_participants_button = ttk.Button(buttons_frame, text="Importar desde Archivo...", command=self._import_participants)
+        self.import_participants_button.pack(side='left', padx=5)
+        self.export_participants_button = ttk.Button(buttons_frame, text="Exportar...", command=self._export_participants)
+        self.export_participants_button.pack(side='left', padx=5)
 
     def load_participant_data(self):
-        # ... (Tu código de carga de participantes) ...
-        for item in self.participant_tree.get_children():
-            self.participant_tree.delete(item)
-        
-        participants, error = self.participant_controller.get_all_system_participants()
+        """Recarga la lista de participantes desde la primera página."""
+        self.participant_loader.reset()
+
+    def _export_participants(self):
+        """Exporta todos los participantes a XLSX o CSV en segundo plano."""
+        file_path = ask_export_path("Exportar Participantes", "participantes.xlsx")
+        if file_path:
+            run_export(self, self.export_controller.export_participants, file_path,
+                       button=self.export_participants_button, status_label=self.participant_status_label,
+                       description="participantes")
+
+    def _import_participants(self):
+        """
+        Importa participantes desde un archivo CSV o XLSX.
+        La importación corre en un hilo aparte para no congelar la interfaz;
+        el progreso se consulta periódicamente con after().
+        """
+        file_path = filedialog.askopenfilename(title="Importar Participantes",
+                                               filetypes=[("Hojas de cálculo", "*.xlsx *.csv"), ("Excel", "*.xlsx"), ("CSV", "*.csv")])
+        if not file_path:
+            return
+
+        self.import_participants_button.config(state='disabled')
+        self.participant_status_label.config(text="Importando participantes...")
+        updates = queue.Queue() # Filas procesadas (int) y, al final, el resultado (tuple)
+
+        def worker():
+            updates.put(self.participant_import_controller.import_participants(file_path, progress_callback=updates.put))
+
+        threading.Thread(target=worker, daemon=True).start()
+        self.after(100, self._poll_participant_import, updates)
+
+    def _poll_participant_import(self, updates):
+        """Muestra el progreso de la importación y, cuando termina, su resumen."""
+        result = None
+        while not updates.empty():
+            item = updates.get_nowait()
+            if isinstance(item, tuple):
+                result = item
+            else:
+                self.participant_status_label.config(text=f"Importando participantes... {item} filas procesadas")
+        if result is None:
+            self.after(100, self._poll_participant_import, updates)
+            return
+
+        self.import_participants_button.config(state='normal')
+        self.load_participant_data()
+        summary, error = result
         if error:
-            messagebox.showerror("Error de Carga", f"No se pudieron cargar los participantes: {error}")
+            messagebox.showerror("Error de Importación", error)
             return
 
-        for p in participants:
-            self.participant_tree.insert("", "end", values=(
-                p.get('id_participante'), 
-                p.get('tipo_participante'), 
-                p.get('nombre'), 
-                p.get('apellido'), 
-                p.get('cedula', ''), 
-                p.get('correo_electronico', ''), 
-                p.get('telefono', ''),
-                p.get('carrera', '')
-            ))
+        errors = summary['errores']
+        message = (f"Filas procesadas: {summary['filas']}\n"
+                   f"Participantes importados: {summary['importados']}\n"
+                   f"Filas rechazadas: {len(errors)}")
+        if not errors:
+            messagebox.showinfo("Importación Completada", message)
+            return
+        if messagebox.askyesno("Importación Completada", message + "\n\n¿Desea guardar el informe de filas rechazadas?"):
+            report_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV", "*.csv")],
+                                                       title="Guardar Informe de Filas Rechazadas")
+            if report_path:
+                success, error = self.participant_import_controller.write_error_report(errors, report_path)
+                if not success:
+                    messagebox.showerror("Error", error)
 
     def _load_participant_data_to_form(self, event):
         # ... (Tu código de carga de datos a formulario de participantes) ...
@@ -1080,6 +1171,16 @@ class DataAdminView(tk.Frame):
         project_list_frame = ttk.LabelFrame(main_frame, text="Lista de Proyectos", padding=10)
         project_list_frame.pack(fill='both', expand=True,  padx=5, pady=5)
 
+        # Búsqueda por palabras del nombre o la descripción (índice de texto completo)
+        search_frame = ttk.Frame(project_list_frame)
+        search_frame.pack(side='top', fill='x', pady=(0, 5))
+        ttk.Label(search_frame, text="Buscar:").pack(side='left')
+        self.project_search_entry = ttk.Entry(search_frame)
+        self.project_search_entry.pack(side='left', fill='x', expand=True, padx=5)
+        self.project_search_entry.bind("<Return>", lambda event: self._search_projects())
+        ttk.Button(search_frame, text="Buscar", command=self._search_projects).pack(side='left', padx=2)
+        ttk.Button(search_frame, text="Limpiar", command=self._clear_project_search).pack(side='left', padx=2)
+
         scrollbar_proj = ttk.Scrollbar(project_list_frame, orient=tk.VERTICAL)
         self.project_tree = ttk.Treeview(project_list_frame, 
                                         columns=("ID", "Período", "Materia", "Nombre", "Descripción"), 
@@ -1103,6 +1204,19 @@ class DataAdminView(tk.Frame):
         self.project_tree.pack(fill='both', expand=True)
         self.project_tree.bind("<<TreeviewSelect>>", self._load_project_data_to_form)
 
+        # Los proyectos se cargan por páginas (del más reciente al más antiguo) a medida que se desplaza la lista
+        self.project_status_label = ttk.Label(main_frame, text="")
+        self.project_status_label.pack(anchor='w', padx=5)
+        self.project_loader = PagedTreeLoader(
+            self.project_tree, scrollbar_proj,
+            fetch_page=lambda after_id, size: self.project_controller.get_projects_page(after_id, size),
+            row_values=self._project_row_values,
+            id_key='id_proyecto',
+            count_total=self.project_controller.count_system_projects,
+            status_label=self.project_status_label,
+            on_error=lambda error: messagebox.showerror("Error de Carga", f"No se pudieron cargar los proyectos: {error}")
+        )
+
         # Frame para los detalles del proyecto y gestión de participantes
         # Este es el frame original, ahora contendrá el canvas
         details_frame = ttk.LabelFrame(main_frame, text="Detalles del Proyecto y Participantes", padding=10)
@@ -1171,7 +1285,13 @@ class DataAdminView(tk.Frame):
         lists_frame.grid_columnconfigure(0, weight=1) 
         lists_frame.grid_columnconfigure(2, weight=1) 
 
-        ttk.Label(lists_frame, text="Disponibles:").grid(row=0, column=0, pady=2, padx=5, sticky='w', columnspan=1)
+        available_header_frame = ttk.Frame(lists_frame)
+        available_header_frame.grid(row=0, column=0, pady=2, padx=5, sticky='ew')
+        ttk.Label(available_header_frame, text="Disponibles:").pack(side='left')
+        self.available_participants_search_entry = ttk.Entry(available_header_frame)
+        self.available_participants_search_entry.pack(side='right', fill='x', expand=True, padx=(10, 0))
+        self.available_participants_search_entry.bind("<KeyRelease>", lambda event: self._sync_participant_trees())
+        ttk.Label(available_header_frame, text="Buscar:").pack(side='right')
         available_participants_frame = ttk.Frame(lists_frame)
         available_participants_frame.grid(row=1, column=0, padx=5, pady=5, sticky='nsew') 
         
@@ -1224,6 +1344,8 @@ class DataAdminView(tk.Frame):
         ttk.Button(buttons_frame, text="Editar Proyecto", command=self._edit_project).pack(side='left', padx=5)
         ttk.Button(buttons_frame, text="Eliminar Proyecto", command=self._delete_project).pack(side='left', padx=5)
         ttk.Button(buttons_frame, text="Limpiar Campos", command=self._clear_project_form).pack(side='left', padx=5)
+        self.export_projects_button = ttk.Button(buttons_frame, text="Exportar...", command=self._export_projects)
+        self.export_projects_button.pack(side='left', padx=5)
 
         # Almacenar los IDs de participantes para la gestión (sin cambios)
         self.current_project_participant_ids = set() 
@@ -1275,9 +1397,18 @@ class DataAdminView(tk.Frame):
                     participant_data['apellido']
                 ), iid=participant_data['id_participante'])
 
-        # Rellenar Treeview de "Disponibles"
-        for p_id, p_data in self.all_available_participants_data.items():
-            if p_id not in self.current_project_participant_ids:
+        # Rellenar Treeview de "Disponibles", filtrado con el índice de búsqueda si se escribió algo
+        search_text = self.available_participants_search_entry.get().strip()
+        if search_text:
+            matches, error = self.participant_controller.search_participants(search_text, limit=None)
+            if error:
+                messagebox.showerror("Error de Búsqueda", error)
+                matches = []
+            available = ((p['id_participante'], p) for p in matches)
+        else:
+            available = self.all_available_participants_data.items()
+        for p_id, p_data in available:
+            if p_id not in self.current_project_participant_ids and p_id in self.all_available_participants_data:
                 self.available_participants_tree.insert("", "end", values=(
                     p_data['id_participante'], 
                     p_data['nombre'], 
@@ -1317,34 +1448,50 @@ class DataAdminView(tk.Frame):
         self._sync_participant_trees()
 
 
-    def load_project_data(self):
-        """
-        Carga los datos de los proyectos desde el controlador y los muestra en el Treeview.
-        """
-        for item in self.project_tree.get_children():
-            self.project_tree.delete(item)
-        
-        projects, error = self.project_controller.get_all_system_projects()
+    def _search_projects(self):
+        """Muestra los proyectos que coinciden con el texto de búsqueda, de más a menos relevante."""
+        search_text = self.project_search_entry.get().strip()
+        if not search_text:
+            self.load_project_data()
+            return
+        projects, error = self.project_controller.search_system_projects(search_text)
         if error:
-            messagebox.showerror("Error de Carga", f"No se pudieron cargar los proyectos: {error}")
+            messagebox.showerror("Error de Búsqueda", error)
             return
+        self.project_loader.show_rows(projects, f"{len(projects)} proyectos coinciden con '{search_text}'")
+
+    def _clear_project_search(self):
+        self.project_search_entry.delete(0, tk.END)
+        self.load_project_data()
 
+    def _export_projects(self):
+        """Exporta todos los proyectos a XLSX o CSV en segundo plano."""
+        file_path = ask_export_path("Exportar Proyectos", "proyectos.xlsx")
+        if file_path:
+            run_export(self, self.export_controller.export_projects, file_path,
+                       button=self.export_projects_button, status_label=self.project_status_label, description="proyectos")
+
+    def load_project_data(self):
+        """
+        Recarga la lista de proyectos desde la primera página.
+        """
         # Para mostrar nombres de periodo y materia en lugar de IDs
         # invertimos los diccionarios de opciones para búsquedas rápidas
-        inv_period_options = {v: k for k, v in self.period_options.items()}
-        inv_subject_options = {v: k for k, v in self.subject_options.items()}
-
-        for p in projects:
-            period_name = inv_period_options.get(p.get('id_periodo'), f"ID:{p.get('id_periodo')}")
-            subject_name = inv_subject_options.get(p.get('id_materia'), f"ID:{p.get('id_materia')}")
-            
-            self.project_tree.insert("", "end", values=(
-                p.get('id_proyecto'), 
-                period_name, 
-                subject_name, 
-                p.get('nombre_proyecto'), 
-                p.get('descripcion')
-            ))
+        self._inv_period_options = {v: k for k, v in self.period_options.items()}
+        self._inv_subject_options = {v: k for k, v in self.subject_options.items()}
+        self.project_loader.reset()
+
+    def _project_row_values(self, p):
+        """Valores de una fila del Treeview de proyectos."""
+        period_name = self._inv_period_options.get(p.get('id_periodo'), f"ID:{p.get('id_periodo')}")
+        subject_name = self._inv_subject_options.get(p.get('id_materia'), f"ID:{p.get('id_materia')}")
+        return (
+            p.get('id_proyecto'),
+            period_name,
+            subject_name,
+            p.get('nombre_proyecto'),
+            p.get('descripcion')
+        )
 
     def _load_project_data_to_form(self, event):
         """
@@ -1409,6 +1556,7 @@ class DataAdminView(tk.Frame):
         self.project_subject_combobox.set('')
 
         self.current_project_participant_ids.clear()
+        self.available_participants_search_entry.delete(0, tk.END)
         self._sync_participant_trees() # Resincroniza para mostrar todos disponibles
 
     def _add_project(self):
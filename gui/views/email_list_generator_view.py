@@ -2,6 +2,8 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import re 
 
+from controllers.search_index import SearchIndex
+
 class EmailListGeneratorView(ttk.Frame):
     def __init__(self, master, app_controller_callback, communication_controller):
         super().__init__(master, padding="15 15 15 15")
@@ -10,6 +12,7 @@ class EmailListGeneratorView(ttk.Frame):
         self.communication_controller = communication_controller 
 
         self.recipients_data = [] 
+        self.recipients_index = None
         self.selected_recipients_emails = [] 
         self.periods = [] 
 
@@ -117,8 +120,7 @@ class EmailListGeneratorView(ttk.Frame):
             messagebox.showerror("Error de Carga", f"No se pudieron cargar los destinatarios: {error}")
             return
         
-        self.recipients_data = recipients 
-        self._display_recipients(self.recipients_data) 
+        self._set_recipients(recipients)
 
     def _display_recipients(self, recipients_list):
         """Muestra una lista dada de destinatarios en el Treeview."""
@@ -137,27 +139,30 @@ class EmailListGeneratorView(ttk.Frame):
         self.recipients_tree.tag_configure('selected', background='lightblue')
         self._update_email_list_output() 
 
+    def _set_recipients(self, recipients):
+        """Guarda la lista de destinatarios, la indexa para la búsqueda y la muestra."""
+        positions = {r['email']: position for position, r in enumerate(recipients)}
+        self.recipients_data = recipients
+        self.recipients_index = SearchIndex(
+            key=lambda r: r['email'],
+            fields={
+                'nombre_completo': (lambda r: r['nombre_completo'], 2),
+                'email': (lambda r: r['email'], 1),
+                'tipo': (lambda r: r['tipo'], 1),
+            },
+            order=lambda r: positions[r['email']] # Mismo orden que la lista sin filtrar
+        )
+        self.recipients_index.build(recipients)
+        self._display_recipients(self.recipients_data)
+
     def _filter_recipients_display(self, event=None):
-        """Filtra los destinatarios visibles en el Treeview según el texto de búsqueda."""
-        search_term = self.search_entry.get().lower()
-        
-        current_displayed_recipients = []
-        for item_id in self.recipients_tree.get_children():
-            values = self.recipients_tree.item(item_id, 'values')
-            current_displayed_recipients.append({
-                'id': values[0],
-                'nombre_completo': values[1],
-                'email': values[2],
-                'tipo': values[3]
-            })
-
-        filtered_by_search = []
-        for r in current_displayed_recipients:
-            if search_term in str(r['nombre_completo']).lower() or \
-               search_term in str(r['email']).lower() or \
-               search_term in str(r['tipo']).lower():
-                filtered_by_search.append(r)
-        
+        """Filtra los destinatarios de la lista cargada según el texto de búsqueda, usando el índice en memoria."""
+        search_term = self.search_entry.get().strip()
+        if search_term and self.recipients_index is not None:
+            filtered_by_search = self.recipients_index.search(search_term, limit=None)
+        else:
+            filtered_by_search = self.recipients_data
+
         self.recipients_tree.delete(*self.recipients_tree.get_children())
         for r in filtered_by_search:
             item_id = self.recipients_tree.insert("", tk.END, values=(r['id'], r['nombre_completo'], r['email'], r['tipo']))
@@ -191,8 +196,7 @@ class EmailListGeneratorView(ttk.Frame):
                 return
             
             # Solo mostrar participantes en este caso, NO usuarios de la tabla `usuarios`
-            self.recipients_data = participants_for_period 
-            self._display_recipients(self.recipients_data)
+            self._set_recipients(participants_for_period)
         
         self.search_entry.delete(0, tk.END)
 
@@ -0,0 +1,113 @@
+# gui/views/query_stats_view.py
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+
+from db.connection import get_query_stats, reset_query_stats, format_query_stats, get_pool_stats
+
+class QueryStatsView(ttk.Frame):
+    """
+    Vista de rendimiento de la base de datos.
+    Muestra, por cada sentencia ejecutada, cuántas veces se ejecutó, sus percentiles
+    de latencia, las filas leídas y qué funciones de los modelos la llaman.
+    """
+    def __init__(self, master, app_controller_callback):
+        super().__init__(master, padding="15 15 15 15")
+        self.master = master
+        self.app_controller_callback = app_controller_callback
+
+        self.setup_ui()
+        self._load_stats()
+
+    def setup_ui(self):
+        """Configura la interfaz de usuario de la vista de estadísticas."""
+        self.pack(expand=True, fill='both')
+
+        top_frame = ttk.Frame(self)
+        top_frame.pack(fill=tk.X, pady=(0, 15))
+
+        back_button = ttk.Button(top_frame, text="Volver al Dashboard",
+                                 command=self.app_controller_callback.show_dashboard_view,
+                                 style='TButton')
+        back_button.pack(side=tk.LEFT, anchor=tk.NW)
+
+        ttk.Label(top_frame, text="Rendimiento de Consultas",
+                  font=("Arial", 22, "bold")).pack(side=tk.TOP, expand=True, fill=tk.X, padx=20)
+
+        summary_frame = ttk.LabelFrame(self, text="Resumen", padding="10")
+        summary_frame.pack(fill=tk.X, pady=5)
+        self.summary_label = ttk.Label(summary_frame, text="", justify=tk.LEFT)
+        self.summary_label.pack(side=tk.LEFT, fill=tk.X)
+
+        buttons_frame = ttk.Frame(summary_frame)
+        buttons_frame.pack(side=tk.RIGHT)
+        ttk.Button(buttons_frame, text="Actualizar", command=self._load_stats).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons_frame, text="Reiniciar", command=self._reset_stats).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons_frame, text="Guardar Informe", command=self._save_report).pack(side=tk.LEFT, padx=5)
+
+        tree_frame = ttk.Frame(self)
+        tree_frame.pack(fill=tk.BOTH, expand=True, pady=10)
+
+        columns = ("Ejecuciones", "Total ms", "p50 ms", "p95 ms", "p99 ms", "Máx ms", "Filas", "Llamado desde", "Sentencia")
+        self.stats_tree = ttk.Treeview(tree_frame, columns=columns, show="headings")
+        widths = (90, 90, 70, 70, 70, 70, 70, 260, 600)
+        for column, width in zip(columns, widths):
+            self.stats_tree.heading(column, text=column)
+            self.stats_tree.column(column, width=width, anchor=tk.W if column in ("Llamado desde", "Sentencia") else tk.E,
+                                   stretch=column == "Sentencia")
+
+        scrollbar_y = ttk.Scrollbar(tree_frame, orient="vertical", command=self.stats_tree.yview)
+        scrollbar_x = ttk.Scrollbar(tree_frame, orient="horizontal", command=self.stats_tree.xview)
+        self.stats_tree.configure(yscrollcommand=scrollbar_y.set, xscrollcommand=scrollbar_x.set)
+        scrollbar_y.pack(side=tk.RIGHT, fill=tk.Y)
+        scrollbar_x.pack(side=tk.BOTTOM, fill=tk.X)
+        self.stats_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+    def _load_stats(self):
+        """Carga las estadísticas actuales de consultas y del pool de conexiones."""
+        stats = get_query_stats()
+        pool = get_pool_stats()
+        cache, _ = self.app_controller_callback.controllers["report_controller"].get_report_cache_stats()
+        self.summary_label.config(text=(
+            f"Desde {stats['since']:%Y-%m-%d %H:%M:%S}: {stats['count']} consultas, "
+            f"{stats['total_ms']:.0f} ms en total, {stats['slow_count']} lentas.\n"
+            f"Latencia p50 {stats['p50_ms']:.1f} ms · p95 {stats['p95_ms']:.1f} ms · p99 {stats['p99_ms']:.1f} ms\n"
+            f"Pool: {pool['in_use']}/{pool['size']} en uso, {pool['handshakes']} conexiones abiertas, "
+            f"{pool['waits']} esperas, {pool['timeouts']} timeouts.\n"
+            f"Caché de reportes: {cache['hits'] + cache['coalesced']} aciertos, {cache['misses']} fallos "
+            f"({cache['hit_rate']:.0%}), {cache['entries']}/{cache['max_entries']} resultados, "
+            f"{cache['stale']} invalidados por escrituras, {cache['expired']} expirados, {cache['evicted']} expulsados."
+        ))
+
+        for item in self.stats_tree.get_children():
+            self.stats_tree.delete(item)
+        for entry in stats['statements']:
+            self.stats_tree.insert("", tk.END, values=(
+                entry['count'],
+                f"{entry['total_ms']:.1f}",
+                f"{entry['p50_ms']:.1f}",
+                f"{entry['p95_ms']:.1f}",
+                f"{entry['p99_ms']:.1f}",
+                f"{entry['max_ms']:.1f}",
+                entry['rows'],
+                ', '.join(entry['callers']),
+                entry['statement'],
+            ))
+
+    def _reset_stats(self):
+        if messagebox.askyesno("Reiniciar Estadísticas", "¿Descartar las estadísticas de consultas acumuladas?"):
+            reset_query_stats()
+            self._load_stats()
+
+    def _save_report(self):
+        """Guarda el informe de consultas en un archivo de texto."""
+        file_path = filedialog.asksaveasfilename(defaultextension=".txt",
+                                                 filetypes=[("Archivos de texto", "*.txt")],
+                                                 title="Guardar Informe de Consultas")
+        if not file_path:
+            return
+        try:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(format_query_stats(limit=None))
+            messagebox.showinfo("Informe Guardado", f"Informe guardado en:\n{file_path}")
+        except OSError as e:
+            messagebox.showerror("Error", f"No se pudo guardar el informe: {e}")
@@ -7,6 +7,7 @@ from controllers.report_controller import ReportController
 from controllers.period_controller import PeriodController
 from controllers.subject_controller import SubjectController
 from controllers.participant_controller import ParticipantController
+from gui.background_export import ask_export_path, run_export
 
 # Importaciones para ReportLab
 from reportlab.lib.pagesizes import letter, A4
@@ -15,6 +16,9 @@ from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch # Para el espaciado
 
+NO_SELECTION = "--- Seleccionar ---"
+PARTICIPANT_OPTIONS_LIMIT = 30 # Sugerencias por búsqueda en los filtros de estudiante/docente
+
 class ReportView(ttk.Frame): 
     """
     Vista para la generación de reportes dinámicos.
@@ -29,6 +33,7 @@ class ReportView(ttk.Frame):
         self.period_controller = self.app_controller_callback.controllers["period_controller"]
         self.subject_controller = self.app_controller_callback.controllers["subject_controller"]
         self.participant_controller = self.app_controller_callback.controllers["participant_controller"]
+        self.export_controller = self.app_controller_callback.controllers["export_controller"]
 
         self.selected_report_type = tk.StringVar(self) 
         self.selected_report_type.set("Proyectos") 
@@ -90,6 +95,8 @@ class ReportView(ttk.Frame):
 
         ttk.Button(action_buttons_frame, text="Generar Reporte", command=self._generate_report_button_click).pack(side=tk.LEFT, padx=5)
         ttk.Button(action_buttons_frame, text="Exportar a PDF", command=self._export_to_pdf_button_click).pack(side=tk.LEFT, padx=5)
+        self.export_spreadsheet_button = ttk.Button(action_buttons_frame, text="Exportar a Excel/CSV", command=self._export_to_spreadsheet_button_click)
+        self.export_spreadsheet_button.pack(side=tk.LEFT, padx=5)
 
         self.results_frame = ttk.LabelFrame(self, text="Resultado del Reporte", padding="10 10 10 10")
         self.results_frame.pack(fill=tk.BOTH, expand=True, pady=10)
@@ -136,15 +143,17 @@ class ReportView(ttk.Frame):
 
         # Filtro por Estudiante
         ttk.Label(parent_frame, text="Estudiante:").grid(row=2, column=0, padx=5, pady=5, sticky=tk.W)
-        self.student_combobox = ttk.Combobox(parent_frame, textvariable=self.filter_student_id, state="readonly")
+        self.student_combobox = ttk.Combobox(parent_frame, textvariable=self.filter_student_id)
         self.student_combobox.grid(row=2, column=1, padx=5, pady=5, sticky=tk.EW)
-        self.student_combobox.set("--- Seleccionar ---")
+        self.student_combobox.set(NO_SELECTION)
+        self._bind_participant_search(self.student_combobox, 'Estudiante')
 
         # Filtro por Docente
         ttk.Label(parent_frame, text="Docente:").grid(row=3, column=0, padx=5, pady=5, sticky=tk.W)
-        self.teacher_combobox = ttk.Combobox(parent_frame, textvariable=self.filter_teacher_id, state="readonly")
+        self.teacher_combobox = ttk.Combobox(parent_frame, textvariable=self.filter_teacher_id)
         self.teacher_combobox.grid(row=3, column=1, padx=5, pady=5, sticky=tk.EW)
-        self.teacher_combobox.set("--- Seleccionar ---")
+        self.teacher_combobox.set(NO_SELECTION)
+        self._bind_participant_search(self.teacher_combobox, 'Docente')
 
         parent_frame.columnconfigure(1, weight=1)
 
@@ -192,25 +201,44 @@ class ReportView(ttk.Frame):
         else:
             messagebox.showerror("Error de Carga", f"No se pudieron cargar materias: {error}")
 
-        # Cargar participantes (para filtros de estudiante/docente)
-        participants, error = self.participant_controller.get_all_system_participants()
-        if not error:
-            student_names = ["--- Seleccionar ---"]
-            teacher_names = ["--- Seleccionar ---"]
-            self.participant_names_to_ids = {"--- Seleccionar ---": None}
-            
-            for p in participants:
-                full_name = f"{p['nombre']} {p['apellido']} (CI: {p['cedula']})"
-                self.participant_names_to_ids[full_name] = p['id_participante']
-                if p['tipo_participante'] == 'Estudiante':
-                    student_names.append(full_name)
-                elif p['tipo_participante'] == 'Docente':
-                    teacher_names.append(full_name)
-            
-            self.student_combobox['values'] = student_names
-            self.teacher_combobox['values'] = teacher_names
-        else:
-            messagebox.showerror("Error de Carga", f"No se pudieron cargar participantes: {error}")
+        # Los participantes no se cargan todos: los filtros de estudiante/docente los buscan mientras se escribe
+        self.participant_names_to_ids = {NO_SELECTION: None}
+        self.student_combobox['values'] = [NO_SELECTION]
+        self.teacher_combobox['values'] = [NO_SELECTION]
+
+    def _bind_participant_search(self, combobox, participant_type):
+        """Convierte el combobox en un buscador de participantes del tipo dado."""
+        combobox.bind("<KeyRelease>", lambda event: self._search_participant_options(event, combobox, participant_type))
+        combobox.bind("<FocusIn>", lambda event: self._clear_participant_placeholder(combobox))
+        combobox.bind("<FocusOut>", lambda event: self._validate_participant_option(combobox))
+
+    def _search_participant_options(self, event, combobox, participant_type):
+        """Llena las opciones del combobox con los participantes que coinciden con lo escrito."""
+        if event.keysym in ("Up", "Down", "Return", "Escape", "Tab"):
+            return
+        text = combobox.get().strip()
+        if not text or text in self.participant_names_to_ids:
+            return
+        participants, error = self.participant_controller.search_participants(
+            text, participant_type=participant_type, limit=PARTICIPANT_OPTIONS_LIMIT)
+        if error:
+            self.status_label.config(text=f"Error al buscar participantes: {error}", foreground="red")
+            return
+        names = []
+        for p in participants:
+            full_name = f"{p['nombre']} {p['apellido']} (CI: {p['cedula']})"
+            self.participant_names_to_ids[full_name] = p['id_participante']
+            names.append(full_name)
+        combobox['values'] = [NO_SELECTION] + names
+
+    def _clear_participant_placeholder(self, combobox):
+        if combobox.get() == NO_SELECTION:
+            combobox.set("")
+
+    def _validate_participant_option(self, combobox):
+        """Un texto que no es una de las opciones no filtra: vuelve a "--- Seleccionar ---"."""
+        if combobox.get() not in self.participant_names_to_ids:
+            combobox.set(NO_SELECTION)
 
     def _toggle_filters(self):
         report_type = self.selected_report_type.get()
@@ -247,25 +275,24 @@ class ReportView(ttk.Frame):
         elif report_type == "Participantes":
             self._generate_participants_report()
 
-    def _generate_projects_report(self):
-        period_name = self.filter_period_id.get()
-        period_id = self.period_names_to_ids.get(period_name)
-
-        subject_name = self.filter_subject_id.get()
-        subject_id = self.subject_names_to_ids.get(subject_name)
-
-        student_name = self.filter_student_id.get()
-        student_id = self.participant_names_to_ids.get(student_name)
+    def _selected_project_filters(self):
+        """Filtros seleccionados del reporte de proyectos, como argumentos con nombre."""
+        return {
+            'period_id': self.period_names_to_ids.get(self.filter_period_id.get()),
+            'student_id': self.participant_names_to_ids.get(self.filter_student_id.get()),
+            'teacher_id': self.participant_names_to_ids.get(self.filter_teacher_id.get()),
+            'subject_id': self.subject_names_to_ids.get(self.filter_subject_id.get()),
+        }
+
+    def _selected_participant_filters(self):
+        """Filtros seleccionados del reporte de participantes, como argumentos con nombre."""
+        return {
+            'period_id': self.period_names_to_ids.get(self.filter_period_id.get()),
+            'participant_type': self.filter_participant_type.get() or None,
+        }
 
-        teacher_name = self.filter_teacher_id.get()
-        teacher_id = self.participant_names_to_ids.get(teacher_name)
-        
-        projects, error = self.report_controller.generate_projects_report(
-            period_id=period_id,
-            student_id=student_id,
-            teacher_id=teacher_id,
-            subject_id=subject_id
-        )
+    def _generate_projects_report(self):
+        projects, error = self.report_controller.generate_projects_report(**self._selected_project_filters())
 
         if error:
             self.status_label.config(text=f"Error al generar reporte: {error}", foreground="red")
@@ -316,17 +343,7 @@ class ReportView(ttk.Frame):
 
 
     def _generate_participants_report(self):
-        period_name = self.filter_period_id.get()
-        period_id = self.period_names_to_ids.get(period_name)
-
-        participant_type = self.filter_participant_type.get()
-        if participant_type == "": 
-            participant_type = None
-
-        participants, error = self.report_controller.generate_participants_report(
-            period_id=period_id,
-            participant_type=participant_type
-        )
+        participants, error = self.report_controller.generate_participants_report(**self._selected_participant_filters())
 
         if error:
             self.status_label.config(text=f"Error al generar reporte: {error}", foreground="red")
@@ -375,6 +392,28 @@ class ReportView(ttk.Frame):
                 pass 
             self.status_label.config(text="No se encontraron participantes.", foreground="orange")
 
+    def _export_to_spreadsheet_button_click(self):
+        """
+        Exporta el reporte seleccionado, con los filtros actuales, a XLSX o CSV.
+        Los datos se leen de nuevo de la base de datos en streaming (no del
+        Treeview), así que no hace falta generar el reporte antes.
+        """
+        if self.selected_report_type.get() == "Proyectos":
+            filters = self._selected_project_filters()
+            export = lambda path, progress_callback: self.export_controller.export_projects_report(
+                path, progress_callback=progress_callback, **filters)
+            title, initialfile, description = "Exportar Reporte de Proyectos", "reporte_proyectos.xlsx", "proyectos"
+        else:
+            filters = self._selected_participant_filters()
+            export = lambda path, progress_callback: self.export_controller.export_participants_report(
+                path, progress_callback=progress_callback, **filters)
+            title, initialfile, description = "Exportar Reporte de Participantes", "reporte_participantes.xlsx", "participantes"
+
+        file_path = ask_export_path(title, initialfile)
+        if file_path:
+            run_export(self, export, file_path, button=self.export_spreadsheet_button,
+                       status_label=self.status_label, description=description)
+
     def _export_to_pdf_button_click(self):
         """
         Maneja el clic en el botón 'Exportar a PDF'.
@@ -3,6 +3,7 @@
 Launcher script for Gestor de Expoferias application.
 Handles both development and production environments.
 """
+import multiprocessing
 import os
 import sys
 import subprocess
@@ -68,4 +69,6 @@ def main():
             sys.exit(1)
 
 if __name__ == "__main__":
+    # Necesario en el ejecutable de PyInstaller para los procesos que generan certificados
+    multiprocessing.freeze_support()
     main()
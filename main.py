@@ -2,9 +2,13 @@
 
 # Importar la clase principal de tu aplicación
 # Asegúrate de que esta ruta sea correcta desde la raíz del proyecto
+import multiprocessing
+
 from gui.main_app import MainApp
 
 if __name__ == "__main__":
+    # Necesario en el ejecutable de PyInstaller para los procesos que generan certificados
+    multiprocessing.freeze_support()
     # Crea la instancia de la aplicación y la inicia
     # MainApp ya hereda de ThemedTk (que es un Tkinter.Tk), por lo tanto,
     # ella misma es la ventana principal y no necesita que le pases 'root'.
@@ -0,0 +1,287 @@
+# models/dashboard_model.py
+"""
+Tablas de resumen para el dashboard (migración 0005).
+
+- resumen_proyectos: proyectos por (período, materia).
+- resumen_participantes: participantes por (período, tipo, carrera). La fila
+  con id_periodo = 0 (ALL_PERIODS) cuenta todos los participantes
+  registrados; las demás, los participantes distintos que tienen al menos
+  un proyecto en ese período.
+- participantes_periodo: en cuántos proyectos de cada período está cada
+  participante. Es el contador que permite saber cuándo un participante
+  entra en un período (0 -> 1) o sale de él (1 -> 0) sin volver a contar.
+
+Las funciones add_*/link_*/unlink_*/move_*/remove_* las llaman project_model
+y participant_model dentro de la misma transacción que la escritura que
+resumen, así que nunca queda un cambio confirmado sin su resumen (ni al
+revés). No se usan triggers: en MySQL las eliminaciones en cascada de las
+claves foráneas no los disparan. rebuild_dashboard_stats recalcula todo
+desde las tablas originales por si algo se desincroniza.
+"""
+from collections import Counter
+
+from mysql.connector import Error
+from db.connection import create_connection, close_connection
+
+ALL_PERIODS = 0 # id_periodo de la fila con todos los participantes registrados (AUTO_INCREMENT empieza en 1)
+
+# Alias de fila (MySQL >= 8.0.19): VALUES(col) en ON DUPLICATE KEY UPDATE está obsoleto desde 8.0.20 y su
+# advertencia (1287) sería una excepción con raise_on_warnings
+
+_PROJECT_UPSERT = """
+INSERT INTO resumen_proyectos (id_periodo, id_materia, total_proyectos) VALUES (%s, %s, %s) AS nuevo
+ON DUPLICATE KEY UPDATE total_proyectos = total_proyectos + nuevo.total_proyectos
+"""
+_PARTICIPANT_UPSERT = """
+INSERT INTO resumen_participantes (id_periodo, tipo_participante, carrera, total_participantes) VALUES (%s, %s, %s, %s) AS nuevo
+ON DUPLICATE KEY UPDATE total_participantes = total_participantes + nuevo.total_participantes
+"""
+_PERIOD_LINK_UPSERT = """
+INSERT INTO participantes_periodo (id_periodo, id_participante, total_proyectos) VALUES (%s, %s, %s) AS nuevo
+ON DUPLICATE KEY UPDATE total_proyectos = total_proyectos + nuevo.total_proyectos
+"""
+
+def participant_bucket(tipo_participante, carrera):
+    """Grupo (tipo, carrera) de un participante en resumen_participantes; sin carrera es ''."""
+    return tipo_participante, carrera or ''
+
+def _placeholders(values):
+    return ', '.join(['%s'] * len(values))
+
+def add_to_project_summary(conn, period_id, subject_id, delta):
+    """Suma `delta` (1 o -1) a los proyectos de (período, materia)."""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(_PROJECT_UPSERT, (period_id, subject_id, delta))
+    finally:
+        cursor.close()
+
+def add_to_participant_summary(conn, period_id, buckets, delta):
+    """Suma `delta` por cada grupo (tipo, carrera) de `buckets` a los participantes del período."""
+    counts = Counter(buckets)
+    if not counts:
+        return
+    cursor = conn.cursor()
+    try:
+        cursor.executemany(_PARTICIPANT_UPSERT, [(period_id, tipo, carrera, delta * count)
+                                                 for (tipo, carrera), count in counts.items()])
+    finally:
+        cursor.close()
+
+def _buckets_of(cursor, participant_ids):
+    cursor.execute(f"SELECT tipo_participante, carrera FROM participantes WHERE id_participante IN ({_placeholders(participant_ids)})",
+                   tuple(participant_ids))
+    return [participant_bucket(tipo, carrera) for tipo, carrera in cursor.fetchall()]
+
+def link_participants(conn, period_id, participant_ids):
+    """Registra que cada participante de la lista tiene un proyecto más en el período."""
+    participant_ids = list(participant_ids)
+    if not participant_ids:
+        return
+    cursor = conn.cursor()
+    try:
+        cursor.executemany(_PERIOD_LINK_UPSERT, [(period_id, p_id, 1) for p_id in participant_ids])
+        # Los que quedaron en 1 no tenían proyectos en el período: entran en el resumen
+        cursor.execute(f"""
+            SELECT id_participante FROM participantes_periodo
+            WHERE id_periodo = %s AND total_proyectos = 1 AND id_participante IN ({_placeholders(participant_ids)})
+        """, (period_id, *participant_ids))
+        entered = [row[0] for row in cursor.fetchall()]
+        if entered:
+            add_to_participant_summary(conn, period_id, _buckets_of(cursor, entered), 1)
+    finally:
+        cursor.close()
+
+def unlink_participants(conn, period_id, participant_ids):
+    """Registra que cada participante de la lista tiene un proyecto menos en el período."""
+    participant_ids = list(participant_ids)
+    if not participant_ids:
+        return
+    placeholders = _placeholders(participant_ids)
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"""
+            UPDATE participantes_periodo SET total_proyectos = total_proyectos - 1
+            WHERE id_periodo = %s AND id_participante IN ({placeholders})
+        """, (period_id, *participant_ids))
+        cursor.execute(f"""
+            SELECT id_participante FROM participantes_periodo
+            WHERE id_periodo = %s AND total_proyectos <= 0 AND id_participante IN ({placeholders})
+        """, (period_id, *participant_ids))
+        left = [row[0] for row in cursor.fetchall()]
+        if left:
+            # Ya no tienen proyectos en el período: salen del resumen
+            add_to_participant_summary(conn, period_id, _buckets_of(cursor, left), -1)
+            cursor.execute(f"DELETE FROM participantes_periodo WHERE id_periodo = %s AND id_participante IN ({_placeholders(left)})",
+                           (period_id, *left))
+    finally:
+        cursor.close()
+
+def move_participant_summary(conn, participant_id, old_bucket, new_bucket):
+    """Mueve un participante de grupo (cambió su tipo o su carrera) en todos los períodos en que cuenta."""
+    if old_bucket == new_bucket:
+        return
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT id_periodo FROM participantes_periodo WHERE id_participante = %s", (participant_id,))
+        periods = [ALL_PERIODS] + [row[0] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+    for period_id in periods:
+        add_to_participant_summary(conn, period_id, [old_bucket], -1)
+        add_to_participant_summary(conn, period_id, [new_bucket], 1)
+
+def remove_participant_summary(conn, participant_id, bucket):
+    """Descuenta un participante eliminado de todos los períodos en que contaba (sus proyectos se borraron en cascada)."""
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT id_periodo FROM participantes_periodo WHERE id_participante = %s", (participant_id,))
+        periods = [ALL_PERIODS] + [row[0] for row in cursor.fetchall()]
+        cursor.execute("DELETE FROM participantes_periodo WHERE id_participante = %s", (participant_id,))
+    finally:
+        cursor.close()
+    for period_id in periods:
+        add_to_participant_summary(conn, period_id, [bucket], -1)
+
+def get_dashboard_stats(period_id=None, conn=None):
+    """
+    Lee las estadísticas del dashboard de las tablas de resumen, sin agrupar
+    las tablas originales: el costo depende del número de materias, carreras
+    y períodos, no del de proyectos o participantes.
+
+    Args:
+        period_id (int, optional): Si se indica, estadísticas de ese período; si no, de todos.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
+
+    Returns:
+        dict or None: {
+            'total_proyectos': int,
+            'proyectos_por_periodo': [{'id_periodo', 'nombre_periodo', 'total_proyectos'}, ...],
+            'proyectos_por_materia': [{'id_materia', 'nombre_materia', 'total_proyectos'}, ...],
+            'participantes_por_carrera': [{'carrera', 'total_participantes'}, ...] (carrera '' = sin carrera),
+            'estudiantes': int, 'docentes': int,
+        }. Con un período, los participantes son los que tienen algún proyecto en él;
+        sin período, todos los registrados. None en caso de error.
+    """
+    conn = create_connection(conn)
+    if conn is None:
+        return None
+
+    stats = None
+    try:
+        cursor = conn.cursor(dictionary=True)
+        period_filter, params = ("WHERE r.id_periodo = %s", (period_id,)) if period_id else ("", ())
+        cursor.execute(f"""
+            SELECT r.id_periodo, pe.nombre_periodo, SUM(r.total_proyectos) AS total_proyectos
+            FROM resumen_proyectos r
+            JOIN periodos pe ON r.id_periodo = pe.id_periodo
+            {period_filter}
+            GROUP BY r.id_periodo, pe.nombre_periodo
+            HAVING SUM(r.total_proyectos) > 0
+            ORDER BY pe.nombre_periodo
+        """, params)
+        by_period = [dict(row, total_proyectos=int(row['total_proyectos'])) for row in cursor.fetchall()]
+
+        cursor.execute(f"""
+            SELECT r.id_materia, m.nombre_materia, SUM(r.total_proyectos) AS total_proyectos
+            FROM resumen_proyectos r
+            JOIN materias m ON r.id_materia = m.id_materia
+            {period_filter}
+            GROUP BY r.id_materia, m.nombre_materia
+            HAVING SUM(r.total_proyectos) > 0
+            ORDER BY total_proyectos DESC, m.nombre_materia
+        """, params)
+        by_subject = [dict(row, total_proyectos=int(row['total_proyectos'])) for row in cursor.fetchall()]
+
+        # Agrupar en SQL: la colación decide qué carreras son la misma ('Informática'/'informática')
+        period_key = (period_id or ALL_PERIODS,)
+        cursor.execute("""
+            SELECT tipo_participante, SUM(total_participantes) AS total_participantes
+            FROM resumen_participantes
+            WHERE id_periodo = %s
+            GROUP BY tipo_participante
+        """, period_key)
+        by_type = {row['tipo_participante']: int(row['total_participantes']) for row in cursor.fetchall()}
+        cursor.execute("""
+            SELECT carrera, SUM(total_participantes) AS total_participantes
+            FROM resumen_participantes
+            WHERE id_periodo = %s
+            GROUP BY carrera
+            HAVING SUM(total_participantes) > 0
+            ORDER BY total_participantes DESC, carrera
+        """, period_key)
+        by_career = [dict(row, total_participantes=int(row['total_participantes'])) for row in cursor.fetchall()]
+
+        stats = {
+            'total_proyectos': sum(row['total_proyectos'] for row in by_period),
+            'proyectos_por_periodo': by_period,
+            'proyectos_por_materia': by_subject,
+            'participantes_por_carrera': by_career,
+            'estudiantes': by_type.get('Estudiante', 0),
+            'docentes': by_type.get('Docente', 0),
+        }
+    except Error as e:
+        print(f"Error al obtener las estadísticas del dashboard: {e}")
+    finally:
+        if 'cursor' in locals() and cursor:
+            cursor.close()
+        close_connection(conn)
+    return stats
+
+def rebuild_dashboard_stats(conn=None):
+    """
+    Recalcula las tablas de resumen desde proyectos, participantes y
+    proyectos_participantes, en una sola transacción.
+
+    Args:
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
+
+    Returns:
+        bool: True si se recalcularon, False en caso de error.
+    """
+    conn = create_connection(conn)
+    if conn is None:
+        return False
+
+    success = False
+    try:
+        cursor = conn.cursor()
+        for table in ('resumen_proyectos', 'resumen_participantes', 'participantes_periodo'):
+            cursor.execute(f"DELETE FROM {table}")
+
+        cursor.execute("SELECT id_periodo, id_materia, COUNT(*) FROM proyectos GROUP BY id_periodo, id_materia")
+        cursor.executemany(_PROJECT_UPSERT, cursor.fetchall())
+
+        cursor.execute("""
+            SELECT p.id_periodo, pp.id_participante, COUNT(*)
+            FROM proyectos_participantes pp
+            JOIN proyectos p ON pp.id_proyecto = p.id_proyecto
+            GROUP BY p.id_periodo, pp.id_participante
+        """)
+        cursor.executemany(_PERIOD_LINK_UPSERT, cursor.fetchall())
+
+        # Con el upsert, las carreras que la colación considera iguales ('Informática'/'informática') suman en un solo grupo
+        cursor.execute("""
+            SELECT tipo_participante, carrera, COUNT(*) FROM participantes
+            GROUP BY tipo_participante, carrera
+        """)
+        participant_rows = [(ALL_PERIODS, *participant_bucket(tipo, carrera), total) for tipo, carrera, total in cursor.fetchall()]
+        cursor.execute("""
+            SELECT pp.id_periodo, part.tipo_participante, part.carrera, COUNT(*)
+            FROM participantes_periodo pp
+            JOIN participantes part ON pp.id_participante = part.id_participante
+            GROUP BY pp.id_periodo, part.tipo_participante, part.carrera
+        """)
+        participant_rows += [(period_id, *participant_bucket(tipo, carrera), total) for period_id, tipo, carrera, total in cursor.fetchall()]
+        cursor.executemany(_PARTICIPANT_UPSERT, participant_rows)
+
+        conn.commit()
+        success = True
+    except Error as e:
+        print(f"Error al recalcular las estadísticas del dashboard: {e}")
+        conn.rollback()
+    finally:
+        if 'cursor' in locals() and cursor:
+            cursor.close()
+        close_connection(conn)
+    return success
@@ -1,9 +1,16 @@
 # models/participant_model.py
-from db.connection import create_connection, close_connection
+from db.connection import create_connection, close_connection, record_write, iter_query, STREAM_BATCH_SIZE
+from models.dashboard_model import (
+    ALL_PERIODS, participant_bucket, add_to_participant_summary, move_participant_summary, remove_participant_summary
+)
 
-def create_participant(tipo_participante, nombre, apellido, cedula, correo_electronico, telefono, carrera):
+# Máximo de IDs por consulta IN (...): mantiene las sentencias acotadas y por debajo
+# del límite de parámetros de SQLite en listas muy grandes
+IDS_CHUNK_SIZE = 500
+
+def create_participant(tipo_participante, nombre, apellido, cedula, correo_electronico, telefono, carrera, conn=None):
     """Inserta un nuevo participante en la base de datos."""
-    conn = create_connection()
+    conn = create_connection(conn)
     cursor = conn.cursor(dictionary=True)
     try:
         query = """
@@ -11,17 +18,20 @@ def create_participant(tipo_participante, nombre, apellido, cedula, correo_elect
         VALUES (%s, %s, %s, %s, %s, %s, %s)
         """
         cursor.execute(query, (tipo_participante, nombre, apellido, cedula, correo_electronico, telefono, carrera))
+        participant_id = cursor.lastrowid
+        add_to_participant_summary(conn, ALL_PERIODS, [participant_bucket(tipo_participante, carrera)], 1)
         conn.commit()
-        return cursor.lastrowid
+        record_write(conn, 'participantes')
+        return participant_id
     except Exception as e:
         conn.rollback()
         raise e
     finally:
         close_connection(conn)
 
-def get_all_participants():
+def get_all_participants(conn=None):
     """Obtiene todos los participantes de la base de datos."""
-    conn = create_connection()
+    conn = create_connection(conn)
     cursor = conn.cursor(dictionary=True)
     try:
         query = "SELECT * FROM participantes"
@@ -32,9 +42,51 @@ def get_all_participants():
     finally:
         close_connection(conn)
 
-def get_participant_by_id(participant_id):
+def iter_participants(batch_size=STREAM_BATCH_SIZE, participant_type=None, conn=None):
+    """Genera los participantes en lotes de hasta `batch_size`, ordenados por ID, leyendo con un cursor sin buffer."""
+    if participant_type:
+        query = "SELECT * FROM participantes WHERE tipo_participante = %s ORDER BY id_participante"
+        params = (participant_type,)
+    else:
+        query, params = "SELECT * FROM participantes ORDER BY id_participante", ()
+    yield from iter_query(query, params, batch_size, conn=conn)
+
+def get_participants_page(after_id=None, limit=200, participant_type=None, conn=None):
+    """Obtiene hasta `limit` participantes con ID mayor que `after_id` (paginación por clave), ordenados por ID."""
+    conn = create_connection(conn)
+    cursor = conn.cursor(dictionary=True)
+    try:
+        where_clauses = ["id_participante > %s"]
+        params = [after_id or 0]
+        if participant_type:
+            where_clauses.append("tipo_participante = %s")
+            params.append(participant_type)
+        query = f"SELECT * FROM participantes WHERE {' AND '.join(where_clauses)} ORDER BY id_participante LIMIT %s"
+        cursor.execute(query, (*params, limit))
+        return cursor.fetchall()
+    except Exception as e:
+        raise e
+    finally:
+        close_connection(conn)
+
+def count_participants(participant_type=None, conn=None):
+    """Cuenta los participantes, opcionalmente solo los de un tipo."""
+    conn = create_connection(conn)
+    cursor = conn.cursor()
+    try:
+        if participant_type:
+            cursor.execute("SELECT COUNT(*) FROM participantes WHERE tipo_participante = %s", (participant_type,))
+        else:
+            cursor.execute("SELECT COUNT(*) FROM participantes")
+        return cursor.fetchone()[0]
+    except Exception as e:
+        raise e
+    finally:
+        close_connection(conn)
+
+def get_participant_by_id(participant_id, conn=None):
     """Obtiene un participante por su ID."""
-    conn = create_connection()
+    conn = create_connection(conn)
     cursor = conn.cursor(dictionary=True)
     try:
         query = "SELECT * FROM participantes WHERE id_participante = %s"
@@ -45,9 +97,97 @@ def get_participant_by_id(participant_id):
     finally:
         close_connection(conn)
 
-def update_participant(participant_id, tipo_participante, nombre, apellido, cedula, correo_electronico, telefono, carrera):
+def get_participants_by_ids(participant_ids, conn=None):
+    """Obtiene los participantes cuyos IDs están en la lista, con una consulta IN (...) por bloque de IDs."""
+    unique_ids = list(dict.fromkeys(participant_ids))
+    if not unique_ids:
+        return []
+    conn = create_connection(conn)
+    cursor = conn.cursor(dictionary=True)
+    try:
+        participants = []
+        for start in range(0, len(unique_ids), IDS_CHUNK_SIZE):
+            chunk = unique_ids[start:start + IDS_CHUNK_SIZE]
+            placeholders = ', '.join(['%s'] * len(chunk))
+            query = f"SELECT * FROM participantes WHERE id_participante IN ({placeholders})"
+            cursor.execute(query, tuple(chunk))
+            participants.extend(cursor.fetchall())
+        return participants
+    except Exception as e:
+        raise e
+    finally:
+        close_connection(conn)
+
+def get_taken_identifiers(cedulas, emails, conn=None):
+    """Retorna (cédulas, correos) de las listas que ya están registrados, en minúsculas, con una consulta IN (...) por bloque."""
+    conn = create_connection(conn)
+    cursor = conn.cursor()
+    try:
+        taken = {}
+        for field, values in (('cedula', cedulas), ('correo_electronico', emails)):
+            unique_values = list(dict.fromkeys(v for v in values if v))
+            found = set()
+            for start in range(0, len(unique_values), IDS_CHUNK_SIZE):
+                chunk = unique_values[start:start + IDS_CHUNK_SIZE]
+                placeholders = ', '.join(['%s'] * len(chunk))
+                cursor.execute(f"SELECT {field} FROM participantes WHERE {field} IN ({placeholders})", tuple(chunk))
+                # Los índices UNIQUE no distinguen mayúsculas: se compara en minúsculas
+                found.update(row[0].lower() for row in cursor.fetchall())
+            taken[field] = found
+        return taken['cedula'], taken['correo_electronico']
+    except Exception as e:
+        raise e
+    finally:
+        close_connection(conn)
+
+def create_participants_bulk(participants, conn=None):
+    """Inserta varios participantes (tuplas en el orden de create_participant) con executemany por bloques; retorna cuántos insertó."""
+    conn = create_connection(conn)
+    cursor = conn.cursor()
+    try:
+        query = """
+        INSERT INTO participantes (tipo_participante, nombre, apellido, cedula, correo_electronico, telefono, carrera)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+        """
+        for start in range(0, len(participants), IDS_CHUNK_SIZE):
+            cursor.executemany(query, participants[start:start + IDS_CHUNK_SIZE])
+        add_to_participant_summary(conn, ALL_PERIODS, [participant_bucket(p[0], p[6]) for p in participants], 1)
+        conn.commit()
+        record_write(conn, 'participantes')
+        return len(participants)
+    except Exception as e:
+        conn.rollback()
+        raise e
+    finally:
+        close_connection(conn)
+
+def exists_participant_with(cedula=None, email=None, exclude_id=None, conn=None):
+    """Retorna los campos ('cedula', 'correo_electronico') que ya usa otro participante; lista vacía si ninguno."""
+    lookups = [(field, value) for field, value in (('cedula', cedula), ('correo_electronico', email)) if value]
+    if not lookups:
+        return []
+    conn = create_connection(conn)
+    cursor = conn.cursor(dictionary=True)
+    try:
+        # Una búsqueda puntual por cada índice UNIQUE, unidas en una sola consulta
+        selects, params = [], []
+        for field, value in lookups:
+            select = f"SELECT '{field}' AS campo FROM participantes WHERE {field} = %s"
+            params.append(value)
+            if exclude_id is not None:
+                select += " AND id_participante <> %s"
+                params.append(exclude_id)
+            selects.append(select)
+        cursor.execute(" UNION ALL ".join(selects), tuple(params))
+        return [row['campo'] for row in cursor.fetchall()]
+    except Exception as e:
+        raise e
+    finally:
+        close_connection(conn)
+
+def update_participant(participant_id, tipo_participante, nombre, apellido, cedula, correo_electronico, telefono, carrera, conn=None):
     """Actualiza un participante existente."""
-    conn = create_connection()
+    conn = create_connection(conn)
     cursor = conn.cursor(dictionary=True)
     try:
         # Construir la consulta dinámicamente para actualizar solo los campos proporcionados
@@ -81,34 +221,50 @@ def update_participant(participant_id, tipo_participante, nombre, apellido, cedu
 
         query = f"UPDATE participantes SET {', '.join(updates)} WHERE id_participante = %s"
         params.append(participant_id)
-        
+
+        bucket_query = "SELECT tipo_participante, carrera FROM participantes WHERE id_participante = %s"
+        cursor.execute(bucket_query, (participant_id,))
+        old = cursor.fetchone()
         cursor.execute(query, tuple(params))
+        updated = cursor.rowcount > 0
+        if updated and (tipo_participante is not None or carrera is not None):
+            cursor.execute(bucket_query, (participant_id,))
+            new = cursor.fetchone()
+            move_participant_summary(conn, participant_id, participant_bucket(old['tipo_participante'], old['carrera']),
+                                     participant_bucket(new['tipo_participante'], new['carrera']))
         conn.commit()
-        return cursor.rowcount > 0 # Retorna True si se actualizó al menos una fila
+        record_write(conn, 'participantes')
+        return updated # Retorna True si se actualizó al menos una fila
     except Exception as e:
         conn.rollback()
         raise e
     finally:
         close_connection(conn)
 
-def delete_participant(participant_id):
+def delete_participant(participant_id, conn=None):
     """Elimina un participante de la base de datos."""
-    conn = create_connection()
+    conn = create_connection(conn)
     cursor = conn.cursor(dictionary=True)
     try:
+        cursor.execute("SELECT tipo_participante, carrera FROM participantes WHERE id_participante = %s", (participant_id,))
+        old = cursor.fetchone()
         query = "DELETE FROM participantes WHERE id_participante = %s"
         cursor.execute(query, (participant_id,))
+        deleted = cursor.rowcount > 0
+        if deleted:
+            remove_participant_summary(conn, participant_id, participant_bucket(old['tipo_participante'], old['carrera']))
         conn.commit()
-        return cursor.rowcount > 0
+        record_write(conn, 'participantes', 'proyectos_participantes')
+        return deleted
     except Exception as e:
         conn.rollback()
         raise e
     finally:
         close_connection(conn)
 
-def get_participants_by_type(participant_type):
+def get_participants_by_type(participant_type, conn=None):
     """Obtiene participantes filtrados por tipo (Estudiante o Docente)."""
-    conn = create_connection()
+    conn = create_connection(conn)
     cursor = conn.cursor(dictionary=True)
     try:
         query = "SELECT * FROM participantes WHERE tipo_participante = %s"
@@ -119,9 +275,9 @@ def get_participants_by_type(participant_type):
     finally:
         close_connection(conn)
 
-def get_participants_by_project_id(project_id):
+def get_participants_by_project_id(project_id, conn=None):
     """Obtiene los participantes asociados a un proyecto específico."""
-    conn = create_connection()
+    conn = create_connection(conn)
     cursor = conn.cursor(dictionary=True)
     try:
         query = """
@@ -2,11 +2,11 @@ import mysql.connector
 from mysql.connector import Error
 from datetime import date # Para trabajar con fechas
 
-from db.connection import create_connection, close_connection
+from db.connection import create_connection, close_connection, record_write
 
 # --- Funciones CRUD para la tabla 'periodos' ---
 
-def create_period(nombre_periodo, fecha_inicio, fecha_fin, activo=True):
+def create_period(nombre_periodo, fecha_inicio, fecha_fin, activo=True, conn=None):
     """
     Inserta un nuevo período en la tabla 'periodos'.
 
@@ -15,11 +15,12 @@ def create_period(nombre_periodo, fecha_inicio, fecha_fin, activo=True):
         fecha_inicio (date): Fecha de inicio del período (objeto datetime.date).
         fecha_fin (date): Fecha de fin del período (objeto datetime.date).
         activo (bool, optional): Indica si el período está activo. Por defecto es True.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
 
     Returns:
         int or None: El ID del nuevo período si la inserción es exitosa, None en caso de error.
     """
-    conn = create_connection()
+    conn = create_connection(conn)
     if conn is None:
         return None
 
@@ -32,6 +33,7 @@ def create_period(nombre_periodo, fecha_inicio, fecha_fin, activo=True):
         """
         cursor.execute(query, (nombre_periodo, fecha_inicio, fecha_fin, activo))
         conn.commit()
+        record_write(conn, 'periodos')
         period_id = cursor.lastrowid
         print(f"Período '{nombre_periodo}' creado con ID: {period_id}")
     except Error as e:
@@ -43,17 +45,18 @@ def create_period(nombre_periodo, fecha_inicio, fecha_fin, activo=True):
         close_connection(conn)
     return period_id
 
-def get_period_by_id(period_id):
+def get_period_by_id(period_id, conn=None):
     """
     Obtiene un período de la tabla 'periodos' por su ID.
 
     Args:
         period_id (int): ID del período a buscar.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
 
     Returns:
         dict or None: Un diccionario con los datos del período si se encuentra, None si no.
     """
-    conn = create_connection()
+    conn = create_connection(conn)
     if conn is None:
         return None
 
@@ -71,17 +74,18 @@ def get_period_by_id(period_id):
         close_connection(conn)
     return period_data
 
-def get_period_by_name(nombre_periodo):
+def get_period_by_name(nombre_periodo, conn=None):
     """
     Obtiene un período de la tabla 'periodos' por su nombre.
 
     Args:
         nombre_periodo (str): Nombre del período a buscar.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
 
     Returns:
         dict or None: Un diccionario con los datos del período si se encuentra, None si no.
     """
-    conn = create_connection()
+    conn = create_connection(conn)
     if conn is None:
         return None
 
@@ -99,17 +103,18 @@ def get_period_by_name(nombre_periodo):
         close_connection(conn)
     return period_data
 
-def get_all_periods(active_only=False):
+def get_all_periods(active_only=False, conn=None):
     """
     Obtiene todos los períodos de la tabla 'periodos'.
 
     Args:
         active_only (bool, optional): Si es True, solo retorna períodos activos. Por defecto es False.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
 
     Returns:
         list of dict: Una lista de diccionarios con los datos de todos los períodos.
     """
-    conn = create_connection()
+    conn = create_connection(conn)
     if conn is None:
         return []
 
@@ -130,7 +135,7 @@ def get_all_periods(active_only=False):
         close_connection(conn)
     return periods_data
 
-def update_period(period_id, **kwargs):
+def update_period(period_id, conn=None, **kwargs):
     """
     Actualiza la información de un período existente.
 
@@ -138,11 +143,12 @@ def update_period(period_id, **kwargs):
         period_id (int): ID del período a actualizar.
         **kwargs: Argumentos de palabra clave con los campos a actualizar
                   (ej. nombre_periodo='2025-II', fecha_fin=date(2025, 12, 31)).
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
 
     Returns:
         bool: True si la actualización fue exitosa, False en caso de error.
     """
-    conn = create_connection()
+    conn = create_connection(conn)
     if conn is None:
         return False
 
@@ -173,6 +179,7 @@ def update_period(period_id, **kwargs):
         cursor = conn.cursor()
         cursor.execute(query, tuple(values))
         conn.commit()
+        record_write(conn, 'periodos')
         success = True
         print(f"Período con ID {period_id} actualizado exitosamente.")
     except Error as e:
@@ -184,7 +191,7 @@ def update_period(period_id, **kwargs):
         close_connection(conn)
     return success
 
-def delete_period(period_id):
+def delete_period(period_id, conn=None):
     """
     Elimina un período de la tabla 'periodos' por su ID.
     Ten en cuenta que esto podría afectar la tabla 'proyectos'
@@ -192,11 +199,12 @@ def delete_period(period_id):
 
     Args:
         period_id (int): ID del período a eliminar.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
 
     Returns:
         bool: True si la eliminación fue exitosa, False en caso de error.
     """
-    conn = create_connection()
+    conn = create_connection(conn)
     if conn is None:
         return False
 
@@ -206,6 +214,7 @@ def delete_period(period_id):
         query = "DELETE FROM periodos WHERE id_periodo = %s"
         cursor.execute(query, (period_id,))
         conn.commit()
+        record_write(conn, 'periodos')
         success = (cursor.rowcount > 0)
         if success:
             print(f"Período con ID {period_id} eliminado exitosamente.")
@@ -1,9 +1,12 @@
+import re
 import mysql.connector
 from mysql.connector import Error
 from datetime import datetime
 
 # Importar las funciones de conexión
-from db.connection import create_connection, close_connection
+from db.connection import create_connection, close_connection, record_write, iter_query, get_backend_name, STREAM_BATCH_SIZE
+from db.errors import is_duplicate_entry
+from models.dashboard_model import add_to_project_summary, link_participants, unlink_participants
 # También importaremos los modelos para verificar IDs si es necesario en las pruebas
 # Estos imports no son estrictamente necesarios para el modelo en sí, solo para el bloque __main__ de prueba.
 # from models.period_model import get_period_by_id
@@ -12,7 +15,32 @@ from db.connection import create_connection, close_connection
 
 # --- Funciones CRUD para la tabla 'proyectos' y 'proyectos_participantes' ---
 
-def create_project(id_periodo, id_materia, nombre_proyecto, descripcion, participantes_ids):
+def normalize_project_name(nombre_proyecto):
+    """
+    Calcula la clave normalizada de un nombre de proyecto (columna nombre_proyecto_clave).
+    Dos nombres con la misma clave se consideran el mismo proyecto: se ignoran
+    mayúsculas/minúsculas y los espacios sobrantes al inicio, al final o repetidos.
+
+    Args:
+        nombre_proyecto (str): Nombre del proyecto tal como lo escribió el usuario.
+
+    Returns:
+        str: La clave normalizada.
+    """
+    return ' '.join(nombre_proyecto.split()).casefold()
+
+def _project_participant_ids(cursor, project_id):
+    """IDs de los participantes asociados al proyecto (para saber cuáles cambió un INSERT IGNORE o un DELETE)."""
+    cursor.execute("SELECT id_participante FROM proyectos_participantes WHERE id_proyecto = %s", (project_id,))
+    return {row[0] for row in cursor.fetchall()}
+
+def _project_period_and_subject(cursor, project_id):
+    """(id_periodo, id_materia) del proyecto, o None si no existe."""
+    cursor.execute("SELECT id_periodo, id_materia FROM proyectos WHERE id_proyecto = %s", (project_id,))
+    return cursor.fetchone()
+
+
+def create_project(id_periodo, id_materia, nombre_proyecto, descripcion, participantes_ids, conn=None):
     """
     Inserta un nuevo proyecto en la tabla 'proyectos' y asocia participantes.
 
@@ -22,11 +50,15 @@ def create_project(id_periodo, id_materia, nombre_proyecto, descripcion, partici
         nombre_proyecto (str): Nombre del proyecto.
         descripcion (str): Descripción detallada del proyecto.
         participantes_ids (list): Lista de IDs de los participantes a asociar al proyecto.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
 
     Returns:
         int or None: El ID del nuevo proyecto si la inserción es exitosa, None en caso de error.
+
+    Raises:
+        mysql.connector.IntegrityError: Si ya existe un proyecto con el mismo nombre normalizado (error 1062).
     """
-    conn = create_connection()
+    conn = create_connection(conn)
     if conn is None:
         return None
 
@@ -36,10 +68,11 @@ def create_project(id_periodo, id_materia, nombre_proyecto, descripcion, partici
 
         # 1. Insertar el proyecto principal
         project_query = """
-        INSERT INTO proyectos (id_periodo, id_materia, nombre_proyecto, descripcion, fecha_registro)
-        VALUES (%s, %s, %s, %s, %s)
+        INSERT INTO proyectos (id_periodo, id_materia, nombre_proyecto, nombre_proyecto_clave, descripcion, fecha_registro)
+        VALUES (%s, %s, %s, %s, %s, %s)
         """
-        cursor.execute(project_query, (id_periodo, id_materia, nombre_proyecto, descripcion, datetime.now()))
+        cursor.execute(project_query, (id_periodo, id_materia, nombre_proyecto, normalize_project_name(nombre_proyecto),
+                                       descripcion, datetime.now()))
         project_id = cursor.lastrowid
 
         # 2. Asociar participantes al proyecto
@@ -51,32 +84,40 @@ def create_project(id_periodo, id_materia, nombre_proyecto, descripcion, partici
             # Usamos executemany para mayor eficiencia
             values = [(project_id, p_id) for p_id in participantes_ids]
             cursor.executemany(participant_project_query, values)
-            
+
+        # 3. Actualizar los resúmenes del dashboard en la misma transacción
+        add_to_project_summary(conn, id_periodo, id_materia, 1)
+        link_participants(conn, id_periodo, _project_participant_ids(cursor, project_id))
+
         conn.commit()
+        record_write(conn, 'proyectos', 'proyectos_participantes')
         print(f"Proyecto '{nombre_proyecto}' creado con ID: {project_id}")
 
     except Error as e:
         print(f"Error al crear proyecto o asociar participantes: {e}")
         conn.rollback() # Revertir toda la transacción
         project_id = None # Asegurarse de retornar None si hubo error
+        if is_duplicate_entry(e):
+            raise # El controlador traduce la duplicidad a su mensaje
     finally:
         if 'cursor' in locals() and cursor:
             cursor.close()
         close_connection(conn)
     return project_id
 
-def get_project_by_id(project_id):
+def get_project_by_id(project_id, conn=None):
     """
     Obtiene un proyecto y sus participantes asociados.
 
     Args:
         project_id (int): ID del proyecto a buscar.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
 
     Returns:
         dict or None: Un diccionario con los datos del proyecto y una lista de participantes,
                       o None si el proyecto no se encuentra.
     """
-    conn = create_connection()
+    conn = create_connection(conn)
     if conn is None:
         return None
 
@@ -116,15 +157,47 @@ def get_project_by_id(project_id):
         close_connection(conn)
     return project_data
 
-def get_all_projects():
+def get_project_by_name(nombre_proyecto, conn=None):
+    """
+    Busca un proyecto por su nombre normalizado (búsqueda por el índice UNIQUE de nombre_proyecto_clave).
+
+    Args:
+        nombre_proyecto (str): Nombre a buscar; se normaliza con normalize_project_name.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
+
+    Returns:
+        dict or None: {'id_proyecto', 'nombre_proyecto'} del proyecto con ese nombre, None si no existe.
+    """
+    conn = create_connection(conn)
+    if conn is None:
+        return None
+
+    project_data = None
+    try:
+        cursor = conn.cursor(dictionary=True)
+        query = "SELECT id_proyecto, nombre_proyecto FROM proyectos WHERE nombre_proyecto_clave = %s"
+        cursor.execute(query, (normalize_project_name(nombre_proyecto),))
+        project_data = cursor.fetchone()
+    except Error as e:
+        print(f"Error al obtener proyecto por nombre: {e}")
+    finally:
+        if 'cursor' in locals() and cursor:
+            cursor.close()
+        close_connection(conn)
+    return project_data
+
+def get_all_projects(conn=None):
     """
     Obtiene todos los proyectos con sus detalles básicos (sin participantes completos).
     Para obtener detalles completos de participantes por proyecto, usar get_project_by_id.
 
+    Args:
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
+
     Returns:
         list of dict: Una lista de diccionarios con los datos de todos los proyectos.
     """
-    conn = create_connection()
+    conn = create_connection(conn)
     if conn is None:
         return []
 
@@ -150,18 +223,219 @@ def get_all_projects():
         close_connection(conn)
     return projects_data
 
-def add_participants_to_project(project_id, new_participant_ids):
+def _project_filters(period_id, subject_id):
+    where_clauses = []
+    params = []
+    if period_id:
+        where_clauses.append("p.id_periodo = %s")
+        params.append(period_id)
+    if subject_id:
+        where_clauses.append("p.id_materia = %s")
+        params.append(subject_id)
+    return where_clauses, params
+
+def get_projects_page(after_id=None, limit=200, period_id=None, subject_id=None, conn=None):
+    """
+    Obtiene una página de proyectos, del más reciente al más antiguo (paginación por clave).
+    Mismas columnas que get_all_projects; el orden es por id_proyecto descendente,
+    que sigue el orden de registro y, a diferencia de fecha_registro, no tiene empates.
+
+    Args:
+        after_id (int, optional): ID del último proyecto de la página anterior. None para la primera página.
+        limit (int): Cantidad máxima de proyectos de la página.
+        period_id (int, optional): Si se indica, solo proyectos de ese período.
+        subject_id (int, optional): Si se indica, solo proyectos de esa materia.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
+
+    Returns:
+        list of dict: Los proyectos de la página (lista vacía al llegar al final o en caso de error).
+    """
+    conn = create_connection(conn)
+    if conn is None:
+        return []
+
+    projects_data = []
+    try:
+        cursor = conn.cursor(dictionary=True)
+        where_clauses, params = _project_filters(period_id, subject_id)
+        if after_id:
+            where_clauses.insert(0, "p.id_proyecto < %s")
+            params.insert(0, after_id)
+        query = """
+        SELECT p.id_proyecto, p.nombre_proyecto, p.descripcion, p.fecha_registro,
+               p.id_periodo, pe.nombre_periodo,
+               p.id_materia, m.nombre_materia
+        FROM proyectos p
+        JOIN periodos pe ON p.id_periodo = pe.id_periodo
+        JOIN materias m ON p.id_materia = m.id_materia
+        """
+        if where_clauses:
+            query += " WHERE " + " AND ".join(where_clauses)
+        query += " ORDER BY p.id_proyecto DESC LIMIT %s"
+        cursor.execute(query, (*params, limit))
+        projects_data = cursor.fetchall()
+    except Error as e:
+        print(f"Error al obtener página de proyectos: {e}")
+    finally:
+        if 'cursor' in locals() and cursor:
+            cursor.close()
+        close_connection(conn)
+    return projects_data
+
+def iter_projects(batch_size=STREAM_BATCH_SIZE, period_id=None, subject_id=None, conn=None):
+    """
+    Variante en streaming de get_projects_page: mismas columnas, filtros y orden
+    (id_proyecto descendente), leídos con un cursor sin buffer y entregados en lotes.
+
+    Args:
+        batch_size (int): Proyectos por lote.
+        period_id (int, optional): Si se indica, solo proyectos de ese período.
+        subject_id (int, optional): Si se indica, solo proyectos de esa materia.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
+
+    Yields:
+        list of dict: Lotes de hasta batch_size proyectos.
+
+    Raises:
+        mysql.connector.Error: Si no hay conexión o la consulta falla.
+    """
+    where_clauses, params = _project_filters(period_id, subject_id)
+    query = """
+    SELECT p.id_proyecto, p.nombre_proyecto, p.descripcion, p.fecha_registro,
+           p.id_periodo, pe.nombre_periodo,
+           p.id_materia, m.nombre_materia
+    FROM proyectos p
+    JOIN periodos pe ON p.id_periodo = pe.id_periodo
+    JOIN materias m ON p.id_materia = m.id_materia
+    """
+    if where_clauses:
+        query += " WHERE " + " AND ".join(where_clauses)
+    query += " ORDER BY p.id_proyecto DESC"
+    yield from iter_query(query, tuple(params), batch_size, conn=conn)
+
+def count_projects(period_id=None, subject_id=None, conn=None):
+    """
+    Cuenta los proyectos, con los mismos filtros opcionales que get_projects_page.
+
+    Args:
+        period_id (int, optional): Si se indica, solo proyectos de ese período.
+        subject_id (int, optional): Si se indica, solo proyectos de esa materia.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
+
+    Returns:
+        int or None: El total de proyectos, None en caso de error.
+    """
+    conn = create_connection(conn)
+    if conn is None:
+        return None
+
+    total = None
+    try:
+        cursor = conn.cursor()
+        where_clauses, params = _project_filters(period_id, subject_id)
+        query = "SELECT COUNT(*) FROM proyectos p"
+        if where_clauses:
+            query += " WHERE " + " AND ".join(where_clauses)
+        cursor.execute(query, tuple(params))
+        total = cursor.fetchone()[0]
+    except Error as e:
+        print(f"Error al contar proyectos: {e}")
+    finally:
+        if 'cursor' in locals() and cursor:
+            cursor.close()
+        close_connection(conn)
+    return total
+
+# Máximo de palabras que se tienen en cuenta en una búsqueda
+SEARCH_MAX_TERMS = 10
+
+def _search_terms(query):
+    """Palabras de una búsqueda, sin los operadores de MATCH ... AGAINST ni de FTS5."""
+    return re.findall(r"\w+", query or '')[:SEARCH_MAX_TERMS]
+
+def search_projects(query, period_id=None, limit=50, conn=None):
+    """
+    Busca proyectos por palabras en el nombre o la descripción, ordenados por relevancia.
+
+    Usa el índice FULLTEXT ft_proyectos_texto (MySQL, modo booleano) o la tabla
+    FTS5 proyectos_fts (SQLite). Cada palabra debe aparecer en el nombre o en
+    la descripción, y se busca como prefijo para que la búsqueda funcione
+    mientras se escribe ("robo" encuentra "Robótica").
+
+    Args:
+        query (str): Texto de búsqueda.
+        period_id (int, optional): Si se indica, solo proyectos de ese período.
+        limit (int): Cantidad máxima de resultados.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
+
+    Returns:
+        list of dict: Mismas columnas que get_all_projects más 'relevancia', de
+        mayor a menor relevancia (lista vacía si no hay palabras que buscar o en caso de error).
+    """
+    terms = _search_terms(query)
+    if not terms:
+        return []
+
+    conn = create_connection(conn)
+    if conn is None:
+        return []
+
+    projects_data = []
+    try:
+        cursor = conn.cursor(dictionary=True)
+        columns = """
+            p.id_proyecto, p.nombre_proyecto, p.descripcion, p.fecha_registro,
+            p.id_periodo, pe.nombre_periodo,
+            p.id_materia, m.nombre_materia"""
+        if get_backend_name(conn) == 'sqlite':
+            # bm25 es menor cuanto más relevante; el nombre pesa más que la descripción
+            match = ' '.join(f'"{term}"*' for term in terms)
+            query_sql = f"""
+            SELECT {columns}, -bm25(proyectos_fts, 10.0, 1.0) AS relevancia
+            FROM proyectos_fts
+            JOIN proyectos p ON p.id_proyecto = proyectos_fts.rowid
+            JOIN periodos pe ON p.id_periodo = pe.id_periodo
+            JOIN materias m ON p.id_materia = m.id_materia
+            WHERE proyectos_fts MATCH %s
+            """
+            params = [match]
+        else:
+            match = ' '.join(f'+{term}*' for term in terms)
+            query_sql = f"""
+            SELECT {columns}, MATCH(p.nombre_proyecto, p.descripcion) AGAINST (%s IN BOOLEAN MODE) AS relevancia
+            FROM proyectos p
+            JOIN periodos pe ON p.id_periodo = pe.id_periodo
+            JOIN materias m ON p.id_materia = m.id_materia
+            WHERE MATCH(p.nombre_proyecto, p.descripcion) AGAINST (%s IN BOOLEAN MODE)
+            """
+            params = [match, match]
+        if period_id:
+            query_sql += " AND p.id_periodo = %s"
+            params.append(period_id)
+        query_sql += " ORDER BY relevancia DESC, p.id_proyecto DESC LIMIT %s"
+        cursor.execute(query_sql, (*params, limit))
+        projects_data = cursor.fetchall()
+    except Error as e:
+        print(f"Error al buscar proyectos: {e}")
+    finally:
+        if 'cursor' in locals() and cursor:
+            cursor.close()
+        close_connection(conn)
+    return projects_data
+
+def add_participants_to_project(project_id, new_participant_ids, conn=None):
     """
     Añade nuevos participantes a un proyecto existente.
 
     Args:
         project_id (int): ID del proyecto.
         new_participant_ids (list): Lista de IDs de participantes a añadir.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
 
     Returns:
         bool: True si la operación es exitosa, False en caso de error.
     """
-    conn = create_connection()
+    conn = create_connection(conn)
     if conn is None:
         return False
 
@@ -173,10 +447,16 @@ def add_participants_to_project(project_id, new_participant_ids):
     success = False
     try:
         cursor = conn.cursor()
+        before = _project_participant_ids(cursor, project_id)
         query = "INSERT IGNORE INTO proyectos_participantes (id_proyecto, id_participante) VALUES (%s, %s)"
         values = [(project_id, p_id) for p_id in new_participant_ids]
         cursor.executemany(query, values)
+        added = _project_participant_ids(cursor, project_id) - before # INSERT IGNORE omite los que ya estaban
+        project = _project_period_and_subject(cursor, project_id)
+        if project and added:
+            link_participants(conn, project[0], added)
         conn.commit()
+        record_write(conn, 'proyectos_participantes')
         success = True # Consideramos éxito si la operación se completó sin errores de DB
     except Error as e:
         print(f"Error general al añadir participantes al proyecto: {e}")
@@ -188,18 +468,19 @@ def add_participants_to_project(project_id, new_participant_ids):
         close_connection(conn)
     return success
 
-def remove_participants_from_project(project_id, participant_ids_to_remove):
+def remove_participants_from_project(project_id, participant_ids_to_remove, conn=None):
     """
     Elimina participantes de un proyecto existente.
 
     Args:
         project_id (int): ID del proyecto.
         participant_ids_to_remove (list): Lista de IDs de participantes a remover.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
 
     Returns:
         bool: True si la operación es exitosa, False en caso de error.
     """
-    conn = create_connection()
+    conn = create_connection(conn)
     if conn is None:
         return False
 
@@ -211,11 +492,17 @@ def remove_participants_from_project(project_id, participant_ids_to_remove):
     success = False
     try:
         cursor = conn.cursor()
+        before = _project_participant_ids(cursor, project_id)
         # Construir la parte IN del WHERE para múltiples IDs
         placeholders = ', '.join(['%s'] * len(participant_ids_to_remove))
         query = f"DELETE FROM proyectos_participantes WHERE id_proyecto = %s AND id_participante IN ({placeholders})"
         cursor.execute(query, (project_id, *participant_ids_to_remove))
+        removed = before - _project_participant_ids(cursor, project_id)
+        project = _project_period_and_subject(cursor, project_id)
+        if project and removed:
+            unlink_participants(conn, project[0], removed)
         conn.commit()
+        record_write(conn, 'proyectos_participantes')
         success = True # Consideramos éxito si el proceso se completa
     except Error as e:
         print(f"Error al remover participantes del proyecto: {e}")
@@ -227,7 +514,7 @@ def remove_participants_from_project(project_id, participant_ids_to_remove):
         close_connection(conn)
     return success
 
-def update_project(project_id, **kwargs):
+def update_project(project_id, conn=None, **kwargs):
     """
     Actualiza la información de un proyecto existente.
     No se usa para actualizar participantes; usar add_participants_to_project
@@ -237,11 +524,15 @@ def update_project(project_id, **kwargs):
         project_id (int): ID del proyecto a actualizar.
         **kwargs: Argumentos de palabra clave con los campos a actualizar
                   (ej. nombre_proyecto='Nuevo Nombre', descripcion='Nueva descripción').
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
 
     Returns:
         bool: True si la actualización fue exitosa, False en caso de error.
+
+    Raises:
+        mysql.connector.IntegrityError: Si el nuevo nombre coincide con el de otro proyecto (error 1062).
     """
-    conn = create_connection()
+    conn = create_connection(conn)
     if conn is None:
         return False
 
@@ -256,6 +547,10 @@ def update_project(project_id, **kwargs):
         if key in ['id_periodo', 'id_materia', 'nombre_proyecto', 'descripcion']:
             updates.append(f"{key} = %s")
             values.append(value)
+            if key == 'nombre_proyecto':
+                # La clave normalizada siempre acompaña al nombre
+                updates.append("nombre_proyecto_clave = %s")
+                values.append(normalize_project_name(value))
         else:
             print(f"Advertencia: El campo '{key}' no es actualizable o es desconocido para proyectos.")
 
@@ -270,9 +565,20 @@ def update_project(project_id, **kwargs):
     success = False
     try:
         cursor = conn.cursor()
+        old = _project_period_and_subject(cursor, project_id)
         cursor.execute(query, tuple(values))
-        conn.commit()
         success = (cursor.rowcount > 0) # True si se afectó al menos una fila
+        if success:
+            new = _project_period_and_subject(cursor, project_id)
+            if old != new: # Cambió de período o de materia: moverlo en los resúmenes del dashboard
+                add_to_project_summary(conn, old[0], old[1], -1)
+                add_to_project_summary(conn, new[0], new[1], 1)
+                if old[0] != new[0]:
+                    participant_ids = _project_participant_ids(cursor, project_id)
+                    unlink_participants(conn, old[0], participant_ids)
+                    link_participants(conn, new[0], participant_ids)
+        conn.commit()
+        record_write(conn, 'proyectos')
         if success:
             print(f"Proyecto con ID {project_id} actualizado exitosamente.")
         else:
@@ -280,13 +586,15 @@ def update_project(project_id, **kwargs):
     except Error as e:
         print(f"Error al actualizar proyecto: {e}")
         conn.rollback()
+        if is_duplicate_entry(e):
+            raise # El controlador traduce la duplicidad a su mensaje
     finally:
         if 'cursor' in locals() and cursor:
             cursor.close()
         close_connection(conn)
     return success
 
-def delete_project(project_id):
+def delete_project(project_id, conn=None):
     """
     Elimina un proyecto de la tabla 'proyectos' por su ID.
     Debido a ON DELETE CASCADE en proyectos_participantes,
@@ -294,23 +602,31 @@ def delete_project(project_id):
 
     Args:
         project_id (int): ID del proyecto a eliminar.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
 
     Returns:
         bool: True si la eliminación fue exitosa, False en caso de error.
     """
-    conn = create_connection()
+    conn = create_connection(conn)
     if conn is None:
         return False
 
     success = False
     try:
         cursor = conn.cursor()
+        project = _project_period_and_subject(cursor, project_id)
+        participant_ids = _project_participant_ids(cursor, project_id)
         # La FK en proyectos_participantes está en CASCADE, por lo que MySQL
         # se encargará de eliminar las entradas de esa tabla automáticamente.
         query = "DELETE FROM proyectos WHERE id_proyecto = %s"
         cursor.execute(query, (project_id,))
-        conn.commit()
         success = (cursor.rowcount > 0)
+        if success:
+            # Las eliminaciones en cascada no disparan nada: los resúmenes se ajustan aquí
+            add_to_project_summary(conn, project[0], project[1], -1)
+            unlink_participants(conn, project[0], participant_ids)
+        conn.commit()
+        record_write(conn, 'proyectos', 'proyectos_participantes')
         if success:
             print(f"Proyecto con ID {project_id} eliminado exitosamente.")
         else:
@@ -1,8 +1,126 @@
 import mysql.connector
 from mysql.connector import Error
-from db.connection import create_connection, close_connection
+from db.connection import create_connection, close_connection, iter_query, STREAM_BATCH_SIZE
 
-def get_filtered_projects_report(period_id=None, student_id=None, teacher_id=None, subject_id=None):
+# Columnas de proyecto del reporte de proyectos (get_filtered_projects_report e iter_projects_report)
+_PROJECT_REPORT_COLUMNS = """
+            p.id_proyecto,
+            p.nombre_proyecto,
+            p.descripcion,
+            p.fecha_registro,
+            pe.nombre_periodo,
+            pe.fecha_inicio AS periodo_inicio,
+            pe.fecha_fin AS periodo_fin,
+            m.nombre_materia,
+            m.codigo_materia
+"""
+_PROJECT_REPORT_KEYS = ('id_proyecto', 'nombre_proyecto', 'descripcion', 'fecha_registro', 'nombre_periodo',
+                        'periodo_inicio', 'periodo_fin', 'nombre_materia', 'codigo_materia')
+
+def _projects_report_source(period_id, student_id, teacher_id, subject_id):
+    """
+    Origen (FROM ... WHERE ...) y parámetros del reporte de proyectos según los filtros.
+
+    Returns:
+        tuple: (str, list, bool, bool)
+               - El FROM con sus JOIN y, si hay filtros, su WHERE.
+               - Los parámetros de los filtros, en orden.
+               - True si hay filtros (y por tanto WHERE).
+               - True si el FROM incluye los JOIN de participantes (hace falta agrupar por proyecto).
+    """
+    from_clause = """
+        FROM proyectos p
+        JOIN periodos pe ON p.id_periodo = pe.id_periodo
+        JOIN materias m ON p.id_materia = m.id_materia
+        """
+    params = []
+    where_clauses = []
+
+    # Construir dinámicamente las cláusulas WHERE basadas en los filtros
+    if period_id:
+        where_clauses.append("p.id_periodo = %s")
+        params.append(period_id)
+
+    if subject_id:
+        where_clauses.append("p.id_materia = %s")
+        params.append(subject_id)
+
+    # Si hay filtros por participante, necesitamos JOIN con proyectos_participantes y participantes
+    participant_join_needed = student_id is not None or teacher_id is not None
+    if participant_join_needed:
+        from_clause += " JOIN proyectos_participantes pp ON p.id_proyecto = pp.id_proyecto "
+        from_clause += " JOIN participantes part ON pp.id_participante = part.id_participante "
+
+        if student_id:
+            where_clauses.append("part.id_participante = %s AND part.tipo_participante = 'Estudiante'")
+            params.append(student_id)
+        if teacher_id:
+            where_clauses.append("part.id_participante = %s AND part.tipo_participante = 'Docente'")
+            params.append(teacher_id)
+
+    # Unir todas las cláusulas WHERE
+    if where_clauses:
+        from_clause += " WHERE " + " AND ".join(where_clauses)
+    return from_clause, params, bool(where_clauses), participant_join_needed
+
+def get_report_filter_references(period_id=None, participant_ids=(), subject_id=None, conn=None):
+    """
+    Comprueba en una sola consulta qué IDs de filtro de un reporte existen.
+
+    Une con UNION ALL una búsqueda por clave primaria en cada tabla
+    (periodos, participantes, materias), de modo que validar todos los filtros
+    cuesta un único viaje a la base de datos en lugar de uno por filtro.
+
+    Args:
+        period_id (int, optional): ID del período a comprobar.
+        participant_ids (iterable of int): IDs de participantes a comprobar (estudiante y/o docente).
+        subject_id (int, optional): ID de la materia a comprobar.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
+
+    Returns:
+        dict or None: {'periodo': bool, 'materia': bool, 'participantes': {id: tipo_participante}}
+                      con los que existen (sin consultar si no hay IDs), o None en caso de error.
+    """
+    references = {'periodo': False, 'materia': False, 'participantes': {}}
+    participant_ids = sorted(set(participant_ids))
+    selects = []
+    params = []
+    if period_id is not None:
+        selects.append("SELECT 'periodo' AS entidad, id_periodo AS id, NULL AS tipo FROM periodos WHERE id_periodo = %s")
+        params.append(period_id)
+    if participant_ids:
+        placeholders = ", ".join(["%s"] * len(participant_ids))
+        selects.append("SELECT 'participante' AS entidad, id_participante AS id, tipo_participante AS tipo "
+                       f"FROM participantes WHERE id_participante IN ({placeholders})")
+        params.extend(participant_ids)
+    if subject_id is not None:
+        selects.append("SELECT 'materia' AS entidad, id_materia AS id, NULL AS tipo FROM materias WHERE id_materia = %s")
+        params.append(subject_id)
+    if not selects:
+        return references
+
+    conn = create_connection(conn)
+    if conn is None:
+        return None
+
+    try:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(" UNION ALL ".join(selects), tuple(params))
+        for row in cursor.fetchall():
+            if row['entidad'] == 'participante':
+                references['participantes'][row['id']] = row['tipo']
+            else:
+                references[row['entidad']] = True
+    except Error as e:
+        print(f"Error al validar los filtros del reporte: {e}")
+        references = None
+    finally:
+        if 'cursor' in locals() and cursor:
+            cursor.close()
+        close_connection(conn)
+    return references
+
+def get_filtered_projects_report(period_id=None, student_id=None, teacher_id=None, subject_id=None, conn=None):
     """
     Obtiene proyectos filtrados dinámicamente por período, tipo de participante (estudiante/profesor)
     y/o materia. Todos los filtros son opcionales.
@@ -12,62 +130,25 @@ def get_filtered_projects_report(period_id=None, student_id=None, teacher_id=Non
         student_id (int, optional): ID de un participante (estudiante).
         teacher_id (int, optional): ID de un participante (docente).
         subject_id (int, optional): ID de la materia.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
 
     Returns:
-        list of dict: Una lista de diccionarios con detalles de los proyectos y sus asociados.
+        list of dict or None: Una lista de diccionarios con detalles de los proyectos y sus asociados,
+        o None en caso de error (para distinguirlo de un reporte vacío).
     """
-    conn = create_connection()
+    conn = create_connection(conn)
     if conn is None:
-        return []
+        return None
 
     projects_data = []
     try:
         cursor = conn.cursor(dictionary=True)
 
-        # La consulta base para proyectos
-        query = """
-        SELECT
-            p.id_proyecto,
-            p.nombre_proyecto,
-            p.descripcion,
-            p.fecha_registro,
-            pe.nombre_periodo,
-            pe.fecha_inicio AS periodo_inicio,
-            pe.fecha_fin AS periodo_fin,
-            m.nombre_materia,
-            m.codigo_materia
-        FROM proyectos p
-        JOIN periodos pe ON p.id_periodo = pe.id_periodo
-        JOIN materias m ON p.id_materia = m.id_materia
-        """
-        params = []
-        where_clauses = []
-
-        # Construir dinámicamente las cláusulas WHERE basadas en los filtros
-        if period_id:
-            where_clauses.append("p.id_periodo = %s")
-            params.append(period_id)
-        
-        if subject_id:
-            where_clauses.append("p.id_materia = %s")
-            params.append(subject_id)
+        # Origen y filtros de la consulta base; se reutilizan para traer los participantes
+        from_clause, params, filtered, participant_join_needed = _projects_report_source(period_id, student_id, teacher_id, subject_id)
 
-        # Si hay filtros por participante, necesitamos JOIN con proyectos_participantes y participantes
-        participant_join_needed = student_id is not None or teacher_id is not None
-        if participant_join_needed:
-            query += " JOIN proyectos_participantes pp ON p.id_proyecto = pp.id_proyecto "
-            query += " JOIN participantes part ON pp.id_participante = part.id_participante "
-
-            if student_id:
-                where_clauses.append("part.id_participante = %s AND part.tipo_participante = 'Estudiante'")
-                params.append(student_id)
-            if teacher_id:
-                where_clauses.append("part.id_participante = %s AND part.tipo_participante = 'Docente'")
-                params.append(teacher_id)
-
-        # Unir todas las cláusulas WHERE
-        if where_clauses:
-            query += " WHERE " + " AND ".join(where_clauses)
+        # La consulta base para proyectos
+        query = "SELECT " + _PROJECT_REPORT_COLUMNS + from_clause
         
         # Asegurar que los proyectos se muestren una sola vez si hay joins de participantes
         if participant_join_needed:
@@ -78,27 +159,135 @@ def get_filtered_projects_report(period_id=None, student_id=None, teacher_id=Non
         cursor.execute(query, tuple(params))
         projects_data = cursor.fetchall()
 
-        # Para cada proyecto, obtener sus participantes asociados (todos los tipos)
-        for project in projects_data:
+        if projects_data:
+            # Participantes (todos los tipos) de todos los proyectos del reporte en una sola consulta:
+            # se repiten los mismos filtros como subconsulta en lugar de consultar proyecto por proyecto,
+            # así el número de consultas no crece con el número de proyectos.
             participants_query = """
-            SELECT part.id_participante, part.tipo_participante, part.nombre, part.apellido, part.cedula
+            SELECT pp.id_proyecto, part.id_participante, part.tipo_participante, part.nombre, part.apellido, part.cedula
             FROM participantes part
             JOIN proyectos_participantes pp ON part.id_participante = pp.id_participante
-            WHERE pp.id_proyecto = %s
-            ORDER BY part.tipo_participante ASC, part.apellido ASC
             """
-            cursor.execute(participants_query, (project['id_proyecto'],))
-            project['participantes'] = cursor.fetchall()
+            if filtered:
+                participants_query += " WHERE pp.id_proyecto IN (SELECT p.id_proyecto " + from_clause + ")"
+            participants_query += " ORDER BY part.tipo_participante ASC, part.apellido ASC"
+            cursor.execute(participants_query, tuple(params))
+
+            participants_by_project = {project['id_proyecto']: [] for project in projects_data}
+            for participant in cursor.fetchall():
+                project_participants = participants_by_project.get(participant.pop('id_proyecto'))
+                if project_participants is not None: # Un proyecto creado entre ambas consultas no está en el reporte
+                    project_participants.append(participant)
+            for project in projects_data:
+                project['participantes'] = participants_by_project[project['id_proyecto']]
 
     except Error as e:
         print(f"Error al generar reporte de proyectos: {e}")
+        projects_data = None
     finally:
         if 'cursor' in locals() and cursor:
             cursor.close()
         close_connection(conn)
     return projects_data
 
-def get_filtered_participants_report(period_id=None, participant_type=None):
+def iter_projects_report(period_id=None, student_id=None, teacher_id=None, subject_id=None, batch_size=STREAM_BATCH_SIZE, conn=None):
+    """
+    Variante en streaming de get_filtered_projects_report: mismos filtros, mismo
+    orden y mismos diccionarios (con 'participantes'), entregados en lotes.
+
+    Proyectos y participantes se leen con una sola consulta (LEFT JOIN ordenado
+    por proyecto) y un cursor sin buffer, agrupando las filas consecutivas de
+    cada proyecto; la memoria no depende del número de proyectos del reporte.
+
+    Args:
+        period_id (int, optional): ID del período.
+        student_id (int, optional): ID de un participante (estudiante).
+        teacher_id (int, optional): ID de un participante (docente).
+        subject_id (int, optional): ID de la materia.
+        batch_size (int): Proyectos por lote.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
+
+    Yields:
+        list of dict: Lotes de hasta batch_size proyectos con sus participantes.
+
+    Raises:
+        mysql.connector.Error: Si no hay conexión o la consulta falla (un reporte incompleto no se entrega como completo).
+    """
+    from_clause, params, filtered, _ = _projects_report_source(period_id, student_id, teacher_id, subject_id)
+    query = "SELECT " + _PROJECT_REPORT_COLUMNS + """,
+            rpart.id_participante, rpart.tipo_participante, rpart.nombre, rpart.apellido, rpart.cedula
+        FROM proyectos p
+        JOIN periodos pe ON p.id_periodo = pe.id_periodo
+        JOIN materias m ON p.id_materia = m.id_materia
+        LEFT JOIN proyectos_participantes rpp ON p.id_proyecto = rpp.id_proyecto
+        LEFT JOIN participantes rpart ON rpp.id_participante = rpart.id_participante
+        """
+    if filtered:
+        query += " WHERE p.id_proyecto IN (SELECT p.id_proyecto " + from_clause + ")"
+    # id_proyecto desempata para que las filas de cada proyecto lleguen siempre juntas
+    query += " ORDER BY pe.fecha_inicio DESC, p.nombre_proyecto ASC, p.id_proyecto, rpart.tipo_participante ASC, rpart.apellido ASC"
+
+    batch = []
+    project = None
+    for rows in iter_query(query, tuple(params), batch_size, conn=conn):
+        for row in rows:
+            if project is None or project['id_proyecto'] != row['id_proyecto']:
+                if project is not None:
+                    batch.append(project)
+                    if len(batch) >= batch_size:
+                        yield batch
+                        batch = []
+                project = {key: row[key] for key in _PROJECT_REPORT_KEYS}
+                project['participantes'] = []
+            if row['id_participante'] is not None: # LEFT JOIN: proyecto sin participantes
+                project['participantes'].append({
+                    'id_participante': row['id_participante'],
+                    'tipo_participante': row['tipo_participante'],
+                    'nombre': row['nombre'],
+                    'apellido': row['apellido'],
+                    'cedula': row['cedula'],
+                })
+    if project is not None:
+        batch.append(project)
+    if batch:
+        yield batch
+
+def _participants_report_query(period_id, participant_type):
+    """Consulta y parámetros del reporte de participantes (get_filtered_participants_report e iter_participants_report)."""
+    query = """
+    SELECT DISTINCT
+        part.id_participante,
+        part.nombre,
+        part.apellido,
+        part.cedula,
+        part.correo_electronico,
+        part.telefono,
+        part.tipo_participante,
+        part.carrera,
+        GROUP_CONCAT(DISTINCT p.nombre_proyecto SEPARATOR '; ') AS proyectos_asociados
+    FROM participantes part
+    JOIN proyectos_participantes pp ON part.id_participante = pp.id_participante
+    JOIN proyectos p ON pp.id_proyecto = p.id_proyecto
+    """
+    params = []
+    where_clauses = []
+
+    if period_id:
+        where_clauses.append("p.id_periodo = %s")
+        params.append(period_id)
+
+    if participant_type:
+        where_clauses.append("part.tipo_participante = %s")
+        params.append(participant_type)
+
+    if where_clauses:
+        query += " WHERE " + " AND ".join(where_clauses)
+
+    query += " GROUP BY part.id_participante " # Agrupar para tener una lista de proyectos por participante
+    query += " ORDER BY part.tipo_participante ASC, part.apellido ASC, part.nombre ASC"
+    return query, tuple(params)
+
+def get_filtered_participants_report(period_id=None, participant_type=None, conn=None):
     """
     Obtiene participantes que están asociados a proyectos, filtrados opcionalmente
     por período y/o tipo de participante.
@@ -107,61 +296,106 @@ def get_filtered_participants_report(period_id=None, participant_type=None):
         period_id (int, optional): ID del período. Si es None, trae participantes de todos los períodos.
         participant_type (str, optional): Tipo de participante ('Estudiante', 'Docente').
                                           Si es None, trae ambos tipos.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
 
     Returns:
-        list of dict: Una lista de diccionarios con datos de participantes y los proyectos en los que están.
+        list of dict or None: Una lista de diccionarios con datos de participantes y los proyectos en los que están,
+        o None en caso de error (para distinguirlo de un reporte vacío).
     """
-    conn = create_connection()
+    conn = create_connection(conn)
     if conn is None:
-        return []
+        return None
 
     participants_data = []
     try:
         cursor = conn.cursor(dictionary=True)
 
-        query = """
-        SELECT DISTINCT
-            part.id_participante,
-            part.nombre,
-            part.apellido,
-            part.cedula,
-            part.correo_electronico,
-            part.telefono,
-            part.tipo_participante,
-            part.carrera,
-            GROUP_CONCAT(DISTINCT p.nombre_proyecto SEPARATOR '; ') AS proyectos_asociados
-        FROM participantes part
-        JOIN proyectos_participantes pp ON part.id_participante = pp.id_participante
-        JOIN proyectos p ON pp.id_proyecto = p.id_proyecto
-        """
-        params = []
-        where_clauses = []
-
-        if period_id:
-            where_clauses.append("p.id_periodo = %s")
-            params.append(period_id)
-
-        if participant_type:
-            where_clauses.append("part.tipo_participante = %s")
-            params.append(participant_type)
-        
-        if where_clauses:
-            query += " WHERE " + " AND ".join(where_clauses)
-        
-        query += " GROUP BY part.id_participante " # Agrupar para tener una lista de proyectos por participante
-        query += " ORDER BY part.tipo_participante ASC, part.apellido ASC, part.nombre ASC"
-
-        cursor.execute(query, tuple(params))
+        query, params = _participants_report_query(period_id, participant_type)
+        cursor.execute(query, params)
         participants_data = cursor.fetchall()
 
     except Error as e:
         print(f"Error al generar reporte de participantes: {e}")
+        participants_data = None
     finally:
         if 'cursor' in locals() and cursor:
             cursor.close()
         close_connection(conn)
     return participants_data
 
+def iter_participants_report(period_id=None, participant_type=None, batch_size=STREAM_BATCH_SIZE, conn=None):
+    """
+    Variante en streaming de get_filtered_participants_report: mismos filtros,
+    columnas y orden, leídos con un cursor sin buffer y entregados en lotes.
+
+    Args:
+        period_id (int, optional): ID del período. Si es None, trae participantes de todos los períodos.
+        participant_type (str, optional): Tipo de participante ('Estudiante', 'Docente').
+        batch_size (int): Participantes por lote.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
+
+    Yields:
+        list of dict: Lotes de hasta batch_size participantes con sus proyectos asociados.
+
+    Raises:
+        mysql.connector.Error: Si no hay conexión o la consulta falla.
+    """
+    query, params = _participants_report_query(period_id, participant_type)
+    yield from iter_query(query, params, batch_size, conn=conn)
+
+def iter_certificate_recipients(period_id=None, project_ids=None, participant_ids=None, batch_size=STREAM_BATCH_SIZE, conn=None):
+    """
+    Genera en lotes las participaciones (proyecto y participante) que reciben certificado,
+    ordenadas por período, proyecto y apellido. Los filtros se combinan con AND.
+
+    Args:
+        period_id (int, optional): Solo proyectos de este período.
+        project_ids (iterable of int, optional): Solo estos proyectos.
+        participant_ids (iterable of int, optional): Solo estos participantes.
+        batch_size (int): Participaciones por lote.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
+
+    Yields:
+        list of dict: Lotes con id_proyecto, nombre_proyecto, nombre_periodo, id_participante,
+                      nombre, apellido, cedula, correo_electronico y tipo_participante.
+
+    Raises:
+        mysql.connector.Error: Si no hay conexión o la consulta falla.
+    """
+    where_clauses = []
+    params = []
+    if period_id is not None:
+        where_clauses.append("p.id_periodo = %s")
+        params.append(period_id)
+    for column, ids in (("p.id_proyecto", project_ids), ("pa.id_participante", participant_ids)):
+        if ids is not None:
+            ids = sorted(set(ids))
+            if not ids:
+                return # Un conjunto vacío no selecciona ninguna participación
+            where_clauses.append(f"{column} IN ({', '.join(['%s'] * len(ids))})")
+            params.extend(ids)
+
+    query = """
+        SELECT
+            p.id_proyecto,
+            p.nombre_proyecto,
+            pe.nombre_periodo,
+            pa.id_participante,
+            pa.nombre,
+            pa.apellido,
+            pa.cedula,
+            pa.correo_electronico,
+            pa.tipo_participante
+        FROM proyectos p
+        JOIN periodos pe ON p.id_periodo = pe.id_periodo
+        JOIN proyectos_participantes pp ON p.id_proyecto = pp.id_proyecto
+        JOIN participantes pa ON pp.id_participante = pa.id_participante
+    """
+    if where_clauses:
+        query += " WHERE " + " AND ".join(where_clauses)
+    query += " ORDER BY pe.nombre_periodo, p.nombre_proyecto, p.id_proyecto, pa.apellido, pa.nombre, pa.id_participante"
+    yield from iter_query(query, tuple(params), batch_size, conn=conn)
+
 # --- Bloque de Prueba (uso de ejemplo) ---
 if __name__ == "__main__":
     print("--- Probando Módulo de Reportes Reestructurado ---")
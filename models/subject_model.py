@@ -1,11 +1,12 @@
 import mysql.connector
 from mysql.connector import Error
 
-from db.connection import create_connection, close_connection
+from db.connection import create_connection, close_connection, record_write
+from db.errors import is_duplicate_entry
 
 # --- Funciones CRUD para la tabla 'materias' ---
 
-def create_subject(codigo_materia, nombre_materia, creditos=None):
+def create_subject(codigo_materia, nombre_materia, creditos=None, conn=None):
     """
     Inserta una nueva materia en la tabla 'materias'.
 
@@ -13,11 +14,15 @@ def create_subject(codigo_materia, nombre_materia, creditos=None):
         codigo_materia (str): Código alfanumérico único de la materia.
         nombre_materia (str): Nombre completo único de la materia.
         creditos (int, optional): Número de unidades de crédito de la materia.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
 
     Returns:
         int or None: El ID de la nueva materia si la inserción es exitosa, None en caso de error.
+
+    Raises:
+        mysql.connector.IntegrityError: Si viola una restricción UNIQUE (error 1062).
     """
-    conn = create_connection()
+    conn = create_connection(conn)
     if conn is None:
         return None
 
@@ -30,28 +35,32 @@ def create_subject(codigo_materia, nombre_materia, creditos=None):
         """
         cursor.execute(query, (codigo_materia, nombre_materia, creditos))
         conn.commit()
+        record_write(conn, 'materias')
         subject_id = cursor.lastrowid
         print(f"Materia '{nombre_materia}' ({codigo_materia}) creada con ID: {subject_id}")
     except Error as e:
         print(f"Error al crear materia: {e}")
         conn.rollback()
+        if is_duplicate_entry(e):
+            raise # El controlador traduce la duplicidad a su mensaje
     finally:
         if 'cursor' in locals() and cursor:
             cursor.close()
         close_connection(conn)
     return subject_id
 
-def get_subject_by_id(subject_id):
+def get_subject_by_id(subject_id, conn=None):
     """
     Obtiene una materia de la tabla 'materias' por su ID.
 
     Args:
         subject_id (int): ID de la materia a buscar.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
 
     Returns:
         dict or None: Un diccionario con los datos de la materia si se encuentra, None si no.
     """
-    conn = create_connection()
+    conn = create_connection(conn)
     if conn is None:
         return None
 
@@ -69,17 +78,18 @@ def get_subject_by_id(subject_id):
         close_connection(conn)
     return subject_data
 
-def get_subject_by_code(codigo_materia):
+def get_subject_by_code(codigo_materia, conn=None):
     """
     Obtiene una materia de la tabla 'materias' por su código.
 
     Args:
         codigo_materia (str): Código de la materia a buscar.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
 
     Returns:
         dict or None: Un diccionario con los datos de la materia si se encuentra, None si no.
     """
-    conn = create_connection()
+    conn = create_connection(conn)
     if conn is None:
         return None
 
@@ -97,14 +107,47 @@ def get_subject_by_code(codigo_materia):
         close_connection(conn)
     return subject_data
 
-def get_all_subjects():
+def get_subject_by_name(nombre_materia, conn=None):
+    """
+    Obtiene una materia de la tabla 'materias' por su nombre (búsqueda por el índice UNIQUE).
+    La comparación sigue la colación de la columna, que no distingue mayúsculas.
+
+    Args:
+        nombre_materia (str): Nombre de la materia a buscar.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
+
+    Returns:
+        dict or None: Un diccionario con los datos de la materia si se encuentra, None si no.
+    """
+    conn = create_connection(conn)
+    if conn is None:
+        return None
+
+    subject_data = None
+    try:
+        cursor = conn.cursor(dictionary=True)
+        query = "SELECT * FROM materias WHERE nombre_materia = %s"
+        cursor.execute(query, (nombre_materia,))
+        subject_data = cursor.fetchone()
+    except Error as e:
+        print(f"Error al obtener materia por nombre: {e}")
+    finally:
+        if 'cursor' in locals() and cursor:
+            cursor.close()
+        close_connection(conn)
+    return subject_data
+
+def get_all_subjects(conn=None):
     """
     Obtiene todas las materias de la tabla 'materias'.
 
+    Args:
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
+
     Returns:
         list of dict: Una lista de diccionarios con los datos de todas las materias.
     """
-    conn = create_connection()
+    conn = create_connection(conn)
     if conn is None:
         return []
 
@@ -122,7 +165,7 @@ def get_all_subjects():
         close_connection(conn)
     return subjects_data
 
-def update_subject(subject_id, **kwargs):
+def update_subject(subject_id, conn=None, **kwargs):
     """
     Actualiza la información de una materia existente.
 
@@ -130,11 +173,15 @@ def update_subject(subject_id, **kwargs):
         subject_id (int): ID de la materia a actualizar.
         **kwargs: Argumentos de palabra clave con los campos a actualizar
                   (ej. nombre_materia='Nueva Materia', creditos=4).
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
 
     Returns:
         bool: True si la actualización fue exitosa, False en caso de error.
+
+    Raises:
+        mysql.connector.IntegrityError: Si viola una restricción UNIQUE (error 1062).
     """
-    conn = create_connection()
+    conn = create_connection(conn)
     if conn is None:
         return False
 
@@ -165,18 +212,21 @@ def update_subject(subject_id, **kwargs):
         cursor = conn.cursor()
         cursor.execute(query, tuple(values))
         conn.commit()
+        record_write(conn, 'materias')
         success = True
         print(f"Materia con ID {subject_id} actualizada exitosamente.")
     except Error as e:
         print(f"Error al actualizar materia: {e}")
         conn.rollback()
+        if is_duplicate_entry(e):
+            raise # El controlador traduce la duplicidad a su mensaje
     finally:
         if 'cursor' in locals() and cursor:
             cursor.close()
         close_connection(conn)
     return success
 
-def delete_subject(subject_id):
+def delete_subject(subject_id, conn=None):
     """
     Elimina una materia de la tabla 'materias' por su ID.
     Ten en cuenta que esto podría afectar la tabla 'proyectos'
@@ -184,11 +234,12 @@ def delete_subject(subject_id):
 
     Args:
         subject_id (int): ID de la materia a eliminar.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
 
     Returns:
         bool: True si la eliminación fue exitosa, False en caso de error.
     """
-    conn = create_connection()
+    conn = create_connection(conn)
     if conn is None:
         return False
 
@@ -198,6 +249,7 @@ def delete_subject(subject_id):
         query = "DELETE FROM materias WHERE id_materia = %s"
         cursor.execute(query, (subject_id,))
         conn.commit()
+        record_write(conn, 'materias')
         success = (cursor.rowcount > 0)
         if success:
             print(f"Materia con ID {subject_id} eliminada exitosamente.")
@@ -4,7 +4,8 @@ import hashlib # Para hashear contraseñas
 
 # Importar la función de conexión desde nuestro módulo database.py
 # Asegúrate de que database.py esté en el mismo nivel o en una ruta accesible
-from db.connection import create_connection, close_connection
+from db.connection import create_connection, close_connection, iter_query, STREAM_BATCH_SIZE
+from db.errors import is_duplicate_entry
 
 # --- Funciones CRUD para la tabla 'usuarios' ---
 
@@ -21,7 +22,7 @@ def verify_password(stored_password_hash, provided_password):
     """
     return stored_password_hash == hash_password(provided_password)
 
-def create_user(nombre_usuario, contrasena, rol, nombre_completo=None, correo_electronico=None):
+def create_user(nombre_usuario, contrasena, rol, nombre_completo=None, correo_electronico=None, conn=None):
     """
     Inserta un nuevo usuario en la tabla 'usuarios'.
 
@@ -31,11 +32,15 @@ def create_user(nombre_usuario, contrasena, rol, nombre_completo=None, correo_el
         rol (str): Rol del usuario (debe ser 'Administrador', 'Coordinador' o 'Profesor').
         nombre_completo (str, optional): Nombre completo del usuario.
         correo_electronico (str, optional): Correo electrónico único del usuario.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
 
     Returns:
         int or None: El ID del nuevo usuario si la inserción es exitosa, None en caso de error.
+
+    Raises:
+        mysql.connector.IntegrityError: Si viola una restricción UNIQUE (error 1062).
     """
-    conn = create_connection()
+    conn = create_connection(conn)
     if conn is None:
         return None
 
@@ -55,23 +60,26 @@ def create_user(nombre_usuario, contrasena, rol, nombre_completo=None, correo_el
     except Error as e:
         print(f"Error al crear usuario: {e}")
         conn.rollback() # Revertir la transacción en caso de error
+        if is_duplicate_entry(e):
+            raise # El controlador traduce la duplicidad a su mensaje
     finally:
         if 'cursor' in locals() and cursor:
             cursor.close()
         close_connection(conn)
     return user_id
 
-def get_user_by_id(user_id):
+def get_user_by_id(user_id, conn=None):
     """
     Obtiene un usuario de la tabla 'usuarios' por su ID.
 
     Args:
         user_id (int): ID del usuario a buscar.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
 
     Returns:
         dict or None: Un diccionario con los datos del usuario si se encuentra, None si no.
     """
-    conn = create_connection()
+    conn = create_connection(conn)
     if conn is None:
         return None
 
@@ -91,14 +99,17 @@ def get_user_by_id(user_id):
 
 # Dentro de models/user_model.py, añade esta función:
 
-def get_all_users():
+def get_all_users(conn=None):
     """
     Obtiene todos los usuarios de la tabla 'usuarios'.
 
+    Args:
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
+
     Returns:
         list of dict: Una lista de diccionarios con los datos de todos los usuarios.
     """
-    conn = create_connection()
+    conn = create_connection(conn)
     if conn is None:
         return []
 
@@ -116,17 +127,115 @@ def get_all_users():
         close_connection(conn)
     return users_data
 
-def get_user_by_username(nombre_usuario):
+def get_users_page(after_id=None, limit=200, role=None, conn=None):
+    """
+    Obtiene una página de usuarios ordenada por ID (paginación por clave).
+
+    Args:
+        after_id (int, optional): ID del último usuario de la página anterior. None para la primera página.
+        limit (int): Cantidad máxima de usuarios de la página.
+        role (str, optional): Si se indica, solo usuarios con ese rol.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
+
+    Returns:
+        list of dict: Los usuarios de la página (lista vacía al llegar al final o en caso de error).
+    """
+    conn = create_connection(conn)
+    if conn is None:
+        return []
+
+    users_data = []
+    try:
+        cursor = conn.cursor(dictionary=True)
+        where_clauses = ["id_usuario > %s"]
+        params = [after_id or 0]
+        if role:
+            where_clauses.append("rol = %s")
+            params.append(role)
+        query = f"""
+        SELECT id_usuario, nombre_usuario, rol, nombre_completo, correo_electronico, activo, fecha_creacion, ultima_sesion
+        FROM usuarios
+        WHERE {' AND '.join(where_clauses)}
+        ORDER BY id_usuario
+        LIMIT %s
+        """
+        cursor.execute(query, (*params, limit))
+        users_data = cursor.fetchall()
+    except Error as e:
+        print(f"Error al obtener página de usuarios: {e}")
+    finally:
+        if 'cursor' in locals() and cursor:
+            cursor.close()
+        close_connection(conn)
+    return users_data
+
+def iter_users(batch_size=STREAM_BATCH_SIZE, role=None, conn=None):
+    """
+    Variante en streaming de get_users_page: mismas columnas y orden (por ID),
+    leídos con un cursor sin buffer y entregados en lotes.
+
+    Args:
+        batch_size (int): Usuarios por lote.
+        role (str, optional): Si se indica, solo usuarios con ese rol.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
+
+    Yields:
+        list of dict: Lotes de hasta batch_size usuarios (sin el hash de la contraseña).
+
+    Raises:
+        mysql.connector.Error: Si no hay conexión o la consulta falla.
+    """
+    query = "SELECT id_usuario, nombre_usuario, rol, nombre_completo, correo_electronico, activo, fecha_creacion, ultima_sesion FROM usuarios"
+    params = ()
+    if role:
+        query += " WHERE rol = %s"
+        params = (role,)
+    query += " ORDER BY id_usuario"
+    yield from iter_query(query, params, batch_size, conn=conn)
+
+def count_users(role=None, conn=None):
+    """
+    Cuenta los usuarios registrados.
+
+    Args:
+        role (str, optional): Si se indica, solo cuenta los usuarios con ese rol.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
+
+    Returns:
+        int or None: El total de usuarios, None en caso de error.
+    """
+    conn = create_connection(conn)
+    if conn is None:
+        return None
+
+    total = None
+    try:
+        cursor = conn.cursor()
+        if role:
+            cursor.execute("SELECT COUNT(*) FROM usuarios WHERE rol = %s", (role,))
+        else:
+            cursor.execute("SELECT COUNT(*) FROM usuarios")
+        total = cursor.fetchone()[0]
+    except Error as e:
+        print(f"Error al contar usuarios: {e}")
+    finally:
+        if 'cursor' in locals() and cursor:
+            cursor.close()
+        close_connection(conn)
+    return total
+
+def get_user_by_username(nombre_usuario, conn=None):
     """
     Obtiene un usuario de la tabla 'usuarios' por su nombre de usuario.
 
     Args:
         nombre_usuario (str): Nombre de usuario a buscar.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
 
     Returns:
         dict or None: Un diccionario con los datos del usuario si se encuentra, None si no.
     """
-    conn = create_connection()
+    conn = create_connection(conn)
     if conn is None:
         return None
 
@@ -144,7 +253,36 @@ def get_user_by_username(nombre_usuario):
         close_connection(conn)
     return user_data
 
-def update_user(user_id, **kwargs):
+def get_user_by_email(correo_electronico, conn=None):
+    """
+    Obtiene un usuario de la tabla 'usuarios' por su correo electrónico (búsqueda por el índice UNIQUE).
+
+    Args:
+        correo_electronico (str): Correo electrónico a buscar.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
+
+    Returns:
+        dict or None: Un diccionario con los datos del usuario si se encuentra, None si no.
+    """
+    conn = create_connection(conn)
+    if conn is None:
+        return None
+
+    user_data = None
+    try:
+        cursor = conn.cursor(dictionary=True)
+        query = "SELECT id_usuario, nombre_usuario, rol, nombre_completo, correo_electronico, activo, fecha_creacion, ultima_sesion FROM usuarios WHERE correo_electronico = %s"
+        cursor.execute(query, (correo_electronico,))
+        user_data = cursor.fetchone()
+    except Error as e:
+        print(f"Error al obtener usuario por correo electrónico: {e}")
+    finally:
+        if 'cursor' in locals() and cursor:
+            cursor.close()
+        close_connection(conn)
+    return user_data
+
+def update_user(user_id, conn=None, **kwargs):
     """
     Actualiza la información de un usuario existente en la tabla 'usuarios'.
 
@@ -153,11 +291,15 @@ def update_user(user_id, **kwargs):
         **kwargs: Argumentos de palabra clave con los campos a actualizar
                   (ej. nombre_completo='Nuevo Nombre', activo=False).
                   La contraseña se debe pasar como 'contrasena' y se hasheará.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
 
     Returns:
         bool: True si la actualización fue exitosa, False en caso de error.
+
+    Raises:
+        mysql.connector.IntegrityError: Si viola una restricción UNIQUE (error 1062).
     """
-    conn = create_connection()
+    conn = create_connection(conn)
     if conn is None:
         return False
 
@@ -197,23 +339,26 @@ def update_user(user_id, **kwargs):
     except Error as e:
         print(f"Error al actualizar usuario: {e}")
         conn.rollback()
+        if is_duplicate_entry(e):
+            raise # El controlador traduce la duplicidad a su mensaje
     finally:
         if 'cursor' in locals() and cursor:
             cursor.close()
         close_connection(conn)
     return success
 
-def delete_user(user_id):
+def delete_user(user_id, conn=None):
     """
     Elimina un usuario de la tabla 'usuarios' por su ID.
 
     Args:
         user_id (int): ID del usuario a eliminar.
+        conn (UnitOfWork, optional): Unidad de trabajo a la que unirse. Si es None, usa una conexión propia.
 
     Returns:
         bool: True si la eliminación fue exitosa, False en caso de error.
     """
-    conn = create_connection()
+    conn = create_connection(conn)
     if conn is None:
         return False
 
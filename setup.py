@@ -68,6 +68,15 @@ def setup_database():
                         cursor.execute(command)
             conn.commit()
             print("✓ Esquema de la base de datos importado correctamente")
+
+            # Índices y demás cambios versionados (db/migrations)
+            from db.migrations import apply_migrations
+            applied, error_msg = apply_migrations(conn=conn)
+            if error_msg:
+                print(f"✗ {error_msg}")
+                sys.exit(1)
+            conn.commit()
+            print(f"✓ Migraciones aplicadas: {len(applied)}")
         else:
             print("✗ Archivo de esquema no encontrado en db/database.sql")
         